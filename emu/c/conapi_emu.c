@@ -0,0 +1,1003 @@
+//------------------------------------------------------------------------------
+// Copyright (c) 2026 Future Design Systems
+// http://www.future-ds.com
+//------------------------------------------------------------------------------
+// conapi_emu.c
+//------------------------------------------------------------------------------
+// VERSION = 2026.10.18.
+//------------------------------------------------------------------------------
+// Software stand-in of 'libconapi' for CON-FMC.
+//
+// It implements the functions of 'conapi.h' without FX3 and libusb,
+// so that TRX_AXI/TRX_AHB API ('libbfmaxi'/'libbfmahb') and Python binding
+// can run without CON-FMC card.
+// The stream from 'conStreamWrite()' is decoded as transactor framing
+// and served from a sparse memory model, while read data is returned
+// through 'conStreamRead()'.
+// In stream modes, i.e., CON_MODE_SU2F/SF2U/SLOOP, the stream is raw data
+// of the user design: stream-out data is sunk or looped back to stream-in,
+// and stream-in data without loop-back is a free-running 32-bit counter,
+// which stands for an ADC or a pattern generator.
+//
+// Each USB transfer is charged with per-transfer latency plus its bytes over
+// link bandwidth, which is selected at conInit() by 'CONFMC_EMU' as a profile
+// ("usb2", "usb3" or "none") and adjusted by 'CONFMC_EMU_LATENCY_US',
+// 'CONFMC_EMU_BANDWIDTH' (MB/s) and 'CONFMC_EMU_REALTIME' (0 or 1).
+// With realtime, the caller waits until the link completes the transfer;
+// otherwise, the time is only accumulated to be read by conEmuGetStats().
+//
+// Cards of AMBA AXI transactor are AMBA AXI4 except the ones whose CID bit is
+// set in 'CONFMC_EMU_AXI3', e.g., 0x2 for CID 1, which complain about
+// incremental bursts longer than 16 beats.
+//
+// U2F and F2U fifos of the transactor have finite depth as reported by
+// conGetMasterInfo(), 1024 words by default, which can be changed by
+// 'CONFMC_EMU_DEPTH' or conEmuSetDepth().
+// Read data go to F2U fifo and the transactor stalls when it is full, while
+// following flits of bulk-out stay in U2F fifo. When U2F fifo is full as well,
+// conStreamWrite() fails as a timed-out bulk-out does, telling how many words
+// went, until conStreamRead() pops read data and the transactor goes on.
+// Stream modes are not limited, since the user design is supposed to keep up.
+// Internal read data of GPIN are limited by the depth of command fifo.
+//
+// Each card is guarded by its own mutex so that threads can share it.
+//------------------------------------------------------------------------------
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <stdint.h>
+#include <time.h>
+#include <pthread.h>
+#include "conapi.h"
+#include "conapi_emu.h"
+
+// bus to decode, which can be overridden by 'CONFMC_EMU_BFM' at conInit()
+#ifndef CONAPI_EMU_BFM
+#define CONAPI_EMU_BFM EMU_BFM_AXI
+#endif
+#define EMU_DEPTH      1024 // num of words of each fifo of the transactor
+#define EMU_DEPTH_MAX  0xFFFF // since con_MasterInfo_t carries 16-bit
+
+//------------------------------------------------------------------------------
+const unsigned int INTERFACE_NUMBER=0;
+const unsigned int con_cid_max=8;
+      unsigned int TIMEOUT_MS=1000;
+int libusb_error=0;
+int conapi_error=CONAPI_ERROR_NO;
+
+//------------------------------------------------------------------------------
+// link profiles
+struct emu_profile {
+       const char     *name;
+       con_EmuLink_t   link;
+       int             speed; // link speed in Mbps
+       int             pkt_size; // bulk max packet size
+};
+
+static const struct emu_profile emu_profiles[] = {
+      //name  , latency_ns, bandwidth, realtime, speed, pkt_size
+       {"none",  {      0,          0,        0},  5000, 1024}
+     , {"usb3",  {  40000,        350,        1},  5000, 1024}
+     , {"usb2",  { 125000,         40,        1},   480,  512}
+};
+
+//------------------------------------------------------------------------------
+#define EMU_PAGE_BITS   12
+#define EMU_PAGE_SIZE   (1<<EMU_PAGE_BITS)
+#define EMU_HASH_SIZE   4096
+
+struct emu_page {
+       struct emu_page *next;
+       uint32_t         num; // page number, i.e., addr>>EMU_PAGE_BITS
+       uint8_t          data[EMU_PAGE_SIZE];
+};
+
+// It keeps words to be popped by conStreamRead()/conDataRead().
+struct emu_fifo {
+       uint32_t     *buf;
+       unsigned int  size; // num of entries allocated
+       unsigned int  head; // index to pop
+       unsigned int  num; // num of valid entries
+};
+
+enum emu_state {
+     EMU_STATE_CTRL=0 // waiting for control-flit
+   , EMU_STATE_CMD     // collecting command and address flits
+   , EMU_STATE_WDATA   // collecting write data flits
+};
+
+struct emu_dev {
+       struct _con_Handle  con; // should be the first
+       pthread_mutex_t     lock;
+       int                 bfm; // EMU_BFM_AXI or EMU_BFM_AHB
+       unsigned int        axi4; // 1 for AMBA AXI4
+       unsigned int        gpout;
+       unsigned int        gpin; // when 'gpin_loop' is 0
+       unsigned int        gpin_loop; // GPIN follows GPOUT when 1
+       volatile unsigned int irq, fiq; // driven by conEmuSetIrq()
+       enum emu_state      state;
+       unsigned int        nflit; // num of flits expected in the current state
+       unsigned int        cbuf[2]; // command and address flits
+       unsigned int        cnum;
+       unsigned int        addr; // address of next beat
+       unsigned int        size; // num of bytes of a beat
+       unsigned int        fixed; // 1 for fixed burst
+       unsigned int        wrap; // num of bytes of wrap window, 0 for not wrap
+       unsigned int        rleft; // num of beats of read burst stalled on F2U fifo
+       struct emu_fifo     u2f; // flits of bulk-out waiting for the transactor
+       struct emu_fifo     f2u; // read data for conStreamRead()
+       struct emu_fifo     dat; // internal read data for conDataRead()
+       unsigned int        depth_cmd; // num of words of command fifo
+       unsigned int        depth_u2f; // num of words of U2F fifo
+       unsigned int        depth_f2u; // num of words of F2U fifo
+       uint32_t            source; // next word of stream-in in CON_MODE_SF2U
+       struct emu_page    *hash[EMU_HASH_SIZE];
+       con_EmuLink_t       link;
+       con_EmuStats_t      stats;
+       uint64_t            busy_until; // monotonic ns when link gets free
+       unsigned int        fault; // every 'fault'-th stream transfer fails; 0 for none
+       unsigned int        fault_count;
+};
+
+#define EMU_DEV(H) ((struct emu_dev *)(H))
+#define EMU_LOCK(D)   pthread_mutex_lock(&(D)->lock)
+#define EMU_UNLOCK(D) pthread_mutex_unlock(&(D)->lock)
+
+//------------------------------------------------------------------------------
+static struct emu_page *emu_page( struct emu_dev *dev
+                                , uint32_t        addr
+                                , int             alloc )
+{
+   uint32_t num = addr>>EMU_PAGE_BITS;
+   struct emu_page **pp = &dev->hash[num%EMU_HASH_SIZE];
+   struct emu_page *p;
+   for (p=*pp; p!=NULL; p=p->next) {
+        if (p->num==num) return p;
+   }
+   if (!alloc) return NULL;
+   p = (struct emu_page *)calloc(1, sizeof(struct emu_page));
+   if (p==NULL) return NULL;
+   p->num  = num;
+   p->next = *pp;
+   *pp     = p;
+   return p;
+}
+
+static void emu_mem_write( struct emu_dev *dev
+                         , uint32_t        addr
+                         , uint32_t        data // justified
+                         , unsigned int    size )
+{
+   unsigned int idx;
+   for (idx=0; idx<size; idx++) {
+        struct emu_page *p = emu_page(dev, addr+idx, 1);
+        if (p==NULL) return;
+        p->data[(addr+idx)&(EMU_PAGE_SIZE-1)] = (data>>(8*idx))&0xFF;
+   }
+}
+
+static uint32_t emu_mem_read( struct emu_dev *dev
+                            , uint32_t        addr
+                            , unsigned int    size )
+{
+   uint32_t data=0;
+   unsigned int idx;
+   for (idx=0; idx<size; idx++) {
+        struct emu_page *p = emu_page(dev, addr+idx, 0);
+        if (p!=NULL) data |= p->data[(addr+idx)&(EMU_PAGE_SIZE-1)]<<(8*idx);
+   }
+   return data;
+}
+
+static void emu_mem_free( struct emu_dev *dev )
+{
+   unsigned int idx;
+   for (idx=0; idx<EMU_HASH_SIZE; idx++) {
+        struct emu_page *p=dev->hash[idx];
+        while (p!=NULL) {
+            struct emu_page *n=p->next;
+            free(p);
+            p = n;
+        }
+        dev->hash[idx] = NULL;
+   }
+}
+
+//------------------------------------------------------------------------------
+static int emu_fifo_push( struct emu_fifo *fifo
+                        , uint32_t         data )
+{
+   if (fifo->num==fifo->size) {
+       unsigned int size = (fifo->size) ? fifo->size*2 : 1024;
+       uint32_t *buf = (uint32_t *)malloc(size*sizeof(uint32_t));
+       unsigned int idx;
+       if (buf==NULL) return -1;
+       for (idx=0; idx<fifo->num; idx++) {
+            buf[idx] = fifo->buf[(fifo->head+idx)%fifo->size];
+       }
+       free(fifo->buf);
+       fifo->buf  = buf;
+       fifo->size = size;
+       fifo->head = 0;
+   }
+   fifo->buf[(fifo->head+fifo->num)%fifo->size] = data;
+   fifo->num++;
+   return 0;
+}
+
+static unsigned int emu_fifo_pop( struct emu_fifo *fifo
+                                , uint32_t        *buf
+                                , unsigned int     num )
+{
+   unsigned int idx;
+   if (num>fifo->num) num = fifo->num;
+   for (idx=0; idx<num; idx++) {
+        buf[idx] = fifo->buf[fifo->head];
+        fifo->head = (fifo->head+1)%fifo->size;
+   }
+   fifo->num -= num;
+   return num;
+}
+
+static void emu_fifo_clear( struct emu_fifo *fifo )
+{
+   fifo->head = 0;
+   fifo->num  = 0;
+}
+
+//------------------------------------------------------------------------------
+static uint64_t emu_now_ns( void )
+{
+   struct timespec ts;
+   clock_gettime(CLOCK_MONOTONIC, &ts);
+   return (uint64_t)ts.tv_sec*1000000000ULL+ts.tv_nsec;
+}
+
+// It charges a USB transfer of 'bytes' to the link.
+static void emu_link( struct emu_dev *dev
+                    , unsigned int    bytes
+                    , int             out )
+{
+   uint64_t cost = dev->link.latency_ns;
+   if (dev->link.bandwidth) cost += ((uint64_t)bytes*1000)/dev->link.bandwidth;
+   if (out) { dev->stats.transfers_out++; dev->stats.bytes_out += bytes; }
+   else     { dev->stats.transfers_in++;  dev->stats.bytes_in  += bytes; }
+   dev->stats.link_ns += cost;
+   if (dev->link.realtime&&cost) {
+       uint64_t now = emu_now_ns();
+       uint64_t end = ((dev->busy_until>now) ? dev->busy_until : now)+cost;
+       dev->busy_until = end;
+       while ((now=emu_now_ns())<end) {
+           if ((end-now)>200000) {
+               struct timespec ts;
+               ts.tv_sec  = 0;
+               ts.tv_nsec = (end-now)-100000;
+               nanosleep(&ts, NULL);
+           }
+       }
+   }
+}
+
+static int emu_profile( struct emu_dev *dev
+                      , const char     *name )
+{
+   unsigned int idx;
+   for (idx=0; idx<sizeof(emu_profiles)/sizeof(emu_profiles[0]); idx++) {
+        if (!strcmp(name, emu_profiles[idx].name)) {
+            dev->link = emu_profiles[idx].link;
+            dev->con.usb.speed = emu_profiles[idx].speed;
+            dev->con.usb.bulk_max_pkt_size_out = emu_profiles[idx].pkt_size;
+            dev->con.usb.bulk_max_pkt_size_in  = emu_profiles[idx].pkt_size;
+            return 0;
+        }
+   }
+   return -1;
+}
+
+//------------------------------------------------------------------------------
+// It returns the value of GPIN as described in 'trx_axi_api.c'.
+static uint32_t emu_gpin( struct emu_dev *dev )
+{
+   uint32_t value = (dev->gpin_loop) ? dev->gpout : dev->gpin;
+   value &= 0xFFFF;
+   value |= (dev->fiq&0x1)<<31
+         |  (dev->irq&0x1)<<30
+         |  (0x2<<16); // WIDTH: 4-byte
+   if (dev->bfm==EMU_BFM_AXI) value |= (dev->axi4&0x1)<<19;
+   return value;
+}
+
+//------------------------------------------------------------------------------
+// It latches command and address flits.
+static void emu_command( struct emu_dev *dev )
+{
+   unsigned int cmd=dev->cbuf[0];
+   if (dev->bfm==EMU_BFM_AXI) {
+       dev->size  = 1<<((cmd>>25)&0x7);
+       dev->fixed = (((cmd>>23)&0x3)==0);
+       dev->wrap  = (((cmd>>23)&0x3)==2) ? dev->size*((cmd&0xFFF)+1) : 0;
+       if ((!dev->axi4)&&((cmd&0xFFF)>=16)) {
+           fprintf(stderr, "%s() %d-beat burst to 0x%08X on AMBA AXI3\n"
+                         , __FUNCTION__, (cmd&0xFFF)+1, dev->cbuf[1]);
+       }
+   } else {
+       dev->size  = 1<<((cmd>>26)&0x3);
+       dev->fixed = 0;
+       dev->wrap  = 0;
+   }
+   dev->addr = dev->cbuf[1];
+}
+
+// It moves to the address of the next beat.
+static void emu_beat_next( struct emu_dev *dev )
+{
+   if (dev->fixed) return;
+   if (dev->wrap) dev->addr = (dev->addr&~(dev->wrap-1))|((dev->addr+dev->size)&(dev->wrap-1));
+   else           dev->addr += dev->size;
+}
+
+static void emu_beat_write( struct emu_dev *dev
+                          , uint32_t        data )
+{
+   emu_mem_write(dev, dev->addr, data, dev->size);
+   emu_beat_next(dev);
+}
+
+// It pushes beats of the read burst while F2U fifo has room.
+static void emu_burst_read( struct emu_dev *dev )
+{
+   while ((dev->rleft>0)&&(dev->f2u.num<dev->depth_f2u)) {
+        if (emu_fifo_push(&dev->f2u, emu_mem_read(dev, dev->addr, dev->size))) break;
+        emu_beat_next(dev);
+        dev->rleft--;
+   }
+}
+
+//------------------------------------------------------------------------------
+// It decodes a flit of transactor framing.
+// - control-flit: [31:16]=num of following flits, [15:12]=packet type
+//   - 0b0010: command+address flits follow
+//   - 0b0100: write data flits follow
+//   - 0b0101: read data to be returned
+static void emu_flit( struct emu_dev *dev
+                    , uint32_t        flit )
+{
+   switch (dev->state) {
+   case EMU_STATE_CTRL:
+        dev->nflit = flit>>16;
+        switch ((flit>>12)&0xF) {
+        case 0x2: dev->cnum  = 0;
+                  dev->state = (dev->nflit) ? EMU_STATE_CMD : EMU_STATE_CTRL;
+                  break;
+        case 0x4: dev->state = (dev->nflit) ? EMU_STATE_WDATA : EMU_STATE_CTRL;
+                  break;
+        case 0x5: dev->rleft = dev->nflit;
+                  emu_burst_read(dev);
+                  break;
+        default:  fprintf(stderr, "%s() unknown control-flit 0x%08X\n", __FUNCTION__, flit);
+                  break;
+        }
+        break;
+   case EMU_STATE_CMD:
+        if (dev->cnum<2) dev->cbuf[dev->cnum] = flit;
+        dev->cnum++;
+        if (--dev->nflit==0) {
+            emu_command(dev);
+            dev->state = EMU_STATE_CTRL;
+        }
+        break;
+   case EMU_STATE_WDATA:
+        emu_beat_write(dev, flit);
+        if (--dev->nflit==0) dev->state = EMU_STATE_CTRL;
+        break;
+   }
+}
+
+// It lets the stalled transactor go on, i.e., it pushes the rest of the read
+// burst and consumes flits of U2F fifo until it stalls again.
+static void emu_run( struct emu_dev *dev )
+{
+   uint32_t flit;
+   for (;;) {
+        emu_burst_read(dev);
+        if (dev->rleft>0) return;
+        if (emu_fifo_pop(&dev->u2f, &flit, 1)==0) return;
+        emu_flit(dev, flit);
+   }
+}
+
+// It feeds bulk-out to the transactor, where flits stay in U2F fifo
+// while the transactor stalls.
+//
+// Return num of words taken, which is less than 'num' when U2F fifo is full.
+static unsigned int emu_stream( struct emu_dev *dev
+                              , uint32_t       *buf
+                              , unsigned int    num )
+{
+   unsigned int idx;
+   for (idx=0; idx<num; idx++) {
+        if (dev->rleft==0) {
+            emu_flit(dev, buf[idx]); // U2F fifo is empty unless it stalls
+        } else if (dev->u2f.num<dev->depth_u2f) {
+            emu_fifo_push(&dev->u2f, buf[idx]);
+        } else {
+            break;
+        }
+   }
+   return idx;
+}
+
+// It drops everything of the transactor and the FX3, e.g., on reset.
+static void emu_flush( struct emu_dev *dev )
+{
+   dev->state = EMU_STATE_CTRL;
+   dev->rleft = 0;
+   emu_fifo_clear(&dev->u2f);
+   emu_fifo_clear(&dev->f2u);
+   emu_fifo_clear(&dev->dat);
+}
+
+// It sets depth of fifos, which is limited to what con_MasterInfo_t carries.
+static void emu_depth( struct emu_dev *dev
+                     , unsigned int    u2f
+                     , unsigned int    f2u )
+{
+   dev->depth_u2f = (u2f==0) ? 1 : (u2f>EMU_DEPTH_MAX) ? EMU_DEPTH_MAX : u2f;
+   dev->depth_f2u = (f2u==0) ? 1 : (f2u>EMU_DEPTH_MAX) ? EMU_DEPTH_MAX : f2u;
+}
+
+//------------------------------------------------------------------------------
+// It returns 1 when the current stream transfer should fail by 'conEmuSetFault()'.
+static int emu_fault( struct emu_dev *dev )
+{
+   if (dev->fault==0) return 0;
+   dev->fault_count++;
+   if (dev->fault_count<dev->fault) return 0;
+   dev->fault_count = 0;
+   return 1;
+}
+
+//------------------------------------------------------------------------------
+con_Handle_t conInit( unsigned int con_cid
+                    , unsigned int con_mode
+                    , unsigned int conapi_log_level )
+{
+   struct emu_dev *dev;
+   const char *env;
+   if (con_cid>=con_cid_max) {
+       conapi_error = CONAPI_ERROR_CID;
+       return NULL;
+   }
+   dev = (struct emu_dev *)calloc(1, sizeof(struct emu_dev));
+   if (dev==NULL) {
+       conapi_error = CONAPI_ERROR_MALLOC;
+       return NULL;
+   }
+   dev->con.mode = con_mode;
+   dev->con.cid  = con_cid;
+   dev->con.usb.handle = (struct libusb_device_handle *)dev;
+   pthread_mutex_init(&dev->lock, NULL);
+   emu_profile(dev, "none");
+   dev->depth_cmd = EMU_DEPTH;
+   emu_depth(dev, EMU_DEPTH, EMU_DEPTH);
+   dev->bfm       = CONAPI_EMU_BFM;
+   dev->axi4      = 1;
+   dev->gpin_loop = 1;
+   env = getenv("CONFMC_EMU_BFM");
+   if (env!=NULL) {
+       if (!strcmp(env, "ahb")) dev->bfm = EMU_BFM_AHB;
+       if (!strcmp(env, "axi")) dev->bfm = EMU_BFM_AXI;
+   }
+   env = getenv("CONFMC_EMU_AXI3");
+   if (env!=NULL) dev->axi4 = ((strtoul(env, NULL, 0)>>con_cid)&0x1) ? 0 : 1;
+   env = getenv("CONFMC_EMU");
+   if (env!=NULL) emu_profile(dev, env); // unknown name keeps "none"
+   env = getenv("CONFMC_EMU_LATENCY_US");
+   if (env!=NULL) dev->link.latency_ns = (unsigned int)(atof(env)*1000);
+   env = getenv("CONFMC_EMU_BANDWIDTH");
+   if (env!=NULL) dev->link.bandwidth = (unsigned int)atoi(env);
+   env = getenv("CONFMC_EMU_REALTIME");
+   if (env!=NULL) dev->link.realtime = (unsigned int)atoi(env);
+   env = getenv("CONFMC_EMU_FAULT");
+   if (env!=NULL) dev->fault = (unsigned int)atoi(env);
+   env = getenv("CONFMC_EMU_DEPTH");
+   if (env!=NULL) emu_depth(dev, (unsigned int)atoi(env), (unsigned int)atoi(env));
+   conapi_error = CONAPI_ERROR_NO;
+   return &dev->con;
+}
+
+int conRelease( con_Handle_t con_handle )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if (dev==NULL) return -1;
+   emu_mem_free(dev);
+   free(dev->u2f.buf);
+   free(dev->f2u.buf);
+   free(dev->dat.buf);
+   pthread_mutex_destroy(&dev->lock);
+   free(dev);
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// It handles internal access (GPOUT/GPIN) of the transactor.
+int conCmdWrite( con_Handle_t  con_handle
+               , void         *pBuffer
+               , unsigned int  nNumberOfItemsToWrite
+               , unsigned int *pNumberOfItemsWritten
+               , unsigned int  transactor )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   uint32_t *buf=(uint32_t *)pBuffer;
+   unsigned int idx;
+   if ((dev==NULL)||(buf==NULL)) {
+       conapi_error = CONAPI_ERROR_INVALID_PARAM;
+       return -1;
+   }
+   EMU_LOCK(dev);
+   for (idx=0; idx<nNumberOfItemsToWrite; idx++) {
+        if (!((buf[idx]>>31)&0x1)) continue; // external access via command fifo
+        if ((buf[idx]>>30)&0x1) {
+            dev->gpout = buf[idx]&0xFFFF;
+        } else {
+            if (dev->dat.num>=dev->depth_cmd) break; // nobody pops internal data
+            emu_fifo_push(&dev->dat, emu_gpin(dev));
+        }
+   }
+   emu_link(dev, idx*4, 1);
+   if (pNumberOfItemsWritten!=NULL) *pNumberOfItemsWritten = idx;
+   if (idx<nNumberOfItemsToWrite) {
+       dev->stats.timeouts++;
+       EMU_UNLOCK(dev);
+       conapi_error = CONAPI_ERROR_USB_BULK_OUT;
+       return -1;
+   }
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+int conDataWrite( con_Handle_t  con_handle
+                , void         *pBuffer
+                , unsigned int  nNumberOfItemsToWrite
+                , unsigned int *pNumberOfItemsWritten
+                , unsigned int  transactor )
+{
+   if (pNumberOfItemsWritten!=NULL) *pNumberOfItemsWritten = nNumberOfItemsToWrite;
+   return 0;
+}
+
+int conDataRead( con_Handle_t  con_handle
+               , void         *pBuffer
+               , unsigned int  nNumberOfItemsToRead
+               , unsigned int *pNumberOfItemsRead
+               , unsigned int  transactor )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   unsigned int done;
+   if ((dev==NULL)||(pBuffer==NULL)) {
+       conapi_error = CONAPI_ERROR_INVALID_PARAM;
+       return -1;
+   }
+   EMU_LOCK(dev);
+   done = emu_fifo_pop(&dev->dat, (uint32_t *)pBuffer, nNumberOfItemsToRead);
+   if (done) emu_link(dev, done*4, 0);
+   EMU_UNLOCK(dev);
+   if (pNumberOfItemsRead!=NULL) *pNumberOfItemsRead = done;
+   if (done<nNumberOfItemsToRead) {
+       conapi_error = CONAPI_ERROR_USB_BULK_IN;
+       return -1;
+   }
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+int conStreamWrite( con_Handle_t  con_handle
+                  , void         *pBuffer
+                  , unsigned int  nNumberOfItemsToWrite
+                  , unsigned int *pNumberOfItemsWritten
+                  , unsigned int  zlp )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if ((dev==NULL)||(pBuffer==NULL)||(pNumberOfItemsWritten==NULL)) {
+       conapi_error = CONAPI_ERROR_INVALID_PARAM;
+       return -1;
+   }
+   EMU_LOCK(dev);
+   if ((dev->con.mode==CON_MODE_CMD)&&emu_fault(dev)) {
+       // only the first half reaches the transactor as a broken bulk-out does
+       unsigned int half = emu_stream(dev, (uint32_t *)pBuffer, nNumberOfItemsToWrite/2);
+       emu_link(dev, half*4, 1);
+       EMU_UNLOCK(dev);
+       *pNumberOfItemsWritten = half;
+       conapi_error = CONAPI_ERROR_USB_BULK_OUT;
+       return -1;
+   }
+   if (dev->con.mode==CON_MODE_SLOOP) {
+       unsigned int idx;
+       for (idx=0; idx<nNumberOfItemsToWrite; idx++) {
+            if (emu_fifo_push(&dev->f2u, ((uint32_t *)pBuffer)[idx])) break;
+       }
+   } else if (dev->con.mode!=CON_MODE_SU2F) {
+       unsigned int done = emu_stream(dev, (uint32_t *)pBuffer, nNumberOfItemsToWrite);
+       if (done<nNumberOfItemsToWrite) {
+           // U2F fifo stays full since nobody pops F2U fifo, i.e., time-out
+           emu_link(dev, done*4, 1);
+           dev->stats.timeouts++;
+           EMU_UNLOCK(dev);
+           *pNumberOfItemsWritten = done;
+           conapi_error = CONAPI_ERROR_USB_BULK_OUT;
+           return -1;
+       }
+   }
+   emu_link(dev, nNumberOfItemsToWrite*4, 1);
+   if (zlp) emu_link(dev, 0, 1);
+   EMU_UNLOCK(dev);
+   *pNumberOfItemsWritten = nNumberOfItemsToWrite;
+   return 0;
+}
+
+// It returns what is available as a real bulk-in does, where the transactor
+// goes on as F2U fifo gets room, and fails when nothing is available,
+// which means time-out.
+int conStreamRead( con_Handle_t  con_handle
+                 , void         *pBuffer
+                 , unsigned int  nNumberOfItemsToRead
+                 , unsigned int *pNumberOfItemsRead )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   unsigned int done;
+   if ((dev==NULL)||(pBuffer==NULL)||(pNumberOfItemsRead==NULL)) {
+       conapi_error = CONAPI_ERROR_INVALID_PARAM;
+       return -1;
+   }
+   EMU_LOCK(dev);
+   if ((dev->con.mode==CON_MODE_CMD)&&emu_fault(dev)) {
+       // data stays in the endpoint as a timed-out bulk-in does
+       EMU_UNLOCK(dev);
+       *pNumberOfItemsRead = 0;
+       conapi_error = CONAPI_ERROR_USB_BULK_IN;
+       return -1;
+   }
+   if (dev->con.mode==CON_MODE_SF2U) {
+       uint32_t *pbuf=(uint32_t *)pBuffer;
+       for (done=0; done<nNumberOfItemsToRead; done++) pbuf[done] = dev->source++;
+   } else {
+       unsigned int num;
+       done = 0;
+       do {
+           num   = emu_fifo_pop(&dev->f2u, (uint32_t *)pBuffer+done, nNumberOfItemsToRead-done);
+           done += num;
+           emu_run(dev);
+       } while ((num>0)&&(done<nNumberOfItemsToRead));
+   }
+   if (done) emu_link(dev, done*4, 0);
+   EMU_UNLOCK(dev);
+   *pNumberOfItemsRead = done;
+   if ((done==0)&&(nNumberOfItemsToRead>0)) {
+       conapi_error = CONAPI_ERROR_USB_BULK_IN;
+       return -1;
+   }
+   return 0;
+}
+
+int conZlpWrite( con_Handle_t con_handle )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if (dev==NULL) return -1;
+   EMU_LOCK(dev);
+   emu_link(dev, 0, 1);
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+int conGetUsbInfo( con_Handle_t  con_handle
+                 , struct _usb  *pInfo )
+{
+   if ((con_handle==NULL)||(pInfo==NULL)) return -1;
+   EMU_LOCK(EMU_DEV(con_handle));
+   memcpy(pInfo, &con_handle->usb, sizeof(struct _usb));
+   EMU_UNLOCK(EMU_DEV(con_handle));
+   return 0;
+}
+
+int conGetBoardInfo( con_Handle_t     con_handle
+                   , con_BoardInfo_t *pInfo
+                   , unsigned int     length
+                   , unsigned int     crc_check )
+{
+   if ((con_handle==NULL)||(pInfo==NULL)||(length<sizeof(con_BoardInfo_t))) return 0;
+   memset(pInfo, 0, sizeof(con_BoardInfo_t));
+   strcpy(pInfo->MagicID, "FPI");
+   pInfo->FormatVersion = 0x20180425;
+   pInfo->Length        = sizeof(con_BoardInfo_t);
+   strcpy(pInfo->Name, "CON-FMC-EMU");
+   pInfo->PcbVersion    = 0x18100101;
+   pInfo->PcbSerial     = con_handle->cid;
+   strcpy(pInfo->MajorInfo, "Emulator");
+   strcpy(pInfo->MajorPart, "conapi_emu");
+   pInfo->CRC           = 0;
+   return 1;
+}
+
+int conSetBoardInfo( con_Handle_t     con_handle
+                   , con_BoardInfo_t *pInfo
+                   , unsigned int     length
+                   , unsigned int     crc_check )
+{
+   return 0;
+}
+
+int conGetMasterInfo( con_Handle_t      con_handle
+                    , con_MasterInfo_t *pInfo )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if ((dev==NULL)||(pInfo==NULL)) return 0;
+   EMU_LOCK(dev);
+   pInfo->version   = 0x20190207;
+   pInfo->depth_cmd = (uint16_t)dev->depth_cmd;
+   pInfo->depth_u2f = (uint16_t)dev->depth_u2f;
+   pInfo->depth_f2u = (uint16_t)dev->depth_f2u;
+   EMU_UNLOCK(dev);
+   pInfo->clk_mhz   = 80;
+   pInfo->clk_inv   = 1;
+   return 1;
+}
+
+int conGetFx3Info( con_Handle_t   con_handle
+                 , con_Fx3Info_t *pVersion )
+{
+   if ((con_handle==NULL)||(pVersion==NULL)) return -1;
+   pVersion->version = 0x20190207;
+   return 0;
+}
+
+int conReset( con_Handle_t con_handle
+            , unsigned int duration )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if (dev==NULL) return -1;
+   EMU_LOCK(dev);
+   emu_flush(dev);
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// Vendor requests, which are reached through 'con_handle->usb.handle'.
+// CON_FX3_RESET: the FX3 restarts and its endpoint buffers are lost,
+// while cold reset brings the transactor back to the start as well.
+int conUsbResetFx3( struct libusb_device_handle *dev_handle
+                  , unsigned int                 warm_reset )
+{
+   struct emu_dev *dev=EMU_DEV(dev_handle);
+   if (dev==NULL) return -1;
+   EMU_LOCK(dev);
+   if (!warm_reset) {
+       emu_flush(dev);
+   } else {
+       emu_fifo_clear(&dev->f2u);
+       emu_fifo_clear(&dev->dat);
+       emu_run(dev);
+   }
+   emu_link(dev, 0, 1);
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+// CON_EP_RESET: ep_flag[0] for bulk-out and ep_flag[1] for bulk-in.
+// The transactor keeps its framing state since only the FX3 side is reset.
+int conUsbResetEp( struct libusb_device_handle *dev_handle
+                 , unsigned int                 ep_flag )
+{
+   struct emu_dev *dev=EMU_DEV(dev_handle);
+   if (dev==NULL) return -1;
+   EMU_LOCK(dev);
+   if (ep_flag&0x2) {
+       emu_fifo_clear(&dev->f2u);
+       emu_fifo_clear(&dev->dat);
+       emu_run(dev);
+   }
+   emu_link(dev, 0, 1);
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+// It sets time-out of bulk transfers and returns the previous one.
+unsigned int conUsbTimeout( int millisecond )
+{
+   unsigned int prev = TIMEOUT_MS;
+   TIMEOUT_MS = (unsigned int)millisecond;
+   return prev;
+}
+
+//------------------------------------------------------------------------------
+int conSetMode( con_Handle_t con_handle
+              , unsigned int con_mode )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if (dev==NULL) return -1;
+   if (con_mode>CON_MODE_SLOOP) {
+       conapi_error = CONAPI_ERROR_INVALID_PARAM;
+       return -1;
+   }
+   EMU_LOCK(dev);
+   dev->con.mode = con_mode;
+   dev->source   = 0;
+   emu_flush(dev);
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+int conGetCid( con_Handle_t con_handle )
+{
+   if (con_handle==NULL) return -1;
+   return con_handle->cid;
+}
+
+unsigned int conGetVersionApi( void )
+{
+   return CONAPI_VERSION;
+}
+
+unsigned int conGetVersionLibusb( void )
+{
+   return 0;
+}
+
+const int conGetErrorLibusb( void )
+{
+   return libusb_error;
+}
+
+const int conGetErrorConapi( void )
+{
+   return conapi_error;
+}
+
+const char *conErrorMsgConapi( int error )
+{
+   switch (error) {
+   case CONAPI_ERROR_NO: return "no error";
+   case CONAPI_ERROR_INVALID_PARAM: return "invalid parameter";
+   case CONAPI_ERROR_CID: return "invalid CID";
+   case CONAPI_ERROR_USB_BULK_OUT: return "bulk-out failed";
+   case CONAPI_ERROR_USB_BULK_IN: return "bulk-in failed";
+   default: return "unknown error";
+   }
+}
+
+const char *conErrorMsgLibusb( int error )
+{
+   return "libusb not used in emulator";
+}
+
+//------------------------------------------------------------------------------
+// Emulator specific
+//------------------------------------------------------------------------------
+int conEmuSetBfm( con_Handle_t con_handle
+                , unsigned int bfm )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if (dev==NULL) return -1;
+   EMU_LOCK(dev);
+   dev->bfm = bfm;
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// It drives IRQ and FIQ of the emulated transactor, which are read through
+// GPIN, e.g., from another thread while the host waits for them.
+int conEmuSetIrq( con_Handle_t con_handle
+                , unsigned int irq
+                , unsigned int fiq )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if (dev==NULL) return -1;
+   EMU_LOCK(dev);
+   dev->irq = irq&0x1;
+   dev->fiq = fiq&0x1;
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// It makes every 'period'-th stream transfer fail in CON_MODE_CMD, i.e.,
+// a bulk-out delivers half of its flits and a bulk-in times out leaving
+// data behind; 0 for no fault, which can be set by 'CONFMC_EMU_FAULT'.
+int conEmuSetFault( con_Handle_t con_handle
+                  , unsigned int period )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if (dev==NULL) return -1;
+   EMU_LOCK(dev);
+   dev->fault       = period;
+   dev->fault_count = 0;
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// It sets num of words of U2F and F2U fifos, which are reported by
+// conGetMasterInfo() and can be set by 'CONFMC_EMU_DEPTH' as well.
+int conEmuSetDepth( con_Handle_t con_handle
+                  , unsigned int depth_u2f
+                  , unsigned int depth_f2u )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if (dev==NULL) return -1;
+   EMU_LOCK(dev);
+   emu_depth(dev, depth_u2f, depth_f2u);
+   emu_run(dev);
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+int conEmuSetProfile( con_Handle_t  con_handle
+                    , const char   *profile )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   int ret;
+   if ((dev==NULL)||(profile==NULL)) return -1;
+   EMU_LOCK(dev);
+   ret = emu_profile(dev, profile);
+   EMU_UNLOCK(dev);
+   return ret;
+}
+
+int conEmuSetLink( con_Handle_t         con_handle
+                 , const con_EmuLink_t *link )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if ((dev==NULL)||(link==NULL)) return -1;
+   EMU_LOCK(dev);
+   dev->link = *link;
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+int conEmuGetLink( con_Handle_t   con_handle
+                 , con_EmuLink_t *link )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if ((dev==NULL)||(link==NULL)) return -1;
+   EMU_LOCK(dev);
+   *link = dev->link;
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+int conEmuGetStats( con_Handle_t    con_handle
+                  , con_EmuStats_t *stats )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if ((dev==NULL)||(stats==NULL)) return -1;
+   EMU_LOCK(dev);
+   *stats = dev->stats;
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+int conEmuClearStats( con_Handle_t con_handle )
+{
+   struct emu_dev *dev=EMU_DEV(con_handle);
+   if (dev==NULL) return -1;
+   EMU_LOCK(dev);
+   memset(&dev->stats, 0, sizeof(dev->stats));
+   EMU_UNLOCK(dev);
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// Revision History
+//
+// 2026.10.18: Wrap bursts of AMBA AXI
+// 2026.10.18: Finite U2F/F2U fifos, conEmuSetDepth() and mutex of each card
+// 2026.10.18: conEmuSetFault() and conUsbResetEp/ResetFx3/Timeout() added
+// 2026.10.18: AMBA AXI3 cards by 'CONFMC_EMU_AXI3'
+// 2026.10.18: Stream modes, i.e., CON_MODE_SU2F/SF2U/SLOOP, added
+// 2026.10.18: conEmuSetIrq() added
+// 2026.10.18: Link timing model with USB 2.0/3.0 profiles
+// 2026.10.18: Started
+//------------------------------------------------------------------------------
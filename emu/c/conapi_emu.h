@@ -0,0 +1,75 @@
+#ifndef CONAPI_EMU_H
+#define CONAPI_EMU_H
+//------------------------------------------------------------------------------
+// Copyright (c) 2026 Future Design Systems
+//
+// http://www.future-ds.com
+//------------------------------------------------------------------------------
+// conapi_emu.h
+//------------------------------------------------------------------------------
+// VERSION = 2026.10.18.
+//------------------------------------------------------------------------------
+// Software stand-in of 'libconapi', which implements 'conapi.h'.
+#include "conapi.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+// bus of the transactor to decode
+enum conapi_emu_bfm {
+     EMU_BFM_AXI=0
+   , EMU_BFM_AHB=1
+};
+
+// Each USB transfer takes 'latency_ns' plus its bytes over 'bandwidth'.
+struct _con_EmuLink {
+       unsigned int latency_ns; // per-transfer latency in nano-second
+       unsigned int bandwidth; // MB/s, i.e., bytes per micro-second; 0 for infinite
+       unsigned int realtime; // 1 to wait for the link, 0 to count time only
+};
+typedef struct _con_EmuLink con_EmuLink_t;
+
+struct _con_EmuStats {
+       unsigned long long transfers_out; // num of bulk-out/command transfers
+       unsigned long long transfers_in; // num of bulk-in/data transfers
+       unsigned long long bytes_out;
+       unsigned long long bytes_in;
+       unsigned long long link_ns; // time spent on the link by the model
+       unsigned long long timeouts; // num of bulk-out timed out on full U2F fifo
+};
+typedef struct _con_EmuStats con_EmuStats_t;
+
+CONFMC_API int conEmuSetBfm( con_Handle_t con_handle
+                           , unsigned int bfm );
+CONFMC_API int conEmuSetIrq( con_Handle_t con_handle
+                           , unsigned int irq
+                           , unsigned int fiq );
+CONFMC_API int conEmuSetFault( con_Handle_t con_handle
+                             , unsigned int period ); // 0 for no fault
+CONFMC_API int conEmuSetDepth( con_Handle_t con_handle
+                             , unsigned int depth_u2f
+                             , unsigned int depth_f2u ); // num of words
+CONFMC_API int conEmuSetProfile( con_Handle_t  con_handle
+                               , const char   *profile ); // "none", "usb2", "usb3"
+CONFMC_API int conEmuSetLink( con_Handle_t         con_handle
+                            , const con_EmuLink_t *link );
+CONFMC_API int conEmuGetLink( con_Handle_t   con_handle
+                            , con_EmuLink_t *link );
+CONFMC_API int conEmuGetStats( con_Handle_t    con_handle
+                             , con_EmuStats_t *stats );
+CONFMC_API int conEmuClearStats( con_Handle_t con_handle );
+
+#ifdef __cplusplus
+}
+#endif
+//------------------------------------------------------------------------------
+// Revision History
+//
+// 2026.10.18: conEmuSetDepth() and 'timeouts' of con_EmuStats_t added
+// 2026.10.18: conEmuSetFault() added
+// 2026.10.18: conEmuSetIrq() added
+// 2026.10.18: Link timing model added
+// 2026.10.18: Started
+//------------------------------------------------------------------------------
+#endif
@@ -14,12 +14,12 @@
 #include <sys/types.h>
 #if defined(_WIN32)
 #	include <windows.h>
+#else
+#	include <pthread.h>
 #endif
 #include "conapi.h"
 #include "trx_axi_api.h"
 
-static unsigned int amba_axi4=16; // 16=AXI3, 256=AXI4
-
 #define GET_CMD(CMD,EI,WR,LK,EX,SZ,BT,PR,CA,ID,BL)\
 	CMD	= ((EI)&0x1)<<31\
 		| ((WR)&0x1)<<30\
@@ -32,161 +32,644 @@ static unsigned int amba_axi4=16; // 16=AXI3, 256=AXI4
 		| ((ID)&0xF)<<12\
 		| ((BL)&0xFFF)
 
-//-------------------------------------------------------------
-// It generates 'length' incremental write transactions
-// from the address in 'addr' with data in 'data[]'.
-// Note that 'data[x]' contains 'size'-bytes in justified fashion.
-void BfmWrite( con_Handle_t handle
-             , unsigned int  addr
-             , unsigned int *data // pointer to the array of justified data
-             , unsigned int  size // num of bytes in an item
-             , unsigned int  length)
+//------------------------------------------------------------------------------
+// Per-handle context.
+//
+// Each handle gets its own context at its first use by the BFM, which holds
+// bus type, data width and burst limit found from GPIN, counters of
+// instrumentation and a lock.
+// The lock keeps command and data flits of a BFM call together when threads
+// share the handle. Reads issued by BfmBatchIssue() and not collected yet
+// are kept in the context as 'pending', which every other BFM call collects
+// before going, so that its read data are not taken as the ones of others.
+// Since the burst limit follows the handle, cards of AMBA AXI3 and AMBA AXI4
+// can be driven by a process at the same time.
+// The context is freed along with the handle by BfmRelease(), which C
+// programs should call instead of conRelease() since the handle may be
+// reused by following conInit(); BfmInit() drops a context left behind
+// when the handle is reused.
+// When GPIN does not answer at the first use, what is assumed is kept
+// without reading GPIN again until BfmRecover() brings the handle back.
+//------------------------------------------------------------------------------
+#define BFM_CONTEXT_MAX  8 // num of handles, i.e., CID 0~7
+#define BFM_RETRIES      2 // default num of retries of idempotent reads
+#define BFM_FIFO_DEPTH   1024 // num of words of U2F/F2U fifo when not known
+
+#if defined(_WIN32)
+typedef CRITICAL_SECTION bfm_lock_t; // recursive
+#define BFM_LOCK_INIT(L)  InitializeCriticalSection(L)
+#define BFM_LOCK(L)       EnterCriticalSection(L)
+#define BFM_UNLOCK(L)     LeaveCriticalSection(L)
+static SRWLOCK bfm_contexts_lock=SRWLOCK_INIT;
+#define BFM_CONTEXTS_LOCK()   AcquireSRWLockExclusive(&bfm_contexts_lock)
+#define BFM_CONTEXTS_UNLOCK() ReleaseSRWLockExclusive(&bfm_contexts_lock)
+#else
+typedef pthread_mutex_t bfm_lock_t;
+static void bfm_lock_init( bfm_lock_t *lock )
 {
-#ifdef RIGOR
-   if (data==NULL) {
-       printf("%s() invalid buffer\n", __FUNCTION__);
-       return;
-   }
-   switch (size) {
-   case 1: case 2: case 4: break;
-   default: printf("%s() cannot support %d-byte transfer\n", __FUNCTION__, size);
-            return;
+   pthread_mutexattr_t attr;
+   pthread_mutexattr_init(&attr);
+   pthread_mutexattr_settype(&attr, PTHREAD_MUTEX_RECURSIVE);
+   pthread_mutex_init(lock, &attr);
+   pthread_mutexattr_destroy(&attr);
+}
+#define BFM_LOCK_INIT(L)  bfm_lock_init(L)
+#define BFM_LOCK(L)       pthread_mutex_lock(L)
+#define BFM_UNLOCK(L)     pthread_mutex_unlock(L)
+static pthread_mutex_t bfm_contexts_lock=PTHREAD_MUTEX_INITIALIZER;
+#define BFM_CONTEXTS_LOCK()   pthread_mutex_lock(&bfm_contexts_lock)
+#define BFM_CONTEXTS_UNLOCK() pthread_mutex_unlock(&bfm_contexts_lock)
+#endif
+
+struct bfm_context {
+       con_Handle_t  handle; // NULL when free
+       unsigned int  cid; // to know the handle reused for another card
+       int           found; // 1 after bus has been found from GPIN, -1 when failed
+       BfmContext_t  info;
+       BfmStats_t    stats;
+       bfm_lock_t    lock; // recursive
+       int           lock_ready;
+       int           desync; // 1 while the stream is out of frame
+       unsigned int *rest; // rest of the frame in flight when 'desync'
+       unsigned int  rest_num; // BFM_REST_LOST when not known
+       unsigned int  rest_max; // num of words allocated for 'rest'
+       int           recover_level; // automatic recovery up to, -1 for none
+       unsigned int  retries; // num of retries of idempotent reads
+       struct _BfmBatch *pending; // batch whose reads are issued, not collected
+};
+
+static struct bfm_context bfm_contexts[BFM_CONTEXT_MAX];
+static int bfm_stats_on=0;
+
+static int bfm_gpin( struct bfm_context *ctx, unsigned int *pValue );
+static int bfm_batch_settle( struct _BfmBatch *batch );
+
+// It sets what is assumed until GPIN tells.
+static void bfm_context_init( struct bfm_context *ctx
+                            , con_Handle_t        handle )
+{
+   ctx->handle = handle;
+   ctx->cid    = handle->cid;
+   ctx->found  = 0;
+   ctx->info.bus       = BFM_BUS_AXI3;
+   ctx->info.width     = 4;
+   ctx->info.burst_max = 16;
+   ctx->info.gpin      = 0;
+   ctx->info.depth_u2f = 0; // taken by conGetMasterInfo() at the first use
+   ctx->info.depth_f2u = 0;
+   ctx->desync         = 0;
+   ctx->rest_num       = 0;
+   ctx->recover_level  = BFM_RECOVER_EP;
+   ctx->retries        = BFM_RETRIES;
+   ctx->pending        = NULL;
+   memset(&ctx->stats, 0, sizeof(BfmStats_t));
+}
+
+// It returns the context of the handle, which takes a free slot for new one.
+static struct bfm_context *bfm_context_get( con_Handle_t handle )
+{
+   struct bfm_context *ctx=NULL;
+   int idx;
+   if (handle==NULL) return NULL;
+   BFM_CONTEXTS_LOCK();
+   for (idx=0; idx<BFM_CONTEXT_MAX; idx++) {
+        if (bfm_contexts[idx].handle==handle) {
+            ctx = &bfm_contexts[idx];
+            if (ctx->cid!=handle->cid) bfm_context_init(ctx, handle);
+            break;
+        }
    }
-   if ((length>0x1000)&&(length<0)) {
-       printf("%s() can support up to 4096 for length\n", __FUNCTION__);
-       return;
+   for (idx=0; (ctx==NULL)&&(idx<BFM_CONTEXT_MAX); idx++) {
+        if (bfm_contexts[idx].handle==NULL) {
+            ctx = &bfm_contexts[idx];
+            if (!ctx->lock_ready) {
+                BFM_LOCK_INIT(&ctx->lock);
+                ctx->lock_ready = 1;
+            }
+            bfm_context_init(ctx, handle);
+        }
    }
-   if (addr%size) {
-       printf("%s() cannot support mis-aligned access\n", __FUNCTION__);
-       return;
+   BFM_CONTEXTS_UNLOCK();
+   if (ctx==NULL) printf("%s() too many handles\n", __FUNCTION__);
+   return ctx;
+}
+
+// It finds bus type, data width and burst limit from GPIN.
+static void bfm_context_depth( struct bfm_context *ctx )
+{
+   con_MasterInfo_t master;
+   if ((conGetMasterInfo(ctx->handle, &master)>0)&&(master.depth_f2u>0)) {
+       ctx->info.depth_u2f = master.depth_u2f;
+       ctx->info.depth_f2u = master.depth_f2u;
+   } else {
+       ctx->info.depth_u2f = BFM_FIFO_DEPTH;
+       ctx->info.depth_f2u = BFM_FIFO_DEPTH;
    }
-#endif
-   // to push BFM command for write
-   // - control-flit for command
-   // - command-flit for bfm write
-   // - address-flit for bfm write
-   unsigned int cbuf[4];
-   cbuf[0] = (2<<16) // command+address
-           | ((0b0010&0xF)<<12) // control packet
-           | ((0x0&0xF)<<4); // transactor
-   GET_CMD(cbuf[1], 0, 1, 0, 0, size>>1, 1, 0, 0, 1, length-1);
-           //       EI,WR,LK,EX, SZ     ,BT,PR,CA,ID,   BL
-   cbuf[2] = addr;
-   // to push BFM data for write
-   // - control-flit for data
-   cbuf[3] = (length<<16) //  command+data
-           | ((0b0100&0xF)<<12) // control packet
-           | ((0x0&0xF)<<4); // transactor
+}
 
-   unsigned int done=0;
-   if (conStreamWrite(handle, cbuf, 4, &done, 0) || (done!=4)) {
-       printf("%s() something went wrong: %d\n", __FUNCTION__, done);
-       return;
+static int bfm_context_find( struct bfm_context *ctx )
+{
+   unsigned int value;
+   if (ctx->info.depth_f2u==0) bfm_context_depth(ctx);
+   if (bfm_gpin(ctx, &value)) {
+       ctx->found = -1; // not to read GPIN on every call
+       return -1;
    }
-//conZlpWrite(handle);
+   ctx->info.gpin  = value;
+   ctx->info.width = 1<<((value>>16)&0x7);
+   if ((value>>19)&0x1) {
+       ctx->info.bus       = BFM_BUS_AXI4;
+       ctx->info.burst_max = 256;
+   } else {
+       ctx->info.bus       = BFM_BUS_AXI3;
+       ctx->info.burst_max = 16;
+   }
+   ctx->found = 1;
+   return 0;
+}
 
-   // to push BFM data for write
-   unsigned int num;
-   unsigned int *pbuf=data;
-   for (num=length, done=0; num>0; num -= done, pbuf += done) {
-        unsigned int zlp = ((num*4)%handle->usb.bulk_max_pkt_size_out) ? 0 : 1;
-//printf("num=%d zlp=%d\n", num, zlp);
-        if (conStreamWrite(handle, (void *)pbuf, num, &done, zlp)) {
-            printf("%s() something went wrong: %d\n", __FUNCTION__, done);
-            return;
-        }
-if (done<num) printf("num=%d zlp=%d done=%d\n", num, zlp, done);
+// It returns the context of the handle with its lock held,
+// where the bus is found at the first use and pending reads are collected.
+static struct bfm_context *bfm_enter( con_Handle_t handle )
+{
+   struct bfm_context *ctx=bfm_context_get(handle);
+   if (ctx==NULL) return NULL;
+   BFM_LOCK(&ctx->lock);
+   if (!ctx->found) bfm_context_find(ctx);
+   if (ctx->pending!=NULL) bfm_batch_settle(ctx->pending);
+   return ctx;
+}
+
+static void bfm_leave( struct bfm_context *ctx )
+{
+   BFM_UNLOCK(&ctx->lock);
+}
+
+//------------------------------------------------------------------------------
+// Instrumentation.
+//
+// When enabled by BfmStatsEnable(), USB transfers carried out by the BFM are
+// counted in the context of each handle, including partial transfers,
+// i.e., the ones that moved less than asked, and ZLPs.
+// It costs a branch when disabled.
+//------------------------------------------------------------------------------
+static void bfm_stats_record( struct bfm_context *ctx
+                            , unsigned int out // 1 for bulk-out
+                            , unsigned int num
+                            , unsigned int done
+                            , unsigned int zlp
+                            , int          ret )
+{
+   BfmStats_t *stats=&ctx->stats;
+   if (out) {
+       stats->writes++;
+       stats->words_out += done;
+       if (done<num) stats->partial_writes++;
+       if (zlp) stats->zlps++;
+   } else {
+       stats->reads++;
+       stats->words_in += done;
+       if (done<num) stats->partial_reads++;
    }
+   if (ret) stats->errors++;
+}
+
+static int bfm_stream_write( struct bfm_context *ctx
+                           , void         *pbuf
+                           , unsigned int  num
+                           , unsigned int *done
+                           , unsigned int  zlp )
+{
+   int ret;
+   *done = 0;
+   ret = conStreamWrite(ctx->handle, pbuf, num, done, zlp);
+   if (bfm_stats_on) bfm_stats_record(ctx, 1, num, *done, zlp, ret);
+   return ret;
+}
+
+static int bfm_stream_read( struct bfm_context *ctx
+                          , void         *pbuf
+                          , unsigned int  num
+                          , unsigned int *done )
+{
+   int ret;
+   *done = 0;
+   ret = conStreamRead(ctx->handle, pbuf, num, done);
+   if (bfm_stats_on) bfm_stats_record(ctx, 0, num, *done, 0, ret);
+   return ret;
+}
+
+static int bfm_cmd_write( struct bfm_context *ctx
+                        , void         *pbuf
+                        , unsigned int  num
+                        , unsigned int *done )
+{
+   int ret;
+   *done = 0;
+   ret = conCmdWrite(ctx->handle, pbuf, num, done, 0);
+   if (bfm_stats_on) bfm_stats_record(ctx, 1, num, *done, 0, ret);
+   return ret;
+}
+
+static int bfm_data_read( struct bfm_context *ctx
+                        , void         *pbuf
+                        , unsigned int  num
+                        , unsigned int *done )
+{
+   int ret;
+   *done = 0;
+   ret = conDataRead(ctx->handle, pbuf, num, done, 0);
+   if (bfm_stats_on) bfm_stats_record(ctx, 0, num, *done, 0, ret);
+   return ret;
 }
 
 //------------------------------------------------------------------------------
-// It generates 'length' incremental read transactions
-// from the address in 'addr' with data in 'data[]'.
-// Note that 'data[x]' contains 'size'-bytes in justified fashion.
-void BfmRead( con_Handle_t handle
-            , unsigned int  addr
-            , unsigned int *data // pointer to the array of justified data
-            , unsigned int  size
-            , unsigned int  length)
+// Recovery.
+//
+// A bulk transfer that failed or moved less than asked leaves the transactor
+// in the middle of a frame, i.e., it waits for flits that have not arrived,
+// and leaves read data behind, which would be taken as data of following
+// reads. The handle is out of sync then, where bfm_recover() brings it back
+// without conRelease()/conInit() by the vendor requests of the FX3 as follows.
+// - BFM_RECOVER_EP : CON_EP_RESET clears both endpoints, the rest of the frame
+//                    is pushed so that the transactor completes it, and stale
+//                    read data are drained.
+// - BFM_RECOVER_TRX: conReset() resets the transactor, which drops the frame,
+//                    instead of pushing the rest.
+// - BFM_RECOVER_FX3: CON_FX3_RESET warm-resets the FX3 before them.
+// It goes up from BFM_RECOVER_EP to the level given until GPIN answers.
+// Note that the rest of the frame is taken from 'done' of the failed transfer,
+// which assumes the flits reported have reached the transactor, and is kept
+// in the context until recovered, so that BfmRecover() can complete it later.
+//------------------------------------------------------------------------------
+#define BFM_DRAIN_MS      10 // time-out of bulk-in while draining
+#define BFM_DRAIN_MAX     64 // max num of bulk-in while draining
+#define BFM_RESET_DURATION 10 // duration of conReset()
+#define BFM_REST_LOST      0xFFFFFFFF
+
+// It keeps 'rest0[num0]' and 'rest1[num1]', i.e., the rest of the frame.
+static void bfm_rest_keep( struct bfm_context *ctx
+                         , unsigned int       *rest0
+                         , unsigned int        num0
+                         , unsigned int       *rest1
+                         , unsigned int        num1 )
 {
-#ifdef RIGOR
-   if (data==NULL) {
-       printf("%s() invalid buffer\n", __FUNCTION__);
-       return;
+   unsigned int num=num0+num1;
+   if (num>ctx->rest_max) {
+       unsigned int *rest=(unsigned int *)realloc(ctx->rest, num*sizeof(unsigned int));
+       if (rest==NULL) {
+           ctx->rest_num = BFM_REST_LOST;
+           return;
+       }
+       ctx->rest     = rest;
+       ctx->rest_max = num;
    }
-   switch (size) {
-   case 1: case 2: case 4: break;
-   default: printf("%s() cannot support %d-byte transfer\n", __FUNCTION__, size);
-            return;
+   if (num0) memcpy(ctx->rest, rest0, num0*sizeof(unsigned int));
+   if (num1) memcpy(ctx->rest+num0, rest1, num1*sizeof(unsigned int));
+   ctx->rest_num = num;
+}
+
+// It pushes the rest of a frame.
+static int bfm_recover_push( struct bfm_context *ctx
+                           , unsigned int       *pbuf
+                           , unsigned int        num )
+{
+   unsigned int done;
+   for (; num>0; num -= done, pbuf += done) {
+        done = 0;
+        if (conStreamWrite(ctx->handle, (void *)pbuf, num, &done, 0)||(done>num)) return -1;
    }
-   if ((length>0x1000)&&(length<0)) {
-       printf("%s() can support up to 4096 for length\n", __FUNCTION__);
-       return;
+   return 0;
+}
+
+// It pops what is left in bulk-in with short time-out,
+// which is shared by all handles for a while.
+//
+// Return <0 when it does not stop coming.
+static int bfm_recover_drain( struct bfm_context *ctx )
+{
+   unsigned int buf[1024];
+   unsigned int tmo=TIMEOUT_MS;
+   unsigned int done, idx;
+   conUsbTimeout(BFM_DRAIN_MS);
+   for (idx=0; idx<BFM_DRAIN_MAX; idx++) {
+        done = 0;
+        if (conStreamRead(ctx->handle, (void *)buf, 1024, &done)||(done==0)) break;
    }
-   if (addr%size) {
-       printf("%s() cannot support mis-aligned access\n", __FUNCTION__);
-       return;
+   conUsbTimeout(tmo);
+   return (idx<BFM_DRAIN_MAX) ? 0 : -1;
+}
+
+// It brings the handle back in sync, while the context is held by the caller.
+//
+// Return <0 on failure, otherwise the level that brought it back.
+static int bfm_recover( struct bfm_context *ctx
+                      , int                 level )
+{
+   struct libusb_device_handle *dev=ctx->handle->usb.handle;
+   unsigned int value;
+   int lvl;
+   for (lvl=BFM_RECOVER_EP; lvl<=level; lvl++) {
+        if ((lvl>=BFM_RECOVER_FX3)&&conUsbResetFx3(dev, 1)) continue;
+        if (conUsbResetEp(dev, 0x3)) continue;
+        if (lvl>=BFM_RECOVER_TRX) {
+            if (conReset(ctx->handle, BFM_RESET_DURATION)) continue;
+        } else if (ctx->rest_num!=BFM_REST_LOST) {
+            if (bfm_recover_push(ctx, ctx->rest, ctx->rest_num)) continue;
+        } else {
+            continue;
+        }
+        if (bfm_recover_drain(ctx)) continue;
+        if (bfm_gpin(ctx, &value)) continue;
+        ctx->desync   = 0;
+        ctx->rest_num = 0;
+        ctx->stats.recoveries++;
+        return lvl;
    }
-#endif
-   // to push BFM command for write
-   // - control-flit for command
-   // - command-flit for bfm write
-   // - address-flit for bfm write
-   unsigned int cbuf[4];
-   cbuf[0] = (2<<16) // command+address
-           | ((0b0010&0xF)<<12) // control packet
-           | ((0x0&0xF)<<4); // transactor
-   GET_CMD(cbuf[1], 0, 0, 0, 0, size>>1, 1, 0, 0, 1, length-1);
-           //       EI,RD,LK,EX, SZ     ,BT,PR,CA,ID,   BL
-   cbuf[2] = addr;
-   // to push BFM data for write
-   // - control-flit for data
-   cbuf[3] = (length<<16) // command+data
-           | ((0b0101&0xF)<<12) // control packet
-           | ((0x0&0xF)<<4); // transactor
+   return -1;
+}
 
-   unsigned int done=0;
-   if (conStreamWrite(handle, cbuf, 4, &done, 0) || (done!=4)) {
-       printf("%s() something went wrong\n", __FUNCTION__);
-       return;
+// It marks the handle out of sync and recovers it when automatic recovery
+// is on, where 'status' is what failed and 'rest0[num0]' and 'rest1[num1]'
+// are the rest of the frame in flight.
+//
+// Return 'status', or BFM_ERR_RECOVER when it could not be recovered.
+static int bfm_fail( struct bfm_context *ctx
+                   , int                 status
+                   , unsigned int       *rest0
+                   , unsigned int        num0
+                   , unsigned int       *rest1
+                   , unsigned int        num1 )
+{
+   if (!ctx->desync) bfm_rest_keep(ctx, rest0, num0, rest1, num1);
+   ctx->desync = 1;
+   if (ctx->recover_level<0) return status;
+   if (bfm_recover(ctx, ctx->recover_level)<0) {
+       printf("%s() could not recover\n", __FUNCTION__);
+       return BFM_ERR_RECOVER;
    }
+   return status;
+}
 
-   // to pop BFM data for read
-   unsigned int num;
-   unsigned int *pbuf=data;
-   for (num=length, done=0; num>0; num -= done, pbuf += done) {
-        if (conStreamRead(handle, (void *)pbuf, num, &done)) {
-            printf("%s() something went wrong\n", __FUNCTION__);
-            return;
+//------------------------------------------------------------------------------
+// It copies the context of the handle, where the bus is found from GPIN
+// at the first use of the handle.
+//
+// Return <0 on failure, 0 on success.
+int BfmContextGet( con_Handle_t  handle
+                 , BfmContext_t *info )
+{
+   struct bfm_context *ctx;
+   if (info==NULL) return -1;
+   ctx = bfm_enter(handle);
+   if (ctx==NULL) return -1;
+   *info = ctx->info;
+   bfm_leave(ctx);
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// It sets the context of the handle, e.g., from what BfmContextGet() gave
+// before and was kept in a file, so that GPIN is not read at the first use.
+// Fifo depths are taken from the transactor when they are 0.
+//
+// Return <0 on failure, 0 on success.
+int BfmContextSet( con_Handle_t        handle
+                 , const BfmContext_t *info )
+{
+   struct bfm_context *ctx;
+   if ((info==NULL)||(info->width==0)||(info->burst_max==0)||(info->burst_max>256)) return -1;
+   ctx = bfm_context_get(handle);
+   if (ctx==NULL) return -1;
+   BFM_LOCK(&ctx->lock);
+   ctx->info  = *info;
+   if ((info->depth_u2f==0)||(info->depth_f2u==0)) bfm_context_depth(ctx);
+   ctx->found = 1;
+   BFM_UNLOCK(&ctx->lock);
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// It opens the card as conInit() does, where the context left by a handle
+// released by conRelease() is dropped, since the handle may be reused.
+//
+// Return NULL on failure.
+con_Handle_t BfmInit( unsigned int con_cid
+                    , unsigned int con_mode
+                    , unsigned int conapi_log_level )
+{
+   con_Handle_t handle=conInit(con_cid, con_mode, conapi_log_level);
+   if (handle!=NULL) BfmContextRelease(handle);
+   return handle;
+}
+
+//------------------------------------------------------------------------------
+// It releases the card as conRelease() does along with the context of
+// the handle, which should not be in use by other threads.
+//
+// Return <0 on failure, 0 on success.
+int BfmRelease( con_Handle_t handle )
+{
+   if (handle==NULL) return -1;
+   BfmContextRelease(handle);
+   return conRelease(handle);
+}
+
+//------------------------------------------------------------------------------
+// It frees the context of the handle, or of all when 'handle' is NULL,
+// which should not be in use by other threads.
+//
+// Return <0 on failure, 0 on success.
+int BfmContextRelease( con_Handle_t handle )
+{
+   int idx;
+   BFM_CONTEXTS_LOCK();
+   for (idx=0; idx<BFM_CONTEXT_MAX; idx++) {
+        if ((handle==NULL)||(bfm_contexts[idx].handle==handle)) {
+            bfm_contexts[idx].handle  = NULL;
+            bfm_contexts[idx].pending = NULL;
+            free(bfm_contexts[idx].rest);
+            bfm_contexts[idx].rest     = NULL;
+            bfm_contexts[idx].rest_max = 0;
         }
    }
+   BFM_CONTEXTS_UNLOCK();
+   return 0;
 }
 
-//-------------------------------------------------------------
-// It generates 'length' incremental write transactions
-// from the address in 'addr' with data in 'data[]'.
-// Note that 'data[x]' contains 'size'-bytes in justified fashion.
-void BfmWriteFix( con_Handle_t handle
-                , unsigned int  addr
-                , unsigned int *data // pointer to the array of justified data
-                , unsigned int  size // num of bytes in an item
-                , unsigned int  length)
+//------------------------------------------------------------------------------
+// It enables (1) or disables (0) instrumentation.
+//
+// Return previous one.
+int BfmStatsEnable( int enable )
+{
+   int prev=bfm_stats_on;
+   bfm_stats_on = (enable) ? 1 : 0;
+   return prev;
+}
+
+//------------------------------------------------------------------------------
+// It copies counters of the handle, which should have its context, i.e.,
+// it is not released, where it does not take a context for a new handle
+// nor look into the handle.
+//
+// Return <0 on failure, 0 on success.
+int BfmStatsGet( con_Handle_t  handle
+               , BfmStats_t   *stats )
+{
+   int idx, ret=-1;
+   if ((handle==NULL)||(stats==NULL)) return -1;
+   BFM_CONTEXTS_LOCK();
+   for (idx=0; idx<BFM_CONTEXT_MAX; idx++) {
+        if (bfm_contexts[idx].handle==handle) {
+            *stats = bfm_contexts[idx].stats;
+            ret = 0;
+            break;
+        }
+   }
+   BFM_CONTEXTS_UNLOCK();
+   return ret;
+}
+
+//------------------------------------------------------------------------------
+// It clears counters of the handle, or of all when 'handle' is NULL.
+//
+// Return <0 on failure, e.g., the handle without context, 0 on success.
+int BfmStatsClear( con_Handle_t handle )
+{
+   int idx, ret=(handle==NULL) ? 0 : -1;
+   BFM_CONTEXTS_LOCK();
+   for (idx=0; idx<BFM_CONTEXT_MAX; idx++) {
+        if ((handle==NULL)||(bfm_contexts[idx].handle==handle)) {
+            memset(&bfm_contexts[idx].stats, 0, sizeof(BfmStats_t));
+            ret = 0;
+        }
+   }
+   BFM_CONTEXTS_UNLOCK();
+   return ret;
+}
+
+//------------------------------------------------------------------------------
+// It brings the handle back in sync in place, going up from BFM_RECOVER_EP
+// to 'level', e.g., after BFM_ERR_DESYNC or BFM_ERR_RECOVER.
+// It can be called at any time since it does no harm to a handle in sync
+// except for read data in flight.
+//
+// Return <0 on failure, otherwise the level that brought it back.
+int BfmRecover( con_Handle_t handle
+              , int          level )
+{
+   struct bfm_context *ctx;
+   int ret;
+   if ((level<BFM_RECOVER_EP)||(level>BFM_RECOVER_FX3)) return BFM_ERR_PARAM;
+   ctx = bfm_enter(handle);
+   if (ctx==NULL) return BFM_ERR_PARAM;
+   ret = bfm_recover(ctx, level);
+   if ((ret>=0)&&(ctx->found<0)) ctx->found = 0; // GPIN is read again
+   bfm_leave(ctx);
+   return (ret<0) ? BFM_ERR_RECOVER : ret;
+}
+
+//------------------------------------------------------------------------------
+// It sets up to which level a failed transfer is recovered by itself,
+// where negative 'level' turns it off so that BfmRecover() should be called,
+// and how many times incremental reads and GPIN are tried again after it.
+// It is BFM_RECOVER_EP with 2 retries by default.
+//
+// Return <0 on failure, 0 on success.
+int BfmSetRecovery( con_Handle_t handle
+                  , int          level
+                  , unsigned int retries )
+{
+   struct bfm_context *ctx;
+   if (level>BFM_RECOVER_FX3) return BFM_ERR_PARAM;
+   ctx = bfm_context_get(handle);
+   if (ctx==NULL) return BFM_ERR_PARAM;
+   BFM_LOCK(&ctx->lock);
+   ctx->recover_level = (level<0) ? -1 : level;
+   ctx->retries       = retries;
+   BFM_UNLOCK(&ctx->lock);
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// It returns message of the status returned by Bfm*Status().
+const char *BfmErrorMsg( int status )
+{
+   switch (status) {
+   case BFM_OK         : return "success";
+   case BFM_ERR_PARAM  : return "invalid argument";
+   case BFM_ERR_WRITE  : return "bulk-out failed";
+   case BFM_ERR_READ   : return "bulk-in failed";
+   case BFM_ERR_CMD    : return "internal access failed";
+   case BFM_ERR_DESYNC : return "out of sync";
+   case BFM_ERR_RECOVER: return "could not recover";
+   }
+   return "unknown";
+}
+
+//------------------------------------------------------------------------------
+// It checks arguments of single transactions against the context of
+// the handle, where mis-aligned access is checked only with RIGOR as before.
+// Incremental burst is limited to the burst limit of the handle and should not
+// cross 4KB boundary, while fixed burst is limited to BFM_FIX_LENGTH_MAX beats,
+// since AMBA AXI limits fixed burst to 16 beats.
+// - bt: burst type (0:fixed, 1:inc)
+#define BFM_FIX_LENGTH_MAX 16
+#define BFM_BOUNDARY       0x1000 // 4KB
+static int bfm_check( struct bfm_context *ctx
+                    , unsigned int        addr
+                    , unsigned int       *data
+                    , unsigned int        size
+                    , unsigned int        length
+                    , unsigned int        bt
+                    , const char         *func )
 {
-#ifdef RIGOR
    if (data==NULL) {
-       printf("%s() invalid buffer\n", __FUNCTION__);
-       return;
+       printf("%s() invalid buffer\n", func);
+       return BFM_ERR_PARAM;
    }
    switch (size) {
    case 1: case 2: case 4: break;
-   default: printf("%s() cannot support %d-byte transfer\n", __FUNCTION__, size);
-            return;
+   default: printf("%s() cannot support %d-byte transfer\n", func, size);
+            return BFM_ERR_PARAM;
+   }
+   if ((length==0)||(length>((bt) ? ctx->info.burst_max : BFM_FIX_LENGTH_MAX))) {
+       printf("%s() can support up to %d for length\n", func
+             , (bt) ? ctx->info.burst_max : BFM_FIX_LENGTH_MAX);
+       return BFM_ERR_PARAM;
    }
-   if ((length>0x1000)&&(length<0)) {
-       printf("%s() can support up to 4096 for length\n", __FUNCTION__);
-       return;
+   if (bt==2) {
+       // wrap burst stays in the window of 'length*size' bytes
+       if ((length<2)||(length>16)||(length&(length-1))||(addr%size)) {
+           printf("%s() illegal wrap burst of %d beats: 0x%08X\n", func, length, addr);
+           return BFM_ERR_PARAM;
+       }
+   } else if (bt&&(((addr%BFM_BOUNDARY)+length*size)>BFM_BOUNDARY)) {
+       printf("%s() cannot cross 4KB boundary: 0x%08X\n", func, addr);
+       return BFM_ERR_PARAM;
+   }
+#ifdef RIGOR
+   if (bt&&(addr%size)) {
+       printf("%s() cannot support mis-aligned access\n", func);
+       return BFM_ERR_PARAM;
    }
 #endif
+   return BFM_OK;
+}
+
+//------------------------------------------------------------------------------
+// It generates 'length' write transactions, while the context is held by
+// the caller.
+// - bt: burst type (0:fixed, 1:inc)
+static int bfm_write( struct bfm_context *ctx
+                    , unsigned int        addr
+                    , unsigned int       *data
+                    , unsigned int        size
+                    , unsigned int        length
+                    , unsigned int        bt )
+{
+   if (ctx->desync) return BFM_ERR_DESYNC;
    // to push BFM command for write
    // - control-flit for command
    // - command-flit for bfm write
@@ -195,7 +678,7 @@ void BfmWriteFix( con_Handle_t handle
    cbuf[0] = (2<<16) // command+address
            | ((0b0010&0xF)<<12) // control packet
            | ((0x0&0xF)<<4); // transactor
-   GET_CMD(cbuf[1], 0, 1, 0, 0, size>>1, 0, 0, 0, 1, length-1);
+   GET_CMD(cbuf[1], 0, 1, 0, 0, size>>1, bt, 0, 0, 1, length-1);
            //       EI,WR,LK,EX, SZ     ,BT,PR,CA,ID,   BL
    cbuf[2] = addr;
    // to push BFM data for write
@@ -205,9 +688,10 @@ void BfmWriteFix( con_Handle_t handle
            | ((0x0&0xF)<<4); // transactor
 
    unsigned int done=0;
-   if (conStreamWrite(handle, cbuf, 4, &done, 0) || (done!=4)) {
+   if (bfm_stream_write(ctx, cbuf, 4, &done, 0) || (done!=4)) {
        printf("%s() something went wrong: %d\n", __FUNCTION__, done);
-       return;
+       if (done>4) done = 0;
+       return bfm_fail(ctx, BFM_ERR_WRITE, cbuf+done, 4-done, data, length);
    }
 //conZlpWrite(handle);
 
@@ -215,73 +699,213 @@ void BfmWriteFix( con_Handle_t handle
    unsigned int num;
    unsigned int *pbuf=data;
    for (num=length, done=0; num>0; num -= done, pbuf += done) {
-        unsigned int zlp = ((num*4)%handle->usb.bulk_max_pkt_size_out) ? 0 : 1;
+        unsigned int zlp = ((num*4)%ctx->handle->usb.bulk_max_pkt_size_out) ? 0 : 1;
 //printf("num=%d zlp=%d\n", num, zlp);
-        if (conStreamWrite(handle, (void *)pbuf, num, &done, zlp)) {
+        if (bfm_stream_write(ctx, (void *)pbuf, num, &done, zlp)) {
             printf("%s() something went wrong: %d\n", __FUNCTION__, done);
-            return;
+            if (done>num) done = 0;
+            return bfm_fail(ctx, BFM_ERR_WRITE, pbuf+done, num-done, NULL, 0);
         }
 if (done<num) printf("num=%d zlp=%d done=%d\n", num, zlp, done);
    }
+   return BFM_OK;
 }
 
 //------------------------------------------------------------------------------
-// It generates 'length' incremental read transactions
-// from the address in 'addr' with data in 'data[]'.
-// Note that 'data[x]' contains 'size'-bytes in justified fashion.
-void BfmReadFix( con_Handle_t handle
-               , unsigned int  addr
-               , unsigned int *data // pointer to the array of justified data
-               , unsigned int  size
-               , unsigned int  length)
+// It generates 'length' read transactions, while the context is held by
+// the caller.
+// - bt: burst type (0:fixed, 1:inc)
+static int bfm_read( struct bfm_context *ctx
+                   , unsigned int        addr
+                   , unsigned int       *data
+                   , unsigned int        size
+                   , unsigned int        length
+                   , unsigned int        bt )
 {
-#ifdef RIGOR
-   if (data==NULL) {
-       printf("%s() invalid buffer\n", __FUNCTION__);
-       return;
-   }
-   switch (size) {
-   case 1: case 2: case 4: break;
-   default: printf("%s() cannot support %d-byte transfer\n", __FUNCTION__, size);
-            return;
-   }
-   if ((length>0x1000)&&(length<0)) {
-       printf("%s() can support up to 4096 for length\n", __FUNCTION__);
-       return;
-   }
-#endif
-   // to push BFM command for write
+   if (ctx->desync) return BFM_ERR_DESYNC;
+   // to push BFM command for read
    // - control-flit for command
-   // - command-flit for bfm write
-   // - address-flit for bfm write
+   // - command-flit for bfm read
+   // - address-flit for bfm read
    unsigned int cbuf[4];
    cbuf[0] = (2<<16) // command+address
            | ((0b0010&0xF)<<12) // control packet
            | ((0x0&0xF)<<4); // transactor
-   GET_CMD(cbuf[1], 0, 0, 0, 0, size>>1, 0, 0, 0, 1, length-1);
+   GET_CMD(cbuf[1], 0, 0, 0, 0, size>>1, bt, 0, 0, 1, length-1);
            //       EI,RD,LK,EX, SZ     ,BT,PR,CA,ID,   BL
    cbuf[2] = addr;
-   // to push BFM data for write
+   // to push BFM data for read
    // - control-flit for data
    cbuf[3] = (length<<16) // command+data
            | ((0b0101&0xF)<<12) // control packet
            | ((0x0&0xF)<<4); // transactor
 
    unsigned int done=0;
-   if (conStreamWrite(handle, cbuf, 4, &done, 0) || (done!=4)) {
+   if (bfm_stream_write(ctx, cbuf, 4, &done, 0) || (done!=4)) {
        printf("%s() something went wrong\n", __FUNCTION__);
-       return;
+       if (done>4) done = 0;
+       return bfm_fail(ctx, BFM_ERR_WRITE, cbuf+done, 4-done, NULL, 0);
    }
 
    // to pop BFM data for read
    unsigned int num;
    unsigned int *pbuf=data;
    for (num=length, done=0; num>0; num -= done, pbuf += done) {
-        if (conStreamRead(handle, (void *)pbuf, num, &done)) {
+        if (bfm_stream_read(ctx, (void *)pbuf, num, &done)) {
             printf("%s() something went wrong\n", __FUNCTION__);
-            return;
+            return bfm_fail(ctx, BFM_ERR_READ, NULL, 0, NULL, 0);
         }
    }
+   return BFM_OK;
+}
+
+//------------------------------------------------------------------------------
+// It generates 'length' incremental write transactions
+// from the address in 'addr' with data in 'data[]'.
+// Note that 'data[x]' contains 'size'-bytes in justified fashion.
+//
+// Return BFM_OK on success, otherwise BFM_ERR_*, where BFM_ERR_WRITE means
+// the write may or may not have been done while the stream is in frame.
+int BfmWriteStatus( con_Handle_t handle
+                  , unsigned int  addr
+                  , unsigned int *data // pointer to the array of justified data
+                  , unsigned int  size // num of bytes in an item
+                  , unsigned int  length)
+{
+   struct bfm_context *ctx=bfm_enter(handle);
+   int ret;
+   if (ctx==NULL) return BFM_ERR_PARAM;
+   ret = bfm_check(ctx, addr, data, size, length, 1, __FUNCTION__);
+   if (ret==BFM_OK) ret = bfm_write(ctx, addr, data, size, length, 1);
+   bfm_leave(ctx);
+   return ret;
+}
+
+//------------------------------------------------------------------------------
+// It generates 'length' incremental read transactions
+// from the address in 'addr' with data in 'data[]'.
+// Note that 'data[x]' contains 'size'-bytes in justified fashion.
+// It is tried again up to the num of retries set by BfmSetRecovery()
+// when the handle has been recovered from a failure.
+//
+// Return BFM_OK on success, otherwise BFM_ERR_*.
+int BfmReadStatus( con_Handle_t handle
+                 , unsigned int  addr
+                 , unsigned int *data // pointer to the array of justified data
+                 , unsigned int  size
+                 , unsigned int  length)
+{
+   struct bfm_context *ctx=bfm_enter(handle);
+   unsigned int retry;
+   int ret;
+   if (ctx==NULL) return BFM_ERR_PARAM;
+   ret = bfm_check(ctx, addr, data, size, length, 1, __FUNCTION__);
+   if (ret) {
+       bfm_leave(ctx);
+       return ret;
+   }
+   for (retry=0; ; retry++) {
+        ret = bfm_read(ctx, addr, data, size, length, 1);
+        if ((ret==BFM_OK)||(ctx->desync)||(retry>=ctx->retries)) break;
+        ctx->stats.retries++;
+   }
+   bfm_leave(ctx);
+   return ret;
+}
+
+//------------------------------------------------------------------------------
+// It generates 'length' fixed-address write transactions
+// to the address in 'addr' with data in 'data[]'.
+//
+// Return BFM_OK on success, otherwise BFM_ERR_*.
+int BfmWriteFixStatus( con_Handle_t handle
+                     , unsigned int  addr
+                     , unsigned int *data // pointer to the array of justified data
+                     , unsigned int  size // num of bytes in an item
+                     , unsigned int  length)
+{
+   struct bfm_context *ctx=bfm_enter(handle);
+   int ret;
+   if (ctx==NULL) return BFM_ERR_PARAM;
+   ret = bfm_check(ctx, addr, data, size, length, 0, __FUNCTION__);
+   if (ret==BFM_OK) ret = bfm_write(ctx, addr, data, size, length, 0);
+   bfm_leave(ctx);
+   return ret;
+}
+
+//------------------------------------------------------------------------------
+// It generates 'length' fixed-address read transactions
+// from the address in 'addr' with data in 'data[]'.
+// It is not tried again, since reading FIFO is not idempotent.
+//
+// Return BFM_OK on success, otherwise BFM_ERR_*.
+int BfmReadFixStatus( con_Handle_t handle
+                    , unsigned int  addr
+                    , unsigned int *data // pointer to the array of justified data
+                    , unsigned int  size
+                    , unsigned int  length)
+{
+   struct bfm_context *ctx=bfm_enter(handle);
+   int ret;
+   if (ctx==NULL) return BFM_ERR_PARAM;
+   ret = bfm_check(ctx, addr, data, size, length, 0, __FUNCTION__);
+   if (ret==BFM_OK) ret = bfm_read(ctx, addr, data, size, length, 0);
+   bfm_leave(ctx);
+   return ret;
+}
+
+//-------------------------------------------------------------
+// It generates 'length' incremental write transactions
+// from the address in 'addr' with data in 'data[]'.
+// Note that 'data[x]' contains 'size'-bytes in justified fashion.
+// Use BfmWriteStatus() to know the result.
+void BfmWrite( con_Handle_t handle
+             , unsigned int  addr
+             , unsigned int *data // pointer to the array of justified data
+             , unsigned int  size // num of bytes in an item
+             , unsigned int  length)
+{
+   (void)BfmWriteStatus(handle, addr, data, size, length);
+}
+
+//------------------------------------------------------------------------------
+// It generates 'length' incremental read transactions
+// from the address in 'addr' with data in 'data[]'.
+// Note that 'data[x]' contains 'size'-bytes in justified fashion.
+// Use BfmReadStatus() to know the result.
+void BfmRead( con_Handle_t handle
+            , unsigned int  addr
+            , unsigned int *data // pointer to the array of justified data
+            , unsigned int  size
+            , unsigned int  length)
+{
+   (void)BfmReadStatus(handle, addr, data, size, length);
+}
+
+//-------------------------------------------------------------
+// It generates 'length' fixed-address write transactions
+// to the address in 'addr' with data in 'data[]'.
+// Use BfmWriteFixStatus() to know the result.
+void BfmWriteFix( con_Handle_t handle
+                , unsigned int  addr
+                , unsigned int *data // pointer to the array of justified data
+                , unsigned int  size // num of bytes in an item
+                , unsigned int  length)
+{
+   (void)BfmWriteFixStatus(handle, addr, data, size, length);
+}
+
+//------------------------------------------------------------------------------
+// It generates 'length' fixed-address read transactions
+// from the address in 'addr' with data in 'data[]'.
+// Use BfmReadFixStatus() to know the result.
+void BfmReadFix( con_Handle_t handle
+               , unsigned int  addr
+               , unsigned int *data // pointer to the array of justified data
+               , unsigned int  size
+               , unsigned int  length)
+{
+   (void)BfmReadFixStatus(handle, addr, data, size, length);
 }
 
 //------------------------------------------------------------------------------
@@ -295,20 +919,24 @@ void BfmReadFix( con_Handle_t handle
 //------------------------------------------------------------------------------
 // It writes GPIO pins.
 //
-// Return <0 on failure, 0 on success.
+// Return <0 on failure, i.e., BFM_ERR_*, 0 on success.
 int BfmGpout( con_Handle_t handle
             , unsigned int value )
 {
-   unsigned int cbuf[1], pbuf[1];
+   unsigned int cbuf[1];
    unsigned int done;
+   int ret=BFM_OK;
+   struct bfm_context *ctx=bfm_enter(handle);
+   if (ctx==NULL) return BFM_ERR_PARAM;
    cbuf[0] = 1<<31
            | 1<<30
            | (value&0xFFFF);
-   if (conCmdWrite(handle, (void *)cbuf, 1, &done, 0)) {
+   if (bfm_cmd_write(ctx, (void *)cbuf, 1, &done)) {
        printf("%s() something went wrong\n", __FUNCTION__);
-       return -1;
+       ret = bfm_fail(ctx, BFM_ERR_CMD, NULL, 0, NULL, 0);
    }
-   return 0;
+   bfm_leave(ctx);
+   return ret;
 }
 
 //------------------------------------------------------------------------------
@@ -331,24 +959,21 @@ int BfmGpout( con_Handle_t handle
 //  WIDTH[2:0]: width of data bus, 0=1-byte,1=2-byte,2=4-byte,3=8-byte,4=16-byte
 //  DA[15:0]: Data
 //------------------------------------------------------------------------------
-// It reads GPIO pins.
+// It reads GPIO pins, while the context is held by the caller.
 //
 // Return <0 on failure, 0 on success.
-int BfmGpin( con_Handle_t handle
-           , unsigned int *pValue )
+static int bfm_gpin( struct bfm_context *ctx
+                   , unsigned int       *pValue )
 {
    unsigned int cbuf[1], pbuf[1];
    unsigned int done;
-   if (pValue==NULL) {
-       return -1;
-   }
    cbuf[0] = 1<<31;
-   if (conCmdWrite(handle, (void *)cbuf, 1, &done, 0)) {
+   if (bfm_cmd_write(ctx, (void *)cbuf, 1, &done)) {
        printf("%s() something went wrong\n", __FUNCTION__);
        return -1;
    }
-   if (conDataRead(handle, (void *)pbuf, 1, &done, 0)) {
-       printf("%se() something went wrong\n", __FUNCTION__);
+   if (bfm_data_read(ctx, (void *)pbuf, 1, &done)) {
+       printf("%s() something went wrong\n", __FUNCTION__);
        return -1;
    }
    *pValue = pbuf[0];
@@ -356,20 +981,552 @@ int BfmGpin( con_Handle_t handle
 }
 
 //------------------------------------------------------------------------------
-// It set 'amba_axi4' after reading GPIO pins.
+// It reads GPIO pins, which is tried again after recovery.
+//
+// Return <0 on failure, i.e., BFM_ERR_*, 0 on success.
+int BfmGpin( con_Handle_t handle
+           , unsigned int *pValue )
+{
+   struct bfm_context *ctx;
+   unsigned int retry;
+   int ret;
+   if (pValue==NULL) {
+       return BFM_ERR_PARAM;
+   }
+   ctx = bfm_enter(handle);
+   if (ctx==NULL) return BFM_ERR_PARAM;
+   for (retry=0; ; retry++) {
+        if (bfm_gpin(ctx, pValue)==0) { ret = BFM_OK; break; }
+        ret = bfm_fail(ctx, BFM_ERR_CMD, NULL, 0, NULL, 0);
+        if ((ctx->desync)||(retry>=ctx->retries)) break;
+        ctx->stats.retries++;
+   }
+   bfm_leave(ctx);
+   return ret;
+}
+
+//------------------------------------------------------------------------------
+// It finds AMBA AXI4 or AMBA AXI3 from GPIO pins again,
+// which is kept in the context of the handle.
 //
 // Return positive burst length on success.
 // Return <0 on failure.
 int BfmSetAmbaAxi4( con_Handle_t handle )
 {
-    unsigned int value;
-    if (BfmGpin(handle, &value)) return -1;
-    if ((value>>19)&0x1) {
-        amba_axi4 = 256;
-    } else {
-        amba_axi4 = 16;
-    }
-    return amba_axi4;
+    struct bfm_context *ctx=bfm_enter(handle);
+    int ret;
+    if (ctx==NULL) return -1;
+    ret = (bfm_context_find(ctx)) ? -1 : (int)ctx->info.burst_max;
+    bfm_leave(ctx);
+    return ret;
+}
+
+//------------------------------------------------------------------------------
+// Batched transactions.
+//
+// BfmBatchWrite()/BfmBatchRead() do not access USB, but append command-flits
+// and write data to the stream buffer of the batch.
+// BfmBatchFlush() pushes the whole stream with conStreamWrite() and then pops
+// read data of all queued reads with conStreamRead(), after which read data
+// are scattered to the buffers given to BfmBatchRead().
+// BfmBatchIssue() and BfmBatchCollect() carry out each half of it, so that
+// reads are split into issue and collect phases.
+// Reads issued are kept in the context as 'pending' until collected, while
+// the handle is not held, so that they are collected by any BFM call of
+// the handle coming first, e.g., BfmRead() or BfmBatchIssue() of another
+// batch; read data are scattered all the same and BfmBatchCollect() tells
+// how it went.
+//
+// Read data of queued reads should not exceed F2U fifo of the transactor,
+// since the transactor stalls on a full F2U fifo while the stream is being
+// pushed and nobody pops it. It is limited by 'depth', which is not more
+// than 'depth_f2u' of the context, and the batch is flushed when reached.
+//------------------------------------------------------------------------------
+#define BFM_BATCH_WORDS  (64*1024) // default num of words of stream buffer
+
+struct _BfmBatchRead {
+       unsigned int *data; // buffer given to BfmBatchRead()
+       unsigned int  length;
+};
+
+struct _BfmBatch {
+       con_Handle_t          handle;
+       struct bfm_context   *ctx;
+       int                   status; // of reads collected by others
+       unsigned int         *wbuf; // stream to push
+       unsigned int          wnum; // num of words in 'wbuf'
+       unsigned int          wmax; // num of words allocated for 'wbuf'
+       unsigned int         *rbuf; // read data popped
+       unsigned int          rnum; // num of read data words queued
+       unsigned int          rmax; // num of words allocated for 'rbuf'
+       unsigned int          depth; // max num of read data words queued
+       struct _BfmBatchRead *rlist; // reads queued
+       unsigned int          rlnum;
+       unsigned int          rlmax;
+       unsigned int          inum; // num of read data words issued
+       unsigned int          ilnum; // num of reads issued
+};
+
+//------------------------------------------------------------------------------
+// It holds the context of the batch, where reads issued by another batch
+// are collected first.
+static void bfm_batch_enter( BfmBatch_t batch )
+{
+   BFM_LOCK(&batch->ctx->lock);
+   if ((batch->ctx->pending!=NULL)&&(batch->ctx->pending!=batch)) {
+       bfm_batch_settle(batch->ctx->pending);
+   }
+}
+
+// It pops read data of reads issued and scatters them when 'scatter' is 1,
+// while the context is held, where reads queued after them are kept.
+//
+// Return <0 on failure, i.e., BFM_ERR_*, 0 on success.
+static int bfm_batch_pop( BfmBatch_t batch
+                        , int        scatter )
+{
+   unsigned int num, done, idx;
+   unsigned int *pbuf;
+   int ret=BFM_OK;
+   if (batch->ctx->pending==batch) batch->ctx->pending = NULL;
+   if (batch->ctx->desync) ret = BFM_ERR_DESYNC;
+   // to pop BFM data for read
+   for (num=(ret) ? 0 : batch->inum, pbuf=batch->rbuf, done=0; num>0; num -= done, pbuf += done) {
+        if (bfm_stream_read(batch->ctx, (void *)pbuf, num, &done)) {
+            printf("%s() something went wrong\n", __FUNCTION__);
+            ret = bfm_fail(batch->ctx, BFM_ERR_READ, NULL, 0, NULL, 0);
+            break;
+        }
+   }
+   // to scatter read data
+   if ((ret==0)&&scatter) {
+       for (idx=0, pbuf=batch->rbuf; idx<batch->ilnum; pbuf += batch->rlist[idx].length, idx++) {
+            memcpy(batch->rlist[idx].data, pbuf, batch->rlist[idx].length*sizeof(unsigned int));
+       }
+   }
+   memmove(batch->rlist, batch->rlist+batch->ilnum
+          , (batch->rlnum-batch->ilnum)*sizeof(struct _BfmBatchRead));
+   batch->rnum  -= batch->inum;
+   batch->rlnum -= batch->ilnum;
+   batch->inum   = 0;
+   batch->ilnum  = 0;
+   return ret;
+}
+
+// It collects reads of the batch for other BFM calls of the handle,
+// whose result is told by BfmBatchCollect() of the batch.
+static int bfm_batch_settle( BfmBatch_t batch )
+{
+   int ret=bfm_batch_pop(batch, 1);
+   if (batch->status==BFM_OK) batch->status = ret;
+   return ret;
+}
+
+//------------------------------------------------------------------------------
+// It returns a batch with 'words' words of stream buffer,
+// which is rounded up to USB bulk max packet size.
+// 0 for 'words' means default and 'depth' is limited to F2U fifo depth
+// of the transactor, which is taken when it is 0.
+//
+// Return NULL on failure.
+BfmBatch_t BfmBatchOpen( con_Handle_t handle
+                       , unsigned int words
+                       , unsigned int depth )
+{
+   BfmBatch_t batch;
+   unsigned int pkt;
+   struct bfm_context *ctx=bfm_enter(handle);
+   if (ctx==NULL) return NULL;
+   bfm_leave(ctx);
+   if (words==0) words = BFM_BATCH_WORDS;
+   if ((depth==0)||(depth>ctx->info.depth_f2u)) depth = ctx->info.depth_f2u;
+   pkt = handle->usb.bulk_max_pkt_size_out/4;
+   if (pkt>0) words = ((words+pkt-1)/pkt)*pkt;
+   batch = (BfmBatch_t)calloc(1, sizeof(struct _BfmBatch));
+   if (batch==NULL) return NULL;
+   batch->handle = handle;
+   batch->ctx    = ctx;
+   batch->wmax   = words;
+   batch->wbuf   = (unsigned int *)malloc(words*sizeof(unsigned int));
+   batch->rmax   = depth;
+   batch->rbuf   = (unsigned int *)malloc(depth*sizeof(unsigned int));
+   batch->depth  = depth;
+   batch->rlmax  = 64;
+   batch->rlist  = (struct _BfmBatchRead *)malloc(batch->rlmax*sizeof(struct _BfmBatchRead));
+   if ((batch->wbuf==NULL)||(batch->rbuf==NULL)||(batch->rlist==NULL)) {
+       BfmBatchClose(batch);
+       return NULL;
+   }
+   return batch;
+}
+
+//------------------------------------------------------------------------------
+// It frees the batch without flushing, where read data of reads issued are
+// popped but not scattered, since their buffers may have gone.
+// It can be called by any thread, e.g., by garbage collector.
+void BfmBatchClose( BfmBatch_t batch )
+{
+   if (batch==NULL) return;
+   BFM_LOCK(&batch->ctx->lock);
+   if (batch->ctx->pending==batch) bfm_batch_pop(batch, 0);
+   BFM_UNLOCK(&batch->ctx->lock);
+   free(batch->wbuf);
+   free(batch->rbuf);
+   free(batch->rlist);
+   free(batch);
+}
+
+//------------------------------------------------------------------------------
+// It pushes queued stream, while read data of queued reads are left in flight
+// until BfmBatchCollect(); i.e., the first half of BfmBatchFlush().
+// It lets the transactor work on the reads while more are queued.
+// Reads issued are collected by another BFM call of the handle, if it comes
+// before BfmBatchCollect(), which can be of any thread.
+// When it fails, the rest of the stream is pushed by recovery and
+// queued reads are dropped, i.e., BfmBatchCollect() has nothing to collect.
+//
+// Return <0 on failure, i.e., BFM_ERR_*, 0 on success.
+int BfmBatchIssue( BfmBatch_t batch )
+{
+   if (batch==NULL) return BFM_ERR_PARAM;
+   con_Handle_t handle=batch->handle;
+   struct bfm_context *ctx=batch->ctx;
+   unsigned int num, done;
+   unsigned int *pbuf;
+   int ret=BFM_OK;
+   bfm_batch_enter(batch);
+   if (ctx->desync) ret = BFM_ERR_DESYNC;
+   // to push BFM commands and write data
+   for (num=(ret) ? 0 : batch->wnum, pbuf=batch->wbuf, done=0; num>0; num -= done, pbuf += done) {
+        unsigned int zlp = ((num*4)%handle->usb.bulk_max_pkt_size_out) ? 0 : 1;
+        if (bfm_stream_write(ctx, (void *)pbuf, num, &done, zlp)) {
+            printf("%s() something went wrong: %d\n", __FUNCTION__, done);
+            if (done>num) done = 0;
+            ret = bfm_fail(ctx, BFM_ERR_WRITE, pbuf+done, num-done, NULL, 0);
+            break;
+        }
+   }
+   batch->wnum = 0;
+   if (ret) {
+       batch->rnum  = 0;
+       batch->rlnum = 0;
+       batch->inum  = 0;
+       batch->ilnum = 0;
+   } else {
+       batch->inum  = batch->rnum;
+       batch->ilnum = batch->rlnum;
+   }
+   if (batch->inum>0) ctx->pending = batch;
+   else if (ctx->pending==batch) ctx->pending = NULL;
+   bfm_leave(ctx);
+   return ret;
+}
+
+//------------------------------------------------------------------------------
+// It pops read data of all reads issued and scatters them;
+// i.e., the second half of BfmBatchFlush().
+// Reads queued but not issued yet are kept for following BfmBatchIssue().
+//
+// Return <0 on failure, i.e., BFM_ERR_*, 0 on success, where the failure
+// can be of collecting by another BFM call since the last one.
+int BfmBatchCollect( BfmBatch_t batch )
+{
+   int ret;
+   if (batch==NULL) return BFM_ERR_PARAM;
+   bfm_batch_enter(batch);
+   ret = bfm_batch_pop(batch, 1);
+   if (batch->status) ret = batch->status;
+   batch->status = BFM_OK;
+   bfm_leave(batch->ctx);
+   return ret;
+}
+
+//------------------------------------------------------------------------------
+// It pushes queued stream and pops read data of queued reads.
+//
+// Return <0 on failure, i.e., BFM_ERR_*, 0 on success.
+int BfmBatchFlush( BfmBatch_t batch )
+{
+   int ret;
+   if (batch==NULL) return BFM_ERR_PARAM;
+   ret = BfmBatchIssue(batch);
+   if (ret) return ret;
+   return BfmBatchCollect(batch);
+}
+
+//------------------------------------------------------------------------------
+// It appends a transaction to the batch, while the context is held.
+// - write: 1 for write, 0 for read
+// - bt: burst type (0:fixed, 1:inc)
+static int bfm_batch_queue( BfmBatch_t    batch
+                          , unsigned int  write
+                          , unsigned int  bt
+                          , unsigned int  addr
+                          , unsigned int *data
+                          , unsigned int  size
+                          , unsigned int  length)
+{
+   if (bfm_check(batch->ctx, addr, data, size, length, bt, __FUNCTION__)) return -1;
+   if (bt&&(addr%size)) {
+       printf("%s() cannot support mis-aligned access\n", __FUNCTION__);
+       return -1;
+   }
+   unsigned int need=4+((write) ? length : 0);
+   if ((!write)&&(batch->rnum>0)&&((batch->rnum+length)>batch->depth)) {
+       if (BfmBatchFlush(batch)) return -1;
+   }
+   if ((batch->wnum+need)>batch->wmax) {
+       if (BfmBatchFlush(batch)) return -1;
+       if (need>batch->wmax) {
+           unsigned int *wbuf=(unsigned int *)realloc(batch->wbuf, need*sizeof(unsigned int));
+           if (wbuf==NULL) return -1;
+           batch->wbuf = wbuf;
+           batch->wmax = need;
+       }
+   }
+   if (!write) {
+       if ((batch->rnum+length)>batch->rmax) {
+           unsigned int *rbuf=(unsigned int *)realloc(batch->rbuf, (batch->rnum+length)*sizeof(unsigned int));
+           if (rbuf==NULL) return -1;
+           batch->rbuf = rbuf;
+           batch->rmax = batch->rnum+length;
+       }
+       if (batch->rlnum==batch->rlmax) {
+           struct _BfmBatchRead *rlist=(struct _BfmBatchRead *)realloc(batch->rlist,
+                                        2*batch->rlmax*sizeof(struct _BfmBatchRead));
+           if (rlist==NULL) return -1;
+           batch->rlist  = rlist;
+           batch->rlmax *= 2;
+       }
+   }
+   // - control-flit for command
+   // - command-flit for bfm write/read
+   // - address-flit for bfm write/read
+   // - control-flit for data
+   unsigned int *cbuf=batch->wbuf+batch->wnum;
+   cbuf[0] = (2<<16) // command+address
+           | ((0b0010&0xF)<<12) // control packet
+           | ((0x0&0xF)<<4); // transactor
+   GET_CMD(cbuf[1], 0, write, 0, 0, size>>1, bt, 0, 0, 1, length-1);
+           //       EI,   WR,LK,EX, SZ     ,BT,PR,CA,ID,   BL
+   cbuf[2] = addr;
+   cbuf[3] = (length<<16) // command+data
+           | (((write) ? 0b0100 : 0b0101)<<12) // control packet
+           | ((0x0&0xF)<<4); // transactor
+   batch->wnum += 4;
+   if (write) {
+       memcpy(batch->wbuf+batch->wnum, data, length*sizeof(unsigned int));
+       batch->wnum += length;
+   } else {
+       batch->rlist[batch->rlnum].data   = data;
+       batch->rlist[batch->rlnum].length = length;
+       batch->rlnum++;
+       batch->rnum += length;
+       if (batch->rnum>=batch->depth) return BfmBatchFlush(batch);
+   }
+   return 0;
+}
+
+// It appends a transaction to the batch, where the context is held so that
+// another BFM call does not collect the batch in the middle of it.
+static int bfm_batch_push( BfmBatch_t    batch
+                         , unsigned int  write
+                         , unsigned int  bt
+                         , unsigned int  addr
+                         , unsigned int *data
+                         , unsigned int  size
+                         , unsigned int  length)
+{
+   int ret;
+   if (batch==NULL) return -1;
+   bfm_batch_enter(batch);
+   ret = bfm_batch_queue(batch, write, bt, addr, data, size, length);
+   bfm_leave(batch->ctx);
+   return ret;
+}
+
+//------------------------------------------------------------------------------
+// It queues 'length' incremental write transactions.
+// Note that 'data[]' is copied, so it can be reused right after.
+//
+// Return <0 on failure, 0 on success.
+int BfmBatchWrite( BfmBatch_t    batch
+                 , unsigned int  addr
+                 , unsigned int *data // pointer to the array of justified data
+                 , unsigned int  size // num of bytes in an item
+                 , unsigned int  length)
+{
+   return bfm_batch_push(batch, 1, 1, addr, data, size, length);
+}
+
+//------------------------------------------------------------------------------
+// It queues 'length' incremental read transactions.
+// Note that 'data[]' is filled by BfmBatchFlush().
+//
+// Return <0 on failure, 0 on success.
+int BfmBatchRead( BfmBatch_t    batch
+                , unsigned int  addr
+                , unsigned int *data // pointer to the array of justified data
+                , unsigned int  size // num of bytes in an item
+                , unsigned int  length)
+{
+   return bfm_batch_push(batch, 0, 1, addr, data, size, length);
+}
+
+//------------------------------------------------------------------------------
+// It queues 'length' fixed-address write transactions, e.g., to FIFO,
+// which are split into bursts of BFM_FIX_LENGTH_MAX beats at most,
+// since AMBA AXI limits fixed burst to 16 beats.
+//
+// Return <0 on failure, 0 on success.
+int BfmBatchWriteFix( BfmBatch_t    batch
+                    , unsigned int  addr
+                    , unsigned int *data // pointer to the array of justified data
+                    , unsigned int  size // num of bytes in an item
+                    , unsigned int  length)
+{
+   unsigned int num;
+   if ((batch==NULL)||(data==NULL)||(length==0)) return -1;
+   for (; length>0; length -= num, data += num) {
+        num = (length>BFM_FIX_LENGTH_MAX) ? BFM_FIX_LENGTH_MAX : length;
+        if (bfm_batch_push(batch, 1, 0, addr, data, size, num)) return -1;
+   }
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// It queues 'length' fixed-address read transactions, e.g., from FIFO,
+// which are split into bursts of BFM_FIX_LENGTH_MAX beats at most.
+//
+// Return <0 on failure, 0 on success.
+int BfmBatchReadFix( BfmBatch_t    batch
+                   , unsigned int  addr
+                   , unsigned int *data // pointer to the array of justified data
+                   , unsigned int  size // num of bytes in an item
+                   , unsigned int  length)
+{
+   unsigned int num;
+   if ((batch==NULL)||(data==NULL)||(length==0)) return -1;
+   for (; length>0; length -= num, data += num) {
+        num = (length>BFM_FIX_LENGTH_MAX) ? BFM_FIX_LENGTH_MAX : length;
+        if (bfm_batch_push(batch, 0, 0, addr, data, size, num)) return -1;
+   }
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// Scatter-gather transactions.
+//
+// BfmTransactV() carries out 'num' transactions described by 'descs' through
+// a batch, i.e., with as few conStreamWrite()/conStreamRead() as possible,
+// where all of them share 'data' of 'words' words; i.e., write data of
+// 'descs[i]' are taken from and its read data are stored to
+// 'data[descs[i].offset]' onwards. 'status' of each descriptor tells
+// whether it has been carried out.
+// An incremental descriptor is split into bursts of up to the burst limit
+// that do not cross 4KB boundary and a fixed one into bursts of
+// BFM_FIX_LENGTH_MAX beats, while a wrap one goes as it is, which should be
+// of 2, 4, 8 or 16 beats from an address aligned to the size.
+//------------------------------------------------------------------------------
+// It marks descriptors from 'from' up to 'to' (exclusive) failed.
+static void bfm_desc_fail( BfmDesc_t    *descs
+                         , unsigned int  from
+                         , unsigned int  to
+                         , int          *failed )
+{
+   for (; from<to; from++) {
+        if (descs[from].status==0) {
+            descs[from].status = -1;
+            (*failed)++;
+        }
+   }
+}
+
+// It flushes the batch before it gets full, so that the batch does not
+// flush by itself in the middle of descriptors;
+// 'mark' is the first descriptor since the last flush.
+static int bfm_transactv_push( BfmBatch_t    batch
+                             , BfmDesc_t    *descs
+                             , unsigned int *mark
+                             , unsigned int  idx
+                             , int           queued // 1 when part of 'idx' is queued
+                             , int          *failed
+                             , unsigned int  write
+                             , unsigned int  bt
+                             , unsigned int  addr
+                             , unsigned int *data
+                             , unsigned int  size
+                             , unsigned int  length )
+{
+   unsigned int need=4+((write) ? length : 0);
+   if (((batch->wnum+need)>batch->wmax)||
+       ((!write)&&(batch->rnum>0)&&((batch->rnum+length)>=batch->depth))) {
+       if (BfmBatchFlush(batch)) bfm_desc_fail(descs, *mark, idx+queued, failed);
+       *mark = idx;
+   }
+   if (bfm_batch_push(batch, write, bt, addr, data, size, length)) {
+       // the whole queue is gone when it failed to flush by itself
+       if ((batch->wnum==0)&&(batch->rnum==0)) {
+           bfm_desc_fail(descs, *mark, idx+1, failed);
+           *mark = idx+1;
+       } else {
+           bfm_desc_fail(descs, idx, idx+1, failed);
+       }
+       return -1;
+   }
+   // flushed by itself since read data reached depth
+   if ((batch->wnum==0)&&(batch->rnum==0)) *mark = idx+1;
+   return 0;
+}
+
+//------------------------------------------------------------------------------
+// Return <0 on failure, otherwise num of descriptors failed.
+int BfmTransactV( con_Handle_t  handle
+                , BfmDesc_t    *descs
+                , unsigned int  num
+                , unsigned int *data // shared data, which are justified
+                , unsigned int  words) // num of words of 'data'
+{
+   BfmBatch_t batch;
+   unsigned int idx, pos, len, max, room, addr, mark=0;
+   int failed=0;
+   if ((handle==NULL)||((num>0)&&((descs==NULL)||(data==NULL)))) return -1;
+   batch = BfmBatchOpen(handle, 0, 0);
+   if (batch==NULL) return -1;
+   for (idx=0; idx<num; idx++) {
+        BfmDesc_t *desc=&descs[idx];
+        desc->status = 0;
+        if ((desc->length==0)||(desc->offset>words)||(desc->length>(words-desc->offset))) {
+            printf("%s() descriptor %d out of data\n", __FUNCTION__, idx);
+            bfm_desc_fail(descs, idx, idx+1, &failed);
+            continue;
+        }
+        if (desc->burst>2) {
+            printf("%s() descriptor %d of unknown burst type %d\n", __FUNCTION__, idx, desc->burst);
+            bfm_desc_fail(descs, idx, idx+1, &failed);
+            continue;
+        }
+        // fixed burst is limited to BFM_FIX_LENGTH_MAX beats, incremental one
+        // to the burst limit of the handle and 4KB boundary,
+        // while wrap one is checked as it is
+        max = (desc->burst==0) ? BFM_FIX_LENGTH_MAX
+            : (desc->burst==1) ? batch->ctx->info.burst_max : desc->length;
+        for (pos=0; pos<desc->length; pos += len) {
+             addr = desc->addr+((desc->burst==1) ? pos*desc->size : 0);
+             len  = desc->length-pos;
+             if (len>max) len = max;
+             if (desc->burst==1) {
+                 room = (BFM_BOUNDARY-(addr%BFM_BOUNDARY))/desc->size;
+                 if ((room>0)&&(len>room)) len = room; // mis-aligned one fails
+             }
+             if (bfm_transactv_push(batch, descs, &mark, idx, pos>0, &failed
+                                   , desc->write, desc->burst, addr
+                                   , data+desc->offset+pos, desc->size, len)) break;
+        }
+   }
+   if (BfmBatchFlush(batch)) bfm_desc_fail(descs, mark, num, &failed);
+   BfmBatchClose(batch);
+   return failed;
 }
 
 //------------------------------------------------------------------------------
@@ -395,6 +1552,20 @@ int BfmSetAmbaAxi4( con_Handle_t handle )
 //------------------------------------------------------------------------------
 // Revision History
 //
+// 2026.10.18: BfmStatsGet/Clear() only for handles with context
+// 2026.10.18: BfmInit/BfmRelease() added and failed GPIN at the first use kept
+// 2026.10.18: BfmTransactV splits at 4KB boundary and checks wrap bursts
+// 2026.10.18: BfmContextSet() added
+// 2026.10.18: Batch depth limited to F2U fifo depth from conGetMasterInfo()
+// 2026.10.18: Reads issued by a batch are collected by other BFM calls before going
+// 2026.10.18: Burst limit and 4KB boundary checked for single transactions as well
+// 2026.10.18: Bfm*Status(), BfmRecover/SetRecovery/ErrorMsg added
+// 2026.10.18: Per-handle context replaced 'amba_axi4' and the table of counters
+// 2026.10.18: BfmTransactV added
+// 2026.10.18: BfmBatchWriteFix/ReadFix split into bursts of 16 beats
+// 2026.10.18: BfmStatsEnable/Get/Clear added
+// 2026.10.18: BfmBatchIssue/Collect added
+// 2026.10.18: BfmBatchOpen/Write/Read/WriteFix/ReadFix/Flush/Close added
 // 2019.02.07: Each API has new arguemnt 'con_Handle_t handle'.
 // 2019.02.07: 'extern con_Handle_t handle' removed
 // 2018.06.25: Error handling for mis-aligned case
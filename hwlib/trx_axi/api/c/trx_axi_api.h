@@ -51,12 +51,137 @@ CONFMC_API int BfmGpout( con_Handle_t handle
 CONFMC_API int BfmGpin ( con_Handle_t handle
                        , unsigned int *pValue );
 CONFMC_API int BfmSetAmbaAxi4( con_Handle_t handle );
+
+typedef struct _BfmBatch *BfmBatch_t;
+CONFMC_API BfmBatch_t BfmBatchOpen( con_Handle_t handle
+                                  , unsigned int words
+                                  , unsigned int depth );
+CONFMC_API void BfmBatchClose( BfmBatch_t batch );
+CONFMC_API int  BfmBatchFlush( BfmBatch_t batch );
+CONFMC_API int  BfmBatchIssue( BfmBatch_t batch );
+CONFMC_API int  BfmBatchCollect( BfmBatch_t batch );
+CONFMC_API int  BfmBatchWrite( BfmBatch_t    batch
+                             , unsigned int  addr
+                             , unsigned int *data
+                             , unsigned int  size
+                             , unsigned int  length);
+CONFMC_API int  BfmBatchRead ( BfmBatch_t    batch
+                             , unsigned int  addr
+                             , unsigned int *data
+                             , unsigned int  size
+                             , unsigned int  length);
+CONFMC_API int  BfmBatchWriteFix( BfmBatch_t    batch
+                                , unsigned int  addr
+                                , unsigned int *data
+                                , unsigned int  size
+                                , unsigned int  length);
+CONFMC_API int  BfmBatchReadFix ( BfmBatch_t    batch
+                                , unsigned int  addr
+                                , unsigned int *data
+                                , unsigned int  size
+                                , unsigned int  length);
+typedef struct _BfmDesc {
+        unsigned int   addr; // starting address
+        unsigned int   offset; // index of the first item in the shared data
+        unsigned short length; // burst length
+        unsigned char  size; // num of bytes of an item: 1, 2 or 4
+        unsigned char  write; // 1 for write, 0 for read
+        unsigned char  burst; // burst type: 0 for fixed, 1 for incremental, 2 for wrap
+                              // of 2, 4, 8 or 16 beats aligned to 'size'
+        unsigned char  rsvd[3];
+        int            status; // 0 on success, <0 on failure
+} BfmDesc_t;
+CONFMC_API int  BfmTransactV( con_Handle_t  handle
+                            , BfmDesc_t    *descs
+                            , unsigned int  num
+                            , unsigned int *data
+                            , unsigned int  words);
+typedef struct _BfmStats {
+        unsigned long long writes; // num of bulk-out transfers
+        unsigned long long reads; // num of bulk-in transfers
+        unsigned long long words_out;
+        unsigned long long words_in;
+        unsigned long long partial_writes; // transfers moved less than asked
+        unsigned long long partial_reads;
+        unsigned long long zlps;
+        unsigned long long errors;
+        unsigned long long recoveries; // num of times brought back in sync
+        unsigned long long retries; // num of reads tried again
+} BfmStats_t;
+CONFMC_API int BfmStatsEnable( int enable );
+CONFMC_API int BfmStatsGet( con_Handle_t  handle
+                          , BfmStats_t   *stats );
+CONFMC_API int BfmStatsClear( con_Handle_t handle );
+#define BFM_BUS_AHB   1
+#define BFM_BUS_AXI3  3
+#define BFM_BUS_AXI4  4
+typedef struct _BfmContext {
+        unsigned int bus; // BFM_BUS_AXI3 or BFM_BUS_AXI4
+        unsigned int width; // num of bytes of data bus
+        unsigned int burst_max; // max burst length
+        unsigned int gpin; // GPIN that tells them, 0 until found
+        unsigned int depth_u2f; // num of words of U2F fifo of the transactor
+        unsigned int depth_f2u; // num of words of F2U fifo of the transactor
+} BfmContext_t;
+CONFMC_API int BfmContextGet( con_Handle_t  handle
+                            , BfmContext_t *info );
+CONFMC_API int BfmContextSet( con_Handle_t        handle
+                            , const BfmContext_t *info );
+CONFMC_API int BfmContextRelease( con_Handle_t handle );
+CONFMC_API con_Handle_t BfmInit( unsigned int con_cid
+                               , unsigned int con_mode
+                               , unsigned int conapi_log_level );
+CONFMC_API int BfmRelease( con_Handle_t handle );
+CONFMC_API int BfmWriteStatus( con_Handle_t  handle
+                             , unsigned int  addr
+                             , unsigned int *data
+                             , unsigned int  size
+                             , unsigned int  length);
+CONFMC_API int BfmReadStatus( con_Handle_t  handle
+                            , unsigned int  addr
+                            , unsigned int *data
+                            , unsigned int  size
+                            , unsigned int  length);
+CONFMC_API int BfmWriteFixStatus( con_Handle_t  handle
+                                , unsigned int  addr
+                                , unsigned int *data
+                                , unsigned int  size
+                                , unsigned int  length);
+CONFMC_API int BfmReadFixStatus( con_Handle_t  handle
+                               , unsigned int  addr
+                               , unsigned int *data
+                               , unsigned int  size
+                               , unsigned int  length);
+#define BFM_OK           0
+#define BFM_ERR_PARAM   (-1) // invalid argument or handle
+#define BFM_ERR_WRITE   (-2) // bulk-out failed or moved less than asked
+#define BFM_ERR_READ    (-3) // bulk-in failed
+#define BFM_ERR_CMD     (-4) // internal access, i.e., GPOUT/GPIN, failed
+#define BFM_ERR_DESYNC  (-5) // stream out of frame; BfmRecover() to go on
+#define BFM_ERR_RECOVER (-6) // could not recover; conRelease()/conInit() to go on
+#define BFM_RECOVER_EP   0 // CON_EP_RESET and completing the frame
+#define BFM_RECOVER_TRX  1 // conReset() to reset the transactor as well
+#define BFM_RECOVER_FX3  2 // CON_FX3_RESET to warm-reset the FX3 as well
+CONFMC_API int BfmRecover( con_Handle_t handle
+                         , int          level );
+CONFMC_API int BfmSetRecovery( con_Handle_t handle
+                             , int          level
+                             , unsigned int retries );
+CONFMC_API const char *BfmErrorMsg( int status );
 #ifdef __cplusplus
 }
 #endif
 //------------------------------------------------------------------------------
 // Revision History
 //
+// 2026.10.18: BfmInit/BfmRelease added
+// 2026.10.18: BfmContextSet added
+// 2026.10.18: BfmWrite/Read/WriteFix/ReadFixStatus(), BfmRecover/SetRecovery/ErrorMsg added
+// 2026.10.18: BfmContextGet/Release added
+// 2026.10.18: BfmTransactV added
+// 2026.10.18: BfmStatsEnable/Get/Clear added
+// 2026.10.18: BfmBatchIssue/Collect added
+// 2026.10.18: BfmBatch*() added
 // 2018.02.07: Each API has new argument, con_Handle_t handle
 // 2018.06.12: BfmWriteFix/BfmReadFix added
 // 2018.05.01: Start by Ando Ki (adki@future-ds.com)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains asyncio interface for CON-FMC AMBA BFM (Python 3.5 or later).
+
+Each handle is served by its own worker thread, which carries out BFM calls
+through ctypes, which releases the GIL during the call, so that the event
+loop keeps running during USB transfers.
+Requests pending on a handle are taken together by the worker and pushed
+to a single BfmBatch, i.e., a single stream transfer, as long as they are
+BFM transactions; GPIO access goes in its order between them.
+
+    async def main():
+        async with AioHandle(confmc.pyconbfmaxi, hdl) as dev:
+            await dev.write(0x1000, [1, 2, 3, 4])
+            data = await dev.read(0x1000, length=4)
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC AMBA BFM asyncio interface"
+
+#-------------------------------------------------------------------------------
+import asyncio
+import ctypes
+import queue
+import threading
+
+#===============================================================================
+class AioHandle(object):
+    """
+    Awaitable BFM transactions on a CON-FMC handler.
+    A failed transaction raises IOError carrying the negative return value.
+    """
+    _STOP = object()
+
+    def __init__(self, bfm, con_handle, max_merge=256, loop=None):
+        """
+        :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+        :param con_handle: CON-FMC handler
+        :param max_merge: number of pending requests to merge at most
+        :param loop: event loop, None for the running loop
+        """
+        self.bfm        = bfm
+        self.con_handle = con_handle
+        self.max_merge  = max_merge
+        self.loop       = loop
+        self.merged     = 0 # num of requests carried in a merged transfer
+        self.transfers  = 0 # num of transfers carried out
+        self._queue     = queue.Queue()
+        self._thread    = threading.Thread(target=self._serve
+                                          ,name='confmc-aio-'+str(id(self)))
+        self._thread.daemon = True
+        self._thread.start()
+
+    #---------------------------------------------------------------------------
+    def _submit(self, kind, *args):
+        if self._thread is None:
+           raise ValueError("AioHandle closed")
+        loop = self.loop or asyncio.get_event_loop()
+        future = loop.create_future()
+        self._queue.put((kind, args, future, loop))
+        return future
+
+    def write(self, addr, data, size=4, length=None):
+        """
+        Incremental write.
+        :param data: list of justified items, buffer-protocol or ctypes object
+                     holding a 32-bit word for each item
+        :param length: number of items, None for all words of 'data'
+        :return: awaitable of None
+        """
+        if isinstance(data, (list, tuple)):
+           data = (ctypes.c_uint*len(data))(*data)
+        if length is None: length = memoryview(data).nbytes>>2
+        return self._submit('write', addr, data, size, length)
+
+    def read(self, addr, size=4, length=1):
+        """
+        Incremental read.
+        :return: awaitable of ctypes array of 'length' justified items
+        """
+        return self._submit('read', addr, size, length)
+
+    def write_block(self, addr, buf):
+        """
+        Write bytes from 'addr' with legal bursts as BfmWriteBlock().
+        :return: awaitable of None
+        """
+        return self._submit('write_block', addr, buf)
+
+    def read_block(self, addr, nbytes, buf=None):
+        """
+        Read bytes from 'addr' with legal bursts as BfmReadBlock().
+        :return: awaitable of the buffer, bytearray when 'buf' is None
+        """
+        return self._submit('read_block', addr, nbytes, buf)
+
+    def gpout(self, value):
+        """
+        :return: awaitable of None
+        """
+        return self._submit('gpout', value)
+
+    def gpin(self):
+        """
+        :return: awaitable of GPIN value
+        """
+        return self._submit('gpin')
+
+    #---------------------------------------------------------------------------
+    def close(self):
+        """
+        Stop the worker after pending requests are served.
+        """
+        if self._thread is None: return
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+
+    async def aclose(self):
+        thread = self._thread
+        if thread is None: return
+        self._thread = None
+        self._queue.put(self._STOP)
+        await (self.loop or asyncio.get_event_loop()).run_in_executor(None, thread.join)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, tb):
+        await self.aclose()
+
+    #---------------------------------------------------------------------------
+    # Followings run in the worker thread.
+    def _serve(self):
+        while True:
+            reqs = [self._queue.get()]
+            while (len(reqs)<self.max_merge) and (reqs[-1] is not self._STOP):
+                try:
+                    reqs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = reqs[-1] is self._STOP
+            if stop: reqs.pop()
+            self._execute(reqs)
+            if stop: return
+
+    def _execute(self, reqs):
+        """
+        Carry out requests in order, where consecutive BFM transactions
+        go together in a batch.
+        """
+        bfm, hdl = self.bfm, self.con_handle
+        pending  = [] # requests pushed to the batch and their results
+        batch    = None
+        try:
+            for kind, args, future, loop in reqs:
+                try:
+                    if kind in ('write', 'read', 'write_block'):
+                       if batch is None: batch = bfm.BfmBatch(hdl)
+                       if kind=='write':
+                          ret, value = batch.write(*args), None
+                       elif kind=='read':
+                          addr, size, length = args
+                          value = (ctypes.c_uint*length)()
+                          ret   = batch.read(addr, value, size, length)
+                       else:
+                          ret, value = bfm.BfmWriteBlock(hdl, args[0], args[1], batch), None
+                       if ret: self._resolve(future, loop, None, ret)
+                       else:   pending.append((future, loop, value))
+                       continue
+                    self._flush(batch, pending)
+                    pending = []
+                    if kind=='read_block':
+                       buf = bfm.BfmReadBlock(hdl, *args)
+                       self._resolve(future, loop, buf, -1 if buf is None else 0)
+                    elif kind=='gpout':
+                       self._resolve(future, loop, None, bfm.BfmGpout(hdl, args[0]))
+                    elif kind=='gpin':
+                       value = ctypes.c_uint(0)
+                       ret   = bfm.BfmGpin(hdl, ctypes.byref(value))
+                       self._resolve(future, loop, value.value, ret)
+                except Exception as error: # e.g., invalid buffer, which fails the request only
+                    loop.call_soon_threadsafe(self._set_exception, future, error)
+            self._flush(batch, pending)
+        finally:
+            if batch is not None: batch.close()
+
+    def _flush(self, batch, pending):
+        if not pending: return
+        try:
+            ret = batch.flush()
+        except Exception as error:
+            for future, loop, value in pending:
+                loop.call_soon_threadsafe(self._set_exception, future, error)
+            return
+        self.transfers += 1
+        if len(pending)>1: self.merged += len(pending)
+        for future, loop, value in pending:
+            self._resolve(future, loop, value, ret)
+
+    def _resolve(self, future, loop, value, ret):
+        if ret<0:
+           error = IOError(ret, "BFM transaction failed")
+           loop.call_soon_threadsafe(self._set_exception, future, error)
+        else:
+           loop.call_soon_threadsafe(self._set_result, future, value)
+
+    @staticmethod
+    def _set_result(future, value):
+        if not future.done(): future.set_result(value)
+
+    @staticmethod
+    def _set_exception(future, error):
+        if not future.done(): future.set_exception(error)
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Failure of a request does not fail others merged, and write length of buffer in words
+# 2026.10.18: Batch depth follows BfmGetReadDepth(), i.e., F2U fifo of the transactor
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,364 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains throughput and latency benchmark for CON-FMC Python
+interface, which sweeps BFM transactions as well as raw stream and GPIO.
+Results are reported as JSON, in which latency is in micro-second.
+
+    $ python -m confmc.bench -b axi -c 0 -o result.json
+    $ CONFMC_EMU=1 python -m confmc.bench -b ahb # without CON-FMC card
+    $ python -m confmc.bench -b ahb -p usb2      # emulated USB 2.0 link
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC benchmark"
+
+#-------------------------------------------------------------------------------
+import os
+import sys
+import math
+import json
+import time
+import ctypes
+import platform
+import importlib
+import timeit
+
+#===============================================================================
+def bfm_module(bfm_type):
+    """
+    Import BFM module.
+    :param bfm_type: 'axi' or 'ahb'
+    :return: module of confmc.pyconbfmaxi or confmc.pyconbfmahb
+    """
+    return importlib.import_module('confmc.pyconbfm'+bfm_type)
+
+#-------------------------------------------------------------------------------
+def _per_call(func, count):
+    """
+    Return average duration of 'func()' in nano-second.
+    """
+    timer = timeit.default_timer
+    start = timer()
+    for idx in range(count):
+        func()
+    return (timer()-start)*1.0E9/count
+
+#-------------------------------------------------------------------------------
+def bench_call_overhead(bfm, con_handle=None, count=100000):
+    """
+    Measure Python-side overhead of each BFM call before and after
+    prototypes are bound at load.
+    Without handle, it calls BfmGpin() with null value pointer, which returns
+    in the C side without USB transfer, so that only the binding is measured.
+    With handle, it also measures single-beat BfmRead().
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler or None
+    :param count: number of calls
+    :return: dictionary of nano-second per call
+    """
+    p_con_Handle = ctypes.POINTER(bfm.con_Handle)
+    p_uint       = ctypes.POINTER(ctypes.c_uint)
+    def gpin_rewrap():
+        func = bfm.wrap_function(bfm.conbfm, 'BfmGpin'
+                                       ,  ctypes.c_int
+                                       ,[ p_con_Handle, p_uint ])
+        return func(con_handle, None)
+    def gpin_prebound():
+        return bfm.BfmGpin(con_handle, None)
+    result = {}
+    result['gpin_rewrap_ns']   = _per_call(gpin_rewrap, count)
+    result['gpin_prebound_ns'] = _per_call(gpin_prebound, count)
+    if con_handle:
+        data  = (ctypes.c_uint*1)()
+        count = max(1, count//100)
+        def read_rewrap():
+            func = bfm.wrap_function(bfm.conbfm, 'BfmRead'
+                                           ,  None
+                                           ,[ p_con_Handle
+                                             ,ctypes.c_uint
+                                             ,p_uint
+                                             ,ctypes.c_uint
+                                             ,ctypes.c_uint ])
+            return func(con_handle, 0, data, 4, 1)
+        def read_prebound():
+            return bfm.BfmRead(con_handle, 0, data, 4, 1)
+        result['read_rewrap_ns']   = _per_call(read_rewrap, count)
+        result['read_prebound_ns'] = _per_call(read_prebound, count)
+    return result
+
+#-------------------------------------------------------------------------------
+def _percentile(samples, percent):
+    """
+    Return 'percent'-th percentile of sorted 'samples' by nearest rank.
+    """
+    if not samples: return 0.0
+    idx = int(math.ceil(percent*len(samples)/100.0))-1
+    return samples[min(len(samples)-1, max(0, idx))]
+
+def _timed(func, count, nbytes):
+    """
+    Call 'func()' 'count' times and return latency and throughput.
+    :param nbytes: number of bytes moved by each call
+    :return: dictionary of p50_us, p99_us, mean_us and mbps
+    """
+    timer   = timeit.default_timer
+    samples = []
+    for idx in range(count):
+        start = timer()
+        func()
+        samples.append(timer()-start)
+    total = sum(samples)
+    samples.sort()
+    return { 'count'  : count
+           , 'p50_us' : _percentile(samples, 50)*1.0E6
+           , 'p99_us' : _percentile(samples, 99)*1.0E6
+           , 'mean_us': total*1.0E6/count
+           , 'mbps'   : (nbytes*count/total/1.0E6) if total>0 else 0.0 }
+
+def _lengths(burst_max):
+    """
+    Return burst lengths to sweep, i.e., power of 2 up to 'burst_max'.
+    """
+    lengths = []
+    length  = 1
+    while length<burst_max:
+        lengths.append(length)
+        length *= 2
+    lengths.append(burst_max)
+    return lengths
+
+#-------------------------------------------------------------------------------
+def bench_bfm(bfm, con_handle, sizes=(1,2,4), lengths=None
+             , ops=('write','read','raw'), modes=('inc','fix'), count=100, addr=0):
+    """
+    Sweep BFM transactions.
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler
+    :param sizes: list of number of bytes of each beat
+    :param lengths: list of burst lengths, None for power of 2 up to the maximum
+    :param ops: list of 'write', 'read' and 'raw' (read-after-write)
+    :param modes: list of 'inc' and 'fix', where 'fix' goes to AMBA AXI only
+    :param count: number of transactions for each point
+    :param addr: address to access
+    :return: list of dictionary for each point
+    """
+    burst_max = bfm.BfmGetBurstMax(con_handle)
+    if lengths is None: lengths = _lengths(burst_max)
+    result = []
+    for mode in modes:
+        if mode=='fix':
+           if not hasattr(bfm, 'BfmWriteFix'): continue
+           write, read, limit = bfm.BfmWriteFix, bfm.BfmReadFix, 16 # AXI fixed burst
+        else:
+           write, read, limit = bfm.BfmWrite, bfm.BfmRead, burst_max
+        for size in sizes:
+            for length in lengths:
+                if length>limit: continue
+                data = (ctypes.c_uint*length)()
+                for op in ops:
+                    if op=='write':
+                       func   = lambda: write(con_handle, addr, data, size, length)
+                       nbytes = size*length
+                    elif op=='read':
+                       func   = lambda: read(con_handle, addr, data, size, length)
+                       nbytes = size*length
+                    else:
+                       def func():
+                           write(con_handle, addr, data, size, length)
+                           read(con_handle, addr, data, size, length)
+                       nbytes = 2*size*length
+                    point = { 'op': op, 'mode': mode, 'size': size, 'length': length }
+                    point.update(_timed(func, count, nbytes))
+                    result.append(point)
+    return result
+
+#-------------------------------------------------------------------------------
+def _frame(bfm, write, addr, length):
+    """
+    Return transactor frame for 4-byte incrementing burst as a list of words,
+    which carries command, address and control-flit for data.
+    """
+    if bfm._con_bfm_type=='axi':
+       cmd = ((write&0x1)<<30)|(2<<25)|(1<<23)|(1<<12)|((length-1)&0xFFF)
+    else:
+       cmd = ((write&0x1)<<30)|(2<<26)|(1<<23)|((length-1)&0xFFF)
+    return [ (2<<16)|(0x2<<12), cmd, addr
+           , (length<<16)|(((0x4) if write else (0x5))<<12) ]
+
+def _stream_write(bfm, con_handle, buf, num):
+    done = ctypes.c_uint(0)
+    pkt  = con_handle.contents.usb.bulk_max_pkt_size_out
+    base = ctypes.addressof(buf)
+    while num>0:
+        zlp = 0 if (num*4)%pkt else 1
+        if bfm._conStreamWrite(con_handle, base, num, ctypes.byref(done), zlp): return -1
+        num  -= done.value
+        base += done.value*4
+    return 0
+
+def _stream_read(bfm, con_handle, buf, num):
+    done = ctypes.c_uint(0)
+    base = ctypes.addressof(buf)
+    while num>0:
+        if bfm._conStreamRead(con_handle, base, num, ctypes.byref(done)): return -1
+        num  -= done.value
+        base += done.value*4
+    return 0
+
+def bench_stream(bfm, con_handle, lengths=None, frames=64, count=20, addr=0):
+    """
+    Time raw conStreamWrite()/conStreamRead() with well-formed transactor frames.
+    - 'write': 'frames' burst writes in a single stream
+    - 'read' : 'frames' burst read requests and stream of read data back
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler
+    :param lengths: list of burst lengths, None for power of 2 up to the maximum
+    :param frames: number of bursts in a stream
+    :param count: number of streams for each point
+    :param addr: address to access
+    :return: list of dictionary for each point, where MB/s counts data only
+    """
+    burst_max = bfm.BfmGetBurstMax(con_handle)
+    if lengths is None: lengths = _lengths(burst_max)
+    result = []
+    for length in lengths:
+        words = []
+        for idx in range(frames):
+            words.extend(_frame(bfm, 1, addr+4*length*idx, length))
+            words.extend(range(length))
+        wbuf = (ctypes.c_uint*len(words))(*words)
+        words = []
+        for idx in range(frames):
+            words.extend(_frame(bfm, 0, addr+4*length*idx, length))
+        qbuf = (ctypes.c_uint*len(words))(*words)
+        rbuf = (ctypes.c_uint*(frames*length))()
+        def write():
+            _stream_write(bfm, con_handle, wbuf, len(wbuf))
+        def read():
+            _stream_write(bfm, con_handle, qbuf, len(qbuf))
+            _stream_read(bfm, con_handle, rbuf, len(rbuf))
+        for op, func in (('write', write), ('read', read)):
+            point = { 'op': op, 'length': length, 'frames': frames }
+            point.update(_timed(func, count, 4*length*frames))
+            result.append(point)
+    return result
+
+#-------------------------------------------------------------------------------
+def bench_gpio(bfm, con_handle, count=1000):
+    """
+    Time BfmGpout() followed by BfmGpin() round trip.
+    :return: dictionary of latency
+    """
+    value = ctypes.c_uint(0)
+    def func():
+        bfm.BfmGpout(con_handle, 0x5A5A)
+        bfm.BfmGpin(con_handle, ctypes.byref(value))
+    return _timed(func, count, 0)
+
+#-------------------------------------------------------------------------------
+def run(bfm, con_handle, count=100, quick=False):
+    """
+    Run all benchmarks.
+    :param quick: sweep 4-byte incrementing bursts only when True
+    :return: dictionary to be reported as JSON
+    """
+    usb = con_handle.contents.usb
+    report = { 'date'    : time.strftime('%Y-%m-%dT%H:%M:%S')
+             , 'host'    : platform.node()
+             , 'python'  : platform.python_version()
+             , 'bfm'     : bfm._con_bfm_type
+             , 'emulated': bool(getattr(bfm, '_con_emu', ''))
+             , 'usb'     : { 'speed'                : usb.speed
+                           , 'bulk_max_pkt_size_out': usb.bulk_max_pkt_size_out
+                           , 'bulk_max_pkt_size_in' : usb.bulk_max_pkt_size_in }
+             , 'burst_max': bfm.BfmGetBurstMax(con_handle) }
+    emulated = report['emulated']
+    if emulated: bfm.conEmuClearStats(con_handle)
+    report['call_overhead'] = bench_call_overhead(bfm, con_handle, 100*count)
+    if quick:
+       report['sweep'] = bench_bfm(bfm, con_handle, sizes=(4,), modes=('inc',), count=count)
+    else:
+       report['sweep'] = bench_bfm(bfm, con_handle, count=count)
+    report['stream'] = bench_stream(bfm, con_handle, count=max(1, count//5))
+    report['gpio']   = bench_gpio(bfm, con_handle, 10*count)
+    if emulated:
+       link  = bfm.con_EmuLink()
+       stats = bfm.con_EmuStats()
+       bfm.conEmuGetLink(con_handle, ctypes.byref(link))
+       bfm.conEmuGetStats(con_handle, ctypes.byref(stats))
+       report['emu'] = { 'profile': os.environ.get('CONFMC_EMU')
+                       , 'latency_ns': link.latency_ns
+                       , 'bandwidth': link.bandwidth
+                       , 'realtime': link.realtime
+                       , 'stats': stats.to_dict() }
+    return report
+
+#-------------------------------------------------------------------------------
+def main(argv):
+    import getopt
+    #----------------------------------------
+    cid   = 0
+    btype = 'axi'
+    count = 100
+    quick = False
+    ofile = None
+    usage = 'bench.py [-b axi|ahb] [-c cid] [-n count] [-e] [-p none|usb2|usb3] [-q] [-o file.json]'
+    try:
+        opts, args = getopt.getopt(argv, "hb:c:n:ep:qo:",['help','bfm=','cid=','count='
+                                                        ,'emu','profile=','quick','output='])
+    except getopt.GetoptError:
+        print(usage)
+        sys.exit(2)
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+             print(usage)
+             sys.exit()
+        elif opt in ("-b", "--bfm"):
+             btype = arg
+        elif opt in ("-c", "--cid"):
+             cid = int(arg)
+        elif opt in ("-n", "--count"):
+             count = int(arg)
+        elif opt in ("-e", "--emu"):
+             os.environ.setdefault('CONFMC_EMU', 'none') # should be set before loading BFM
+        elif opt in ("-p", "--profile"):
+             os.environ['CONFMC_EMU'] = arg # emulator with link profile
+        elif opt in ("-q", "--quick"):
+             quick = True
+        elif opt in ("-o", "--output"):
+             ofile = arg
+    #----------------------------------------
+    bfm = bfm_module(btype)
+    hdl = bfm.conInit(cid)
+    if not hdl:
+       print(bfm.conErrorMsgConapi(bfm.conGetErrorConapi())+' for CID: '+str(cid))
+       sys.exit(1)
+    if btype=='axi': bfm.BfmSetAmbaAxi4(hdl)
+    report = run(bfm, hdl, count, quick)
+    bfm.conRelease(hdl)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if ofile:
+       with open(ofile, 'w') as fd: fd.write(text+'\n')
+    else:
+       print(text)
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main(sys.argv[1:])
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Emulator link profile and statistics reported
+# 2026.10.18: Sweeps of BFM, raw stream and GPIO with JSON report
+# 2026.10.18: Started with per-call overhead benchmark
+#===============================================================================
@@ -0,0 +1,574 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains client of CON-FMC BFM server, i.e., confmc.confmcd.
+
+connect() returns a client, which has the same BFM calls as
+confmc.pyconbfmaxi and confmc.pyconbfmahb, so that it can be used as
+'bfm' of other modules, e.g., confmc.memtest, confmc.fifo and confmc.regmap.
+
+BfmWrite() and BfmWriteFix() return without waiting for the server,
+i.e., posted, where failures of them are counted and returned by sync().
+BfmRead() and BfmReadFix() raise confmc.errors.BfmError on failure, while
+Bfm*Status() return the status of the server. Other calls wait for their results, while queued BfmBatch and BfmPipe
+go to the server as a single request and as pipelined requests respectively.
+Bulk payloads go through shared memory when the server is on the same host.
+
+    bfm = confmc.client.connect('/tmp/confmcd.sock')
+    hdl = bfm.conInit(0)
+    bfm.BfmWrite(hdl, 0x0, wdata, 4, 16)
+    bfm.BfmRead(hdl, 0x0, rdata, 4, 16)
+    bfm.conRelease(hdl)
+    bfm.close()
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC BFM client"
+
+#-------------------------------------------------------------------------------
+import os
+import ctypes
+import json
+import socket
+import struct
+import tempfile
+import threading
+import numpy
+from confmc import confmcd
+from confmc import errors
+from confmc.confmcd import REQ, RSP, SUB, FLAG_SHM_IN, FLAG_SHM_OUT, SHM_MIN
+
+BFM_BUS_AHB  = 1
+BFM_BUS_AXI3 = 3
+BFM_BUS_AXI4 = 4
+
+_ctypes_data = (ctypes.Array, ctypes._Pointer, type(ctypes.byref(ctypes.c_uint())))
+
+#-------------------------------------------------------------------------------
+def _view(pdata, nbytes, writable):
+    """
+    Return numpy.uint8 array on the memory of 'pdata' without copying,
+    where 'pdata' is ctypes object or buffer-protocol object.
+    Read-only object is copied when 'writable' is False.
+    :param nbytes: number of bytes, None for all of 'pdata'
+    """
+    if isinstance(pdata, numpy.ndarray):
+       if not pdata.flags['C_CONTIGUOUS']:
+          raise ValueError("buffer should be contiguous")
+       data = pdata.reshape(-1).view(numpy.uint8)
+    elif isinstance(pdata, _ctypes_data):
+       size = ctypes.sizeof(pdata) if nbytes is None else nbytes
+       address = ctypes.cast(pdata, ctypes.c_void_p).value
+       data = numpy.ctypeslib.as_array((ctypes.c_ubyte*size).from_address(address))
+    else:
+       try:
+           data = numpy.ctypeslib.as_array((ctypes.c_ubyte*_buffer_nbytes(pdata))
+                                          .from_buffer(pdata))
+       except TypeError:
+           if writable: raise
+           data = numpy.frombuffer(pdata, dtype=numpy.uint8)
+    if (nbytes is not None) and len(data)<nbytes:
+       raise ValueError("buffer too small (%d bytes instead of at least %d bytes)" % (len(data), nbytes))
+    return data[:nbytes]
+
+def _buffer_nbytes(buf):
+    try:
+        return memoryview(buf).nbytes
+    except (TypeError, AttributeError): # Python 2 old-style buffer
+        return len(buffer(buf))
+
+#===============================================================================
+class Handle(object):
+    """
+    CON-FMC handler of the server, which is passed to BFM calls of the client.
+    """
+    def __init__(self, cid):
+        self.cid = cid
+
+    def __repr__(self):
+        return 'Handle(%d)' % self.cid
+
+class BfmContext(object):
+    """
+    Context of the handler, see confmc.pyconbfmaxi.BfmContext.
+    """
+    _fields_ = ('bus', 'width', 'burst_max', 'gpin', 'depth_u2f', 'depth_f2u')
+    def __init__(self, bus, width, burst_max, gpin, depth_u2f, depth_f2u):
+        self.bus       = bus
+        self.width     = width
+        self.burst_max = burst_max
+        self.gpin      = gpin
+        self.depth_u2f = depth_u2f
+        self.depth_f2u = depth_f2u
+
+    def to_dict(self):
+        return dict((name, getattr(self, name)) for name in self._fields_)
+
+#===============================================================================
+class Client(object):
+    """
+    Connection to the server, which carries BFM calls of all handlers.
+    """
+    def __init__(self, address=confmcd.DEFAULT_ADDRESS, shm_size=4*1024*1024, max_posted=1024):
+        """
+        :param address: path of Unix domain socket, or 'host:port' for TCP
+        :param shm_size: bytes of shared memory, 0 not to use it
+        :param max_posted: number of posted writes not acknowledged yet at most
+        """
+        family, addr = confmcd.parse_address(address)
+        self.address    = address
+        self.max_posted = max_posted
+        self.errors     = 0 # num of posted writes failed since sync()
+        self._sock      = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.connect(addr)
+        if family==socket.AF_INET:
+           self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._lock   = threading.RLock()
+        self._seq    = 0
+        self._posted = set() # seq of posted requests
+        self._stash  = {} # seq -> (status, payload) received before waited
+        self._shm    = None
+        status, payload = self._call(confmcd.OP_HELLO, 0)
+        info = json.loads(payload.tobytes().decode('utf-8'))
+        self._con_bfm_type     = info['bfm']
+        self._burst_boundary   = info['burst_boundary']
+        self.server            = info
+        if shm_size: self._attach(shm_size)
+
+    def _attach(self, size):
+        if (self._sock.family!=socket.AF_UNIX) or not os.path.isdir(confmcd.SHM_DIR):
+           return False # the server attaches files in SHM_DIR of Unix domain socket peers only
+        fd, path = tempfile.mkstemp(prefix='confmc-', dir=confmcd.SHM_DIR)
+        try:
+            os.ftruncate(fd, size)
+            shm = confmcd.attach(path, size)
+            status, payload = self._call(confmcd.OP_ATTACH, 0, (size, 0, 0), path.encode('utf-8'))
+            if status==0: self._shm = shm # otherwise, the server is on other host or user
+        finally:
+            os.close(fd)
+            os.unlink(path) # kept while mapped by both
+        return self._shm is not None
+
+    #---------------------------------------------------------------------------
+    def _send(self, op, cid, args=(0, 0, 0), payload=None, flags=0):
+        """
+        :return: sequence number of the request
+        """
+        seq = self._seq
+        self._seq = (seq+1)&0xFFFFFFFF
+        nbytes = 0 if payload is None else len(payload)
+        if (self._shm is not None) and SHM_MIN<=nbytes<=len(self._shm):
+           self._shm[:nbytes] = payload if isinstance(payload, numpy.ndarray)\
+                                else numpy.frombuffer(payload, dtype=numpy.uint8)
+           payload, flags = None, flags|FLAG_SHM_IN
+        confmcd.send_frame(self._sock, REQ.pack(nbytes, seq, op, cid, flags, *args), payload)
+        return seq
+
+    def _receive(self):
+        """
+        Receive a response, where failures of posted ones are counted.
+        :return: (seq, status, payload of numpy.uint8 array, posted or not)
+        """
+        header = confmcd.recv_exact(self._sock, RSP.size)
+        if header is None: raise IOError("confmcd closed the connection")
+        nbytes, seq, status, flags = RSP.unpack(bytes(header))
+        if flags&FLAG_SHM_IN:
+           payload = self._shm[:nbytes]
+        else:
+           payload = confmcd.recv_exact(self._sock, nbytes) if nbytes else bytearray()
+           if payload is None: raise IOError("confmcd closed the connection")
+           payload = numpy.frombuffer(payload, dtype=numpy.uint8)
+        posted = seq in self._posted
+        if posted:
+           self._posted.discard(seq)
+           if status<0: self.errors += 1
+        return seq, status, payload, posted
+
+    def _wait(self, seq):
+        """
+        :return: (status, payload) of the request
+        """
+        while seq not in self._stash:
+            got, status, payload, posted = self._receive()
+            if got==seq: return status, payload
+            if not posted: self._stash[got] = (status, payload)
+        return self._stash.pop(seq)
+
+    def _call(self, op, cid, args=(0, 0, 0), payload=None, flags=0):
+        with self._lock:
+            return self._wait(self._send(op, cid, args, payload, flags))
+
+    def _post(self, op, cid, args, payload):
+        with self._lock:
+            while len(self._posted)>=self.max_posted: self._receive()
+            self._posted.add(self._send(op, cid, args, payload))
+
+    def sync(self):
+        """
+        Wait for all posted writes.
+        :return: number of posted writes failed since the last sync()
+        """
+        with self._lock:
+            while self._posted: self._receive()
+            errors, self.errors = self.errors, 0
+            return errors
+
+    def close(self):
+        if self._sock is None: return
+        try:
+            self.sync()
+        finally:
+            self._sock.close()
+            self._sock = None
+            self._shm  = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    #---------------------------------------------------------------------------
+    def conInit(self, con_cid=0, con_mode=0, conapi_log_level=0):
+        """
+        Get the card of the server, which is opened by the server when not yet.
+        :param con_cid: card id
+        :param con_mode: 0 only, i.e., command mode (CON_MODE_CMD)
+        :return: Handle, None on failure
+        """
+        if con_mode: return None
+        status, payload = self._call(confmcd.OP_OPEN, con_cid)
+        return Handle(con_cid) if status==0 else None
+
+    def conRelease(self, con_handle):
+        """
+        Wait for posted writes, while the card is kept by the server.
+        :return: 0 on success, otherwize negative value.
+        """
+        return -1 if self.sync() else 0
+
+    def conGetCid(self, con_handle):
+        return con_handle.cid
+
+    #---------------------------------------------------------------------------
+    def BfmWrite(self, con_handle, addr, pdata, size, length):
+        """
+        Generate AMBA write transaction, which is posted.
+        :return: void
+        """
+        self._post(confmcd.OP_WRITE, con_handle.cid, (addr, size, length)
+                  ,_view(pdata, length<<2, False))
+
+    def BfmRead(self, con_handle, addr, pdata, size, length):
+        """
+        Generate AMBA read transaction.
+        :return: void
+        :raise errors.BfmError: on failure
+        """
+        ret = self._read(confmcd.OP_READ, con_handle, addr, pdata, size, length)
+        if ret: raise errors.error(ret, 'BfmRead')
+
+    def BfmWriteFix(self, con_handle, addr, pdata, size, length):
+        """
+        Generate write transaction with fixed-address, which is posted.
+        :return: void
+        """
+        self._post(confmcd.OP_WRITE_FIX, con_handle.cid, (addr, size, length)
+                  ,_view(pdata, length<<2, False))
+
+    def BfmReadFix(self, con_handle, addr, pdata, size, length):
+        """
+        Generate read transaction with fixed-address.
+        :return: void
+        :raise errors.BfmError: on failure
+        """
+        ret = self._read(confmcd.OP_READ_FIX, con_handle, addr, pdata, size, length)
+        if ret: raise errors.error(ret, 'BfmReadFix')
+
+    def BfmWriteStatus(self, con_handle, addr, pdata, size, length):
+        """
+        Generate AMBA write transaction, which waits for the server.
+        :return: 0 on success, otherwize BFM_ERR_* (negative value).
+        """
+        return self._call(confmcd.OP_WRITE, con_handle.cid, (addr, size, length)
+                         ,_view(pdata, length<<2, False))[0]
+
+    def BfmReadStatus(self, con_handle, addr, pdata, size, length):
+        """
+        Generate AMBA read transaction.
+        :return: 0 on success, otherwize BFM_ERR_* (negative value).
+        """
+        return self._read(confmcd.OP_READ, con_handle, addr, pdata, size, length)
+
+    def BfmWriteFixStatus(self, con_handle, addr, pdata, size, length):
+        """
+        Generate write transaction with fixed-address, which waits for the server.
+        :return: 0 on success, otherwize BFM_ERR_* (negative value).
+        """
+        return self._call(confmcd.OP_WRITE_FIX, con_handle.cid, (addr, size, length)
+                         ,_view(pdata, length<<2, False))[0]
+
+    def BfmReadFixStatus(self, con_handle, addr, pdata, size, length):
+        """
+        Generate read transaction with fixed-address.
+        :return: 0 on success, otherwize BFM_ERR_* (negative value).
+        """
+        return self._read(confmcd.OP_READ_FIX, con_handle, addr, pdata, size, length)
+
+    def _read(self, op, con_handle, addr, pdata, size, length):
+        data = _view(pdata, length<<2, True)
+        status, payload = self._call(op, con_handle.cid, (addr, size, length), flags=FLAG_SHM_OUT)
+        if status==0: data[:] = payload[:length<<2]
+        return status
+
+    def BfmGpout(self, con_handle, value):
+        """
+        :return: 0 on success, otherwize negative value.
+        """
+        return self._call(confmcd.OP_GPOUT, con_handle.cid, (value, 0, 0))[0]
+
+    def BfmGpin(self, con_handle, pValue):
+        """
+        :param pValue: ctypes.c_uint or pointer to it to get the value
+        :return: 0 on success, otherwize negative value.
+        """
+        status, payload = self._call(confmcd.OP_GPIN, con_handle.cid)
+        if status==0:
+           _view(pValue, 4, True)[:] = payload[:4]
+        return status
+
+    def BfmSetAmbaAxi4(self, con_handle):
+        """
+        :return: the maximum number of burst length.
+        """
+        return self._call(confmcd.OP_SET_AXI4, con_handle.cid)[0]
+
+    def BfmGetBurstMax(self, con_handle):
+        """
+        :return: the maximum number of burst length, negative value on failure.
+        """
+        info = self.BfmContextGet(con_handle)
+        return -1 if info is None else info.burst_max
+
+    def BfmGetReadDepth(self, con_handle):
+        """
+        :return: F2U fifo depth of the transactor in words, negative value on failure.
+        """
+        info = self.BfmContextGet(con_handle)
+        return -1 if info is None else info.depth_f2u
+
+    def BfmContextGet(self, con_handle):
+        """
+        :return: BfmContext, None on failure
+        """
+        status, payload = self._call(confmcd.OP_CONTEXT, con_handle.cid)
+        if status: return None
+        return BfmContext(*struct.unpack('<IIIIII', payload[:24].tobytes()))
+
+    def BfmBatch(self, con_handle, words=0, depth=0):
+        """
+        Transaction queue, which goes to the server as a single request on
+        flush(), where the server pushes it along with others to the card.
+        :param words: not used
+        :param depth: not used
+        """
+        return _Batch(self, con_handle)
+
+    def BfmPipe(self, con_handle, depth=0, post=256):
+        """
+        Split-phase reads, which are pipelined to the server.
+        :param depth: number of reads in flight, 0 for 'max_posted'
+        :param post: not used
+        """
+        return _Pipe(self, con_handle, depth if depth else self.max_posted)
+
+    def BfmWriteBlock(self, con_handle, addr, buf, batch=None):
+        """
+        Write bytes to arbitrary byte range.
+        :param batch: BfmBatch of the client to queue into, which is flushed
+                      by the caller
+        :return: 0 on success, otherwize negative value.
+        """
+        data = _view(buf, None, False)
+        if batch is not None: return batch._push(confmcd.SUB_WRITE_BLOCK, addr, 1, len(data), data)
+        return self._call(confmcd.OP_WRITE_BLOCK, con_handle.cid, (addr, len(data), 0), data)[0]
+
+    def BfmReadBlock(self, con_handle, addr, nbytes, buf=None):
+        """
+        Read bytes from arbitrary byte range.
+        :return: 'buf' holding read data, None on failure.
+        """
+        if buf is None: buf = bytearray(nbytes)
+        data = _view(buf, nbytes, True)
+        status, payload = self._call(confmcd.OP_READ_BLOCK, con_handle.cid, (addr, nbytes, 0)
+                                    ,flags=FLAG_SHM_OUT)
+        if status: return None
+        data[:] = payload[:nbytes]
+        return buf
+
+    def BfmTransactV(self, con_handle, descs, data):
+        """
+        Carry out transactions described by 'descs', whose 'status' and
+        read data in 'data' are filled.
+        :return: number of descriptors failed, negative value on failure.
+        """
+        dview = _view(descs, None, True)
+        wview = _view(data, None, True)
+        if len(dview)%confmcd.BFM_DESC_BYTES:
+           raise ValueError("descs should be array of BfmDesc")
+        payload = numpy.concatenate((dview, wview))
+        status, payload = self._call(confmcd.OP_TRANSACTV, con_handle.cid
+                                    ,(len(dview)//confmcd.BFM_DESC_BYTES, len(wview)>>2, 0)
+                                    ,payload, FLAG_SHM_OUT)
+        if len(payload)==len(dview)+len(wview):
+           dview[:] = payload[:len(dview)]
+           wview[:] = payload[len(dview):]
+        return status
+
+#-------------------------------------------------------------------------------
+class _Batch(object):
+    """
+    Transaction queue of the client, see confmc.pyconbfmaxi.BfmBatch.
+    """
+    def __init__(self, client, con_handle):
+        self.client     = client
+        self.con_handle = con_handle
+        self._parts     = [] # SUB and write data
+        self._reads     = [] # (buffer view, word offset, length)
+        self._num       = 0
+        self._words     = 0
+
+    def _push(self, kind, addr, size, length, data=None):
+        self._parts.append(numpy.frombuffer(SUB.pack(addr, length, size, kind), dtype=numpy.uint8))
+        if data is not None: self._parts.append(numpy.array(data)) # copied right away
+        self._num += 1
+        return 0
+
+    def write(self, addr, pdata, size, length):
+        return self._push(confmcd.SUB_WRITE, addr, size, length, _view(pdata, length<<2, False))
+
+    def write_fix(self, addr, pdata, size, length):
+        return self._push(confmcd.SUB_WRITE_FIX, addr, size, length, _view(pdata, length<<2, False))
+
+    def read(self, addr, pdata, size, length):
+        self._reads.append((_view(pdata, length<<2, True), self._words, length))
+        self._words += length
+        return self._push(confmcd.SUB_READ, addr, size, length)
+
+    def read_fix(self, addr, pdata, size, length):
+        self._reads.append((_view(pdata, length<<2, True), self._words, length))
+        self._words += length
+        return self._push(confmcd.SUB_READ_FIX, addr, size, length)
+
+    def flush(self):
+        """
+        :return: 0 on success, otherwize negative value.
+        """
+        if not self._num: return 0
+        payload = numpy.concatenate(self._parts)
+        status, value = self.client._call(confmcd.OP_BATCH, self.con_handle.cid
+                                         ,(self._num, 0, 0), payload, FLAG_SHM_OUT)
+        if status==0:
+           for data, offset, length in self._reads:
+               data[:] = value[offset<<2:(offset+length)<<2]
+        self.close()
+        return status
+
+    def close(self):
+        self._parts = []
+        self._reads = []
+        self._num   = 0
+        self._words = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        try:
+            if exc_type is None: self.flush()
+        finally:
+            self.close()
+
+#-------------------------------------------------------------------------------
+class _Pipe(object):
+    """
+    Split-phase reads of the client, see confmc.pyconbfmaxi.BfmPipe.
+    """
+    def __init__(self, client, con_handle, depth):
+        self.client     = client
+        self.con_handle = con_handle
+        self.depth      = depth
+        self._ticket    = 0
+        self._flight    = {} # ticket -> seq of outstanding reads
+        self._done      = {} # ticket -> data of reads collected by itself
+        self._failed    = False
+
+    def issue_read(self, addr, size=4, length=1):
+        """
+        :return: ticket (0 or positive) on success, otherwize negative value.
+        """
+        if len(self._flight)>=self.depth: self._collect()
+        with self.client._lock:
+            seq = self.client._send(confmcd.OP_READ, self.con_handle.cid, (addr, size, length))
+        ticket = self._ticket
+        self._ticket += 1
+        self._flight[ticket] = seq
+        return ticket
+
+    def _collect(self):
+        with self.client._lock:
+            for ticket, seq in self._flight.items():
+                status, payload = self.client._wait(seq)
+                if status: self._failed = True
+                else: self._done[ticket] = numpy.array(payload).view(numpy.uint32)
+        self._flight = {}
+
+    def collect(self):
+        """
+        :return: dictionary of ticket and numpy array of justified items,
+                 None on failure.
+        """
+        self._collect()
+        done, failed = self._done, self._failed
+        self._done, self._failed = {}, False
+        return None if failed else done
+
+    @property
+    def outstanding(self):
+        return len(self._flight)+len(self._done)
+
+    def close(self):
+        if self._flight: self._collect()
+        self._done = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+#===============================================================================
+def connect(address=confmcd.DEFAULT_ADDRESS, **kwargs):
+    """
+    Connect to the server.
+    :param address: path of Unix domain socket, or 'host:port' for TCP
+    :return: Client
+    """
+    return Client(address, **kwargs)
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Shared memory only in /dev/shm over Unix domain socket
+# 2026.10.18: BfmGetReadDepth() from fifo depths in OP_CONTEXT
+# 2026.10.18: Bfm*Status() and errors.BfmError of reads
+# 2026.10.18: Started
+#===============================================================================
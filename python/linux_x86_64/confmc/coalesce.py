@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains host-side write coalescer for CON-FMC AMBA BFM.
+
+Narrow (1 or 2-byte) write carries each item in a full 32-bit word, one beat
+per item, and each write is usually a separate transaction.
+The coalescer keeps writes in host and merges contiguous or overlapping ones
+into aligned 32-bit bursts, which are pushed with a single batch on flush().
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC AMBA BFM write coalescer"
+
+#-------------------------------------------------------------------------------
+import ctypes
+
+#===============================================================================
+class BfmCoalescer(object):
+    """
+    Write coalescer on top of BFM module.
+
+    A partial word, i.e., a word some bytes of which are not written, goes
+    as 1 or 2-byte accesses, except when it is in the region marked by
+    mark_rmw_safe(), where it is read, merged and written as a full word.
+    Buffered writes are flushed when a read overlaps them, when the number
+    of buffered words reaches 'limit', and on flush().
+
+    with BfmCoalescer(confmc.pyconbfmaxi, hdl) as co:
+         for x in range(640): co.write(fb+x, pixel, 1, 1)
+    """
+    def __init__(self, bfm, con_handle, rmw_safe=(), limit=4096):
+        """
+        :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+        :param con_handle: CON-FMC handler
+        :param rmw_safe: list of (address, number of bytes) safe for read-modify-write
+        :param limit: number of buffered words to flush by itself
+        """
+        self.bfm        = bfm
+        self.con_handle = con_handle
+        self.limit      = limit
+        self._rmw_safe  = list(rmw_safe)
+        self._words     = {} # word address -> [value, byte-enable]
+        self._lo        = None # range of buffered bytes
+        self._hi        = None
+
+    def mark_rmw_safe(self, addr, nbytes):
+        """
+        Mark the region where read-modify-write does not have side effect.
+        """
+        self._rmw_safe.append((addr, nbytes))
+
+    def _is_rmw_safe(self, waddr):
+        for start, nbytes in self._rmw_safe:
+            if (start<=waddr) and ((waddr+4)<=(start+nbytes)): return True
+        return False
+
+    def _overlap(self, addr, nbytes):
+        return self._words and (addr<self._hi) and (self._lo<(addr+nbytes))
+
+    def write(self, addr, pdata, size, length):
+        """
+        Buffer incremental write, which has the same arguments as BfmWrite().
+        :return: 0 on success, otherwize negative value.
+        """
+        data  = self.bfm._as_uint_p(pdata, length, False)
+        words = self._words
+        for idx in range(length):
+            value = data[idx]
+            baddr = addr+idx*size
+            if (size==4) and not (baddr&0x3):
+               words[baddr] = [value&0xFFFFFFFF, 0xF]
+               continue
+            for lane in range(size):
+                waddr = (baddr+lane)&~0x3
+                shift = ((baddr+lane)&0x3)<<3
+                entry = words.get(waddr)
+                if entry is None: entry = words[waddr] = [0, 0]
+                entry[0] = (entry[0]&~(0xFF<<shift)) | (((value>>(lane<<3))&0xFF)<<shift)
+                entry[1] |= 1<<(shift>>3)
+        end = addr+size*length
+        self._lo = addr if (self._lo is None) or (addr<self._lo) else self._lo
+        self._hi = end  if (self._hi is None) or (end>self._hi)  else self._hi
+        if len(words)>=self.limit: return self.flush()
+        return 0
+
+    def write_bytes(self, addr, buf):
+        """
+        Buffer bytes to write from 'addr'.
+        :return: 0 on success, otherwize negative value.
+        """
+        buf = bytearray(buf)
+        return self.write(addr, (ctypes.c_uint*len(buf))(*buf), 1, len(buf))
+
+    def read(self, addr, pdata, size, length):
+        """
+        Read after flushing buffered writes if overlapped,
+        which has the same arguments as BfmRead().
+        """
+        if self._overlap(addr, size*length):
+           ret = self.flush()
+           if ret: return ret
+        return self.bfm.BfmRead(self.con_handle, addr, pdata, size, length)
+
+    def read_block(self, addr, nbytes, buf=None):
+        """
+        Read bytes after flushing buffered writes if overlapped,
+        which has the same arguments as BfmReadBlock().
+        """
+        if self._overlap(addr, nbytes):
+           if self.flush(): return None
+        return self.bfm.BfmReadBlock(self.con_handle, addr, nbytes, buf)
+
+    def flush(self):
+        """
+        Push buffered writes as contiguous runs of bytes, each of which goes
+        as 4-byte bursts except unaligned head and tail.
+        Buffered writes are dropped only when all of them have been pushed,
+        so that flush() can be called again after failure.
+        :return: 0 on success, otherwize negative value.
+        """
+        if not self._words: return 0
+        ret = self._push(self._words)
+        if ret==0:
+           self._words = {}
+           self._lo = self._hi = None
+        return ret
+
+    def _push(self, words):
+        bfm = self.bfm
+        #----------------------------------------
+        # read-modify-write for partial words in safe region
+        rmw = [waddr for waddr, entry in words.items()
+                     if (entry[1]!=0xF) and self._is_rmw_safe(waddr)]
+        if rmw:
+           rdata = (ctypes.c_uint*len(rmw))()
+           batch = bfm.BfmBatch(self.con_handle)
+           try:
+               for idx, waddr in enumerate(rmw):
+                   ret = batch.read(waddr, (ctypes.c_uint*1).from_buffer(rdata, idx<<2), 4, 1)
+                   if ret: return ret
+               ret = batch.flush()
+               if ret: return ret
+           finally:
+               batch.close()
+           words = dict(words) # merged ones do not go to the buffer
+           for idx, waddr in enumerate(rmw):
+               value, enable = words[waddr]
+               keep = 0
+               for lane in range(4):
+                   if not (enable>>lane)&0x1: keep |= 0xFF<<(lane<<3)
+               words[waddr] = [value|(rdata[idx]&keep), 0xF]
+        #----------------------------------------
+        # contiguous runs of bytes
+        runs  = [] # list of [address, bytearray]
+        for waddr in sorted(words):
+            value, enable = words[waddr]
+            for lane in range(4):
+                if not (enable>>lane)&0x1: continue
+                baddr = waddr+lane
+                if runs and (runs[-1][0]+len(runs[-1][1]))==baddr:
+                   runs[-1][1].append((value>>(lane<<3))&0xFF)
+                else:
+                   runs.append([baddr, bytearray([(value>>(lane<<3))&0xFF])])
+        batch = bfm.BfmBatch(self.con_handle)
+        try:
+            for baddr, buf in runs:
+                ret = bfm.BfmWriteBlock(self.con_handle, baddr, buf, batch)
+                if ret: return ret
+            return batch.flush()
+        finally:
+            batch.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None: self.flush()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Buffered writes kept until flush() succeeds
+# 2026.10.18: Started
+#===============================================================================
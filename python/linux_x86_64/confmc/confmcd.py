@@ -0,0 +1,647 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains CON-FMC BFM server, i.e., confmcd.
+
+The server owns CON-FMC handlers of cards and serves BFM requests of many
+processes over Unix domain socket or TCP on localhost, so that a tool gets
+a card in a few milliseconds without conInit() and discovery, and tools
+running at the same time share the card.
+
+Each card is served by its own worker thread, which takes pending requests
+of all clients in round-robin, up to 'quantum' requests of each client at
+a time, and pushes BFM transactions of all of them to a single BfmBatch,
+i.e., a single stream transfer; so that clients get fair share of the link
+and small requests of them are merged. GPIO and other requests go in their
+order between batches.
+
+Protocol is little-endian binary frames over the socket.
+  - request:  REQ, i.e., (payload bytes, seq, op, cid, flags, arg0, arg1, arg2)
+              followed by payload
+  - response: RSP, i.e., (payload bytes, seq, status, flags) followed by payload
+A client can send requests without waiting for responses, i.e., pipelining,
+where requests of a client to a card are carried out in order.
+Bulk payloads go through a shared memory file of the client instead of the
+socket when the server could attach it by OP_ATTACH, i.e., a regular file in
+/dev/shm owned by the user of the client on the other end of the Unix domain
+socket, where FLAG_SHM_IN tells that the request payload is there and FLAG_SHM_OUT
+lets the response payload be put there.
+
+    $ python -m confmc.confmcd -b axi -a /tmp/confmcd.sock
+
+    bfm = confmc.client.connect('/tmp/confmcd.sock')
+    hdl = bfm.conInit(0)
+    bfm.BfmWrite(hdl, 0x0, data, 4, 16)
+
+Note that stream modes, i.e., CON_MODE_SU2F/SF2U/SLOOP, are not served.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC BFM server"
+
+#-------------------------------------------------------------------------------
+import sys
+import os
+import stat
+import ctypes
+import json
+import socket
+import struct
+import threading
+import collections
+import numpy
+try:
+    import queue
+except ImportError: # Python 2
+    import Queue as queue
+
+#===============================================================================
+VERSION = 1
+DEFAULT_ADDRESS = '/tmp/confmcd.sock'
+
+REQ = struct.Struct('<IIHHIIII') # nbytes, seq, op, cid, flags, arg0, arg1, arg2
+RSP = struct.Struct('<IIiI') # nbytes, seq, status, flags
+SUB = struct.Struct('<IIBB2x') # addr, length, size, kind of a request of OP_BATCH
+
+OP_HELLO       = 0x01 # payload of response: JSON of server information
+OP_ATTACH      = 0x02 # arg0: bytes of shared memory, payload: its path
+OP_OPEN        = 0x03 # opens the card of 'cid' when not yet
+OP_CONTEXT     = 0x04 # payload of response: bus, width, burst_max, gpin,
+                      # depth_u2f and depth_f2u
+OP_SET_AXI4    = 0x05 # status: burst length
+OP_GPOUT       = 0x06 # arg0: value
+OP_GPIN        = 0x07 # payload of response: value
+OP_WRITE       = 0x10 # arg0: addr, arg1: size, arg2: length, payload: data
+OP_READ        = 0x11 # arg0: addr, arg1: size, arg2: length
+OP_WRITE_FIX   = 0x12
+OP_READ_FIX    = 0x13
+OP_WRITE_BLOCK = 0x14 # arg0: addr, arg1: nbytes, payload: bytes
+OP_READ_BLOCK  = 0x15 # arg0: addr, arg1: nbytes
+OP_BATCH       = 0x16 # arg0: num of SUB, payload: SUB and write data of each
+OP_TRANSACTV   = 0x17 # arg0: num of descriptors, arg1: words, payload: both
+
+SUB_WRITE       = 0
+SUB_READ        = 1
+SUB_WRITE_FIX   = 2
+SUB_READ_FIX    = 3
+SUB_WRITE_BLOCK = 4 # 'length' is num of bytes
+
+FLAG_SHM_IN  = 0x1 # payload of request is in the shared memory
+FLAG_SHM_OUT = 0x2 # payload of response can be put in the shared memory
+
+SHM_MIN = 64*1024 # bytes of payload to go through the shared memory at least
+SHM_DIR = '/dev/shm' # shared memory files to attach are there
+
+PAYLOAD_MAX = 64*1024*1024 # bytes of payload of a request or a response at most
+
+SO_PEERCRED = getattr(socket, 'SO_PEERCRED', 17) # Python 2 does not have it
+
+BFM_DESC_BYTES = 20 # sizeof(BfmDesc_t)
+
+# Requests carried by BfmBatch of the card, where others flush it first.
+_BATCHED = (OP_WRITE, OP_READ, OP_WRITE_FIX, OP_READ_FIX, OP_WRITE_BLOCK, OP_BATCH)
+
+#-------------------------------------------------------------------------------
+def parse_address(address):
+    """
+    Return (family, address) of socket, where 'host:port' or (host, port)
+    is TCP and others are path of Unix domain socket.
+    """
+    if isinstance(address, tuple):
+       return socket.AF_INET, address
+    if (':' in address) and not address.startswith('/'):
+       host, port = address.rsplit(':', 1)
+       return socket.AF_INET, (host or '127.0.0.1', int(port))
+    return socket.AF_UNIX, address
+
+def is_loopback(host):
+    """
+    Return True when 'host' is an address of this host only, e.g., 127.0.0.1.
+    """
+    try:
+        return socket.gethostbyname(host).startswith('127.')
+    except (socket.error, UnicodeError):
+        return False
+
+def recv_exact(sock, nbytes):
+    """
+    Receive 'nbytes' bytes.
+    :return: bytearray, None when the peer closed
+    """
+    buf  = bytearray(nbytes)
+    view = memoryview(buf)
+    pos  = 0
+    while pos<nbytes:
+        num = sock.recv_into(view[pos:], nbytes-pos)
+        if num==0: return None
+        pos += num
+    return buf
+
+def send_frame(sock, header, payload):
+    """
+    Send header and payload of bytes or numpy.uint8 array, where small
+    payload goes with the header.
+    """
+    if payload is None or len(payload)==0:
+       sock.sendall(header)
+    elif len(payload)<4096:
+       sock.sendall(header+(payload if isinstance(payload, bytes) else payload.tobytes()))
+    else:
+       sock.sendall(header)
+       sock.sendall(payload)
+
+def attach(path, size):
+    """
+    Map shared memory file.
+    :return: numpy.memmap of 'size' bytes
+    """
+    return numpy.memmap(path, dtype=numpy.uint8, mode='r+', shape=(size,))
+
+def attach_peer(sock, path, size):
+    """
+    Map shared memory file of the client on the other end of 'sock', which
+    should be a regular file in SHM_DIR owned by the user of the client
+    connected through Unix domain socket.
+    :return: numpy.memmap of 'size' bytes, None when not allowed
+    """
+    if (sock.family!=socket.AF_UNIX) or not (0<size<=PAYLOAD_MAX): return None
+    pid, uid, gid = struct.unpack('3i', sock.getsockopt(socket.SOL_SOCKET, SO_PEERCRED
+                                                       ,struct.calcsize('3i')))
+    if os.path.dirname(path)!=SHM_DIR: return None
+    fd = os.open(path, os.O_RDWR|os.O_NOFOLLOW)
+    try:
+        info = os.fstat(fd)
+        if (not stat.S_ISREG(info.st_mode)) or (info.st_uid!=uid) or (info.st_size<size):
+           return None
+        with os.fdopen(os.dup(fd), 'r+b') as fobj:
+             return numpy.memmap(fobj, dtype=numpy.uint8, mode='r+', shape=(size,))
+    finally:
+        os.close(fd)
+
+#===============================================================================
+class _Request(object):
+    __slots__ = ('conn', 'seq', 'op', 'cid', 'flags', 'args', 'payload')
+    def __init__(self, conn, seq, op, cid, flags, args, payload):
+        self.conn    = conn
+        self.seq     = seq
+        self.op      = op
+        self.cid     = cid
+        self.flags   = flags
+        self.args    = args
+        self.payload = payload # numpy.uint8 array
+
+class _Conn(object):
+    """
+    Client connection, whose responses are sent by its own thread, so that
+    a client slow to take them does not hold the card.
+    """
+    def __init__(self, sock, name):
+        self.sock     = sock
+        self.name     = name
+        self.shm      = None
+        self.requests = 0
+        self._out     = queue.Queue()
+        self._thread  = threading.Thread(target=self._send, name='confmcd-send-'+name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def respond(self, req, status, payload=None):
+        """
+        Queue the response, where 'payload' is numpy array or bytes.
+        """
+        flags  = 0
+        nbytes = 0
+        if payload is not None:
+           if not isinstance(payload, bytes): payload = payload.reshape(-1).view(numpy.uint8)
+           nbytes = len(payload)
+           if (req.flags&FLAG_SHM_OUT) and (self.shm is not None) and SHM_MIN<=nbytes<=len(self.shm):
+              self.shm[:nbytes] = numpy.frombuffer(payload, dtype=numpy.uint8)\
+                                  if isinstance(payload, bytes) else payload
+              payload, flags = None, FLAG_SHM_IN
+        self._out.put((RSP.pack(nbytes, req.seq, status, flags), payload))
+
+    def _send(self):
+        while True:
+            item = self._out.get()
+            if item is None: return
+            header, payload = item
+            try:
+                send_frame(self.sock, header, payload)
+            except (socket.error, IOError, OSError):
+                pass # the reader finds it closed
+
+    def close(self):
+        self._out.put(None)
+        self._thread.join()
+        try:
+            self.sock.close()
+        except (socket.error, IOError, OSError):
+            pass
+        self.shm = None
+
+#-------------------------------------------------------------------------------
+class _Card(object):
+    """
+    Card with its own worker, which serves requests of all clients.
+    """
+    def __init__(self, bfm, cid, con_handle, quantum):
+        self.bfm        = bfm
+        self.cid        = cid
+        self.con_handle = con_handle
+        self.quantum    = quantum
+        self.rounds     = 0 # num of rounds served
+        self.requests   = 0 # num of requests served
+        self.batches    = 0 # num of batch flushes
+        self._pending   = collections.OrderedDict() # conn -> deque of requests
+        self._cond      = threading.Condition()
+        self._stop      = False
+        self._thread    = threading.Thread(target=self._serve, name='confmcd-card-'+str(cid))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, req):
+        with self._cond:
+            reqs = self._pending.get(req.conn)
+            if reqs is None: reqs = self._pending[req.conn] = collections.deque()
+            reqs.append(req)
+            self._cond.notify()
+
+    def drop(self, conn):
+        with self._cond:
+            self._pending.pop(conn, None)
+
+    def _take(self):
+        """
+        Take up to 'quantum' requests of each client with pending requests,
+        where clients left with more requests go to the end.
+        :return: list of requests, None when stopped
+        """
+        with self._cond:
+            while (not self._pending) and (not self._stop):
+                self._cond.wait()
+            if self._stop: return None
+            taken = []
+            for conn in list(self._pending):
+                reqs = self._pending.pop(conn)
+                for idx in range(min(self.quantum, len(reqs))):
+                    taken.append(reqs.popleft())
+                if reqs: self._pending[conn] = reqs
+            return taken
+
+    def _serve(self):
+        while True:
+            reqs = self._take()
+            if reqs is None: return
+            self.rounds   += 1
+            self.requests += len(reqs)
+            self._execute(reqs)
+
+    #---------------------------------------------------------------------------
+    def _execute(self, reqs):
+        """
+        Carry out requests in order, where consecutive BFM transactions of
+        all clients go together in a batch.
+        """
+        bfm, hdl = self.bfm, self.con_handle
+        pending  = [] # (request, read buffer) pushed to the batch
+        batch    = None
+        try:
+            for req in reqs:
+                try:
+                    if req.op in _BATCHED:
+                       if batch is None: batch = bfm.BfmBatch(hdl)
+                       ret, value = self._push(batch, req)
+                       if ret: req.conn.respond(req, ret)
+                       else:   pending.append((req, value))
+                       continue
+                    self._flush(batch, pending)
+                    pending = []
+                    self._direct(req)
+                except Exception:
+                    req.conn.respond(req, -1) # malformed request, which leaves the card served
+            self._flush(batch, pending)
+        finally:
+            if batch is not None: batch.close()
+
+    def _push(self, batch, req):
+        """
+        :return: (status, read buffer to respond with)
+        """
+        op, (arg0, arg1, arg2), payload = req.op, req.args, req.payload
+        if op in (OP_WRITE, OP_WRITE_FIX):
+           if len(payload)<(arg2<<2): return -1, None
+           data = payload[:arg2<<2].view(numpy.uint32)
+           func = batch.write if op==OP_WRITE else batch.write_fix
+           return func(arg0, data, arg1, arg2), None
+        if op in (OP_READ, OP_READ_FIX):
+           if (arg2<<2)>PAYLOAD_MAX: return -1, None
+           value = numpy.empty(arg2, dtype=numpy.uint32)
+           func  = batch.read if op==OP_READ else batch.read_fix
+           return func(arg0, value, arg1, arg2), value
+        if op==OP_WRITE_BLOCK:
+           if len(payload)<arg1: return -1, None
+           return self.bfm.BfmWriteBlock(self.con_handle, arg0, payload[:arg1], batch), None
+        # OP_BATCH
+        rnum = 0
+        subs = []
+        pos  = 0
+        for idx in range(arg0):
+            addr, length, size, kind = SUB.unpack_from(payload, pos)
+            pos += SUB.size
+            if kind in (SUB_WRITE, SUB_WRITE_FIX, SUB_WRITE_BLOCK):
+               nbytes = length if kind==SUB_WRITE_BLOCK else length<<2
+               if (pos+nbytes)>len(payload): return -1, None
+               subs.append((kind, addr, size, length, payload[pos:pos+nbytes]))
+               pos += nbytes
+            else:
+               subs.append((kind, addr, size, length, rnum))
+               rnum += length
+        if (rnum<<2)>PAYLOAD_MAX: return -1, None
+        value = numpy.empty(rnum, dtype=numpy.uint32)
+        for kind, addr, size, length, data in subs:
+            if kind==SUB_WRITE:
+               ret = batch.write(addr, data.view(numpy.uint32), size, length)
+            elif kind==SUB_WRITE_FIX:
+               ret = batch.write_fix(addr, data.view(numpy.uint32), size, length)
+            elif kind==SUB_WRITE_BLOCK:
+               ret = self.bfm.BfmWriteBlock(self.con_handle, addr, data, batch)
+            elif kind==SUB_READ:
+               ret = batch.read(addr, value[data:data+length], size, length)
+            elif kind==SUB_READ_FIX:
+               ret = batch.read_fix(addr, value[data:data+length], size, length)
+            else:
+               ret = -1
+            if ret: return ret, None
+        return 0, value
+
+    def _flush(self, batch, pending):
+        if not pending: return
+        ret = batch.flush()
+        self.batches += 1
+        for req, value in pending:
+            req.conn.respond(req, ret, value if ret==0 else None)
+
+    def _direct(self, req):
+        bfm, hdl = self.bfm, self.con_handle
+        op, (arg0, arg1, arg2), payload = req.op, req.args, req.payload
+        if op==OP_GPOUT:
+           req.conn.respond(req, bfm.BfmGpout(hdl, arg0))
+        elif op==OP_GPIN:
+           value = ctypes.c_uint(0)
+           ret   = bfm.BfmGpin(hdl, ctypes.byref(value))
+           req.conn.respond(req, ret, struct.pack('<I', value.value) if ret==0 else None)
+        elif op==OP_CONTEXT:
+           info = bfm.BfmContextGet(hdl)
+           if info is None: req.conn.respond(req, -1)
+           else: req.conn.respond(req, 0, struct.pack('<IIIIII', info.bus, info.width
+                                                     , info.burst_max, info.gpin
+                                                     , info.depth_u2f, info.depth_f2u))
+        elif op==OP_SET_AXI4:
+           if hasattr(bfm, 'BfmSetAmbaAxi4'): req.conn.respond(req, bfm.BfmSetAmbaAxi4(hdl))
+           else: req.conn.respond(req, bfm.BfmGetBurstMax(hdl))
+        elif op==OP_READ_BLOCK:
+           if arg1>PAYLOAD_MAX: return req.conn.respond(req, -1)
+           value = numpy.empty(arg1, dtype=numpy.uint8)
+           ret   = 0 if bfm.BfmReadBlock(hdl, arg0, arg1, value) is not None else -1
+           req.conn.respond(req, ret, value if ret==0 else None)
+        elif op==OP_TRANSACTV:
+           nbytes = arg0*BFM_DESC_BYTES
+           if len(payload)<(nbytes+(arg1<<2)): return req.conn.respond(req, -1)
+           descs = numpy.array(payload[:nbytes]) # copied to be sent back
+           data  = numpy.array(payload[nbytes:nbytes+(arg1<<2)]).view(numpy.uint32)
+           ret   = bfm.BfmTransactV(hdl, descs, data) if arg0 else 0
+           req.conn.respond(req, ret, numpy.concatenate((descs, data.view(numpy.uint8))))
+        else:
+           req.conn.respond(req, -1)
+
+    def close(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join()
+        self.bfm.conRelease(self.con_handle)
+
+#===============================================================================
+class Server(object):
+    """
+    BFM server owning cards.
+    """
+    def __init__(self, bfm, address=DEFAULT_ADDRESS, cids=(), quantum=64
+                ,allow_remote=False):
+        """
+        :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+        :param address: path of Unix domain socket, or 'host:port' for TCP
+        :param cids: CIDs to open at start, while others are opened by clients
+        :param quantum: number of requests of a client to take at a time
+        :param allow_remote: True to let TCP bind to an address other than
+                             loopback, which gives the cards to any host reaching it
+        """
+        self.bfm      = bfm
+        self.address  = address
+        self.quantum  = quantum
+        self.cards    = {} # cid -> _Card
+        self.conns    = []
+        self._lock    = threading.Lock()
+        self._thread  = None
+        self._closing = False
+        family, addr  = parse_address(address)
+        if (family==socket.AF_INET) and not allow_remote and not is_loopback(addr[0]):
+           raise ValueError(str(addr[0])+" is not loopback, which needs allow_remote")
+        if (family==socket.AF_UNIX) and os.path.exists(addr):
+           os.unlink(addr) # left by a server gone
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        if family==socket.AF_INET:
+           self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(addr)
+        self._sock.listen(16)
+        if isinstance(addr, tuple): self.address = '%s:%d' % self._sock.getsockname()[:2]
+        for cid in cids: self.open(cid)
+
+    def open(self, cid):
+        """
+        Open the card of 'cid' unless it is opened.
+        :return: _Card, None on failure
+        """
+        with self._lock:
+            card = self.cards.get(cid)
+            if card is None:
+               hdl = self.bfm.conInit(cid)
+               if not hdl: return None
+               if hasattr(self.bfm, 'BfmSetAmbaAxi4'): self.bfm.BfmSetAmbaAxi4(hdl)
+               card = self.cards[cid] = _Card(self.bfm, cid, hdl, self.quantum)
+            return card
+
+    #---------------------------------------------------------------------------
+    def serve_forever(self):
+        """
+        Accept clients until close().
+        """
+        while not self._closing:
+            try:
+                sock, peer = self._sock.accept()
+            except (socket.error, OSError):
+                if self._closing: return
+                raise
+            if sock.family==socket.AF_INET:
+               sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn = _Conn(sock, str(len(self.conns)))
+            with self._lock: self.conns.append(conn)
+            thread = threading.Thread(target=self._serve_conn, args=(conn,)
+                                     ,name='confmcd-conn-'+conn.name)
+            thread.daemon = True
+            thread.start()
+
+    def start(self):
+        """
+        Serve in a thread, e.g., for tests in a process.
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name='confmcd')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def _serve_conn(self, conn):
+        try:
+            while True:
+                header = recv_exact(conn.sock, REQ.size)
+                if header is None: return
+                nbytes, seq, op, cid, flags, arg0, arg1, arg2 = REQ.unpack(bytes(header))
+                if nbytes>PAYLOAD_MAX: return # broken client
+                if flags&FLAG_SHM_IN:
+                   if (conn.shm is None) or (nbytes>len(conn.shm)): return # broken client
+                   payload = conn.shm[:nbytes]
+                else:
+                   payload = recv_exact(conn.sock, nbytes) if nbytes else bytearray()
+                   if payload is None: return
+                   payload = numpy.frombuffer(payload, dtype=numpy.uint8)
+                req = _Request(conn, seq, op, cid, flags, (arg0, arg1, arg2), payload)
+                conn.requests += 1
+                if op==OP_HELLO:
+                   conn.respond(req, 0, json.dumps(self.info()).encode('utf-8'))
+                elif op==OP_ATTACH:
+                   try:
+                       conn.shm = attach_peer(conn.sock, payload.tobytes().decode('utf-8'), arg0)
+                       conn.respond(req, 0 if conn.shm is not None else -1)
+                   except (IOError, OSError, ValueError):
+                       conn.respond(req, -1)
+                elif op==OP_OPEN:
+                   conn.respond(req, 0 if self.open(cid) else -1)
+                else:
+                   card = self.cards.get(cid)
+                   if card is None: conn.respond(req, -1)
+                   else: card.submit(req)
+        except (socket.error, IOError, OSError):
+            pass
+        finally:
+            for card in list(self.cards.values()): card.drop(conn)
+            with self._lock:
+                if conn in self.conns: self.conns.remove(conn)
+            conn.close()
+
+    def info(self):
+        return { 'version'         : VERSION
+               , 'bfm'             : self.bfm._con_bfm_type
+               , 'burst_boundary'  : self.bfm._burst_boundary
+               , 'cids'            : sorted(self.cards) }
+
+    def stats(self):
+        """
+        :return: dictionary of CID and counters of its worker
+        """
+        return dict((cid, { 'rounds'  : card.rounds
+                          , 'requests': card.requests
+                          , 'batches' : card.batches })
+                    for cid, card in self.cards.items())
+
+    def close(self):
+        self._closing = True
+        family, addr = parse_address(self.address)
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except (socket.error, OSError):
+            pass
+        self._sock.close()
+        if self._thread is not None: self._thread.join()
+        for conn in list(self.conns):
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except (socket.error, OSError):
+                pass
+        for card in self.cards.values(): card.close()
+        self.cards = {}
+        if (family==socket.AF_UNIX) and os.path.exists(addr): os.unlink(addr)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+#===============================================================================
+def main(argv):
+    import getopt
+    import importlib
+    import signal
+    #----------------------------------------
+    btype   = 'axi'
+    address = DEFAULT_ADDRESS
+    cids    = None
+    quantum = 64
+    remote  = False
+    usage   = 'confmcd.py [-b axi|ahb] [-a path|host:port] [-c cid,...] [-q quantum] [-r]'
+    try:
+        opts, args = getopt.getopt(argv, "hb:a:c:q:r",['help','bfm=','address=','cids='
+                                                      ,'quantum=','allow-remote'])
+    except getopt.GetoptError:
+        print(usage)
+        sys.exit(2)
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+             print(usage)
+             sys.exit()
+        elif opt in ("-b", "--bfm"):
+             btype = arg
+        elif opt in ("-a", "--address"):
+             address = arg
+        elif opt in ("-c", "--cids"):
+             cids = [int(cid) for cid in arg.split(',')]
+        elif opt in ("-q", "--quantum"):
+             quantum = int(arg)
+        elif opt in ("-r", "--allow-remote"):
+             remote = True # TCP on an address other than loopback
+    #----------------------------------------
+    bfm = importlib.import_module('confmc.pyconbfm'+btype)
+    if cids is None:
+       from confmc import pool
+       cids = range(pool.cid_max(bfm)) # cards not found are skipped
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0)) # to close cards
+    server = Server(bfm, address, [], quantum, remote)
+    for cid in cids: server.open(cid)
+    print('confmcd: serving CID %s on %s' % (sorted(server.cards), server.address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main(sys.argv[1:])
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: TCP only on loopback unless allow_remote
+# 2026.10.18: OP_ATTACH only for files of the peer user in /dev/shm, bounded payloads
+# 2026.10.18: Fifo depths in OP_CONTEXT instead of block_read_depth in OP_HELLO
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,500 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains cached view of device memory for CON-FMC AMBA BFM.
+
+DeviceMemory makes a range of device memory look like a byte sequence,
+which is backed by LRU page cache, so that random accesses of small items,
+e.g., walking linked lists or descriptor tables in the memory of DUT, hit
+the cache instead of paying a round trip to USB each.
+A page is filled with maximum-length bursts, i.e., a single burst for
+the default page size, and all pages missed by an access go in a single
+batch along with pages read ahead when misses are sequential.
+
+    mem = DeviceMemory(confmc.pyconbfmaxi, hdl, 0x00000000, 0x100000)
+    mem.uncached(0xF000, 0x100)   # MMIO registers
+    desc = mem.unpack('<IIHH', 0x1000)
+    head = mem.u32(0x2000)
+    data = mem[0x3000:0x3100]     # bytes
+    mem[0x4000:0x4004] = b'\\x01\\x02\\x03\\x04'
+    mem.readinto(0x5000, array)   # buffer-protocol object
+    print(mem.stats)
+
+Writes go to the device right away (write-through) by default, where
+cached pages are updated as well. With 'write_back', writes stay in
+the cache until flush(), eviction or invalidate(), where only written byte
+range of each page goes back and contiguous ones go together.
+Uncached regions are always accessed directly, where accesses of aligned
+1, 2 or 4 bytes go as a single transfer of the same size.
+Failed access raises IOError carrying the negative return value.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC device memory"
+
+#-------------------------------------------------------------------------------
+import ctypes
+import struct
+import numbers
+import collections
+import numpy
+from confmc import memtest
+
+#===============================================================================
+class DeviceMemory(object):
+    """
+    Range of device memory with page cache, where offsets are from 'base'.
+    """
+    def __init__(self, bfm, con_handle, base, size, page_size=0
+                , cache_size=1024*1024, readahead=8, write_back=False):
+        """
+        :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+        :param con_handle: CON-FMC handler
+        :param base: address of the memory, multiple of 4
+        :param size: number of bytes of the memory, multiple of 4
+        :param page_size: number of bytes of a page, power of 2 and multiple
+                          of 4, 0 for the maximum burst, e.g., 1KB for AMBA AXI4
+        :param cache_size: number of bytes to cache at most
+        :param readahead: number of pages to read ahead at most, 0 not to
+        :param write_back: True to keep writes until flush()
+        """
+        if (base%4) or (size%4):
+           raise ValueError("base and size should be multiple of 4")
+        if not page_size:
+           page_size = 4*max(bfm.BfmGetBurstMax(con_handle), 1)
+        if (page_size<4) or (page_size&(page_size-1)):
+           raise ValueError("page_size should be power of 2 and multiple of 4")
+        self.bfm        = bfm
+        self.con_handle = con_handle
+        self.base       = base
+        self.size       = size
+        self.page_size  = page_size
+        self.max_pages  = max(cache_size//page_size, 1)
+        self.readahead  = readahead
+        self.write_back = write_back
+        self._pages     = collections.OrderedDict() # page -> numpy.uint8 array, LRU first
+        self._dirty     = {} # page -> [lo, hi) offset in the page written
+        self._uncached  = [] # sorted [start, end) offsets
+        self._next      = None # page following the last missed
+        self._ahead     = 0    # pages to read ahead on sequential miss
+        self.clear_stats()
+
+    def clear_stats(self):
+        self.hits       = 0 # num of pages found in the cache
+        self.misses     = 0 # num of pages missed
+        self.prefetched = 0 # num of pages read ahead
+        self.fills      = 0 # num of batches filling pages
+        self.writebacks = 0 # num of batches writing dirty pages back
+        self.evictions  = 0 # num of pages evicted
+        self.direct     = 0 # num of accesses to uncached regions
+
+    @property
+    def stats(self):
+        """
+        Dictionary of statistics along with hit rate.
+        """
+        total = self.hits+self.misses
+        return { 'hits'      : self.hits
+               , 'misses'    : self.misses
+               , 'hit_rate'  : float(self.hits)/total if total else 0.0
+               , 'prefetched': self.prefetched
+               , 'fills'     : self.fills
+               , 'writebacks': self.writebacks
+               , 'evictions' : self.evictions
+               , 'direct'    : self.direct
+               , 'pages'     : len(self._pages)
+               , 'dirty'     : len(self._dirty) }
+
+    #---------------------------------------------------------------------------
+    def uncached(self, offset, nbytes):
+        """
+        Mark the range not to be cached, e.g., MMIO registers, where cached
+        pages overlapping it are dropped after writing back dirty bytes.
+        """
+        if (offset%4) or (nbytes%4):
+           raise ValueError("uncached region should be multiple of 4")
+        self._check(offset, nbytes)
+        self.invalidate(offset, nbytes)
+        ranges = sorted(self._uncached+[[offset, offset+nbytes]])
+        self._uncached = []
+        for start, end in ranges:
+            if self._uncached and start<=self._uncached[-1][1]:
+               self._uncached[-1][1] = max(self._uncached[-1][1], end)
+            else:
+               self._uncached.append([start, end])
+
+    def _segments(self, offset, nbytes):
+        """
+        Split the range at uncached regions.
+        :return: list of (offset, nbytes, cached)
+        """
+        result = []
+        end = offset+nbytes
+        for ustart, uend in self._uncached:
+            if uend<=offset: continue
+            if ustart>=end: break
+            if ustart>offset: result.append((offset, ustart-offset, True))
+            result.append((max(offset, ustart), min(end, uend)-max(offset, ustart), False))
+            offset = min(end, uend)
+        if offset<end: result.append((offset, end-offset, True))
+        return result
+
+    def _segments_uncached(self, offset, nbytes):
+        for ustart, uend in self._uncached:
+            if (ustart<offset+nbytes) and (uend>offset): return True
+        return False
+
+    def _check(self, offset, nbytes):
+        if (offset<0) or (nbytes<0) or ((offset+nbytes)>self.size):
+           raise IndexError("0x%X+%d out of device memory of %d bytes" % (offset, nbytes, self.size))
+
+    def _page_range(self, page):
+        start = page*self.page_size
+        return start, min(start+self.page_size, self.size)
+
+    #---------------------------------------------------------------------------
+    def _touch(self, page):
+        data = self._pages.pop(page)
+        self._pages[page] = data
+        return data
+
+    def _fetch(self, pages):
+        """
+        Fill pages with a single batch, where uncached regions in them are not read.
+        :return: dictionary of page and numpy.uint8 array
+        """
+        bfm    = self.bfm
+        filled = {}
+        batch  = bfm.BfmBatch(self.con_handle)
+        try:
+            for page in pages:
+                start, end = self._page_range(page)
+                data = numpy.zeros((end-start)>>2, dtype=numpy.uint32)
+                filled[page] = data.view(numpy.uint8)
+                for off, num, cached in self._segments(start, end-start):
+                    if not cached: continue
+                    words = data[(off-start)>>2:(off-start+num)>>2]
+                    for addr, idx, length in memtest.bursts(bfm, self.con_handle
+                                                          , self.base+off, num>>2, 4):
+                        ret = batch.read(addr, words[idx:idx+length], 4, length)
+                        if ret: raise IOError(ret, "device memory read failed")
+            ret = batch.flush()
+            self.fills += 1
+            if ret: raise IOError(ret, "device memory read failed")
+        finally:
+            batch.close()
+        return filled
+
+    def _load(self, first, last, partial=None):
+        """
+        Get pages from 'first' to 'last' inclusive, where missed ones are
+        filled together with pages read ahead.
+        :param partial: pages to be written in part, which are the only ones
+                        to be filled without reading ahead, None for reads
+        :return: dictionary of page and numpy.uint8 array
+        """
+        found  = {}
+        missed = []
+        for page in range(first, last+1):
+            if page in self._pages:
+               found[page] = self._touch(page)
+               self.hits += 1
+            else:
+               missed.append(page)
+               self.misses += 1
+        if missed:
+           if partial is not None: fetch = [page for page in missed if page in partial]
+           else: fetch = list(missed)
+           ahead = self._readahead(missed[0], last) if partial is None else []
+           fetch.extend(ahead)
+           filled = self._fetch(fetch) if fetch else {}
+           for page in missed:
+               data = filled.get(page)
+               if data is None: data = numpy.zeros(self._page_range(page)[1]-page*self.page_size
+                                                  , dtype=numpy.uint8) # to be overwritten
+               found[page] = data
+           for page in fetch: self._insert(page, filled[page])
+           for page in missed:
+               if page not in filled: self._insert(page, found[page])
+           self.prefetched += len(ahead)
+        return found
+
+    def _readahead(self, page, last):
+        """
+        Pages to read ahead, which grows on sequential misses.
+        """
+        if page==self._next: self._ahead = min(max(self._ahead*2, 1), self.readahead)
+        else: self._ahead = 0
+        pages = []
+        npages = (self.size+self.page_size-1)//self.page_size
+        for ahead in range(last+1, min(last+1+self._ahead, npages)):
+            if ahead not in self._pages: pages.append(ahead)
+        self._next = last+1+self._ahead
+        return pages
+
+    def _insert(self, page, data):
+        self._pages[page] = data
+        evicted = []
+        while len(self._pages)>self.max_pages:
+            old, odata = self._pages.popitem(last=False)
+            self.evictions += 1
+            if old in self._dirty: evicted.append((old, odata, self._dirty.pop(old)))
+        if evicted: self._write_back(evicted)
+
+    def _write_back(self, pages):
+        """
+        Write dirty byte ranges of pages with a single batch,
+        where contiguous ones go together.
+        :param pages: list of (page, data, [lo, hi))
+        """
+        runs = [] # [start, end, [(offset, data)]]
+        for page, data, (lo, hi) in sorted(pages, key=lambda item: item[0]):
+            start = page*self.page_size
+            if runs and runs[-1][1]==start+lo:
+               runs[-1][1] = start+hi
+               runs[-1][2].append(data[lo:hi])
+            else:
+               runs.append([start+lo, start+hi, [data[lo:hi]]])
+        batch = self.bfm.BfmBatch(self.con_handle)
+        try:
+            for start, end, parts in runs:
+                data = parts[0] if len(parts)==1 else numpy.concatenate(parts)
+                for off, num, cached in self._segments(start, end-start):
+                    if not cached: continue # never dirty
+                    ret = self.bfm.BfmWriteBlock(self.con_handle, self.base+off
+                                                , data[off-start:off-start+num], batch)
+                    if ret: raise IOError(ret, "device memory write failed")
+            ret = batch.flush()
+            self.writebacks += 1
+            if ret: raise IOError(ret, "device memory write failed")
+        finally:
+            batch.close()
+
+    #---------------------------------------------------------------------------
+    def readinto(self, offset, buf):
+        """
+        Fill writable buffer-protocol object, e.g., bytearray, memoryview,
+        array and numpy.ndarray, from 'offset'.
+        :return: 'buf'
+        """
+        if isinstance(buf, numpy.ndarray):
+           out = buf.reshape(-1).view(numpy.uint8)
+        else: # numpy.frombuffer() is read-only for Python 2
+           out = numpy.frombuffer(buf, dtype=numpy.uint8)
+           if len(out): out = numpy.ctypeslib.as_array((ctypes.c_ubyte*len(out)).from_buffer(buf))
+        self._check(offset, len(out))
+        for off, num, cached in self._segments(offset, len(out)):
+            dst = out[off-offset:off-offset+num]
+            if cached: self._read_cached(off, dst)
+            else: self._read_direct(off, dst)
+        return buf
+
+    def read(self, offset, nbytes):
+        """
+        :return: bytes from 'offset'
+        """
+        return bytes(self.readinto(offset, bytearray(nbytes)))
+
+    def _read_cached(self, offset, out):
+        ps    = self.page_size
+        first = offset//ps
+        last  = (offset+len(out)-1)//ps
+        pages = self._load(first, last)
+        for page in range(first, last+1):
+            start = page*ps
+            lo = max(offset, start)
+            hi = min(offset+len(out), start+ps)
+            out[lo-offset:hi-offset] = pages[page][lo-start:hi-start]
+
+    def _read_direct(self, offset, out):
+        self.direct += 1
+        bfm  = self.bfm
+        addr = self.base+offset
+        if (len(out) in (1, 2, 4)) and not (addr%len(out)): # single transfer of the size
+           data = numpy.zeros(1, dtype=numpy.uint32)
+           bfm.BfmRead(self.con_handle, addr, data, len(out), 1)
+           out[:] = data.view(numpy.uint8)[:len(out)]
+           return
+        if bfm.BfmReadBlock(self.con_handle, addr, len(out), out) is None:
+           raise IOError(-1, "device memory read failed")
+
+    #---------------------------------------------------------------------------
+    def write(self, offset, buf):
+        """
+        Write buffer-protocol object, e.g., bytes, bytearray, array and
+        numpy.ndarray, from 'offset'.
+        """
+        if isinstance(buf, numpy.ndarray):
+           data = numpy.ascontiguousarray(buf).reshape(-1).view(numpy.uint8)
+        else:
+           data = numpy.frombuffer(buf, dtype=numpy.uint8)
+        self._check(offset, len(data))
+        for off, num, cached in self._segments(offset, len(data)):
+            src = data[off-offset:off-offset+num]
+            if not cached:
+               self._write_direct(off, src)
+            elif self.write_back:
+               self._write_cached(off, src)
+            else:
+               self._write_through(off, src)
+
+    def _write_direct(self, offset, data):
+        self.direct += 1
+        bfm  = self.bfm
+        addr = self.base+offset
+        if (len(data) in (1, 2, 4)) and not (addr%len(data)):
+           value = numpy.zeros(1, dtype=numpy.uint32)
+           value.view(numpy.uint8)[:len(data)] = data
+           bfm.BfmWrite(self.con_handle, addr, value, len(data), 1)
+           return
+        ret = bfm.BfmWriteBlock(self.con_handle, addr, data)
+        if ret: raise IOError(ret, "device memory write failed")
+
+    def _write_through(self, offset, data):
+        ret = self.bfm.BfmWriteBlock(self.con_handle, self.base+offset, data)
+        if ret: raise IOError(ret, "device memory write failed")
+        ps = self.page_size
+        for page in range(offset//ps, (offset+len(data)-1)//ps+1):
+            pdata = self._pages.get(page)
+            if pdata is None: continue # no write-allocate
+            start = page*ps
+            lo = max(offset, start)
+            hi = min(offset+len(data), start+ps)
+            pdata[lo-start:hi-start] = data[lo-offset:hi-offset]
+
+    def _write_cached(self, offset, data):
+        ps    = self.page_size
+        first = offset//ps
+        last  = (offset+len(data)-1)//ps
+        partial = set()
+        for page in (first, last): # pages written in part are filled first
+            start, end = self._page_range(page)
+            if (offset>start) or ((offset+len(data))<end): partial.add(page)
+        pages = self._load(first, last, partial)
+        for page in range(first, last+1):
+            start = page*ps
+            lo = max(offset, start)
+            hi = min(offset+len(data), start+ps)
+            pages[page][lo-start:hi-start] = data[lo-offset:hi-offset]
+            dirty = self._dirty.get(page)
+            if dirty is None: self._dirty[page] = [lo-start, hi-start]
+            else: dirty[0], dirty[1] = min(dirty[0], lo-start), max(dirty[1], hi-start)
+            if page not in self._pages: # evicted by itself when larger than the cache
+               self._write_back([(page, pages[page], self._dirty.pop(page))])
+
+    #---------------------------------------------------------------------------
+    def flush(self):
+        """
+        Write back all dirty pages with a single batch.
+        """
+        if not self._dirty: return
+        pages = [(page, self._pages[page], dirty) for page, dirty in self._dirty.items()]
+        self._dirty = {}
+        self._write_back(pages)
+
+    def invalidate(self, offset=0, nbytes=None):
+        """
+        Drop cached pages of the range after writing back dirty ones,
+        e.g., after the device wrote the memory.
+        """
+        if nbytes is None: nbytes = self.size-offset
+        if nbytes<=0: return
+        ps    = self.page_size
+        pages = [page for page in self._pages if offset//ps<=page<=(offset+nbytes-1)//ps]
+        dirty = [(page, self._pages[page], self._dirty.pop(page))
+                 for page in pages if page in self._dirty]
+        if dirty: self._write_back(dirty)
+        for page in pages: del self._pages[page]
+        self._next = None
+
+    def close(self):
+        self.invalidate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    #---------------------------------------------------------------------------
+    def unpack(self, fmt, offset):
+        """
+        Items of 'struct' format from 'offset', e.g., unpack('<IIHH', 0x100).
+        :return: tuple
+        """
+        nbytes = struct.calcsize(fmt)
+        page   = offset//self.page_size
+        if (page in self._pages) and ((offset+nbytes-1)//self.page_size==page)\
+           and (offset>=0) and ((offset+nbytes)<=self.size) and not self._segments_uncached(offset, nbytes):
+           self.hits += 1 # hit within a page, which is the most of pointer chasing
+           return struct.unpack_from(fmt, self._touch(page), offset-page*self.page_size)
+        return struct.unpack(fmt, self.read(offset, nbytes))
+
+    def pack(self, fmt, offset, *values):
+        """
+        Write items of 'struct' format from 'offset'.
+        """
+        self.write(offset, struct.pack(fmt, *values))
+
+    def u8(self, offset):
+        return self.unpack('<B', offset)[0]
+
+    def u16(self, offset):
+        return self.unpack('<H', offset)[0]
+
+    def u32(self, offset):
+        return self.unpack('<I', offset)[0]
+
+    def u64(self, offset):
+        return self.unpack('<Q', offset)[0]
+
+    def array(self, offset, count, dtype=numpy.uint32):
+        """
+        :return: numpy array of 'count' items of 'dtype' from 'offset'
+        """
+        return self.readinto(offset, numpy.empty(count, dtype=dtype))
+
+    #---------------------------------------------------------------------------
+    def __len__(self):
+        return self.size
+
+    def _slice(self, key):
+        start, stop, step = key.indices(self.size)
+        if step!=1: raise ValueError("step of slice should be 1")
+        return start, max(stop-start, 0)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+           start, nbytes = self._slice(key)
+           return self.read(start, nbytes)
+        if not isinstance(key, numbers.Integral): raise TypeError("index should be integer")
+        if key<0: key += self.size
+        return self.u8(key)
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+           start, nbytes = self._slice(key)
+           data = numpy.frombuffer(value, dtype=numpy.uint8) if not isinstance(value, numpy.ndarray)\
+                  else value.reshape(-1).view(numpy.uint8)
+           if len(data)!=nbytes:
+              raise ValueError("%d bytes for slice of %d bytes" % (len(data), nbytes))
+           self.write(start, data)
+        else:
+           if not isinstance(key, numbers.Integral): raise TypeError("index should be integer")
+           if key<0: key += self.size
+           self.pack('<B', key, value)
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Batch depth follows BfmGetReadDepth(), i.e., F2U fifo of the transactor
+# 2026.10.18: Started
+#===============================================================================
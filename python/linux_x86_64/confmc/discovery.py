@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains persistent discovery cache for CON-FMC.
+
+Opening a card usually goes with a number of queries, i.e., USB, FX3, board
+(EEPROM read with CRC check) and master information as well as GPIN read
+for AMBA AXI4, which take noticeable time for short scripts.
+Results of these queries are kept in a file for each CID and USB topology,
+so that the next open only reads CID and FX3 version to validate them,
+while a mis-match invalidates the entry and queries again.
+
+    hdl, info = confmc.discovery.open_card(confmc.pyconbfmaxi, cid=0)
+    print(info['master']['depth_u2f'])
+
+The cache file is '~/.cache/confmc/discovery.json', which can be changed by
+environment variable 'CONFMC_CACHE'.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC discovery cache"
+
+#-------------------------------------------------------------------------------
+import os
+import sys
+import json
+import time
+import timeit
+import ctypes
+import confmc.pyconfmc as pyconfmc
+
+#===============================================================================
+def cache_path():
+    """
+    Return path of the cache file.
+    """
+    path = os.environ.get('CONFMC_CACHE', '')
+    if path: return path
+    return os.path.join(os.path.expanduser('~'), '.cache', 'confmc', 'discovery.json')
+
+def _load(path):
+    try:
+        with open(path) as fp:
+            entries = json.load(fp)
+        return entries if isinstance(entries, dict) else {}
+    except (IOError, OSError, ValueError):
+        return {}
+
+def _save(path, entries):
+    """
+    Write the whole cache to a temporary file and then rename it,
+    so that concurrent scripts never see a partial file.
+    """
+    try:
+        dname = os.path.dirname(path)
+        if dname and not os.path.isdir(dname): os.makedirs(dname)
+        tmp = path+'.'+str(os.getpid())
+        with open(tmp, 'w') as fp:
+            json.dump(entries, fp, indent=2, sort_keys=True)
+        os.rename(tmp, path)
+        return 0
+    except (IOError, OSError):
+        return -1
+
+#-------------------------------------------------------------------------------
+def topology(bfm, con_handle):
+    """
+    Return USB topology of the card, i.e., 'bus-port.port...', which is
+    'emu' for the emulator and None when libusb does not tell it.
+    """
+    if getattr(bfm, '_con_emu', ''): return 'emu'
+    libusb = getattr(pyconfmc, '_libusb', None)
+    dev    = con_handle.contents.usb.dev
+    if (libusb is None) or (not dev): return None
+    try:
+        bus   = libusb.libusb_get_bus_number(ctypes.c_void_p(dev))
+        ports = (ctypes.c_uint8*8)()
+        num   = libusb.libusb_get_port_numbers(ctypes.c_void_p(dev), ports, len(ports))
+    except AttributeError: # libusb older than 1.0.16
+        return None
+    if num<0: return None
+    return str(bus)+'-'+'.'.join(str(p) for p in ports[:num])
+
+def _key(bfm, cid, topo):
+    return bfm._con_bfm_type+':'+str(cid)+'@'+str(topo)
+
+def _struct(obj):
+    value = {}
+    for name, typ in obj._fields_:
+        item = getattr(obj, name)
+        if isinstance(item, bytes): item = item.decode('ascii', 'replace')
+        value[name] = item
+    return value
+
+#-------------------------------------------------------------------------------
+def probe(bfm, con_handle):
+    """
+    Query all information of the opened card.
+    For AMBA AXI, BfmSetAmbaAxi4() is called to detect the burst limit.
+    :return: dictionary of information, None on failure
+    """
+    cid = bfm.conGetCid(con_handle)
+    if cid<0: return None
+    usb = pyconfmc._usb()
+    if bfm.conGetUsbInfo(con_handle, ctypes.byref(usb)): return None
+    fx3 = pyconfmc.con_Fx3Info()
+    if bfm.conGetFx3Info(con_handle, ctypes.byref(fx3)): return None
+    board = pyconfmc.con_BoardInfo()
+    if bfm.conGetBoardInfo(con_handle, ctypes.byref(board), ctypes.sizeof(board), 1)>0:
+       board = _struct(board)
+    else:
+       board = None # not programmed
+    master = pyconfmc.con_MasterInfo()
+    if bfm.conGetMasterInfo(con_handle, ctypes.byref(master))>0:
+       master = _struct(master)
+    else:
+       return None # FPGA may not be configured yet
+    if bfm._con_bfm_type == 'axi':
+       burst_max = bfm.BfmSetAmbaAxi4(con_handle)
+       if burst_max<0: return None
+    else:
+       burst_max = bfm.BfmGetBurstMax(con_handle)
+    context = bfm.BfmContextGet(con_handle)
+    if context is None: return None
+    return { 'cid'        : cid
+           , 'bfm'        : bfm._con_bfm_type
+           , 'topology'   : topology(bfm, con_handle)
+           , 'api_version': bfm.conGetVersionApi()
+           , 'fx3_version': fx3.version
+           , 'usb'        : { 'speed'                : usb.speed
+                            , 'bulk_max_pkt_size_out': usb.bulk_max_pkt_size_out
+                            , 'bulk_max_pkt_size_in' : usb.bulk_max_pkt_size_in }
+           , 'board'      : board
+           , 'master'     : master
+           , 'burst_max'  : burst_max
+           , 'context'    : context.to_dict()
+           , 'time'       : time.strftime('%Y.%m.%d %H:%M:%S') }
+
+def validate(bfm, con_handle, cid, info):
+    """
+    Check the cached information against the opened card with CID and
+    FX3 version, which are cheap vendor requests.
+    :return: True when it is valid
+    """
+    if not info: return False
+    if 'context' not in info: return False # cached by older version
+    if info.get('api_version')!=bfm.conGetVersionApi(): return False
+    if bfm.conGetCid(con_handle)!=cid: return False
+    fx3 = pyconfmc.con_Fx3Info()
+    if bfm.conGetFx3Info(con_handle, ctypes.byref(fx3)): return False
+    return fx3.version==info.get('fx3_version')
+
+#===============================================================================
+def open_card(bfm, cid=0, refresh=False, path=None):
+    """
+    Open the card with the cached information when it is valid, otherwise
+    with full queries, which update the cache.
+    The cached context, e.g., burst limit, is set to the BFM by BfmContextSet(),
+    so that the BFM does not read GPIN at the first use.
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param cid: card id
+    :param refresh: True to ignore the cache
+    :param path: cache file, None for cache_path()
+    :return: (CON-FMC handler, dictionary of information), (None, None) on failure
+    """
+    hdl = bfm.conInit(cid)
+    if not hdl: return None, None
+    path    = path or cache_path()
+    entries = _load(path)
+    key     = _key(bfm, cid, topology(bfm, hdl))
+    info    = None if refresh else entries.get(key)
+    if validate(bfm, hdl, cid, info) and bfm.BfmContextSet(hdl, info['context'])==0:
+       info['cached'] = True
+       return hdl, info
+    info = probe(bfm, hdl)
+    if info is None:
+       bfm.conRelease(hdl)
+       return None, None
+    entries[key] = info
+    _save(path, entries)
+    info = dict(info)
+    info['cached'] = False
+    return hdl, info
+
+def invalidate(cid=None, path=None):
+    """
+    Remove cached information of 'cid', or all when it is None.
+    :return: 0 on success, otherwize negative value.
+    """
+    path    = path or cache_path()
+    entries = {} if cid is None else _load(path)
+    return _save(path, dict((k, v) for k, v in entries.items() if v.get('cid')!=cid))
+
+def cached(path=None):
+    """
+    Return cached information without touching any card.
+    :return: list of dictionary
+    """
+    entries = _load(path or cache_path())
+    return [entries[key] for key in sorted(entries)]
+
+#-------------------------------------------------------------------------------
+def benchmark(bfm, cid=0, count=10, path=None):
+    """
+    Measure open time with full queries and with the cache.
+    :return: dictionary of 'full_ms', 'cached_ms' and 'speedup'
+    """
+    timer  = timeit.default_timer
+    result = {}
+    for name, refresh in (('full_ms', True), ('cached_ms', False)):
+        spent = []
+        for idx in range(count):
+            start = timer()
+            hdl, info = open_card(bfm, cid, refresh, path)
+            spent.append(timer()-start)
+            if hdl is None: return None
+            bfm.conRelease(hdl)
+        spent.sort()
+        result[name] = spent[len(spent)//2]*1.0E3 # median
+    result['speedup'] = result['full_ms']/result['cached_ms'] if result['cached_ms']>0 else 0.0
+    return result
+
+#-------------------------------------------------------------------------------
+def main(argv):
+    import getopt
+    import importlib
+    #----------------------------------------
+    cid   = 0
+    btype = 'axi'
+    count = 0
+    usage = 'discovery.py [-b axi|ahb] [-c cid] [-r] [-l] [-x] [-n count]'
+    try:
+        opts, args = getopt.getopt(argv, "hb:c:rlxn:",['help','bfm=','cid=','refresh'
+                                                      ,'list','clear','bench='])
+    except getopt.GetoptError:
+        print(usage)
+        sys.exit(2)
+    refresh = False
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+             print(usage)
+             sys.exit()
+        elif opt in ("-l", "--list"):
+             print(json.dumps(cached(), indent=2, sort_keys=True))
+             sys.exit()
+        elif opt in ("-x", "--clear"):
+             sys.exit(0 if invalidate()==0 else 1)
+        elif opt in ("-b", "--bfm"):
+             btype = arg
+        elif opt in ("-c", "--cid"):
+             cid = int(arg)
+        elif opt in ("-r", "--refresh"):
+             refresh = True
+        elif opt in ("-n", "--bench"):
+             count = int(arg)
+    #----------------------------------------
+    bfm = importlib.import_module('confmc.pyconbfm'+btype)
+    if count:
+       result = benchmark(bfm, cid, count)
+       if result is None:
+          print('CON-FMC not found for CID: '+str(cid))
+          sys.exit(1)
+       print("open: %.3f ms full, %.3f ms cached (x%.1f)" % (result['full_ms']
+             , result['cached_ms'], result['speedup']))
+       sys.exit(0)
+    hdl, info = open_card(bfm, cid, refresh)
+    if hdl is None:
+       print('CON-FMC not found for CID: '+str(cid))
+       sys.exit(1)
+    print(json.dumps(info, indent=2, sort_keys=True))
+    bfm.conRelease(hdl)
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main(sys.argv[1:])
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Cached context is set to the BFM by BfmContextSet()
+# 2026.10.18: Started
+#===============================================================================
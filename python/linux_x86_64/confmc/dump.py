@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains memory-mapped file transfers for CON-FMC.
+
+  - dump_to_file():    device memory to file using BFM bursts
+  - capture_to_file(): stream-in, i.e., CON_MODE_SF2U, to file
+  - load_from_file():  file to device memory using BFM bursts
+
+Data move straight between USB transfers and a numpy.memmap window of the
+file, which slides over the file, so that memory use does not depend on
+the size of the file and nothing is copied or touched in Python per word.
+Each call carries 'chunk' bytes, which are split into maximum-length bursts
+by BfmReadBlock()/BfmWriteBlock(), and 'progress(done, total)' is called
+after each chunk, where 'done' can be given as 'offset' to resume later.
+
+    ret = dump_to_file(confmc.pyconbfmaxi, hdl, 0x0, 4<<30, 'ddr.bin'
+                      , progress=lambda done, total: print(done, total))
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC memory-mapped file transfers"
+
+#-------------------------------------------------------------------------------
+import os
+import ctypes
+import timeit
+import numpy
+
+#===============================================================================
+WINDOW = 64<<20 # bytes of a memmap window
+
+CON_MODE_CMD  = 0x0 # see 'include/conapi_int.h'
+CON_MODE_SF2U = 0x2
+
+#-------------------------------------------------------------------------------
+def _open(path, nbytes, offset):
+    """
+    Open file to write 'nbytes', which is truncated unless resuming.
+    """
+    fp = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+    if (offset==0) or (os.fstat(fp.fileno()).st_size<nbytes):
+       fp.truncate(nbytes)
+    return fp
+
+def _windows(fp, nbytes, offset, window, mode):
+    """
+    Yield (file offset, numpy.memmap) of windows from 'offset' to 'nbytes'.
+    """
+    while offset<nbytes:
+        size = min(window, nbytes-offset)
+        mm   = numpy.memmap(fp, dtype=numpy.uint8, mode=mode, offset=offset, shape=(size,))
+        try:
+            yield offset, mm
+        finally:
+            if mode!='r': mm.flush()
+            del mm
+        offset += size
+
+def _check(nbytes, offset, chunk, window):
+    if (offset<0) or (offset>nbytes):
+       raise ValueError("offset should be between 0 and %d" % nbytes)
+    if (chunk<=0) or (window<chunk):
+       raise ValueError("chunk should be positive and not larger than window")
+
+#===============================================================================
+def dump_to_file(bfm, con_handle, addr, nbytes, path, offset=0, chunk=None
+                , window=WINDOW, progress=None):
+    """
+    Read device memory into file.
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler
+    :param addr: starting address to read
+    :param nbytes: number of bytes to read
+    :param path: file to write, which holds bytes of 'addr' at 0
+    :param offset: number of bytes already dumped, i.e., to resume from
+    :param chunk: number of bytes of each call, None for BfmGetReadDepth(),
+                  i.e., F2U fifo of the transactor, a single batch
+    :param window: number of bytes of memmap window
+    :param progress: callable with (bytes done, nbytes) after each chunk
+    :return: 0 on success, otherwize negative value.
+    """
+    if chunk is None:
+       chunk = bfm.BfmGetReadDepth(con_handle)*4
+       if chunk<=0: return -1
+    _check(nbytes, offset, chunk, window)
+    if nbytes==0: return 0
+    with _open(path, nbytes, offset) as fp:
+        for base, mm in _windows(fp, nbytes, offset, window, 'r+'):
+            for pos in range(0, len(mm), chunk):
+                num = min(chunk, len(mm)-pos)
+                if bfm.BfmReadBlock(con_handle, addr+base+pos, num, mm[pos:pos+num]) is None:
+                   return -1
+                if progress: progress(base+pos+num, nbytes)
+    return 0
+
+def load_from_file(bfm, con_handle, addr, path, nbytes=None, offset=0, chunk=None
+                  , window=WINDOW, progress=None):
+    """
+    Write file into device memory.
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler
+    :param addr: starting address to write, which gets byte 0 of the file
+    :param path: file to read
+    :param nbytes: number of bytes to write, None for the whole file
+    :param offset: number of bytes already loaded, i.e., to resume from
+    :param chunk: number of bytes of each call, None for the read depth of
+                  the transactor
+    :param window: number of bytes of memmap window
+    :param progress: callable with (bytes done, nbytes) after each chunk
+    :return: 0 on success, otherwize negative value.
+    """
+    if chunk is None:
+       chunk = bfm.BfmGetReadDepth(con_handle)*4
+       if chunk<=0: return -1
+    size = os.path.getsize(path)
+    if nbytes is None: nbytes = size
+    if nbytes>size:
+       raise ValueError("file too small (%d bytes instead of at least %d bytes)" % (size, nbytes))
+    _check(nbytes, offset, chunk, window)
+    if nbytes==0: return 0
+    with open(path, 'rb') as fp:
+        for base, mm in _windows(fp, nbytes, offset, window, 'r'):
+            for pos in range(0, len(mm), chunk):
+                num = min(chunk, len(mm)-pos)
+                ret = bfm.BfmWriteBlock(con_handle, addr+base+pos, mm[pos:pos+num])
+                if ret: return ret
+                if progress: progress(base+pos+num, nbytes)
+    return 0
+
+#-------------------------------------------------------------------------------
+def capture_to_file(bfm, con_handle, nbytes, path, offset=0, chunk=1<<20
+                   , window=WINDOW, progress=None, timeout=1.0):
+    """
+    Capture stream-in data into file, where the card is put into
+    CON_MODE_SF2U during the capture and back to CON_MODE_CMD after that.
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler
+    :param nbytes: number of bytes to capture, which should be multiple of 4
+    :param path: file to write
+    :param offset: number of bytes already captured, i.e., to resume from
+    :param chunk: number of bytes of each conStreamRead()
+    :param window: number of bytes of memmap window
+    :param progress: callable with (bytes done, nbytes) after each chunk
+    :param timeout: seconds without stream-in data to give up
+    :return: 0 on success, otherwize negative value.
+    """
+    if (nbytes%4) or (offset%4) or (chunk%4):
+       raise ValueError("nbytes, offset and chunk should be multiple of 4")
+    _check(nbytes, offset, chunk, window)
+    if nbytes==0: return 0
+    ret = bfm.conSetMode(con_handle, CON_MODE_SF2U)
+    if ret<0: return ret
+    done = ctypes.c_uint(0)
+    try:
+        with _open(path, nbytes, offset) as fp:
+            for base, mm in _windows(fp, nbytes, offset, window, 'r+'):
+                addr = mm.ctypes.data
+                pos  = 0
+                idle = None
+                while pos<len(mm):
+                    num = min(chunk, len(mm)-pos)
+                    bfm._conStreamRead(con_handle, addr+pos, num//4, ctypes.byref(done))
+                    if done.value==0: # time-out
+                       now = timeit.default_timer()
+                       if idle is None: idle = now
+                       elif (now-idle)>=timeout: return -1
+                       continue
+                    idle = None
+                    pos += done.value*4
+                    if progress: progress(base+pos, nbytes)
+    finally:
+        bfm.conSetMode(con_handle, CON_MODE_CMD)
+    return 0
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Default chunk follows BfmGetReadDepth(), i.e., F2U fifo of the transactor
+# 2026.10.18: Started
+#===============================================================================
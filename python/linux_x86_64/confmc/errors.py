@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains status codes of CON-FMC AMBA BFM and exceptions for them.
+
+Bfm*Status() calls return one of BFM_* below, while BfmWrite(), BfmRead()
+and the like raise the exception of the status on failure, all of which are
+IOError so that 'except IOError' catches them as before.
+
+    try:
+        bfm.BfmRead(hdl, addr, data, 4, 16)
+    except errors.BfmDesyncError:
+        bfm.BfmRecover(hdl, bfm.BFM_RECOVER_TRX)
+
+A failed transfer is recovered in place by the BFM, see BfmSetRecovery(),
+so that BfmDesyncError and BfmRecoverError are what is left when it could not.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC BFM status and exceptions"
+
+#===============================================================================
+# Status of BFM calls, see 'trx_axi_api.h' and 'trx_ahb_api.h'.
+BFM_OK          =  0
+BFM_ERR_PARAM   = -1 # invalid argument or handler
+BFM_ERR_WRITE   = -2 # bulk-out failed or moved less than asked
+BFM_ERR_READ    = -3 # bulk-in failed
+BFM_ERR_CMD     = -4 # internal access, i.e., GPOUT/GPIN, failed
+BFM_ERR_DESYNC  = -5 # stream out of frame; BfmRecover() to go on
+BFM_ERR_RECOVER = -6 # could not recover; conRelease()/conInit() to go on
+
+_MESSAGES = { BFM_OK         : "success"
+            , BFM_ERR_PARAM  : "invalid argument"
+            , BFM_ERR_WRITE  : "bulk-out failed"
+            , BFM_ERR_READ   : "bulk-in failed"
+            , BFM_ERR_CMD    : "internal access failed"
+            , BFM_ERR_DESYNC : "out of sync"
+            , BFM_ERR_RECOVER: "could not recover" }
+
+#-------------------------------------------------------------------------------
+class BfmError(IOError):
+    """
+    Failure of a BFM call, where 'status' is BFM_ERR_* and 'call' is its name.
+    """
+    def __init__(self, status, call=None):
+        message = _MESSAGES.get(status, "unknown")
+        if call: message = call+"() "+message
+        IOError.__init__(self, status, message)
+        self.status = status
+        self.call   = call
+
+    def __reduce__(self):
+        return (self.__class__, (self.status, self.call))
+
+class BfmParamError(BfmError):
+    """Invalid argument or handler."""
+
+class BfmWriteError(BfmError):
+    """Bulk-out failed, while the write may or may not have been done."""
+
+class BfmReadError(BfmError):
+    """Bulk-in failed, which is left after retries."""
+
+class BfmCmdError(BfmError):
+    """Internal access, i.e., GPOUT/GPIN, failed."""
+
+class BfmDesyncError(BfmError):
+    """Stream out of frame, which goes on after BfmRecover()."""
+
+class BfmRecoverError(BfmError):
+    """Could not recover, which goes on after conRelease()/conInit()."""
+
+_ERRORS = { BFM_ERR_PARAM  : BfmParamError
+          , BFM_ERR_WRITE  : BfmWriteError
+          , BFM_ERR_READ   : BfmReadError
+          , BFM_ERR_CMD    : BfmCmdError
+          , BFM_ERR_DESYNC : BfmDesyncError
+          , BFM_ERR_RECOVER: BfmRecoverError }
+
+#-------------------------------------------------------------------------------
+def error(status, call=None):
+    """
+    Return exception of the status.
+    :param status: BFM_ERR_* returned by the BFM
+    :param call: name of the call
+    """
+    return _ERRORS.get(status, BfmError)(status, call)
+
+def check(status, call=None):
+    """
+    Raise exception of the status when it is negative.
+    :return: status
+    """
+    if status<0: raise error(status, call)
+    return status
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
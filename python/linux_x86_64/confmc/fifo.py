@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains FIFO port for CON-FMC AMBA BFM.
+
+FifoPort pushes data into or drains data from a memory-mapped FIFO, i.e.,
+a single address, with fixed-address bursts of maximum length, i.e., 16
+for AMBA AXI, or with single transfers for AMBA AHB, all of which are queued
+in a batch and carried by a single stream per 'chunk' items.
+
+When the FIFO tells its room or fill level through a register, the register
+is read at the end of the same batch, so that the next batch carries no more
+than the FIFO can take or give without extra round trip; the register is
+polled by itself only when the FIFO is full or empty.
+
+    port = FifoPort(confmc.pyconbfmaxi, hdl, 0xC0000000, space=0xC0000004)
+    port.write(packet) # buffer-protocol object
+    data = port.read(256) # numpy array of 256 items
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC FIFO port"
+
+#-------------------------------------------------------------------------------
+import numpy
+from confmc import irq
+
+_DTYPES = { 1:numpy.uint8, 2:numpy.uint16, 4:numpy.uint32 }
+
+#===============================================================================
+class FifoPort(object):
+    """
+    Memory-mapped FIFO at a single address.
+    """
+    def __init__(self, bfm, con_handle, addr, size=4, level=None, space=None
+                , chunk=None, timeout=1.0):
+        """
+        :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+        :param con_handle: CON-FMC handler
+        :param addr: address of the FIFO
+        :param size: number of bytes of each item, i.e., 1, 2 or 4
+        :param level: register telling number of items to read, which is
+                      address or (address, mask, shift); None not to throttle
+        :param space: register telling number of items that can be written,
+                      which is address or (address, mask, shift); None not to throttle
+        :param chunk: number of items of a batch at most, None for half of
+                      BfmGetReadDepth(), i.e., F2U fifo of the transactor
+        :param timeout: seconds to wait for the FIFO while full or empty
+        """
+        if size not in _DTYPES:
+           raise ValueError("size should be 1, 2 or 4")
+        self.bfm        = bfm
+        self.con_handle = con_handle
+        self.addr       = addr
+        self.size       = size
+        self.level      = self._register(level)
+        self.space      = self._register(space)
+        self.chunk      = chunk if chunk else bfm.BfmGetReadDepth(con_handle)//2
+        if self.chunk<=0:
+           raise ValueError("chunk should be positive")
+        self.timeout    = timeout
+        self.batches    = 0 # num of batches carried out
+        self.polls      = 0 # num of register reads by itself
+        self._reg       = numpy.zeros(1, dtype=numpy.uint32)
+
+    @staticmethod
+    def _register(reg):
+        if reg is None: return None
+        if isinstance(reg, (tuple, list)):
+           if not 1<=len(reg)<=3:
+              raise ValueError("register should be address or (address, mask, shift)")
+           return tuple(reg)+(0xFFFFFFFF, 0)[len(reg)-1:]
+        return reg, 0xFFFFFFFF, 0
+
+    def _value(self, reg):
+        return (int(self._reg[0])&reg[1])>>reg[2]
+
+    def _wait(self, reg):
+        """
+        Poll the register until it is not zero.
+        :return: the value, 0 on timeout, otherwize negative value.
+        """
+        bfm   = self.bfm
+        error = []
+        def poll():
+            self.polls += 1
+            ret = bfm.BfmReadStatus(self.con_handle, reg[0], self._reg, 4, 1)
+            if ret:
+               error.append(ret)
+               return ret
+            return self._value(reg) or None
+        found = irq._wait(poll, self.timeout, 20.0E-6, 0.002, None, None)
+        if error: return error[0]
+        return found or 0
+
+    #---------------------------------------------------------------------------
+    def write(self, buf):
+        """
+        Write items of buffer-protocol object, e.g., bytes, array or numpy
+        array, which is taken as items of 'size' bytes.
+        :return: 0 on success, otherwize negative value, e.g., -2 on timeout.
+        """
+        if isinstance(buf, numpy.ndarray):
+           data = numpy.ascontiguousarray(buf).view(numpy.uint8).reshape(-1)
+        else:
+           data = numpy.frombuffer(buf, dtype=numpy.uint8)
+        if len(data)%self.size:
+           raise ValueError("buffer should be multiple of %d bytes" % self.size)
+        data  = data.view(_DTYPES[self.size])
+        if self.size!=4: data = data.astype(numpy.uint32) # right-justified
+        return self._move(True, data, self.space)
+
+    def read(self, num, out=None):
+        """
+        Read 'num' items.
+        :param out: writable buffer-protocol object to be filled,
+                    new numpy array when None
+        :return: numpy array of 'num' items of 'size' bytes, None on failure
+        """
+        dtype = _DTYPES[self.size]
+        if out is None:
+           out = numpy.empty(num, dtype=dtype)
+        elif not isinstance(out, numpy.ndarray):
+           out = numpy.frombuffer(out, dtype=numpy.uint8)[:num*self.size].view(dtype)
+        if len(out)<num:
+           raise ValueError("buffer too small (%d items instead of at least %d items)" % (len(out), num))
+        data = out[:num] if self.size==4 else numpy.empty(num, dtype=numpy.uint32)
+        if num and self._move(False, data, self.level): return None
+        if self.size!=4: out[:num] = data
+        return out[:num]
+
+    def _move(self, write, data, reg):
+        bfm    = self.bfm
+        num    = len(data)
+        pos    = 0
+        credit = num if reg is None else 0
+        batch  = bfm.BfmBatch(self.con_handle)
+        try:
+            while pos<num:
+                if credit==0:
+                   credit = self._wait(reg)
+                   if credit==0: return -2
+                   if credit<0: return credit
+                end = pos+min(credit, num-pos, self.chunk)
+                if write:
+                   ret = batch.write_fix(self.addr, data[pos:end], self.size, end-pos)
+                else:
+                   ret = batch.read_fix(self.addr, data[pos:end], self.size, end-pos)
+                if ret: return ret
+                if reg is not None: batch.read(reg[0], self._reg, 4, 1)
+                ret = batch.flush()
+                if ret: return ret
+                self.batches += 1
+                pos    = end
+                credit = num if reg is None else self._value(reg)
+            return 0
+        finally:
+            batch.close()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Register of (address, mask) gets shift of 0, not the mask default
+# 2026.10.18: Default chunk follows BfmGetReadDepth(), i.e., F2U fifo of the transactor
+# 2026.10.18: BfmReadStatus() for polling, since BfmRead() raises on failure
+# 2026.10.18: Started
+#===============================================================================
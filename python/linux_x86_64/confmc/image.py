@@ -0,0 +1,419 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains memory image loader for CON-FMC AMBA BFM.
+
+Image is a list of segments, i.e., (address, bytes), taken from
+  - ELF:       PT_LOAD program headers at their physical addresses
+  - Intel HEX: data records with extended segment/linear addresses
+  - SREC:      S1/S2/S3 records
+  - raw:       binary at a given address
+Segments are merged into regions when adjacent or overlapping, where a later
+segment overrides an earlier one, and gaps are filled only when 'fill' is
+given. Each region is written with maximum-length bursts by BfmWriteBlock(),
+and optionally read back by BfmReadBlock() and compared with vectorized
+operations.
+
+    image  = load('firmware.elf')
+    result = write(confmc.pyconbfmaxi, hdl, image, verify=True)
+    print(result) # MB/s and the first mis-matches if any
+
+Image keeps merged regions, so that reloading the same image on each test
+iteration costs only the transfers.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC memory image loader"
+
+#-------------------------------------------------------------------------------
+import sys
+import os
+import bisect
+import binascii
+import struct
+import timeit
+import numpy
+
+#===============================================================================
+class Image(object):
+    """
+    Memory image.
+    - segments: list of (address, numpy.uint8 array) in the order added
+    - entry: entry address when the file tells, otherwise None
+    """
+    def __init__(self, name=''):
+        self.name     = name
+        self.segments = []
+        self.entry    = None
+        self._regions = {} # (fill, max_gap) -> regions
+
+    def add(self, addr, data):
+        """
+        Add a segment.
+        :param addr: starting address
+        :param data: buffer-protocol object holding bytes
+        """
+        if isinstance(data, numpy.ndarray):
+           data = numpy.ascontiguousarray(data).view(numpy.uint8).reshape(-1)
+        else:
+           data = numpy.frombuffer(data, dtype=numpy.uint8)
+        if len(data):
+           self.segments.append((addr, data))
+           self._regions = {}
+
+    @property
+    def nbytes(self):
+        return sum(len(data) for addr, data in self.segments)
+
+    def regions(self, fill=None, max_gap=None):
+        """
+        Merge segments into regions.
+        :param fill: byte value to fill gaps between segments, None not to fill
+        :param max_gap: number of bytes of a gap to fill at most, None for any
+        :return: list of (address, numpy.uint8 array) in address order
+        """
+        key = (fill, max_gap)
+        if key in self._regions: return self._regions[key]
+        extents = []
+        for addr, data in sorted(self.segments, key=lambda s: s[0]):
+            end = addr+len(data)
+            if extents:
+               gap = addr-extents[-1][1]
+               if (gap<=0) or ((fill is not None) and ((max_gap is None) or (gap<=max_gap))):
+                  extents[-1][1] = max(extents[-1][1], end)
+                  continue
+            extents.append([addr, end])
+        starts  = [start for start, end in extents]
+        regions = [(start, numpy.full(end-start, 0 if fill is None else fill, dtype=numpy.uint8))
+                   for start, end in extents]
+        for addr, data in self.segments: # later one overrides
+            start, region = regions[bisect.bisect_right(starts, addr)-1]
+            region[addr-start:addr-start+len(data)] = data
+        self._regions[key] = regions
+        return regions
+
+    def __str__(self):
+        return "%s: %d segments %d bytes" % (self.name, len(self.segments), self.nbytes)
+
+#===============================================================================
+# Parsers
+#-------------------------------------------------------------------------------
+PT_LOAD = 1
+
+def load_elf(path, vaddr=False, bss=False):
+    """
+    Load PT_LOAD segments of ELF32 or ELF64 of either endian.
+    :param vaddr: True to use virtual address instead of physical address
+    :param bss: True to include zeros beyond file image, i.e., .bss
+    """
+    with open(path, 'rb') as fp: blob = fp.read()
+    if blob[:4]!=b'\x7fELF':
+       raise ValueError(path+": not ELF")
+    cls, endian = bytearray(blob[4:6])
+    if (cls not in (1, 2)) or (endian not in (1, 2)):
+       raise ValueError(path+": unknown ELF class or data encoding")
+    order = '<' if endian==1 else '>'
+    if cls==1:
+       entry, phoff = struct.unpack_from(order+'II', blob, 24)
+       phentsize, phnum = struct.unpack_from(order+'HH', blob, 42)
+    else:
+       entry, phoff = struct.unpack_from(order+'QQ', blob, 24)
+       phentsize, phnum = struct.unpack_from(order+'HH', blob, 54)
+    image = Image(os.path.basename(path))
+    image.entry = entry
+    data = numpy.frombuffer(blob, dtype=numpy.uint8)
+    for idx in range(phnum):
+        off = phoff+idx*phentsize
+        if cls==1:
+           ptype, offset, va, pa, filesz, memsz = struct.unpack_from(order+'IIIIII', blob, off)
+        else:
+           ptype, flags, offset, va, pa, filesz, memsz = struct.unpack_from(order+'IIQQQQQ', blob, off)
+        if ptype!=PT_LOAD: continue
+        addr = va if vaddr else pa
+        if offset+filesz>len(blob):
+           raise ValueError(path+": segment beyond file")
+        image.add(addr, data[offset:offset+filesz])
+        if bss and (memsz>filesz):
+           image.add(addr+filesz, numpy.zeros(memsz-filesz, dtype=numpy.uint8))
+    return image
+
+class _Records(object):
+    # collects records into a segment as long as they are contiguous
+    def __init__(self, image):
+        self.image = image
+        self.addr  = 0
+        self.data  = bytearray()
+
+    def add(self, addr, data):
+        if addr!=self.addr+len(self.data):
+           self.flush()
+           self.addr = addr
+        self.data.extend(data)
+
+    def flush(self):
+        if self.data: self.image.add(self.addr, self.data)
+        self.data = bytearray()
+
+def _record(path, lineno, text):
+    try:
+        return bytearray(binascii.unhexlify(text))
+    except (TypeError, ValueError, binascii.Error):
+        raise ValueError("%s:%d: invalid hex" % (path, lineno))
+
+def load_ihex(path):
+    """
+    Load Intel HEX, where checksum of each record is checked.
+    """
+    image = Image(os.path.basename(path))
+    recs  = _Records(image)
+    base  = 0
+    with open(path, 'r') as fp:
+        for lineno, line in enumerate(fp, 1):
+            line = line.strip()
+            if not line: continue
+            if line[0]!=':':
+               raise ValueError("%s:%d: record should start with ':'" % (path, lineno))
+            rec = _record(path, lineno, line[1:])
+            if (len(rec)<5) or (len(rec)!=rec[0]+5):
+               raise ValueError("%s:%d: invalid record length" % (path, lineno))
+            if sum(rec)&0xFF:
+               raise ValueError("%s:%d: checksum error" % (path, lineno))
+            num, offset, rtype, data = rec[0], (rec[1]<<8)|rec[2], rec[3], rec[4:-1]
+            if rtype==0x00:
+               recs.add(base+offset, data)
+            elif rtype==0x01:
+               break
+            elif rtype==0x02: # extended segment address
+               base = ((data[0]<<8)|data[1])<<4
+            elif rtype==0x04: # extended linear address
+               base = ((data[0]<<8)|data[1])<<16
+            elif rtype==0x03: # start segment address, i.e., CS:IP
+               image.entry = (((data[0]<<8)|data[1])<<4)+((data[2]<<8)|data[3])
+            elif rtype==0x05: # start linear address
+               image.entry = struct.unpack('>I', bytes(data))[0]
+            else:
+               raise ValueError("%s:%d: unknown record type %d" % (path, lineno, rtype))
+    recs.flush()
+    return image
+
+def load_srec(path):
+    """
+    Load Motorola S-record, where checksum of each record is checked.
+    """
+    image = Image(os.path.basename(path))
+    recs  = _Records(image)
+    alen  = { '1':2, '2':3, '3':4, '7':4, '8':3, '9':2 }
+    with open(path, 'r') as fp:
+        for lineno, line in enumerate(fp, 1):
+            line = line.strip()
+            if not line: continue
+            if (line[0]!='S') or (len(line)<4):
+               raise ValueError("%s:%d: record should start with 'S'" % (path, lineno))
+            stype = line[1]
+            rec   = _record(path, lineno, line[2:])
+            if len(rec)!=rec[0]+1:
+               raise ValueError("%s:%d: invalid record length" % (path, lineno))
+            if (sum(rec)&0xFF)!=0xFF:
+               raise ValueError("%s:%d: checksum error" % (path, lineno))
+            if stype not in alen: continue # S0 header, S5/S6 count
+            num  = alen[stype]
+            addr = 0
+            for byte in rec[1:1+num]: addr = (addr<<8)|byte
+            if stype in '123':
+               recs.add(addr, rec[1+num:-1])
+            else:
+               image.entry = addr
+    recs.flush()
+    return image
+
+def load_raw(path, addr=0):
+    """
+    Load raw binary at 'addr'.
+    """
+    image = Image(os.path.basename(path))
+    image.add(addr, numpy.fromfile(path, dtype=numpy.uint8))
+    return image
+
+def load(path, addr=0):
+    """
+    Load image by its contents and extension, where 'addr' is used
+    only for raw binary.
+    """
+    with open(path, 'rb') as fp: head = fp.read(4)
+    ext = os.path.splitext(path)[1].lower()
+    if head==b'\x7fELF':
+       return load_elf(path)
+    if ext in ('.hex', '.ihex', '.ihx') and head[:1]==b':':
+       return load_ihex(path)
+    if ext in ('.srec', '.s19', '.s28', '.s37', '.mot', '.s') and head[:1]==b'S':
+       return load_srec(path)
+    return load_raw(path, addr)
+
+#===============================================================================
+class LoadResult(object):
+    """
+    Result of loading an image.
+    - regions: list of (address, number of bytes) written
+    - nbytes: number of bytes written
+    - write_seconds, verify_seconds: duration of each pass
+    - verify: confmc.memtest.MemTestResult of byte compare, None when not verified
+    """
+    def __init__(self, name):
+        self.name           = name
+        self.regions        = []
+        self.nbytes         = 0
+        self.write_seconds  = 0.0
+        self.verify_seconds = 0.0
+        self.verify         = None
+        self.error          = 0
+
+    @property
+    def ok(self):
+        return (self.error==0) and ((self.verify is None) or self.verify.ok)
+
+    @property
+    def mbps_write(self):
+        return (self.nbytes/self.write_seconds/1.0E6) if self.write_seconds>0 else 0.0
+
+    @property
+    def mbps_verify(self):
+        return (self.nbytes/self.verify_seconds/1.0E6) if self.verify_seconds>0 else 0.0
+
+    def to_dict(self):
+        return { 'name'          : self.name
+               , 'regions'       : self.regions
+               , 'nbytes'        : self.nbytes
+               , 'write_seconds' : self.write_seconds
+               , 'verify_seconds': self.verify_seconds
+               , 'mbps_write'    : self.mbps_write
+               , 'mbps_verify'   : self.mbps_verify
+               , 'error'         : self.error
+               , 'verify'        : None if self.verify is None else self.verify.to_dict() }
+
+    def __str__(self):
+        text = "%s %d bytes in %d regions, write %.2f MB/s" % (self.name, self.nbytes
+               , len(self.regions), self.mbps_write)
+        if self.error: text += ", failed (%d)" % self.error
+        if self.verify is not None:
+           text += ", verify %.2f MB/s" % self.mbps_verify
+           if self.verify.errors:
+              text += ", %d mis-match" % self.verify.errors
+              text += ''.join("\n  0x%08X: expected 0x%02X actual 0x%02X" % x
+                              for x in zip(self.verify.addresses, self.verify.expected
+                                          ,self.verify.actual))
+           else:
+              text += ", OK"
+        return text
+
+#-------------------------------------------------------------------------------
+def write(bfm, con_handle, image, verify=False, fill=None, max_gap=None
+         , chunk=1<<20, max_report=16):
+    """
+    Write image into device memory.
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler
+    :param image: Image or file name to load()
+    :param verify: True to read back and compare
+    :param fill: byte value to fill gaps between segments, None not to fill
+    :param max_gap: number of bytes of a gap to fill at most, None for any
+    :param chunk: number of bytes of each BfmWriteBlock()/BfmReadBlock()
+    :param max_report: number of mis-matches to keep
+    :return: LoadResult
+    """
+    from confmc import memtest
+    if not isinstance(image, Image): image = load(image)
+    regions = image.regions(fill, max_gap)
+    result  = LoadResult(image.name)
+    result.regions = [(addr, len(data)) for addr, data in regions]
+    timer = timeit.default_timer
+    start = timer()
+    for addr, data in regions:
+        for pos in range(0, len(data), chunk):
+            ret = bfm.BfmWriteBlock(con_handle, addr+pos, data[pos:pos+chunk])
+            if ret:
+               result.error = ret
+               break
+        if result.error: break
+        result.nbytes += len(data)
+    result.write_seconds = timer()-start
+    if result.error or not verify: return result
+    result.verify = memtest.MemTestResult(image.name, regions[0][0] if regions else 0
+                                         ,result.nbytes, 1, max_report)
+    actual = numpy.empty(min(chunk, max([len(d) for a, d in regions] or [0])), dtype=numpy.uint8)
+    start  = timer()
+    for addr, data in regions:
+        for pos in range(0, len(data), chunk):
+            num = min(chunk, len(data)-pos)
+            if bfm.BfmReadBlock(con_handle, addr+pos, num, actual[:num]) is None:
+               result.error = -1
+               break
+            result.verify.compare(addr+pos, data[pos:pos+num], actual[:num])
+        if result.error: break
+    result.verify_seconds = timer()-start
+    result.verify.nbytes  = result.nbytes
+    result.verify.seconds = result.verify_seconds
+    return result
+
+#===============================================================================
+def main(argv):
+    import getopt
+    import importlib
+    #----------------------------------------
+    cid    = 0
+    btype  = 'axi'
+    addr   = 0
+    fill   = None
+    verify = False
+    usage  = 'image.py [-b axi|ahb] [-c cid] [-a addr] [-f fill] [-v] file'
+    try:
+        opts, args = getopt.getopt(argv, "hb:c:a:f:v",['help','bfm=','cid=','addr='
+                                                     ,'fill=','verify'])
+    except getopt.GetoptError:
+        print(usage)
+        sys.exit(2)
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+             print(usage)
+             sys.exit()
+        elif opt in ("-b", "--bfm"):
+             btype = arg
+        elif opt in ("-c", "--cid"):
+             cid = int(arg)
+        elif opt in ("-a", "--addr"):
+             addr = int(arg, 0)
+        elif opt in ("-f", "--fill"):
+             fill = int(arg, 0)
+        elif opt in ("-v", "--verify"):
+             verify = True
+    if len(args)!=1:
+       print(usage)
+       sys.exit(2)
+    #----------------------------------------
+    bfm = importlib.import_module('confmc.pyconbfm'+btype)
+    hdl = bfm.conInit(cid)
+    if not hdl:
+       print('CON-FMC not found for CID: '+str(cid))
+       sys.exit(1)
+    if hasattr(bfm, 'BfmSetAmbaAxi4'): bfm.BfmSetAmbaAxi4(hdl)
+    result = write(bfm, hdl, load(args[0], addr), verify, fill)
+    print(str(result))
+    bfm.conRelease(hdl)
+    sys.exit(0 if result.ok else 1)
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main(sys.argv[1:])
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
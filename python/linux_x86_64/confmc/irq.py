@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains event wait for CON-FMC AMBA BFM.
+
+wait_irq() watches FIQ and IRQ, i.e., GPIN[31] and GPIN[30] of the transactor,
+which costs a single-word internal access for each poll.
+wait_condition() waits for registers of the DUT to match with mask and value,
+where all registers are read with a single batch for each poll, optionally
+after IRQ/FIQ tells that something happened.
+
+Polling interval starts short and grows up to 'max_interval', so that a long
+wait leaves USB bandwidth to bulk transfers. A poll does not go in the middle
+of a BFM call of another thread on the same handler, since the BFM holds the
+handler for each call; give the lock only when polls should not go in the
+middle of a sequence of calls of another thread.
+
+    stats = WaitStats()
+    value = wait_irq(confmc.pyconbfmaxi, hdl, timeout=1.0, stats=stats)
+    print(stats)
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC event wait"
+
+#-------------------------------------------------------------------------------
+import time
+import timeit
+import ctypes
+import numpy
+
+#===============================================================================
+GPIN_FIQ = 1<<31
+GPIN_IRQ = 1<<30
+
+#-------------------------------------------------------------------------------
+class WaitStats(object):
+    """
+    Statistics of waits.
+    - waits, timeouts: number of waits and the ones timed out
+    - polls: number of polls
+    - latency: wake-up latency of each wait that found the event, i.e.,
+               interval between the last poll that missed it and the poll
+               that found it, which bounds the delay of detection.
+    - elapsed: duration of each wait that found the event
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.waits    = 0
+        self.timeouts = 0
+        self.polls    = 0
+        self.latency  = []
+        self.elapsed  = []
+
+    @staticmethod
+    def _us(values, q):
+        if not values: return 0.0
+        values = sorted(values)
+        return values[min(len(values)-1, int(q*len(values)))]*1.0E6
+
+    def to_dict(self):
+        return { 'waits'          : self.waits
+               , 'timeouts'       : self.timeouts
+               , 'polls'          : self.polls
+               , 'latency_p50_us' : self._us(self.latency, 0.50)
+               , 'latency_p99_us' : self._us(self.latency, 0.99)
+               , 'latency_max_us' : self._us(self.latency, 1.00)
+               , 'elapsed_p50_us' : self._us(self.elapsed, 0.50)
+               , 'elapsed_max_us' : self._us(self.elapsed, 1.00) }
+
+    def __str__(self):
+        d = self.to_dict()
+        return ("%d waits %d timeouts %d polls, latency p50 %.1f us p99 %.1f us max %.1f us"
+                % (d['waits'], d['timeouts'], d['polls'], d['latency_p50_us']
+                  ,d['latency_p99_us'], d['latency_max_us']))
+
+#-------------------------------------------------------------------------------
+def _wait(poll, timeout, min_interval, max_interval, stats, lock):
+    """
+    Call 'poll()' with growing interval until it returns other than None.
+    :return: what 'poll()' returned, None on timeout
+    """
+    timer    = timeit.default_timer
+    start    = timer()
+    last     = start
+    interval = min_interval
+    polls    = 0
+    while True:
+        if lock is None:
+           found = poll()
+        else:
+           with lock: found = poll()
+        now    = timer()
+        polls += 1
+        if found is not None: break
+        if (timeout is not None) and ((now-start)>=timeout): break
+        last = now
+        if timeout is None:
+           time.sleep(interval)
+        else:
+           time.sleep(min(interval, timeout-(now-start)))
+        interval = min(max_interval, interval*2)
+    if stats is not None:
+       stats.waits += 1
+       stats.polls += polls
+       if found is None:
+          stats.timeouts += 1
+       else:
+          stats.latency.append(now-last)
+          stats.elapsed.append(now-start)
+    return found
+
+#===============================================================================
+def wait_irq(bfm, con_handle, timeout=1.0, mask=GPIN_IRQ|GPIN_FIQ
+            , min_interval=20.0E-6, max_interval=0.002, stats=None, lock=None):
+    """
+    Wait until IRQ or FIQ of the transactor goes high.
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler
+    :param timeout: seconds to wait, None for ever
+    :param mask: GPIN bits to watch, i.e., GPIN_IRQ, GPIN_FIQ or both
+    :param min_interval: seconds between the first and second polls,
+                         which doubles for each poll
+    :param max_interval: seconds between polls at most
+    :param stats: WaitStats to accumulate
+    :param lock: lock to hold during each poll
+    :return: GPIN value on the event, 0 on timeout, otherwize negative value.
+    """
+    value = ctypes.c_uint(0)
+    error = []
+    def poll():
+        ret = bfm.BfmGpin(con_handle, ctypes.byref(value))
+        if ret:
+           error.append(ret)
+           return ret
+        return value.value if value.value&mask else None
+    found = _wait(poll, timeout, min_interval, max_interval, stats, lock)
+    if error: return error[0]
+    return 0 if found is None else found
+
+def wait_condition(bfm, con_handle, conditions, timeout=1.0, match='all', irq=0
+                  , min_interval=20.0E-6, max_interval=0.002, stats=None, lock=None):
+    """
+    Wait until registers match, where all registers are read in a single
+    batch for each poll.
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler
+    :param conditions: list of (address, mask, value), which is met when
+                       'read(address)&mask==value'
+    :param timeout: seconds to wait, None for ever
+    :param match: 'all' or 'any' of conditions
+    :param irq: GPIN bits to watch, e.g., GPIN_IRQ, before reading registers;
+                0 to poll registers only
+    :return: list of register values when met, None on timeout or failure
+    """
+    if match not in ('all', 'any'):
+       raise ValueError("match should be 'all' or 'any'")
+    conditions = [(addr, mask&0xFFFFFFFF, value&0xFFFFFFFF) for addr, mask, value in conditions]
+    if not conditions:
+       raise ValueError("no condition")
+    data   = numpy.zeros(len(conditions), dtype=numpy.uint32)
+    masks  = numpy.array([c[1] for c in conditions], dtype=numpy.uint32)
+    values = numpy.array([c[2] for c in conditions], dtype=numpy.uint32)
+    gpin   = ctypes.c_uint(0)
+    error  = []
+    check  = numpy.all if match=='all' else numpy.any
+    def poll():
+        if irq:
+           ret = bfm.BfmGpin(con_handle, ctypes.byref(gpin))
+           if ret:
+              error.append(ret)
+              return ret
+           if not (gpin.value&irq): return None
+        batch = bfm.BfmBatch(con_handle)
+        try:
+            for idx, (addr, mask, value) in enumerate(conditions):
+                ret = batch.read(addr, data[idx:idx+1], 4, 1)
+                if ret: break
+            if not ret: ret = batch.flush()
+        finally:
+            batch.close()
+        if ret:
+           error.append(ret)
+           return ret
+        return [int(x) for x in data] if check((data&masks)==values) else None
+    found = _wait(poll, timeout, min_interval, max_interval, stats, lock)
+    if error: return None
+    return found
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
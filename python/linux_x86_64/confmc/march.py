@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains pattern and March memory tests for CON-FMC AMBA BFM.
+
+Pattern tests (walking-1/0, checkerboard, address-in-address) write the
+whole range and then read it back, using confmc.memtest engine.
+March tests apply each element as burst sweeps in ascending or descending
+order, where all operations of the element are carried out on a burst
+before moving to the next burst; i.e., a burst takes the role of a cell.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC March memory test"
+
+#-------------------------------------------------------------------------------
+import sys
+import timeit
+import collections
+import numpy
+from confmc import memtest
+
+#===============================================================================
+# Data patterns: function(addr, nitems, size) returning numpy.uint32 array.
+#-------------------------------------------------------------------------------
+def _word_index(addr, nitems):
+    return numpy.arange(addr>>2, (addr>>2)+nitems, dtype=numpy.uint64)
+
+def pattern_walking1(addr, nitems, size=4):
+    """
+    A single 1 walking across the word, moving a bit for each word.
+    """
+    shift = (_word_index(addr, nitems)%32).astype(numpy.uint32)
+    return numpy.left_shift(numpy.uint32(1), shift)
+
+def pattern_walking0(addr, nitems, size=4):
+    """
+    A single 0 walking across the word, moving a bit for each word.
+    """
+    return numpy.invert(pattern_walking1(addr, nitems, size))
+
+def pattern_checkerboard(addr, nitems, size=4):
+    """
+    0x55555555 and 0xAAAAAAAA alternating word by word.
+    """
+    odd = (_word_index(addr, nitems)&1).astype(bool)
+    return numpy.where(odd, numpy.uint32(0xAAAAAAAA), numpy.uint32(0x55555555)).astype(numpy.uint32)
+
+def pattern_checkerboard_inv(addr, nitems, size=4):
+    """
+    Inverse of checkerboard.
+    """
+    return numpy.invert(pattern_checkerboard(addr, nitems, size))
+
+def pattern_address(addr, nitems, size=4):
+    """
+    Address of each word as its data.
+    """
+    return memtest.pattern_address(addr, nitems, 4)
+
+#===============================================================================
+# March elements: (direction, operations), where direction is 'up', 'down' or
+# 'any' and each operation is 'r0', 'r1', 'w0' or 'w1'.
+#-------------------------------------------------------------------------------
+MARCH_C_MINUS = [ ('any' , ('w0',))
+                , ('up'  , ('r0','w1'))
+                , ('up'  , ('r1','w0'))
+                , ('down', ('r0','w1'))
+                , ('down', ('r1','w0'))
+                , ('any' , ('r0',)) ]
+
+MARCH_B       = [ ('any' , ('w0',))
+                , ('up'  , ('r0','w1','r1','w0','r0','w1'))
+                , ('up'  , ('r1','w0','w1'))
+                , ('down', ('r1','w0','w1','w0'))
+                , ('down', ('r0','w1','w0')) ]
+
+#-------------------------------------------------------------------------------
+def march(bfm, con_handle, saddr, depth, elements, background=0x00000000
+         , chunk=0x40000, max_report=16, name='march'):
+    """
+    Run March elements over the range with burst sweeps.
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler
+    :param saddr: starting address to test, which should be 4-byte aligned
+    :param depth: number of bytes to test, which should be multiple of 4
+    :param elements: list of March elements, e.g., MARCH_C_MINUS
+    :param background: 32-bit data for '0', while its inverse for '1'
+    :param chunk: number of bytes of each batch
+    :param max_report: number of mis-matches to keep details
+    :return: MemTestResult, which is not ok when an access failed
+    """
+    if (saddr&0x3) or (depth&0x3):
+       raise ValueError("address and depth should be multiple of 4")
+    nreads = sum(1 for direction, operations in elements
+                   for op in operations if op[0]=='r')
+    result = memtest.MemTestResult(name, saddr, depth, 4, max_report
+                                  , expect=nreads*(depth>>2))
+    chunk  = max(4, chunk&~0x3)
+    value  = {'0': numpy.uint32(background&0xFFFFFFFF)
+             ,'1': numpy.uint32(~background&0xFFFFFFFF)}
+    fill   = {}
+    for key in value:
+        fill[key] = numpy.empty(min(chunk, depth)>>2, dtype=numpy.uint32)
+        fill[key].fill(value[key])
+    chunks = [(addr, min(chunk, saddr+depth-addr)>>2)
+              for addr in range(saddr, saddr+depth, chunk)]
+    moved  = 0
+    timer  = timeit.default_timer
+    start  = timer()
+    for direction, operations in elements:
+        nreads = sum(1 for op in operations if op[0]=='r')
+        order  = chunks if direction!='down' else reversed(chunks)
+        for addr, nitems in order:
+            plan  = memtest.bursts(bfm, con_handle, addr, nitems, 4)
+            if direction=='down': plan.reverse()
+            rbufs = [numpy.empty(nitems, dtype=numpy.uint32) for idx in range(nreads)]
+            batch = bfm.BfmBatch(con_handle)
+            ret   = 0
+            try:
+                for baddr, idx, num in plan:
+                    ridx = 0
+                    for op in operations:
+                        if op[0]=='w':
+                           ret = batch.write(baddr, fill[op[1]][:num], 4, num)
+                        else:
+                           ret = batch.read(baddr, rbufs[ridx][idx:idx+num], 4, num)
+                           ridx += 1
+                        if ret: break
+                    if ret: break
+                if not ret: ret = batch.flush()
+            finally:
+                batch.close()
+            if ret:
+               result.fail(addr, ret)
+               break
+            moved += len(operations)*nitems*4
+            ridx = 0
+            for op in operations:
+                if op[0]=='r':
+                   result.compare(addr, fill[op[1]][:nitems], rbufs[ridx])
+                   ridx += 1
+        else:
+            continue
+        break # failed to access, i.e., 'result.status'
+    result.seconds = timer()-start
+    result.nbytes  = moved
+    return result
+
+#===============================================================================
+# Tests by name: function(bfm, con_handle, saddr, depth, **kwargs)
+#-------------------------------------------------------------------------------
+def _pattern_test(name, pattern):
+    def test(bfm, con_handle, saddr, depth, **kwargs):
+        return memtest.memtest(bfm, con_handle, saddr, depth, pattern=pattern
+                              , order='all', name=name, **kwargs)
+    return test
+
+def _march_test(name, elements):
+    def test(bfm, con_handle, saddr, depth, **kwargs):
+        return march(bfm, con_handle, saddr, depth, elements, name=name, **kwargs)
+    return test
+
+TESTS = collections.OrderedDict()
+TESTS['walking1']         = _pattern_test('walking1', pattern_walking1)
+TESTS['walking0']         = _pattern_test('walking0', pattern_walking0)
+TESTS['checkerboard']     = _pattern_test('checkerboard', pattern_checkerboard)
+TESTS['checkerboard-inv'] = _pattern_test('checkerboard-inv', pattern_checkerboard_inv)
+TESTS['address']          = _pattern_test('address', pattern_address)
+TESTS['march-c-']         = _march_test('march-c-', MARCH_C_MINUS)
+TESTS['march-b']          = _march_test('march-b', MARCH_B)
+
+#-------------------------------------------------------------------------------
+def run(bfm, con_handle, saddr, depth, names=None, verbose=True, **kwargs):
+    """
+    Run tests selected by name over the range.
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler
+    :param saddr: starting address to test
+    :param depth: number of bytes to test
+    :param names: list of test names in TESTS, None for all
+    :param verbose: print summary of each test when True
+    :return: list of MemTestResult
+    """
+    names = list(TESTS) if names is None else names
+    for name in names:
+        if name not in TESTS:
+           raise ValueError("unknown test: "+str(name))
+    results = []
+    for name in names:
+        result = TESTS[name](bfm, con_handle, saddr, depth, **kwargs)
+        if verbose: print(str(result))
+        results.append(result)
+    return results
+
+#-------------------------------------------------------------------------------
+def main(argv):
+    import getopt
+    import json
+    import importlib
+    #----------------------------------------
+    cid   = 0
+    btype = 'axi'
+    saddr = 0
+    depth = 0x100000
+    names = None
+    jout  = False
+    usage = 'march.py [-b axi|ahb] [-c cid] [-a addr] [-d depth] [-t name,...] [-j] [-l]'
+    try:
+        opts, args = getopt.getopt(argv, "hb:c:a:d:t:jl",['help','bfm=','cid=','addr='
+                                                         ,'depth=','test=','json','list'])
+    except getopt.GetoptError:
+        print(usage)
+        sys.exit(2)
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+             print(usage)
+             sys.exit()
+        elif opt in ("-l", "--list"):
+             print(' '.join(TESTS))
+             sys.exit()
+        elif opt in ("-b", "--bfm"):
+             btype = arg
+        elif opt in ("-c", "--cid"):
+             cid = int(arg)
+        elif opt in ("-a", "--addr"):
+             saddr = int(arg, 0)
+        elif opt in ("-d", "--depth"):
+             depth = int(arg, 0)
+        elif opt in ("-t", "--test"):
+             names = arg.split(',')
+        elif opt in ("-j", "--json"):
+             jout = True
+    #----------------------------------------
+    bfm = importlib.import_module('confmc.pyconbfm'+btype)
+    hdl = bfm.conInit(cid)
+    if not hdl:
+       print(bfm.conErrorMsgConapi(bfm.conGetErrorConapi())+' for CID: '+str(cid))
+       sys.exit(1)
+    if btype=='axi': bfm.BfmSetAmbaAxi4(hdl)
+    results = run(bfm, hdl, saddr, depth, names, verbose=not jout)
+    if jout: print(json.dumps([r.to_dict() for r in results], indent=2))
+    bfm.conRelease(hdl)
+    sys.exit(0 if all(r.ok for r in results) else 1)
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    main(sys.argv[1:])
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Batch depth follows BfmGetReadDepth(), i.e., F2U fifo of the transactor
+# 2026.10.18: Failed access recorded in the result, so that main() exits with 1
+# 2026.10.18: Started
+#===============================================================================
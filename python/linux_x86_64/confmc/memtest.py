@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains memory test engine for CON-FMC AMBA BFM.
+
+Patterns are generated with NumPy in bulk, moved with maximum-length bursts
+queued in a batch and compared chunk by chunk with vectorized operations.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC memory test"
+
+#-------------------------------------------------------------------------------
+import timeit
+import numpy
+
+#===============================================================================
+class MemTestResult(object):
+    """
+    Result of memory test.
+    - errors: number of mis-matched items
+    - status: 0, or negative value of the transfer that failed, e.g.,
+              errors.BFM_ERR_WRITE, after which the test has stopped
+    - failed: address of the chunk whose transfer failed, None if not
+    - addresses, expected, actual: the first 'max_report' mis-matches
+    - bit_errors: number of errors of each bit of 32-bit data
+    - nbytes: number of bytes moved for both write and read
+    - seconds: duration
+    - expect: number of items to compare, 'depth//size' by default
+    """
+    def __init__(self, name, saddr, depth, size, max_report=16, expect=None):
+        self.name       = name
+        self.saddr      = saddr
+        self.depth      = depth
+        self.size       = size
+        self.items      = 0
+        self.errors     = 0
+        self.status     = 0
+        self.failed     = None
+        self.addresses  = []
+        self.expected   = []
+        self.actual     = []
+        self.bit_errors = numpy.zeros(32, dtype=numpy.uint64)
+        self.nbytes     = 0
+        self.seconds    = 0.0
+        self.max_report = max_report
+        self.expect     = (depth//size) if expect is None else expect
+
+    @property
+    def ok(self):
+        """
+        True when all items have been compared without mis-match.
+        """
+        return (self.errors==0) and (self.status==0) and (self.items==self.expect)
+
+    def fail(self, addr, status):
+        """
+        Record the transfer of the chunk at 'addr' failed with 'status'.
+        """
+        self.status = status
+        self.failed = addr
+
+    @property
+    def mbps(self):
+        """
+        Achieved throughput in MB/s.
+        """
+        return (self.nbytes/self.seconds/1.0E6) if self.seconds>0 else 0.0
+
+    def compare(self, addr, expected, actual):
+        """
+        Compare 'actual' against 'expected', both of which are numpy.uint32
+        arrays of items from 'addr', and accumulate mis-matches.
+        :return: number of mis-matches
+        """
+        self.items += len(expected)
+        diff = numpy.bitwise_xor(expected, actual)
+        idx  = numpy.flatnonzero(diff)
+        if len(idx)==0: return 0
+        self.errors += len(idx)
+        diff = diff[idx]
+        for bit in range(32):
+            self.bit_errors[bit] += numpy.count_nonzero(diff&numpy.uint32(1<<bit))
+        room = self.max_report-len(self.addresses)
+        if room>0:
+           idx = idx[:room]
+           self.addresses.extend(int(addr+i*self.size) for i in idx)
+           self.expected.extend(int(x) for x in expected[idx])
+           self.actual.extend(int(x) for x in actual[idx])
+        return len(diff)
+
+    def to_dict(self):
+        return { 'name'      : self.name
+               , 'saddr'     : self.saddr
+               , 'depth'     : self.depth
+               , 'size'      : self.size
+               , 'items'     : self.items
+               , 'errors'    : self.errors
+               , 'status'    : self.status
+               , 'failed'    : self.failed
+               , 'addresses' : self.addresses
+               , 'expected'  : self.expected
+               , 'actual'    : self.actual
+               , 'bit_errors': [int(x) for x in self.bit_errors]
+               , 'nbytes'    : self.nbytes
+               , 'seconds'   : self.seconds
+               , 'mbps'      : self.mbps }
+
+    def __str__(self):
+        if self.status:
+           return "%s size%d transfer failed (%d) at 0x%08X after %d items" % (
+                  self.name, self.size, self.status, self.failed, self.items)
+        if self.errors:
+           return "%s size%d %d mis-match out of %d items (%.2f MB/s)" % (
+                  self.name, self.size, self.errors, self.items, self.mbps)
+        return "%s size%d %d OK (%.2f MB/s)" % (self.name, self.size, self.depth, self.mbps)
+
+#-------------------------------------------------------------------------------
+def bursts(bfm, con_handle, addr, nitems, size, length=0):
+    """
+    Split 'nitems' items of 'size' bytes from 'addr' into bursts,
+    which do not exceed 'length' or the maximum burst length and
+    do not cross the burst boundary.
+    :return: list of (address, item index, burst length)
+    """
+    blen = bfm.BfmGetBurstMax(con_handle)
+    if length: blen = min(blen, length)
+    boundary = bfm._burst_boundary
+    result = []
+    idx = 0
+    while idx<nitems:
+        num = min(nitems-idx, blen, (boundary-(addr%boundary))//size)
+        result.append((addr, idx, num))
+        addr += num*size
+        idx  += num
+    return result
+
+def write_items(bfm, con_handle, addr, data, size=4, length=0):
+    """
+    Write numpy.uint32 array of right-justified items with bursts
+    pushed back to back.
+    :return: 0 on success, otherwize negative value.
+    """
+    batch = bfm.BfmBatch(con_handle)
+    try:
+        for baddr, idx, num in bursts(bfm, con_handle, addr, len(data), size, length):
+            ret = batch.write(baddr, data[idx:idx+num], size, num)
+            if ret: return ret
+        return batch.flush()
+    finally:
+        batch.close()
+
+def read_items(bfm, con_handle, addr, nitems, size=4, length=0, out=None):
+    """
+    Read right-justified items into numpy.uint32 array with bursts
+    pushed back to back.
+    :return: numpy.uint32 array, None on failure.
+    """
+    if out is None: out = numpy.empty(nitems, dtype=numpy.uint32)
+    if _read_items(bfm, con_handle, addr, out, size, length): return None
+    return out
+
+def _read_items(bfm, con_handle, addr, out, size, length):
+    """
+    :return: 0 on success, otherwize negative value.
+    """
+    batch = bfm.BfmBatch(con_handle)
+    try:
+        for baddr, idx, num in bursts(bfm, con_handle, addr, len(out), size, length):
+            ret = batch.read(baddr, out[idx:idx+num], size, num)
+            if ret: return ret
+        return batch.flush()
+    finally:
+        batch.close()
+
+#-------------------------------------------------------------------------------
+def _mask(size):
+    return numpy.uint32((1<<(8*size))-1)
+
+def pattern_address(addr, nitems, size, offset=0):
+    """
+    Address (plus 'offset') of each item as data.
+    """
+    data = numpy.arange(addr, addr+nitems*size, size, dtype=numpy.uint64)+offset
+    return data.astype(numpy.uint32)&_mask(size)
+
+class pattern_random(object):
+    """
+    Seeded random data, which generates the same sequence after reset().
+    """
+    def __init__(self, seed):
+        self.seed = seed
+        self.reset()
+    def reset(self):
+        self.rng = numpy.random.RandomState(self.seed)
+    def __call__(self, addr, nitems, size):
+        data = self.rng.randint(0, 1<<32, size=nitems, dtype=numpy.uint64)
+        return data.astype(numpy.uint32)&_mask(size)
+
+#-------------------------------------------------------------------------------
+def memtest(bfm, con_handle, saddr, depth, pattern='random', order='all'
+           , size=4, length=0, seed=0x11, chunk=0x100000, max_report=16
+           , name=None):
+    """
+    Memory test.
+    :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :param con_handle: CON-FMC handler
+    :param saddr: starting address to test
+    :param depth: number of bytes to test
+    :param pattern: 'random', 'address', 'address+1' or
+                    function(addr, nitems, size) returning numpy.uint32 array
+    :param order: 'raw' for read-after-write chunk by chunk,
+                  'all' for read-all-after-write-all
+    :param size: number of bytes for each item and can be 1, 2, 4
+    :param length: burst length, 0 for the maximum
+    :param seed: seed for 'random'
+    :param chunk: number of bytes of each chunk
+    :param max_report: number of mis-matches to keep details
+    :return: MemTestResult, which tells the transfer failed, if any,
+             by 'status' and 'ok'
+    """
+    if size not in (1, 2, 4):
+       raise ValueError("size should be 1, 2 or 4")
+    if pattern=='random':
+       gen = pattern_random(seed)
+    elif pattern=='address':
+       gen = lambda addr, nitems, size: pattern_address(addr, nitems, size)
+    elif pattern=='address+1':
+       gen = lambda addr, nitems, size: pattern_address(addr, nitems, size, 1)
+    else:
+       gen = pattern
+    result = MemTestResult(name or ('memtest-'+str(pattern)+'-'+order)
+                          , saddr, depth, size, max_report)
+    chunk  = max(size, chunk-(chunk%size))
+    chunks = [(addr, min(chunk, saddr+depth-addr)//size)
+              for addr in range(saddr, saddr+depth, chunk)]
+    timer  = timeit.default_timer
+    start  = timer()
+    rdata  = numpy.empty(max(n for a, n in chunks) if chunks else 0, dtype=numpy.uint32)
+    if order=='raw':
+       for addr, nitems in chunks:
+           wdata = gen(addr, nitems, size)
+           ret   = write_items(bfm, con_handle, addr, wdata, size, length) or\
+                   _read_items(bfm, con_handle, addr, rdata[:nitems], size, length)
+           if ret:
+              result.fail(addr, ret)
+              break
+           result.compare(addr, wdata, rdata[:nitems]&_mask(size))
+    else:
+       for addr, nitems in chunks:
+           ret = write_items(bfm, con_handle, addr, gen(addr, nitems, size), size, length)
+           if ret:
+              result.fail(addr, ret)
+              break
+       if hasattr(gen, 'reset'): gen.reset()
+       for addr, nitems in chunks:
+           if result.status: break # nothing to compare
+           wdata = gen(addr, nitems, size)
+           ret   = _read_items(bfm, con_handle, addr, rdata[:nitems], size, length)
+           if ret:
+              result.fail(addr, ret)
+              break
+           result.compare(addr, wdata, rdata[:nitems]&_mask(size))
+    result.seconds = timer()-start
+    result.nbytes  = 2*result.items*size
+    return result
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Batch depth follows BfmGetReadDepth(), i.e., F2U fifo of the transactor
+# 2026.10.18: Failed transfer recorded in MemTestResult, which is not ok then
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,325 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains opt-in instrumentation for CON-FMC AMBA BFM.
+
+While enabled, BFM and conapi calls of the BFM module are replaced by
+wrappers, which record number of calls, errors, bytes, burst length and
+latency histograms for each handler, and USB transfers are counted by the
+BFM library itself including partial transfers and ZLPs.
+Original calls are put back when disabled, so that nothing is paid then.
+
+    with Metrics(confmc.pyconbfmaxi, trace=True) as metrics:
+         ...
+    print(metrics.to_prometheus())
+    metrics.dump_trace('trace.json') # chrome://tracing or Perfetto
+
+Note that only calls through the module are seen, e.g., 'bfm.BfmWrite()',
+while the ones bound before enabling, e.g., 'from ... import BfmWrite', are not.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC instrumentation"
+
+#-------------------------------------------------------------------------------
+import json
+import ctypes
+import timeit
+import numbers
+import threading
+import collections
+
+#===============================================================================
+# Calls to instrument and how to get (number of bytes, burst length) from
+# their arguments, i.e., (con_handle, addr, pdata, size, length) for BfmWrite.
+#-------------------------------------------------------------------------------
+def _burst(args):
+    return args[3]*args[4], args[4]
+
+_CALLS = collections.OrderedDict()
+_CALLS['BfmWrite']         = _burst
+_CALLS['BfmRead']          = _burst
+_CALLS['BfmWriteFix']      = _burst
+_CALLS['BfmReadFix']       = _burst
+_CALLS['BfmWriteStatus']   = _burst
+_CALLS['BfmReadStatus']    = _burst
+_CALLS['BfmWriteFixStatus']= _burst
+_CALLS['BfmReadFixStatus'] = _burst
+_CALLS['BfmGpout']         = lambda args: (0, 0)
+_CALLS['BfmGpin']          = lambda args: (0, 0)
+_CALLS['BfmWriteBlock']    = None # set by Metrics, which needs the module
+_CALLS['BfmReadBlock']     = lambda args: (args[2], 0)
+_CALLS['BfmRecover']       = None
+_CALLS['conInit']          = None
+_CALLS['conRelease']       = None
+_CALLS['conGetCid']        = None
+_CALLS['conGetUsbInfo']    = None
+_CALLS['conGetFx3Info']    = None
+_CALLS['conGetBoardInfo']  = None
+_CALLS['conGetMasterInfo'] = None
+_CALLS['conReset']         = None
+_CALLS['conSetMode']       = None
+
+# Calls returning None or NULL on failure, while others return void or status
+_NULL_FAILS = ('conInit', 'BfmReadBlock')
+
+# Upper bounds of histogram buckets
+LATENCY_BUCKETS_US = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 100000)
+BURST_BUCKETS      = (1, 2, 4, 8, 16, 32, 64, 128, 256, 1024, 4096)
+
+#-------------------------------------------------------------------------------
+def _bucket(bounds, value):
+    for idx, bound in enumerate(bounds):
+        if value<=bound: return idx
+    return len(bounds) # +Inf
+
+def _failed(ret):
+    """
+    Return True when the call failed, i.e., negative status.
+    """
+    return isinstance(ret, numbers.Integral) and (ret<0)
+
+class CallStats(object):
+    """
+    Statistics of a call on a handler.
+    """
+    def __init__(self):
+        self.calls   = 0
+        self.errors  = 0
+        self.nbytes  = 0
+        self.seconds = 0.0
+        self.latency = [0]*(len(LATENCY_BUCKETS_US)+1)
+        self.burst   = [0]*(len(BURST_BUCKETS)+1)
+
+    def to_dict(self):
+        return { 'calls'   : self.calls
+               , 'errors'  : self.errors
+               , 'bytes'   : self.nbytes
+               , 'seconds' : self.seconds
+               , 'latency_us_buckets': dict(zip([str(b) for b in LATENCY_BUCKETS_US]+['inf'], self.latency))
+               , 'burst_buckets'     : dict(zip([str(b) for b in BURST_BUCKETS]+['inf'], self.burst)) }
+
+#===============================================================================
+class Metrics(object):
+    """
+    Instrumentation of a BFM module.
+    """
+    def __init__(self, bfm, trace=False, trace_max=1000000):
+        """
+        :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+        :param trace: True to keep events for Chrome trace
+        :param trace_max: number of events to keep at most
+        """
+        self.bfm       = bfm
+        self.trace     = trace
+        self.trace_max = trace_max
+        self.events    = []
+        self.stats     = {} # (cid, call) -> CallStats
+        self.handles   = {} # cid -> con_handle, for USB counters
+        self.enabled   = False
+        self._origs    = {}
+        self._lock     = threading.Lock()
+        self._start    = timeit.default_timer()
+
+    #---------------------------------------------------------------------------
+    def enable(self):
+        if self.enabled: return
+        bfm = self.bfm
+        for name, sizer in _CALLS.items():
+            func = getattr(bfm, name, None)
+            if func is None: continue
+            if name=='BfmWriteBlock':
+               sizer = lambda args: (bfm._buffer_nbytes(args[2]), 0)
+            self._origs[name] = func
+            setattr(bfm, name, self._wrap(name, func, sizer))
+        if hasattr(bfm, 'BfmStatsEnable'): bfm.BfmStatsEnable(True)
+        self.enabled = True
+
+    def disable(self):
+        if not self.enabled: return
+        for name, func in self._origs.items():
+            setattr(self.bfm, name, func)
+        self._origs = {}
+        if hasattr(self.bfm, 'BfmStatsEnable'): self.bfm.BfmStatsEnable(False)
+        self.enabled = False
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.disable()
+
+    def clear(self):
+        with self._lock:
+            self.stats  = {}
+            self.events = []
+        if hasattr(self.bfm, 'BfmStatsClear'):
+           for hdl in self.handles.values(): self.bfm.BfmStatsClear(hdl)
+
+    #---------------------------------------------------------------------------
+    def _wrap(self, name, func, sizer):
+        timer = timeit.default_timer
+        def wrapper(*args, **kwargs):
+            cid   = -1 if name=='conInit' else self._cid(args) # before it is freed
+            if name=='conRelease': self._forget(args[0] if args else None)
+            start = timer()
+            try:
+                ret = func(*args, **kwargs)
+            except IOError: # e.g., errors.BfmError, which is counted as well
+                self._record(cid, name, start, timer(), 0, 0, True)
+                raise
+            end   = timer()
+            if name=='conInit':
+               cid = args[0] if args else kwargs.get('con_cid', 0)
+               if ret: self.handles[cid] = ret
+            nbytes, length = sizer(args) if sizer else (0, 0)
+            failed = (not ret) if name in _NULL_FAILS else _failed(ret)
+            self._record(cid, name, start, end, nbytes, length, failed)
+            return ret
+        wrapper.__name__ = name
+        wrapper.__doc__  = func.__doc__
+        return wrapper
+
+    def _forget(self, handle):
+        """
+        Drop the handle to be released, which should not go to BfmStatsGet().
+        """
+        addr = ctypes.cast(handle, ctypes.c_void_p).value if handle else None
+        for cid, hdl in list(self.handles.items()):
+            if ctypes.cast(hdl, ctypes.c_void_p).value==addr:
+               del self.handles[cid]
+
+    @staticmethod
+    def _cid(args):
+        try:
+            return args[0].contents.cid
+        except (AttributeError, ValueError, IndexError):
+            return -1
+
+    def _record(self, cid, name, start, end, nbytes, length, failed):
+        with self._lock:
+            stats = self.stats.get((cid, name))
+            if stats is None: stats = self.stats[(cid, name)] = CallStats()
+            stats.calls   += 1
+            stats.errors  += 1 if failed else 0
+            stats.nbytes  += nbytes
+            stats.seconds += end-start
+            stats.latency[_bucket(LATENCY_BUCKETS_US, (end-start)*1.0E6)] += 1
+            if length: stats.burst[_bucket(BURST_BUCKETS, length)] += 1
+            if self.trace and (len(self.events)<self.trace_max):
+               self.events.append((name, cid, threading.current_thread().ident
+                                  ,start-self._start, end-start, nbytes))
+
+    #---------------------------------------------------------------------------
+    def usb(self):
+        """
+        Counters of USB transfers of each handler seen by conInit().
+        :return: dictionary of CID and dictionary of counters
+        """
+        result = {}
+        if hasattr(self.bfm, 'BfmStatsGet'):
+           for cid, hdl in self.handles.items():
+               stats = self.bfm.BfmStatsGet(hdl)
+               if stats is not None: result[cid] = stats.to_dict()
+        return result
+
+    def to_dict(self):
+        calls = {}
+        with self._lock:
+            for (cid, name), stats in sorted(self.stats.items()):
+                calls.setdefault(str(cid), {})[name] = stats.to_dict()
+        return { 'calls': calls
+               , 'usb'  : dict((str(cid), value) for cid, value in self.usb().items()) }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent, sort_keys=True)
+
+    def to_prometheus(self):
+        """
+        Return metrics in Prometheus text exposition format.
+        """
+        lines = []
+        def add(name, kind, text, samples):
+            lines.append('# HELP confmc_'+name+' '+text)
+            lines.append('# TYPE confmc_'+name+' '+kind)
+            for labels, value in samples:
+                label = ','.join('%s="%s"' % kv for kv in labels)
+                lines.append('confmc_%s{%s} %s' % (name, label, value))
+        def histogram(name, text, bounds, attr, scale):
+            lines.append('# HELP confmc_'+name+' '+text)
+            lines.append('# TYPE confmc_'+name+' histogram')
+            for (cid, call), stats in items:
+                label  = 'cid="%s",call="%s"' % (cid, call)
+                counts = getattr(stats, attr)
+                acc    = 0
+                for bound, count in zip(['%g' % (b*scale) for b in bounds]+['+Inf'], counts):
+                    acc += count
+                    lines.append('confmc_%s_bucket{%s,le="%s"} %d' % (name, label, bound, acc))
+                if attr=='latency':
+                   lines.append('confmc_%s_sum{%s} %r' % (name, label, stats.seconds))
+                lines.append('confmc_%s_count{%s} %d' % (name, label, acc))
+        with self._lock:
+            items = sorted(self.stats.items())
+        add('calls_total', 'counter', 'Number of calls.'
+           ,[((('cid', cid), ('call', call)), s.calls) for (cid, call), s in items])
+        add('errors_total', 'counter', 'Number of failed calls.'
+           ,[((('cid', cid), ('call', call)), s.errors) for (cid, call), s in items])
+        add('bytes_total', 'counter', 'Number of bytes moved.'
+           ,[((('cid', cid), ('call', call)), s.nbytes) for (cid, call), s in items])
+        histogram('latency_seconds', 'Latency of calls.', LATENCY_BUCKETS_US, 'latency', 1.0E-6)
+        histogram('burst_length', 'Burst length of calls.', BURST_BUCKETS, 'burst', 1)
+        usb = sorted(self.usb().items())
+        for key, text in (('writes', 'Number of bulk-out transfers.')
+                         ,('reads', 'Number of bulk-in transfers.')
+                         ,('words_out', 'Number of words moved out.')
+                         ,('words_in', 'Number of words moved in.')
+                         ,('partial_writes', 'Number of bulk-out transfers moved less than asked.')
+                         ,('partial_reads', 'Number of bulk-in transfers moved less than asked.')
+                         ,('zlps', 'Number of zero-length packets.')
+                         ,('errors', 'Number of failed transfers.')
+                         ,('recoveries', 'Number of times brought back in sync.')
+                         ,('retries', 'Number of reads tried again after recovery.')):
+            add('usb_'+key+'_total', 'counter', text
+               ,[((('cid', cid),), value[key]) for cid, value in usb])
+        return '\n'.join(lines)+'\n'
+
+    def dump_trace(self, path):
+        """
+        Write events in Chrome trace format, where each CID is a process
+        and each thread is a thread.
+        """
+        with self._lock:
+            events = list(self.events)
+        trace = [{ 'name': name, 'cat': 'confmc', 'ph': 'X'
+                 , 'ts'  : start*1.0E6, 'dur': dur*1.0E6
+                 , 'pid' : cid, 'tid': tid, 'args': {'bytes': nbytes} }
+                 for name, cid, tid, start, dur, nbytes in events]
+        with open(path, 'w') as fp:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ns'}, fp)
+
+#-------------------------------------------------------------------------------
+def enable(bfm, trace=False):
+    """
+    Enable instrumentation of the BFM module.
+    :return: Metrics, which is to be disabled by disable()
+    """
+    metrics = Metrics(bfm, trace)
+    metrics.enable()
+    return metrics
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Handles released dropped from USB counters
+# 2026.10.18: Exceptions counted as errors, and recovery counters
+# 2026.10.18: Started
+#===============================================================================
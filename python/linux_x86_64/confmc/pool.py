@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains multi-card pool for CON-FMC AMBA BFM.
+
+All cards are discovered and opened in parallel, and each card is served
+by its own worker thread, where BFM calls release the GIL during USB
+transfers, so that a job on all cards takes as long as the slowest card.
+
+    with CardPool(confmc.pyconbfmaxi) as pool:
+         result = pool.map(confmc.memtest.memtest, 0, 0x1000000)
+         print(result)
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC multi-card pool"
+
+#-------------------------------------------------------------------------------
+import ctypes
+import numbers
+import threading
+import timeit
+try:
+    import queue
+except ImportError: # Python 2
+    import Queue as queue
+
+#===============================================================================
+def cid_max(bfm):
+    """
+    Return the number of CIDs, i.e., 'con_cid_max' of libconapi when available.
+    """
+    for lib in (getattr(bfm, 'conbfm', None), getattr(bfm, 'confmc', None)):
+        try:
+            return ctypes.c_uint.in_dll(lib, 'con_cid_max').value
+        except (ValueError, TypeError, AttributeError):
+            pass
+    return 8 # CID: 0~7
+
+#-------------------------------------------------------------------------------
+class CardResult(object):
+    """
+    Result of a job on a card.
+    - value: what the job returned
+    - error: exception raised, None if not
+    - nbytes: taken from 'value.nbytes' when it has one, e.g., MemTestResult
+    """
+    def __init__(self, cid, value=None, error=None, seconds=0.0):
+        self.cid     = cid
+        self.value   = value
+        self.error   = error
+        self.seconds = seconds
+        self.nbytes  = getattr(value, 'nbytes', 0) if error is None else 0
+
+    @property
+    def errors(self):
+        """
+        Number of errors, i.e., 1 for exception or negative return value,
+        'value.errors' when it has one, or 1 when 'value.ok' is False without
+        errors, e.g., MemTestResult of a transfer failed.
+        """
+        if self.error is not None: return 1
+        if isinstance(self.value, numbers.Integral) and (self.value<0): return 1
+        errors = getattr(self.value, 'errors', 0)
+        if (not errors) and (getattr(self.value, 'ok', True) is False): return 1
+        return errors
+
+    @property
+    def mbps(self):
+        return (self.nbytes/self.seconds/1.0E6) if self.seconds>0 else 0.0
+
+    def to_dict(self):
+        return { 'cid'    : self.cid
+               , 'error'  : None if self.error is None else repr(self.error)
+               , 'errors' : self.errors
+               , 'nbytes' : self.nbytes
+               , 'seconds': self.seconds
+               , 'mbps'   : self.mbps }
+
+class PoolResult(object):
+    """
+    Results of a job on all cards, where 'seconds' is the wall-clock time.
+    """
+    def __init__(self, cards, seconds):
+        self.cards   = cards # dictionary of CID and CardResult
+        self.seconds = seconds
+
+    def __getitem__(self, cid):
+        return self.cards[cid]
+
+    @property
+    def nbytes(self):
+        return sum(r.nbytes for r in self.cards.values())
+
+    @property
+    def errors(self):
+        return sum(r.errors for r in self.cards.values())
+
+    @property
+    def ok(self):
+        return self.errors==0
+
+    @property
+    def mbps(self):
+        """
+        Aggregate throughput of all cards.
+        """
+        return (self.nbytes/self.seconds/1.0E6) if self.seconds>0 else 0.0
+
+    def to_dict(self):
+        return { 'cards'  : [self.cards[cid].to_dict() for cid in sorted(self.cards)]
+               , 'errors' : self.errors
+               , 'nbytes' : self.nbytes
+               , 'seconds': self.seconds
+               , 'mbps'   : self.mbps }
+
+    def __str__(self):
+        lines = ["CID %d: %s %d errors %.2f MB/s %.3f sec" % (r.cid
+                 , 'OK' if not r.errors else 'NG', r.errors, r.mbps, r.seconds)
+                 for r in (self.cards[cid] for cid in sorted(self.cards))]
+        lines.append("all: %d cards %d errors %.2f MB/s %.3f sec" % (len(self.cards)
+                     , self.errors, self.mbps, self.seconds))
+        return '\n'.join(lines)
+
+#-------------------------------------------------------------------------------
+class _Job(object):
+    def __init__(self, func, args, kwargs):
+        self.func   = func
+        self.args   = args
+        self.kwargs = kwargs
+        self.done   = threading.Event()
+        self.result = None
+
+class Card(object):
+    """
+    Opened card with its own worker thread.
+    """
+    def __init__(self, bfm, cid, con_handle):
+        self.bfm        = bfm
+        self.cid        = cid
+        self.con_handle = con_handle
+        self._queue     = queue.Queue()
+        self._thread    = threading.Thread(target=self._serve, name='confmc-card-'+str(cid))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Run 'func(bfm, con_handle, *args, **kwargs)' in the worker.
+        :return: job to wait for, whose 'result' is CardResult
+        """
+        job = _Job(func, args, kwargs)
+        self._queue.put(job)
+        return job
+
+    def _serve(self):
+        timer = timeit.default_timer
+        while True:
+            job = self._queue.get()
+            if job is None: return
+            start = timer()
+            try:
+                value = job.func(self.bfm, self.con_handle, *job.args, **job.kwargs)
+                job.result = CardResult(self.cid, value, None, timer()-start)
+            except Exception as error:
+                job.result = CardResult(self.cid, None, error, timer()-start)
+            job.done.set()
+
+    def close(self):
+        if self._thread is None: return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self.bfm.conRelease(self.con_handle)
+
+#===============================================================================
+class CardPool(object):
+    """
+    Pool of all CON-FMC cards, each of which has its own worker.
+    """
+    def __init__(self, bfm, cids=None):
+        """
+        :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+        :param cids: list of CIDs to open, None for all available
+        """
+        self.bfm   = bfm
+        self.cards = []
+        if cids is None: cids = range(cid_max(bfm))
+        handles = {}
+        def open_card(cid):
+            hdl = bfm.conInit(cid)
+            if not hdl: return
+            if hasattr(bfm, 'BfmSetAmbaAxi4'): bfm.BfmSetAmbaAxi4(hdl)
+            handles[cid] = hdl
+        threads = [threading.Thread(target=open_card, args=(cid,)) for cid in cids]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        self.cards = [Card(bfm, cid, handles[cid]) for cid in sorted(handles)]
+
+    @property
+    def cids(self):
+        return [card.cid for card in self.cards]
+
+    def __len__(self):
+        return len(self.cards)
+
+    def map(self, func, *args, **kwargs):
+        """
+        Run 'func(bfm, con_handle, *args, **kwargs)' on all cards at once.
+        :return: PoolResult
+        """
+        start = timeit.default_timer()
+        jobs  = [card.submit(func, *args, **kwargs) for card in self.cards]
+        for job in jobs: job.done.wait()
+        return PoolResult(dict((job.result.cid, job.result) for job in jobs)
+                         ,timeit.default_timer()-start)
+
+    def broadcast_write(self, addr, buf):
+        """
+        Write the same host buffer to all cards, where all workers refer to
+        the memory of 'buf' itself, i.e., it is not copied for each card.
+        :param buf: buffer-protocol object, e.g., bytes, bytearray, numpy.ndarray
+        :return: PoolResult, where 'value' of each card is BfmWriteBlock() return
+        """
+        address, nbytes, keep = self.bfm._buffer_address(buf, False)
+        view   = (ctypes.c_char*nbytes).from_address(address)
+        result = self.map(lambda bfm, con_handle: bfm.BfmWriteBlock(con_handle, addr, view))
+        for card in result.cards.values():
+            if not card.errors: card.nbytes = nbytes
+        return result
+
+    def close(self):
+        for card in self.cards: card.close()
+        self.cards = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: CardResult.errors counts a result that is not ok
+# 2026.10.18: Started
+#===============================================================================
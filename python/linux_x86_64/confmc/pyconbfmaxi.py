@@ -17,17 +17,28 @@ __description__= "CON-FMC AMBA AXI BFM"
 
 #-------------------------------------------------------------------------------
 from confmc.pyconfmc import *
+from confmc.pyconfmc import _usb # not taken by '*'
+from confmc import errors
+from confmc.errors import BFM_OK, BFM_ERR_PARAM, BFM_ERR_WRITE, BFM_ERR_READ\
+                        , BFM_ERR_CMD, BFM_ERR_DESYNC, BFM_ERR_RECOVER
 
 #===============================================================================
 _con_bfm_type = 'axi'
 _libbfm = os.path.abspath( os.path.join(CONFMC_BFM, "hwlib/trx_axi/lib", sys_mach, "libbfmaxi.so"))
 
+# When 'CONFMC_EMU' is set, the transactor API built together with software
+# stand-in of 'libconapi' (see 'emu/c/Makefile') is used instead,
+# so that it runs without CON-FMC card.
+# Its value selects link profile at conInit(), i.e., 'usb2', 'usb3' or 'none'.
+_con_emu = os.environ.get('CONFMC_EMU', '')
+if _con_emu: _libbfm = _libbfm[:-len('.so')]+'_emu.so'
+
 if not os.path.isfile(_libbfm):
-   print _libbfm+' not found'
+   print(_libbfm+' not found')
    traceback.print_exc(file=sys.stdout)
    sys.exit(1)
 else:
-   if __debug__: print _libbfm+" found."
+   if __debug__: print(_libbfm+" found.")
 
 #-------------------------------------------------------------------------------
 try:
@@ -36,7 +47,424 @@ except:
     traceback.print_exc(file=sys.stdout)
     sys.exit(1)
 
+# The library should be built from the same API as this module, i.e., by
+# 'hwlib/Makefile' ('emu/c/Makefile' for the emulator), where one built
+# before calls below were added lacks them.
+for _name in ('BfmBatchOpen', 'BfmTransactV', 'BfmContextGet', 'BfmContextSet'
+             ,'BfmReadStatus', 'BfmRecover', 'BfmStatsGet', 'BfmRelease'):
+    if not hasattr(conbfm, _name):
+       print(_libbfm+' does not have '+_name+'(), rebuild it by "make -C '
+             +os.path.join(CONFMC_BFM, 'hwlib')+'"')
+       sys.exit(1)
+
+#-------------------------------------------------------------------------------
+# All symbols are resolved and their prototypes are set only once at load,
+# so that each call does not pay for 'wrap_function()'.
+# Note that libconapi symbols are resolved through 'conbfm',
+# which depends on libconapi.
+_p_con_Handle = ctypes.POINTER(con_Handle)
+_p_uint       = ctypes.POINTER(ctypes.c_uint)
+
+_BfmWriteStatus = wrap_function(conbfm, 'BfmWriteStatus'
+                                ,  ctypes.c_int
+                                ,[ _p_con_Handle
+                                  ,ctypes.c_uint
+                                  ,_p_uint
+                                  ,ctypes.c_uint
+                                  ,ctypes.c_uint ])
+_BfmReadStatus  = wrap_function(conbfm, 'BfmReadStatus'
+                                ,  ctypes.c_int
+                                ,[ _p_con_Handle
+                                  ,ctypes.c_uint
+                                  ,_p_uint
+                                  ,ctypes.c_uint
+                                  ,ctypes.c_uint ])
+_BfmGpout = wrap_function(conbfm, 'BfmGpout'
+                                ,  ctypes.c_int
+                                ,[ _p_con_Handle
+                                  ,ctypes.c_uint ])
+_BfmGpin  = wrap_function(conbfm, 'BfmGpin'
+                                ,  ctypes.c_int
+                                ,[ _p_con_Handle
+                                  ,_p_uint ])
+if _con_bfm_type == 'axi':
+   _BfmWriteFixStatus = wrap_function(conbfm, 'BfmWriteFixStatus'
+                                      ,  ctypes.c_int
+                                      ,[ _p_con_Handle
+                                        ,ctypes.c_uint
+                                        ,_p_uint
+                                        ,ctypes.c_uint
+                                        ,ctypes.c_uint ])
+   _BfmReadFixStatus  = wrap_function(conbfm, 'BfmReadFixStatus'
+                                      ,  ctypes.c_int
+                                      ,[ _p_con_Handle
+                                        ,ctypes.c_uint
+                                        ,_p_uint
+                                        ,ctypes.c_uint
+                                        ,ctypes.c_uint ])
+   _BfmSetAmbaAxi4 = wrap_function(conbfm, 'BfmSetAmbaAxi4'
+                                         ,  ctypes.c_int
+                                         ,[ _p_con_Handle ])
+
+_BfmBatchOpen  = wrap_function(conbfm, 'BfmBatchOpen'
+                                     ,  ctypes.c_void_p
+                                     ,[ _p_con_Handle
+                                       ,ctypes.c_uint
+                                       ,ctypes.c_uint ])
+_BfmBatchClose = wrap_function(conbfm, 'BfmBatchClose'
+                                     ,  None
+                                     ,[ ctypes.c_void_p ])
+_BfmBatchFlush = wrap_function(conbfm, 'BfmBatchFlush'
+                                     ,  ctypes.c_int
+                                     ,[ ctypes.c_void_p ])
+_BfmBatchIssue = wrap_function(conbfm, 'BfmBatchIssue'
+                                     ,  ctypes.c_int
+                                     ,[ ctypes.c_void_p ])
+_BfmBatchCollect = wrap_function(conbfm, 'BfmBatchCollect'
+                                       ,  ctypes.c_int
+                                       ,[ ctypes.c_void_p ])
+
+class BfmStats(ctypes.Structure):
+      """
+      USB transfers carried out by the BFM, see BfmStatsEnable().
+      """
+      _fields_ = [ ("writes"        , ctypes.c_ulonglong) # num of bulk-out transfers
+                 , ("reads"         , ctypes.c_ulonglong) # num of bulk-in transfers
+                 , ("words_out"     , ctypes.c_ulonglong)
+                 , ("words_in"      , ctypes.c_ulonglong)
+                 , ("partial_writes", ctypes.c_ulonglong) # moved less than asked
+                 , ("partial_reads" , ctypes.c_ulonglong)
+                 , ("zlps"          , ctypes.c_ulonglong)
+                 , ("errors"        , ctypes.c_ulonglong)
+                 , ("recoveries"    , ctypes.c_ulonglong) # brought back in sync
+                 , ("retries"       , ctypes.c_ulonglong) ] # reads tried again
+      def to_dict(self):
+          return dict((name, getattr(self, name)) for name, typ in self._fields_)
+
+_BfmStatsEnable = wrap_function(conbfm, 'BfmStatsEnable'
+                                      ,  ctypes.c_int
+                                      ,[ ctypes.c_int ])
+_BfmStatsGet    = wrap_function(conbfm, 'BfmStatsGet'
+                                      ,  ctypes.c_int
+                                      ,[ _p_con_Handle
+                                        ,ctypes.POINTER(BfmStats) ])
+_BfmStatsClear  = wrap_function(conbfm, 'BfmStatsClear'
+                                      ,  ctypes.c_int
+                                      ,[ _p_con_Handle ])
+
+# Recovery levels, see BfmRecover()
+BFM_RECOVER_EP  = 0 # CON_EP_RESET and completing the frame
+BFM_RECOVER_TRX = 1 # conReset() to reset the transactor as well
+BFM_RECOVER_FX3 = 2 # CON_FX3_RESET to warm-reset the FX3 as well
+
+_BfmRecover     = wrap_function(conbfm, 'BfmRecover'
+                                      ,  ctypes.c_int
+                                      ,[ _p_con_Handle
+                                        ,ctypes.c_int ])
+_BfmSetRecovery = wrap_function(conbfm, 'BfmSetRecovery'
+                                      ,  ctypes.c_int
+                                      ,[ _p_con_Handle
+                                        ,ctypes.c_int
+                                        ,ctypes.c_uint ])
+_BfmErrorMsg    = wrap_function(conbfm, 'BfmErrorMsg'
+                                      ,  ctypes.c_char_p
+                                      ,[ ctypes.c_int ])
+
+BFM_BUS_AHB  = 1
+BFM_BUS_AXI3 = 3
+BFM_BUS_AXI4 = 4
+
+class BfmContext(ctypes.Structure):
+      """
+      Context of the handler kept by the BFM, see BfmContextGet().
+      """
+      _fields_ = [ ("bus"      , ctypes.c_uint) # BFM_BUS_AHB, BFM_BUS_AXI3 or BFM_BUS_AXI4
+                 , ("width"    , ctypes.c_uint) # num of bytes of data bus
+                 , ("burst_max", ctypes.c_uint) # max burst length
+                 , ("gpin"     , ctypes.c_uint) # GPIN that tells them, 0 until found
+                 , ("depth_u2f", ctypes.c_uint) # num of words of U2F fifo of the transactor
+                 , ("depth_f2u", ctypes.c_uint) ] # num of words of F2U fifo of the transactor
+      def to_dict(self):
+          return dict((name, getattr(self, name)) for name, typ in self._fields_)
+
+_BfmContextGet     = wrap_function(conbfm, 'BfmContextGet'
+                                         ,  ctypes.c_int
+                                         ,[ _p_con_Handle
+                                           ,ctypes.POINTER(BfmContext) ])
+_BfmContextSet     = wrap_function(conbfm, 'BfmContextSet'
+                                         ,  ctypes.c_int
+                                         ,[ _p_con_Handle
+                                           ,ctypes.POINTER(BfmContext) ])
+_BfmContextRelease = wrap_function(conbfm, 'BfmContextRelease'
+                                         ,  ctypes.c_int
+                                         ,[ _p_con_Handle ])
+
+class BfmDesc(ctypes.Structure):
+      """
+      Descriptor of BfmTransactV(), which can be used as NumPy dtype as well,
+      e.g., numpy.zeros(n, dtype=BfmDesc).
+      """
+      _fields_ = [ ("addr"  , ctypes.c_uint) # starting address
+                 , ("offset", ctypes.c_uint) # index of the first item in the shared data
+                 , ("length", ctypes.c_ushort) # burst length
+                 , ("size"  , ctypes.c_ubyte) # num of bytes of an item: 1, 2 or 4
+                 , ("write" , ctypes.c_ubyte) # 1 for write, 0 for read
+                 , ("burst" , ctypes.c_ubyte) # 0 for fixed-address, 1 for incremental, 2 for wrap of AMBA AXI
+                 , ("rsvd"  , ctypes.c_ubyte*3)
+                 , ("status", ctypes.c_int) ] # 0 on success, <0 on failure
+
+_BfmTransactV   = wrap_function(conbfm, 'BfmTransactV'
+                                      ,  ctypes.c_int
+                                      ,[ _p_con_Handle
+                                        ,ctypes.c_void_p
+                                        ,ctypes.c_uint
+                                        ,ctypes.c_void_p
+                                        ,ctypes.c_uint ])
+_BfmBatchWrite = wrap_function(conbfm, 'BfmBatchWrite'
+                                     ,  ctypes.c_int
+                                     ,[ ctypes.c_void_p
+                                       ,ctypes.c_uint
+                                       ,_p_uint
+                                       ,ctypes.c_uint
+                                       ,ctypes.c_uint ])
+_BfmBatchRead  = wrap_function(conbfm, 'BfmBatchRead'
+                                     ,  ctypes.c_int
+                                     ,[ ctypes.c_void_p
+                                       ,ctypes.c_uint
+                                       ,_p_uint
+                                       ,ctypes.c_uint
+                                       ,ctypes.c_uint ])
+_BfmBatchWriteFix = wrap_function(conbfm, 'BfmBatchWriteFix'
+                                        ,  ctypes.c_int
+                                        ,[ ctypes.c_void_p
+                                          ,ctypes.c_uint
+                                          ,_p_uint
+                                          ,ctypes.c_uint
+                                          ,ctypes.c_uint ])
+_BfmBatchReadFix  = wrap_function(conbfm, 'BfmBatchReadFix'
+                                        ,  ctypes.c_int
+                                        ,[ ctypes.c_void_p
+                                          ,ctypes.c_uint
+                                          ,_p_uint
+                                          ,ctypes.c_uint
+                                          ,ctypes.c_uint ])
+
+_conStreamWrite = wrap_function(conbfm, 'conStreamWrite'
+                                      ,  ctypes.c_int
+                                      ,[ _p_con_Handle
+                                        ,ctypes.c_void_p
+                                        ,ctypes.c_uint
+                                        ,_p_uint
+                                        ,ctypes.c_uint ])
+_conStreamRead  = wrap_function(conbfm, 'conStreamRead'
+                                      ,  ctypes.c_int
+                                      ,[ _p_con_Handle
+                                        ,ctypes.c_void_p
+                                        ,ctypes.c_uint
+                                        ,_p_uint ])
+_conCmdWrite    = wrap_function(conbfm, 'conCmdWrite'
+                                      ,  ctypes.c_int
+                                      ,[ _p_con_Handle
+                                        ,ctypes.c_void_p
+                                        ,ctypes.c_uint
+                                        ,_p_uint
+                                        ,ctypes.c_uint ])
+_conDataRead    = wrap_function(conbfm, 'conDataRead'
+                                      ,  ctypes.c_int
+                                      ,[ _p_con_Handle
+                                        ,ctypes.c_void_p
+                                        ,ctypes.c_uint
+                                        ,_p_uint
+                                        ,ctypes.c_uint ])
+
+#-------------------------------------------------------------------------------
+# With the emulator, conapi functions are taken from 'conbfm' as well,
+# since the ones from 'confmc.pyconfmc' are bound to 'libconapi'.
+if _con_emu:
+   _conInit = wrap_function(conbfm, 'conInit'
+                                  ,  _p_con_Handle
+                                  ,[ ctypes.c_uint
+                                    ,ctypes.c_uint
+                                    ,ctypes.c_uint ])
+   def conInit(con_cid=0, con_mode=0, conapi_log_level=0):
+       """
+       Open emulated CON-FMC.
+       :param con_cid: card id
+       :param con_mode: 0 for command mode (CON_MODE_CMD)
+       :param conapi_log_level: not used
+       :return: CON-FMC handler, None on failure
+       """
+       return _conInit(con_cid, con_mode, conapi_log_level)
+   conRelease        = wrap_function(conbfm, 'conRelease', ctypes.c_int, [ _p_con_Handle ])
+   conGetCid         = wrap_function(conbfm, 'conGetCid', ctypes.c_int, [ _p_con_Handle ])
+   conGetUsbInfo     = wrap_function(conbfm, 'conGetUsbInfo', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.POINTER(_usb) ])
+   conGetFx3Info     = wrap_function(conbfm, 'conGetFx3Info', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.POINTER(con_Fx3Info) ])
+   conGetBoardInfo   = wrap_function(conbfm, 'conGetBoardInfo', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.POINTER(con_BoardInfo)
+                                             ,ctypes.c_uint, ctypes.c_uint ])
+   conGetMasterInfo  = wrap_function(conbfm, 'conGetMasterInfo', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.POINTER(con_MasterInfo) ])
+   conReset          = wrap_function(conbfm, 'conReset', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.c_uint ])
+   conSetMode        = wrap_function(conbfm, 'conSetMode', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.c_uint ])
+   conGetVersionApi  = wrap_function(conbfm, 'conGetVersionApi', ctypes.c_uint, [])
+   conGetErrorConapi = wrap_function(conbfm, 'conGetErrorConapi', ctypes.c_int, [])
+   conGetErrorLibusb = wrap_function(conbfm, 'conGetErrorLibusb', ctypes.c_int, [])
+   conErrorMsgConapi = wrap_function(conbfm, 'conErrorMsgConapi', ctypes.c_char_p
+                                           ,[ ctypes.c_int ])
+
+   #----------------------------------------------------------------------------
+   # Link timing model of the emulator, see 'emu/c/conapi_emu.h'.
+   class con_EmuLink(ctypes.Structure):
+         _fields_ = [ ("latency_ns", ctypes.c_uint) # per-transfer latency
+                    , ("bandwidth" , ctypes.c_uint) # MB/s, 0 for infinite
+                    , ("realtime"  , ctypes.c_uint) ] # 1 to wait for the link
+         def __str__(self):
+             return "latency:"+str(self.latency_ns)+"ns bandwidth:"+str(self.bandwidth)+\
+                    "MB/s realtime:"+str(self.realtime)
+
+   class con_EmuStats(ctypes.Structure):
+         _fields_ = [ ("transfers_out", ctypes.c_ulonglong)
+                    , ("transfers_in" , ctypes.c_ulonglong)
+                    , ("bytes_out"    , ctypes.c_ulonglong)
+                    , ("bytes_in"     , ctypes.c_ulonglong)
+                    , ("link_ns"      , ctypes.c_ulonglong) # time spent on the link
+                    , ("timeouts"     , ctypes.c_ulonglong) ] # bulk-out timed out on full U2F fifo
+         def to_dict(self):
+             return dict((name, getattr(self, name)) for name, typ in self._fields_)
+
+   _conEmuSetProfile = wrap_function(conbfm, 'conEmuSetProfile', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.c_char_p ])
+   conEmuSetLink     = wrap_function(conbfm, 'conEmuSetLink', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.POINTER(con_EmuLink) ])
+   conEmuGetLink     = wrap_function(conbfm, 'conEmuGetLink', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.POINTER(con_EmuLink) ])
+   conEmuGetStats    = wrap_function(conbfm, 'conEmuGetStats', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.POINTER(con_EmuStats) ])
+   conEmuClearStats  = wrap_function(conbfm, 'conEmuClearStats', ctypes.c_int
+                                           ,[ _p_con_Handle ])
+   conEmuSetIrq      = wrap_function(conbfm, 'conEmuSetIrq', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.c_uint, ctypes.c_uint ])
+   # every 'period'-th stream transfer fails, 0 for none
+   conEmuSetFault    = wrap_function(conbfm, 'conEmuSetFault', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.c_uint ])
+   # num of words of U2F and F2U fifos of the transactor
+   conEmuSetDepth    = wrap_function(conbfm, 'conEmuSetDepth', ctypes.c_int
+                                           ,[ _p_con_Handle, ctypes.c_uint, ctypes.c_uint ])
+   def conEmuSetProfile(con_handle, profile):
+       """
+       Select link profile of emulated CON-FMC.
+       :param con_handle: CON-FMC handler
+       :param profile: 'none', 'usb2' or 'usb3'
+       :return: 0 on success, otherwize negative value.
+       """
+       return _conEmuSetProfile(con_handle, profile.encode('ascii'))
+
+#-------------------------------------------------------------------------------
+# The BFM keeps context of each handler, which is freed along with
+# the handler by BfmRelease(), since it may be reused by following conInit().
+_BfmRelease = wrap_function(conbfm, 'BfmRelease', ctypes.c_int, [ _p_con_Handle ])
+def conRelease(con_handle):
+    """
+    Release CON-FMC along with context of the handler kept by the BFM.
+    :param con_handle: CON-FMC handler
+    :return: 0 on success, otherwize negative value.
+    """
+    return _BfmRelease(con_handle)
+
+#-------------------------------------------------------------------------------
+# Address boundary that a burst should not cross, while maximum burst length
+# is kept in the context of each handler by the BFM; see BfmGetBurstMax().
+if _con_bfm_type == 'axi':
+   _burst_boundary = 0x1000 # 4KB
+else:
+   _burst_boundary = 0x400 # 1KB
+
+#-------------------------------------------------------------------------------
+# 'pdata' of BFM calls can be ctypes object as well as buffer-protocol object,
+# e.g., bytearray, memoryview, array('I'), numpy.ndarray and mmap.
+_ctypes_data = (ctypes.Array, ctypes._Pointer, type(ctypes.byref(ctypes.c_uint())))
+
+def _buffer_nbytes(buf):
+    """
+    Return number of bytes of buffer-protocol object.
+    """
+    try:
+        return memoryview(buf).nbytes
+    except (TypeError, AttributeError): # Python 2 old-style buffer
+        return len(buffer(buf))
+
+def _buffer_address(buf, writable):
+    """
+    Return address of the memory of buffer-protocol object without copying.
+    Read-only object other than bytes and numpy.ndarray is copied
+    when 'writable' is False.
+    :return: (address, number of bytes, object to keep alive while using address)
+    """
+    if hasattr(buf, 'ctypes') and hasattr(buf, 'nbytes'): # numpy.ndarray
+       if not buf.flags['C_CONTIGUOUS']:
+          raise ValueError("buffer should be contiguous")
+       if writable and not buf.flags['WRITEABLE']:
+          raise TypeError("buffer should be writable")
+       return buf.ctypes.data, buf.nbytes, buf
+    if (not writable) and isinstance(buf, bytes):
+       return ctypes.cast(ctypes.c_char_p(buf), ctypes.c_void_p).value, len(buf), buf
+    nbytes = _buffer_nbytes(buf)
+    try:
+        keep = (ctypes.c_char*nbytes).from_buffer(buf)
+    except TypeError:
+        if writable: raise
+        keep = (ctypes.c_char*nbytes).from_buffer_copy(buf)
+    return ctypes.addressof(keep), nbytes, keep
+
+def _as_uint_p(pdata, length, writable):
+    """
+    Return 'pdata' as it is when it is ctypes object or None, otherwise
+    array of 'length' c_uint on the memory of buffer-protocol object.
+    :param writable: True when 'pdata' is to be filled
+    """
+    if (pdata is None) or isinstance(pdata, _ctypes_data):
+       return pdata
+    address, nbytes, keep = _buffer_address(pdata, writable)
+    if nbytes<(length<<2):
+       raise ValueError("buffer too small (%d bytes instead of at least %d bytes)" % (nbytes, length<<2))
+    data = (ctypes.c_uint*length).from_address(address)
+    data._keep = keep
+    return data
+
 #-------------------------------------------------------------------------------
+# Each transaction has status-returning call, which returns BFM_ERR_* defined
+# in 'confmc.errors', while the one without 'Status' raises errors.BfmError
+# of the status, e.g., errors.BfmWriteError, on failure.
+# A failed transfer is recovered in place by the BFM (see BfmSetRecovery()),
+# after which incremental reads are tried again, so that what is left
+# to the caller is whether to do it again or not.
+# Each call is a single burst, which is limited to BfmGetBurstMax() beats
+# (16 beats for fixed-address) and should not cross '_burst_boundary';
+# BfmWriteBlock()/BfmReadBlock() split arbitrary ranges into such bursts.
+#-------------------------------------------------------------------------------
+# int BfmWriteStatus( con_Handle_t handle
+#                   , unsigned int  addr
+#                   , unsigned int *data
+#                   , unsigned int  size
+#                   , unsigned int  length);
+def BfmWriteStatus(con_handle, addr, pdata, size, length):
+    """
+    Generate AMBA AXI write transaction.
+    :param con_handle: CON-FMC handler
+    :param addr: starting address to write
+    :param pdata: pointer to the buffer holding 32-bit data, which is right-justified
+                  It can be buffer-protocol object as well as ctypes object.
+    :param size: number of bytes of each pdata items, can be 1, 2, 4.
+    :param length: number of burst length
+    :return: BFM_OK on success, otherwize BFM_ERR_*, where BFM_ERR_WRITE means
+             the write may or may not have been done.
+    """
+    return _BfmWriteStatus(con_handle, addr, _as_uint_p(pdata, length, False), size, length)
+
 # void BfmWrite( con_Handle_t handle
 #              , unsigned int  addr
 #              , unsigned int *data
@@ -48,20 +476,34 @@ def BfmWrite(con_handle, addr, pdata, size, length):
     :param con_handle: CON-FMC handler
     :param addr: starting address to write
     :param pdata: pointer to the buffer holding 32-bit data, which is right-justified
+                  It can be buffer-protocol object as well as ctypes object.
     :param size: number of bytes of each pdata items, can be 1, 2, 4.
     :param length: number of burst length
     :return: void
+    :raise errors.BfmError: on failure
     """
-    _BfmWrite=wrap_function(conbfm, 'BfmWrite'
-                                  ,  None
-                                  ,[ ctypes.POINTER(con_Handle)
-                                    ,ctypes.c_uint
-                                    ,ctypes.POINTER(ctypes.c_uint)
-                                    ,ctypes.c_uint
-                                    ,ctypes.c_uint ])
-    return _BfmWrite(con_handle, addr, pdata, size, length)
+    ret = _BfmWriteStatus(con_handle, addr, _as_uint_p(pdata, length, False), size, length)
+    if ret: raise errors.error(ret, 'BfmWrite')
 
 #-------------------------------------------------------------------------------
+# int BfmReadStatus( con_Handle_t handle
+#                  , unsigned int  addr
+#                  , unsigned int *data
+#                  , unsigned int  size
+#                  , unsigned int  length);
+def BfmReadStatus(con_handle, addr, pdata, size, length):
+    """
+    Generate AMBA AXI read transaction, which is tried again after recovery.
+    :param con_handle: CON-FMC handler
+    :param addr: starting address to read
+    :param pdata: pointer to the buffer holding 32-bit data, which is right-justified
+                  It can be buffer-protocol object as well as ctypes object.
+    :param size: number of bytes of each pdata items, can be 1, 2, 4.
+    :param length: number of burst length
+    :return: BFM_OK on success, otherwize BFM_ERR_*.
+    """
+    return _BfmReadStatus(con_handle, addr, _as_uint_p(pdata, length, True), size, length)
+
 # void BfmRead ( con_Handle_t handle
 #              , unsigned int  addr
 #              , unsigned int *data
@@ -69,26 +511,40 @@ def BfmWrite(con_handle, addr, pdata, size, length):
 #              , unsigned int  length);
 def BfmRead(con_handle, addr, pdata, size, length):
     """
-    Generate AMBA AXI read transaction.
+    Generate AMBA AXI read transaction, which is tried again after recovery.
     :param con_handle: CON-FMC handler
     :param addr: starting address to read
     :param pdata: pointer to the buffer holding 32-bit data, which is right-justified
+                  It can be buffer-protocol object as well as ctypes object.
     :param size: number of bytes of each pdata items, can be 1, 2, 4.
     :param length: number of burst length
     :return: void
+    :raise errors.BfmError: on failure
     """
-    _BfmRead=wrap_function(conbfm, 'BfmRead'
-                                  ,  None
-                                  ,[ ctypes.POINTER(con_Handle)
-                                    ,ctypes.c_uint
-                                    ,ctypes.POINTER(ctypes.c_uint)
-                                    ,ctypes.c_uint
-                                    ,ctypes.c_uint ])
-    return _BfmRead(con_handle, addr, pdata, size, length)
+    ret = _BfmReadStatus(con_handle, addr, _as_uint_p(pdata, length, True), size, length)
+    if ret: raise errors.error(ret, 'BfmRead')
 
 #-------------------------------------------------------------------------------
 # Only for AMBA AXI fixed address mode
 if _con_bfm_type == 'axi':
+   # int BfmWriteFixStatus( con_Handle_t handle
+   #                      , unsigned int  addr
+   #                      , unsigned int *data
+   #                      , unsigned int  size
+   #                      , unsigned int  length);
+   def BfmWriteFixStatus(con_handle, addr, pdata, size, length):
+       """
+       Generate AMBA AXI write transaction with fixed-address.
+       :param con_handle: CON-FMC handler
+       :param addr: address to write
+       :param pdata: pointer to the buffer holding 32-bit data, which is right-justified
+                     It can be buffer-protocol object as well as ctypes object.
+       :param size: number of bytes of each pdata items, can be 1, 2, 4.
+       :param length: number of burst length
+       :return: BFM_OK on success, otherwize BFM_ERR_*.
+       """
+       return _BfmWriteFixStatus(con_handle, addr, _as_uint_p(pdata, length, False), size, length)
+
    # void BfmWriteFix( con_Handle_t handle
    #                 , unsigned int  addr
    #                 , unsigned int *data
@@ -100,25 +556,37 @@ if _con_bfm_type == 'axi':
        :param con_handle: CON-FMC handler
        :param addr: address to write
        :param pdata: pointer to the buffer holding 32-bit data, which is right-justified
+                     It can be buffer-protocol object as well as ctypes object.
        :param size: number of bytes of each pdata items, can be 1, 2, 4.
        :param length: number of burst length
        :return: void
+       :raise errors.BfmError: on failure
        """
-       if _con_bfm_type!='axi' and _con_bfm_type!='AXI' and _con_bfm_type!='AMBA AXI':
-          print("fixed transaction is not supported")
-          sys.exit(1)
-       _BfmWriteFix=wrap_function(conbfm, 'BfmWriteFix'
-                                     ,  None
-                                     ,[ ctypes.POINTER(con_Handle)
-                                       ,ctypes.c_uint
-                                       ,ctypes.POINTER(ctypes.c_uint)
-                                       ,ctypes.c_uint
-                                       ,ctypes.c_uint ])
-       return _BfmWriteFix(con_handle,addr, pdata, size, length)
+       ret = _BfmWriteFixStatus(con_handle, addr, _as_uint_p(pdata, length, False), size, length)
+       if ret: raise errors.error(ret, 'BfmWriteFix')
 
 #-------------------------------------------------------------------------------
 # Only for AMBA AXI fixed address mode
 if _con_bfm_type == 'axi':
+   # int BfmReadFixStatus( con_Handle_t handle
+   #                     , unsigned int  addr
+   #                     , unsigned int *data
+   #                     , unsigned int  size
+   #                     , unsigned int  length);
+   def BfmReadFixStatus(con_handle, addr, pdata, size, length):
+       """
+       Generate AMBA AXI read transaction with fixed-address,
+       which is not tried again since reading FIFO is not idempotent.
+       :param con_handle: CON-FMC handler
+       :param addr: address to read
+       :param pdata: pointer to the buffer holding 32-bit data, which is right-justified
+                     It can be buffer-protocol object as well as ctypes object.
+       :param size: number of bytes of each pdata items, can be 1, 2, 4.
+       :param length: number of burst length
+       :return: BFM_OK on success, otherwize BFM_ERR_*.
+       """
+       return _BfmReadFixStatus(con_handle, addr, _as_uint_p(pdata, length, True), size, length)
+
    # void BfmReadFix ( con_Handle_t handle
    #                 , unsigned int  addr
    #                 , unsigned int *data
@@ -130,18 +598,14 @@ if _con_bfm_type == 'axi':
        :param con_handle: CON-FMC handler
        :param addr: address to read
        :param pdata: pointer to the buffer holding 32-bit data, which is right-justified
+                     It can be buffer-protocol object as well as ctypes object.
        :param size: number of bytes of each pdata items, can be 1, 2, 4.
        :param length: number of burst length
        :return: void
+       :raise errors.BfmError: on failure
        """
-       _BfmReadFix=wrap_function(conbfm, 'BfmReadFix'
-                                     ,  None
-                                     ,[ ctypes.POINTER(con_Handle)
-                                       ,ctypes.c_uint
-                                       ,ctypes.POINTER(ctypes.c_uint)
-                                       ,ctypes.c_uint
-                                       ,ctypes.c_uint ])
-       return _BfmReadFix(con_handle, addr, pdata, size, length)
+       ret = _BfmReadFixStatus(con_handle, addr, _as_uint_p(pdata, length, True), size, length)
+       if ret: raise errors.error(ret, 'BfmReadFix')
 
 #-------------------------------------------------------------------------------
 # int BfmGpout( con_Handle_t handle
@@ -151,12 +615,8 @@ def BfmGpout(con_handle, value):
     Drive value to the GPOUT port of AMBA AXI Transactor.
     :param con_handle: CON-FMC handler
     :param value: value to drive and lower 16-bit is valid
-    :return: 0 on success, otherwize negative value.
+    :return: 0 on success, otherwize BFM_ERR_* (negative value).
     """
-    _BfmGpout=wrap_function(conbfm, 'BfmGpout'
-                                  ,  ctypes.c_int
-                                  ,[ ctypes.POINTER(con_Handle)
-                                    ,ctypes.c_uint ])
     return _BfmGpout(con_handle, value)
 
 #-------------------------------------------------------------------------------
@@ -164,15 +624,12 @@ def BfmGpout(con_handle, value):
 #            , unsigned int value );
 def BfmGpin(con_handle, pValue):
     """
-    Read value from the GPIN port of AMBA AXI Transactor.
+    Read value from the GPIN port of AMBA AXI Transactor,
+    which is tried again after recovery.
     :param con_handle: CON-FMC handler
     :param value: value has been read and lower 16-bit is valid
-    :return: 0 on success, otherwize negative value.
+    :return: 0 on success, otherwize BFM_ERR_* (negative value).
     """
-    _BfmGpin=wrap_function(conbfm, 'BfmGpin'
-                                  ,  ctypes.c_int
-                                  ,[ ctypes.POINTER(con_Handle)
-                                    ,ctypes.POINTER(ctypes.c_uint)])
     return _BfmGpin(con_handle, pValue)
 
 #-------------------------------------------------------------------------------
@@ -181,37 +638,481 @@ if _con_bfm_type == 'axi':
    # int BfmSetAmbaAxi4( con_Handle_t handle );
    def BfmSetAmbaAxi4(con_handle):
        """
-       Set AMBA AXI4 mode.
+       Find AMBA AXI4 or AMBA AXI3 from GPIN again, which is kept in
+       the context of the handler.
        :param con_handle: CON-FMC handler
        :return: the maximum number of burst length.
        """
-       _BfmSetAmbaAxi4=wrap_function(conbfm, 'BfmSetAmbaAxi4'
-                                     ,  ctypes.c_int
-                                     ,[ ctypes.POINTER(con_Handle)])
        return _BfmSetAmbaAxi4(con_handle)
 
+#-------------------------------------------------------------------------------
+def BfmGetBurstMax(con_handle):
+    """
+    Get the maximum number of burst length of the handler, which is found
+    from GPIN at the first use of the handler, i.e., 16 for AMBA AXI3,
+    256 for AMBA AXI4 and 256 for AMBA AHB.
+    :param con_handle: CON-FMC handler
+    :return: the maximum number of burst length, negative value on failure.
+    """
+    info = BfmContext()
+    if _BfmContextGet(con_handle, ctypes.byref(info)): return -1
+    return info.burst_max
+
+def BfmGetReadDepth(con_handle):
+    """
+    Get the number of read data words that can be in flight, i.e., F2U fifo
+    depth of the transactor, which is taken by conGetMasterInfo() at the first
+    use of the handler. Read data beyond it stall the transactor while
+    commands are being pushed, since nobody pops them until then.
+    It is what BfmBatch and BfmPipe are limited to.
+    :param con_handle: CON-FMC handler
+    :return: number of words, negative value on failure.
+    """
+    info = BfmContext()
+    if _BfmContextGet(con_handle, ctypes.byref(info)): return -1
+    return info.depth_f2u
+
+def BfmContextGet(con_handle):
+    """
+    Get context of the handler kept by the BFM, i.e., bus type, data width
+    and maximum burst length, which are found from GPIN at the first use,
+    and fifo depths of the transactor from conGetMasterInfo().
+    Each handler has its own context and lock, so that BFM calls of threads
+    sharing the handler do not go in the middle of each other.
+    :param con_handle: CON-FMC handler
+    :return: BfmContext, None on failure
+    """
+    info = BfmContext()
+    if _BfmContextGet(con_handle, ctypes.byref(info)): return None
+    return info
+
+def BfmContextSet(con_handle, info):
+    """
+    Set context of the handler, e.g., from what BfmContextGet() gave before
+    and was cached, so that GPIN is not read at the first use.
+    :param con_handle: CON-FMC handler
+    :param info: BfmContext or dictionary of its fields, e.g., from to_dict(),
+                 where missing fifo depths are taken from the transactor.
+    :return: 0 on success, otherwize negative value.
+    """
+    if isinstance(info, dict):
+       try: info = BfmContext(**info)
+       except (TypeError, AttributeError): return -1
+    return _BfmContextSet(con_handle, ctypes.byref(info))
+
+def BfmContextRelease(con_handle=None):
+    """
+    Free context of the handler, or of all when it is None,
+    which is done by conRelease() as well.
+    :return: 0 on success, otherwize negative value.
+    """
+    return _BfmContextRelease(con_handle)
+
+#-------------------------------------------------------------------------------
+def BfmStatsEnable(enable):
+    """
+    Enable or disable counting USB transfers of the BFM for each handler,
+    which costs nearly nothing when disabled.
+    :param enable: True to enable
+    :return: previous one
+    """
+    return bool(_BfmStatsEnable(1 if enable else 0))
+
+def BfmStatsGet(con_handle):
+    """
+    Get counters of USB transfers of the handler.
+    :param con_handle: CON-FMC handler
+    :return: BfmStats, None on failure
+    """
+    stats = BfmStats()
+    if _BfmStatsGet(con_handle, ctypes.byref(stats)): return None
+    return stats
+
+def BfmStatsClear(con_handle=None):
+    """
+    Clear counters of the handler, or of all when it is None.
+    :return: 0 on success, otherwize negative value.
+    """
+    return _BfmStatsClear(con_handle)
+
+#-------------------------------------------------------------------------------
+def BfmRecover(con_handle, level=BFM_RECOVER_EP):
+    """
+    Bring the handler back in sync in place without conRelease()/conInit(),
+    going up from BFM_RECOVER_EP to 'level' until GPIN answers, e.g.,
+    after errors.BfmDesyncError. Read data in flight are dropped.
+    :param con_handle: CON-FMC handler
+    :param level: BFM_RECOVER_EP, BFM_RECOVER_TRX or BFM_RECOVER_FX3
+    :return: the level that brought it back, otherwize BFM_ERR_* (negative value).
+    """
+    return _BfmRecover(con_handle, level)
+
+def BfmSetRecovery(con_handle, level=BFM_RECOVER_EP, retries=2):
+    """
+    Set up to which level a failed transfer is recovered by the BFM by itself
+    and how many times incremental reads and GPIN are tried again after it.
+    :param con_handle: CON-FMC handler
+    :param level: BFM_RECOVER_EP, BFM_RECOVER_TRX or BFM_RECOVER_FX3,
+                  None to turn it off so that BfmRecover() should be called
+    :param retries: number of retries
+    :return: 0 on success, otherwize negative value.
+    """
+    return _BfmSetRecovery(con_handle, -1 if level is None else level, retries)
+
+def BfmErrorMsg(status):
+    """
+    Return message of BFM_ERR_* returned by the BFM.
+    """
+    return _BfmErrorMsg(status).decode('ascii')
+
+#-------------------------------------------------------------------------------
+def BfmTransactV(con_handle, descs, data):
+    """
+    Carry out transactions described by 'descs' with a single call,
+    which goes to USB with as few stream transfers as possible.
+    Write data of each descriptor are taken from and its read data are stored
+    to 'data' from its 'offset', where each item is right-justified 32-bit word.
+    Incremental descriptors are split into bursts of up to the burst limit
+    that do not cross '_burst_boundary', while fixed-address ones go as
+    bursts of 16 beats, or single transfers for AMBA AHB.
+    Wrap descriptors of AMBA AXI go as they are, which should be of 2, 4, 8
+    or 16 beats from an address aligned to the size.
+    :param con_handle: CON-FMC handler
+    :param descs: array of BfmDesc, i.e., NumPy structured array of
+                  dtype=BfmDesc or ctypes array, whose 'status' are filled
+    :param data: writable buffer-protocol object holding 32-bit words
+                 shared by all descriptors, e.g., numpy.uint32 array
+    :return: number of descriptors failed, negative value on failure.
+    """
+    dbase, dbytes, dkeep = _buffer_address(descs, True)
+    if dbytes%ctypes.sizeof(BfmDesc):
+       raise ValueError("descs should be array of BfmDesc")
+    base, nbytes, keep = _buffer_address(data, True)
+    return _BfmTransactV(con_handle, dbase, dbytes//ctypes.sizeof(BfmDesc), base, nbytes//4)
+
+#-------------------------------------------------------------------------------
+class BfmBatch(object):
+    """
+    Transaction queue, which packs a number of BFM transactions into a single
+    stream. Nothing goes to USB until flush(), which pushes the stream with
+    a single conStreamWrite() and then pops read data of all queued reads
+    with a single conStreamRead(). Read data are scattered to the buffers
+    given to read() at that time.
+    Note that the queue is flushed by itself when read data in flight reaches
+    'depth' or the stream buffer is full.
+
+    with BfmBatch(hdl) as batch:
+         batch.write(addr, wdata, 4, 16)
+         batch.read(addr, rdata, 4, 16)
+    """
+    def __init__(self, con_handle, words=0, depth=0):
+        """
+        :param con_handle: CON-FMC handler
+        :param words: number of 32-bit words of stream buffer, 0 for default.
+        :param depth: number of read data words in flight, 0 for default.
+                      It is limited to BfmGetReadDepth(), i.e., F2U fifo of the transactor.
+        """
+        self.con_handle = con_handle
+        self._rbufs = [] # keeps read buffers alive until flush
+        self._batch = _BfmBatchOpen(con_handle, words, depth)
+        if not self._batch:
+           raise MemoryError("BfmBatchOpen() failed")
+
+    def write(self, addr, pdata, size, length):
+        """
+        Queue AMBA write transaction, where 'pdata' is copied right away.
+        :return: 0 on success, otherwize negative value.
+        """
+        return _BfmBatchWrite(self._batch, addr, _as_uint_p(pdata, length, False), size, length)
+
+    def read(self, addr, pdata, size, length):
+        """
+        Queue AMBA read transaction, where 'pdata' is filled on flush().
+        :return: 0 on success, otherwize negative value.
+        """
+        data = _as_uint_p(pdata, length, True)
+        self._rbufs.append(data)
+        return _BfmBatchRead(self._batch, addr, data, size, length)
+
+    def write_fix(self, addr, pdata, size, length):
+        """
+        Queue write transactions with fixed-address, e.g., to FIFO,
+        which go as fixed bursts of 16 beats at most for AMBA AXI and
+        as 'length' single transfers for AMBA AHB.
+        :return: 0 on success, otherwize negative value.
+        """
+        return _BfmBatchWriteFix(self._batch, addr, _as_uint_p(pdata, length, False), size, length)
+
+    def read_fix(self, addr, pdata, size, length):
+        """
+        Queue read transactions with fixed-address, e.g., from FIFO,
+        which go as fixed bursts of 16 beats at most for AMBA AXI and
+        as 'length' single transfers for AMBA AHB.
+        :return: 0 on success, otherwize negative value.
+        """
+        data = _as_uint_p(pdata, length, True)
+        self._rbufs.append(data)
+        return _BfmBatchReadFix(self._batch, addr, data, size, length)
+
+    def flush(self):
+        """
+        Push all queued transactions and pop read data.
+        :return: 0 on success, otherwize negative value.
+        """
+        ret = _BfmBatchFlush(self._batch)
+        self._rbufs = []
+        return ret
+
+    def close(self):
+        """
+        Free the queue without flushing.
+        """
+        if self._batch:
+           _BfmBatchClose(self._batch)
+           self._batch = None
+        self._rbufs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        try:
+            if exc_type is None: self.flush()
+        finally:
+            self.close()
+
+    def __del__(self):
+        self.close()
+
+#-------------------------------------------------------------------------------
+class BfmPipe(object):
+    """
+    Split-phase reads, where issue_read() queues a read and returns a ticket
+    without waiting for its data, and collect() pops read data of all
+    outstanding reads with as few conStreamRead() as possible.
+    Queued read commands are pushed to USB whenever 'post' command words are
+    queued, so that the transactor works on them while more reads are issued.
+    Words in flight, i.e., command-flits and read data of outstanding reads,
+    are bounded by 'depth', beyond which outstanding reads are collected
+    by itself and kept until collect().
+    Reads pushed are collected by another BFM call of the handle if it comes
+    first, e.g., BfmRead(), while their data still go to the tickets.
+
+    with BfmPipe(hdl) as pipe:
+         tickets = [pipe.issue_read(addr) for addr in addrs]
+         data    = pipe.collect()
+         values  = [data[ticket][0] for ticket in tickets]
+    """
+    def __init__(self, con_handle, depth=0, post=256):
+        """
+        :param con_handle: CON-FMC handler
+        :param depth: number of words in flight, 0 for default.
+                      It is limited to BfmGetReadDepth(), i.e., F2U fifo of the transactor.
+        :param post: number of command words to push at once
+        """
+        self.con_handle = con_handle
+        limit           = BfmGetReadDepth(con_handle)
+        if limit<=0: raise errors.error(limit, 'BfmGetReadDepth')
+        self.depth      = min(depth, limit) if depth else limit
+        self.post       = post
+        self._batch     = _BfmBatchOpen(con_handle, 0, self.depth)
+        if not self._batch:
+           raise MemoryError("BfmBatchOpen() failed")
+        self._ticket    = 0  # ticket of the next read
+        self._flight    = {} # ticket -> buffer of outstanding reads
+        self._done      = {} # ticket -> buffer of reads collected by itself
+        self._dropped   = 0  # num of reads dropped by failed collection by itself
+        self._words     = 0  # num of words in flight
+        self._unposted  = 0  # num of command words not pushed yet
+
+    def issue_read(self, addr, size=4, length=1):
+        """
+        Queue AMBA incremental read.
+        :return: ticket (0 or positive) on success, otherwize negative value.
+        """
+        need = 4+length
+        if self._flight and (self._words+need)>self.depth:
+           ret = self._collect()
+           if ret: return ret
+        data = (ctypes.c_uint*length)()
+        ret  = _BfmBatchRead(self._batch, addr, data, size, length)
+        if ret: return ret
+        ticket = self._ticket
+        self._ticket += 1
+        self._flight[ticket] = data
+        self._words    += need
+        self._unposted += 4
+        if self._unposted>=self.post:
+           self._unposted = 0
+           ret = _BfmBatchIssue(self._batch)
+           if ret: return ret
+        return ticket
+
+    def _collect(self):
+        ret = _BfmBatchFlush(self._batch)
+        if ret==0: self._done.update(self._flight)
+        else     : self._dropped += len(self._flight)
+        self._flight   = {}
+        self._words    = 0
+        self._unposted = 0
+        return ret
+
+    def collect(self):
+        """
+        Pop read data of all outstanding reads.
+        :return: dictionary of ticket and ctypes array of justified items,
+                 None on failure including reads dropped since the last collect().
+        """
+        ret  = self._collect()
+        done = self._done
+        self._done = {}
+        if self._dropped:
+           self._dropped = 0
+           return None
+        return None if ret else done
+
+    @property
+    def outstanding(self):
+        """
+        Number of reads not collected yet.
+        """
+        return len(self._flight)+len(self._done)
+
+    def close(self):
+        """
+        Free the pipe without collecting.
+        """
+        if self._batch:
+           _BfmBatchClose(self._batch)
+           self._batch = None
+        self._flight  = {}
+        self._done    = {}
+        self._dropped = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+#-------------------------------------------------------------------------------
+def _block_split(addr, nbytes, burst_max):
+    """
+    Split byte range into bursts, where unaligned head and tail bytes use
+    1 or 2-byte accesses and others use maximum-length 4-byte bursts that
+    do not cross '_burst_boundary'.
+    :return: list of (address, byte offset, size, length)
+    """
+    bursts = []
+    offset = 0
+    end    = addr+nbytes
+    while (addr<end) and (addr&0x3):
+        size = 1 if (addr&0x1) or (end-addr)<2 else 2
+        bursts.append((addr, offset, size, 1))
+        addr   += size
+        offset += size
+    while (end-addr)>=4:
+        length = min((end-addr)>>2
+                    ,burst_max
+                    ,(_burst_boundary-(addr%_burst_boundary))>>2)
+        bursts.append((addr, offset, 4, length))
+        addr   += length<<2
+        offset += length<<2
+    while addr<end:
+        size = 2 if (end-addr)>=2 else 1
+        bursts.append((addr, offset, size, 1))
+        addr   += size
+        offset += size
+    return bursts
+
+#-------------------------------------------------------------------------------
+def BfmWriteBlock(con_handle, addr, buf, batch=None):
+    """
+    Write bytes to arbitrary byte range using maximum-length bursts,
+    which are pushed back to back.
+    :param con_handle: CON-FMC handler
+    :param addr: starting address to write
+    :param buf: buffer-protocol object holding bytes to write,
+                which is not copied except when it is read-only.
+    :param batch: BfmBatch to queue bursts into, which is flushed by the caller.
+                  New one is used and flushed when None.
+    :return: 0 on success, otherwize negative value.
+    """
+    base, nbytes, keep = _buffer_address(buf, False)
+    own = batch is None
+    if own: batch = BfmBatch(con_handle)
+    try:
+        for baddr, offset, size, length in _block_split(addr, nbytes, BfmGetBurstMax(con_handle)):
+            if size==4:
+               data = (ctypes.c_uint*length).from_address(base+offset)
+            elif size==2:
+               data = (ctypes.c_uint*1)(ctypes.c_uint16.from_address(base+offset).value)
+            else:
+               data = (ctypes.c_uint*1)(ctypes.c_uint8.from_address(base+offset).value)
+            ret = batch.write(baddr, data, size, length)
+            if ret: return ret
+        return batch.flush() if own else 0
+    finally:
+        if own: batch.close()
+
+#-------------------------------------------------------------------------------
+def BfmReadBlock(con_handle, addr, nbytes, buf=None):
+    """
+    Read bytes from arbitrary byte range using maximum-length bursts,
+    which are pushed back to back.
+    :param con_handle: CON-FMC handler
+    :param addr: starting address to read
+    :param nbytes: number of bytes to read
+    :param buf: writable buffer-protocol object to be filled, e.g.,
+                bytearray, memoryview, array, numpy.ndarray and mmap.
+                New bytearray is used when None.
+    :return: 'buf' holding read data, None on failure.
+    """
+    if buf is None: buf = bytearray(nbytes)
+    base, bsize, keep = _buffer_address(buf, True)
+    if bsize<nbytes:
+       raise ValueError("buffer too small (%d bytes instead of at least %d bytes)" % (bsize, nbytes))
+    narrow = []
+    with BfmBatch(con_handle) as batch:
+        for baddr, offset, size, length in _block_split(addr, nbytes, BfmGetBurstMax(con_handle)):
+            if size==4:
+               data = (ctypes.c_uint*length).from_address(base+offset)
+            else:
+               data = (ctypes.c_uint*1)()
+               narrow.append((offset, size, data))
+            if batch.read(baddr, data, size, length): return None
+        if batch.flush(): return None
+    for offset, size, data in narrow:
+        ctypes.memmove(base+offset, data, size) # little-endian host
+    return buf
+
 #===============================================================================
+# Memory tests are carried out by confmc.memtest, which moves NumPy patterns
+# with maximum-length bursts and compares them with vectorized operations.
+# Each returns confmc.memtest.MemTestResult, which carries mis-match addresses
+# along with expected and actual values, per-bit error histogram and MB/s.
+#-------------------------------------------------------------------------------
+def _memtest(con_handle, saddr, depth, name, **kwargs):
+    from confmc import memtest # numpy is loaded only when required
+    result = memtest.memtest(sys.modules[__name__], con_handle, saddr, depth
+                            , name=name, **kwargs)
+    print(str(result))
+    return result
+
+#-------------------------------------------------------------------------------
 def MemTestAddRAW(con_handle, saddr, depth):
     """
     Memory test using addres in read-after-write fashion.
     :param con_hadle: CON-FMC handler
     :param saddr: starting address to test
     :param depth: number of bytes to test
-    :return: void
+    :return: MemTestResult
     """
-    Wdata = ctypes.c_uint32(0)
-    Rdata = ctypes.c_uint32(0)
-    error = 0
-    for addr in range(saddr, depth, 4):
-        Wdata = ctypes.c_uint32(addr)
-        BfmWrite(con_handle, addr, ctypes.pointer(Wdata), 4, 1)
-        BfmRead(con_handle, addr, ctypes.pointer(Rdata), 4, 1)
-        if Wdata.value!=Rdata.value: error = error + 1
-       #else: print("A=%d DW=%d DR=%d" %(addr, Wdata.value, Rdata.value))
-    if error!=0:
-        print get_function_name()+" "+str(error)+" mis-match out of "+str(depth)
-    else:
-        print get_function_name()+" "+str(depth)+" OK"
+    return _memtest(con_handle, saddr, depth, "MemTestAddRAW"
+                   , pattern='address', order='raw')
 
 #-------------------------------------------------------------------------------
 def MemTestAdd(con_handle, saddr, depth):
@@ -220,24 +1121,10 @@ def MemTestAdd(con_handle, saddr, depth):
     :param con_hadle: CON-FMC handler
     :param saddr: starting address to test
     :param depth: number of bytes to test
-    :return: void
+    :return: MemTestResult
     """
-    error = 0
-    addr  = saddr
-    for addr in range(saddr, depth, 4):
-        Wdata = ctypes.c_uint32(addr+1)
-        BfmWrite(con_handle, addr, ctypes.pointer(Wdata), 4, 1)
-    addr  = saddr
-    for addr in range(saddr, depth, 4):
-        Edata = ctypes.c_uint32(addr+1)
-        Rdata = ctypes.c_uint32(0)
-        BfmRead(con_handle, addr, ctypes.pointer(Rdata), 4, 1)
-        if Rdata.value!=Edata.value: error = error + 1;
-       #else: print("A=%d DW=%d DR=%d" %(addr, Edata.value, Rdata.value))
-    if error!=0:
-        print get_function_name()+" "+str(error)+" mis-match out of "+str(depth)
-    else:
-        print get_function_name()+" "+str(depth)+" OK"
+    return _memtest(con_handle, saddr, depth, "MemTestAdd"
+                   , pattern='address+1', order='all')
 
 #-------------------------------------------------------------------------------
 def MemTestRAW(con_handle, saddr, depth, size):
@@ -247,29 +1134,11 @@ def MemTestRAW(con_handle, saddr, depth, size):
     :param saddr: starting address to test
     :param depth: number of bytes to test
     :param size: number of bytes for each access and can be 1, 2, 4.
-    :return: void
+    :return: MemTestResult
     """
-    import random
-    Wdata = ctypes.c_uint32(0)
-    Rdata = ctypes.c_uint32(0)
-    if   size==1: mask = 0x000000FF
-    elif size==2: mask = 0x0000FFFF
-    elif size==4: mask = 0xFFFFFFFF
-    else: 
-         mask = 0xFFFFFFFF
-         size = 4
-    random.seed(0x7)
-    error = 0
-    for addr in range(saddr, depth, size):
-        Wdata = ctypes.c_uint32(mask & random.randint(0,0xFFFFFFFF))
-        BfmWrite(con_handle, addr, ctypes.pointer(Wdata), size, 1)
-        BfmRead(con_handle, addr, ctypes.pointer(Rdata), size, 1)
-        if Wdata.value!=(Rdata.value&mask): error = error + 1
-       #else: print("A=%d DW=%d DR=%d" %(addr, Wdata.value, (Rdata.value&mask)))
-    if error!=0:
-        print get_function_name()+" size "+str(size)+" "+str(error)+" mis-match out of "+str(depth)
-    else:
-        print get_function_name()+" size"+str(size)+" "+str(depth)+" OK"
+    if size not in (1, 2, 4): size = 4
+    return _memtest(con_handle, saddr, depth, "MemTestRAW"
+                   , pattern='random', order='raw', size=size, seed=0x7)
 
 #-------------------------------------------------------------------------------
 def MemTest(con_handle, saddr, depth, size):
@@ -279,32 +1148,11 @@ def MemTest(con_handle, saddr, depth, size):
     :param saddr: starting address to test
     :param depth: number of bytes to test
     :param size: number of bytes for each access and can be 1, 2, 4.
-    :return: void
+    :return: MemTestResult
     """
-    import random
-    Wdata = ctypes.c_uint32(0)
-    Rdata = ctypes.c_uint32(0)
-    if   size==1: mask = 0x000000FF
-    elif size==2: mask = 0x0000FFFF
-    elif size==4: mask = 0xFFFFFFFF
-    else: 
-         mask = 0xFFFFFFFF
-         size = 4
-    random.seed(0x11)
-    for addr in range(saddr, depth, size):
-        Wdata = ctypes.c_uint32(mask & random.randint(0,0xFFFFFFFF))
-        BfmWrite(con_handle, addr, ctypes.pointer(Wdata), size, 1)
-    random.seed(0x11)
-    error = 0
-    for addr in range(saddr, depth, size):
-        Wdata = ctypes.c_uint32(mask & random.randint(0,0xFFFFFFFF))
-        BfmRead(con_handle, addr, ctypes.pointer(Rdata), size, 1)
-        if Wdata.value!=(Rdata.value&mask): error = error + 1
-       #else: print("A=%d DW=%d DR=%d" %(addr, Wdata.value, (Rdata.value&mask)))
-    if error!=0:
-        print get_function_name()+" size "+str(size)+" "+str(error)+" mis-match out of "+str(depth)
-    else:
-        print get_function_name()+" size"+str(size)+" "+str(depth)+" OK"
+    if size not in (1, 2, 4): size = 4
+    return _memtest(con_handle, saddr, depth, "MemTest"
+                   , pattern='random', order='all', size=size, seed=0x11)
 
 #-------------------------------------------------------------------------------
 def MemTestBurstRAW(con_handle, saddr, depth, leng):
@@ -313,33 +1161,13 @@ def MemTestBurstRAW(con_handle, saddr, depth, leng):
     :param con_hadle: CON-FMC handler
     :param saddr: starting address to test
     :param depth: number of bytes to test
-    :param length: burst length and can be 1-256 for AMBA AXI4
-    :return: void
+    :param length: burst length and can be 1-256 for AMBA AXI4,
+                   which is limited by BfmGetBurstMax().
+    :return: MemTestResult
     """
-    import random
-    Wdata = [ctypes.c_uint32(i) for i in range(leng)]
-    Rdata = [ctypes.c_uint32(0)]*leng
-    random.seed(0x3)
-    error = 0
-    for addr in range(saddr, depth, 4*leng):
-        for idx in range(0, leng, 1):
-            Wdata[idx] = ctypes.c_uint32(random.randint(0,0xFFFFFFFF))
-       #print Wdata
-        wints = (ctypes.c_uint32 * len(Wdata))(*Wdata)
-       #pwints = ctypes.cast(wints, ctypes.POINTER(ctypes.c_uint32))
-        BfmWrite(con_handle, addr, wints, 4, leng)
-        rints = (ctypes.c_uint32 * len(Rdata))(*Rdata)
-       #prints = ctypes.cast(rints, ctypes.POINTER(ctypes.c_uint32))
-        BfmRead(con_handle, addr, rints, 4, leng)
-        for idx in range(0, leng, 1):
-            if Wdata[idx].value!=rints[idx]:
-                  error = error + 1
-                 #print("A=%d DW=%s DR=%s" %(addr, hex(Wdata[idx].value), hex(rints[idx])))
-           #else: print("A=%d DW=%s DR=%s" %(addr, hex(Wdata[idx].value), hex(rints[idx])))
-    if error!=0:
-        print get_function_name()+" burst "+str(leng)+" "+str(error)+" mis-match out of "+str(depth)
-    else:
-        print get_function_name()+" burst " +str(leng)+" "+str(depth)+" OK"
+    return _memtest(con_handle, saddr, depth, "MemTestBurstRAW"
+                   , pattern='random', order='raw', length=leng, seed=0x3
+                   , chunk=4*leng)
 
 #-------------------------------------------------------------------------------
 def MemTestBurst(con_handle, saddr, depth, leng):
@@ -348,32 +1176,12 @@ def MemTestBurst(con_handle, saddr, depth, leng):
     :param con_hadle: CON-FMC handler
     :param saddr: starting address to test
     :param depth: number of bytes to test
-    :param length: burst length and can be 1-256 for AMBA AXI4
-    :return: void
+    :param length: burst length and can be 1-256 for AMBA AXI4,
+                   which is limited by BfmGetBurstMax().
+    :return: MemTestResult
     """
-    import random
-    Wdata = [ctypes.c_uint32(i) for i in range(leng)]
-    random.seed(0x3)
-    for addr in range(saddr, depth, 4*leng):
-        for idx in range(0, leng, 1):
-            Wdata[idx] = ctypes.c_uint32(random.randint(0,0xFFFFFFFF))
-        wints = (ctypes.c_uint32 * len(Wdata))(*Wdata)
-        BfmWrite(con_handle, addr, wints, 4, leng)
-    error = 0
-    random.seed(0x3)
-    Rdata = [ctypes.c_uint32(0)]*leng
-    for addr in range(saddr, depth, 4*leng):
-        rints = (ctypes.c_uint32 * len(Rdata))(*Rdata)
-        BfmRead(con_handle, addr, rints, 4, leng)
-        for idx in range(0, leng, 1):
-            if Wdata[idx].value!=rints[idx]:
-                  error = error + 1
-                 #print("A=%d DW=%s DR=%s" %(addr, hex(Wdata[idx].value), hex(rints[idx])))
-           #else: print("A=%d DW=%s DR=%s" %(addr, hex(Wdata[idx].value), hex(rints[idx])))
-    if error!=0:
-        print get_function_name()+" burst "+str(leng)+" "+str(error)+" mis-match out of "+str(depth)
-    else:
-        print get_function_name()+" burst "+str(leng)+" "+str(depth)+" OK"
+    return _memtest(con_handle, saddr, depth, "MemTestBurst"
+                   , pattern='random', order='all', length=leng, seed=0x3)
 
 #-------------------------------------------------------------------------------
 # Testing code for standalone
@@ -385,16 +1193,16 @@ def main(argv):
     try:
         opts, args = getopt.getopt(argv, "hc:",['help','cid='])
     except getopt.GetoptError:
-        print 'pyconbfm.py -c 0'
+        print('pyconbfm.py -c 0')
         sys.exit(2)
     for opt, arg in opts:
         if opt == '-h':
-             print 'pyconbfm.py -c 0'
+             print('pyconbfm.py -c 0')
              sys.exit()
         elif opt in ("-c", "--cid"):
              cid = int(arg)
         else:
-             print 'Unknown options: '+str(opt)
+             print('Unknown options: '+str(opt))
              sys.exit(1)
   
     #----------------------------------------
@@ -407,8 +1215,8 @@ def main(argv):
     hdl = conInit(cid)
     if not hdl:
        error = conGetErrorConapi()
-       print error
-       print conErrorMsgConapi(error)+' for CID: '+str(cid)
+       print(error)
+       print(conErrorMsgConapi(error)+' for CID: '+str(cid))
        sys.exit(1)
     con = hdl.contents; #con = con_Handle.from_address(hdl)
     print(con.__repr__())
@@ -422,11 +1230,11 @@ def main(argv):
     cid_r = conGetCid(hdl)
     if cid_r<0:
        error = conGetErrorConapi()
-       print 'error code: '+str(error)
-       print conErrorMsgConapi(error)
+       print('error code: '+str(error))
+       print(conErrorMsgConapi(error))
        sys.exit(1)
     elif cid!=cid_r:
-       print 'cid mis-match'
+       print('cid mis-match')
        sys.exit(1)
     print('CID: '+str(cid))
 
@@ -435,14 +1243,14 @@ def main(argv):
     pUsbInfo = ctypes.byref(UsbInfo)
     conGetUsbInfo( hdl, pUsbInfo )
     print("USB Infomation")
-    print "      %s" % UsbInfo.__str__()
+    print("      %s" % UsbInfo.__str__())
   
     #----------------------------------------
     Fx3Info=con_Fx3Info()
     pFx3Info = ctypes.byref(Fx3Info); # pFx3Info = ctypes.pointer(Fx3Info)
     conGetFx3Info ( hdl, pFx3Info )
     print('FX3 Version')
-    print "      %s" % Fx3Info.__str__()
+    print("      %s" % Fx3Info.__str__())
   
     #----------------------------------------
     BoardInfo=con_BoardInfo()
@@ -452,7 +1260,7 @@ def main(argv):
     ret = conGetBoardInfo( hdl, pBoardInfo, length, crc_check )
     if ret:
        print("Board Infomation")
-       print "      %s" % BoardInfo.__str__()
+       print("      %s" % BoardInfo.__str__())
     else:
        print("Board Information not found; check if programmed")
   
@@ -462,16 +1270,16 @@ def main(argv):
     ret = conGetMasterInfo( hdl, pMasterInfo )
     if ret:
        print("Master Infomation")
-       print "      %s" % MasterInfo.__str__()
+       print("      %s" % MasterInfo.__str__())
     else:
-       print 'CON-FMC master not found; FPGA may not be configured yet.'
+       print('CON-FMC master not found; FPGA may not be configured yet.')
        error = conGetErrorConapi()
-       print error
-       print conErrorMsgConapi(error)+' for CID: '+str(cid)
+       print(error)
+       print(conErrorMsgConapi(error)+' for CID: '+str(cid))
        print('ret:'+str(ret))
        if  ret <= -6 and ret >= -18:
-             print 'conGetErrorLibusb'
-             print conGetErrorLibusb()
+             print('conGetErrorLibusb')
+             print(conGetErrorLibusb())
        sys.exit(1)
   
     #----------------------------------------
@@ -481,7 +1289,7 @@ def main(argv):
     #----------------------------------------
     if _con_bfm_type == 'axi':
        ret = BfmSetAmbaAxi4(hdl)
-       print "AMBA AXI burst length: "+str(ret)
+       print("AMBA AXI burst length: "+str(ret))
     MemTestAddRAW(hdl, 0, 0x100)
     MemTestAdd(hdl, 0, 0x100)
     MemTestRAW(hdl, 0, 0x100, 4)
@@ -504,6 +1312,30 @@ if __name__ == '__main__':
 #===============================================================================
 # Revision history:
 #
+# 2026.10.18: conGetErrorLibusb() of the emulator
+# 2026.10.18: BfmPipe.collect() fails after reads dropped by collection by itself
+# 2026.10.18: Library lacking BFM calls of this module reported at load
+# 2026.10.18: _usb imported explicitly for conGetUsbInfo() of the emulator
+# 2026.10.18: conRelease() by BfmRelease() of the BFM
+# 2026.10.18: BfmTransactV splits incremental descriptors at '_burst_boundary'
+# 2026.10.18: BfmContextSet() added
+# 2026.10.18: conEmuSetDepth() and 'timeouts' of con_EmuStats
+# 2026.10.18: BfmGetReadDepth() from conGetMasterInfo() limits BfmBatch and BfmPipe
+# 2026.10.18: Bfm*Status(), BfmRecover/SetRecovery/ErrorMsg and typed exceptions
+# 2026.10.18: Burst limit kept in the context of each handler by the BFM
+# 2026.10.18: BfmTransactV for scatter-gather transactions
+# 2026.10.18: BfmBatch.write_fix/read_fix for AMBA AHB as well
+# 2026.10.18: BfmStatsEnable/Get/Clear for instrumentation
+# 2026.10.18: conEmuSetIrq() of the emulator
+# 2026.10.18: BfmPipe for split-phase reads
+# 2026.10.18: print() used for Python 3
+# 2026.10.18: Emulator link profile and statistics
+# 2026.10.18: Emulated libconapi selected by 'CONFMC_EMU'
+# 2026.10.18: MemTest* carried out by confmc.memtest with structured results
+# 2026.10.18: Buffer-protocol objects accepted for BFM data without copying
+# 2026.10.18: BfmWriteBlock/BfmReadBlock added
+# 2026.10.18: BfmBatch added
+# 2026.10.18: Prototypes are bound once at load instead of on each call
 # 2019.01.28: Started by Ando Ki (adki@future-ds.com)
 #             - Not finished yet
 #===============================================================================
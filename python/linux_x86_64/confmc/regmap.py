@@ -0,0 +1,445 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains register-map layer for CON-FMC AMBA BFM.
+
+A register map is loaded from JSON, CSV or IP-XACT-lite file and bound to
+a CON-FMC handler, where registers and their fields are attributes.
+
+    regs = RegisterBank(confmc.pyconbfmaxi, hdl, load('dma.json'))
+    regs.CTRL.ENABLE = 1         # read-modify-write right away
+    with regs.transaction():     # deferred and merged
+         regs.SRC  = 0x1000
+         regs.DST  = 0x2000
+         regs.CTRL.START = 1
+    print(regs.STATUS.BUSY)
+
+Each register has one of the policies:
+- 'volatile'  : always read from the device, e.g., status registers
+- 'cached'    : read once and then kept in the shadow, which is updated on write
+- 'write-only': never read, where the shadow starts from the reset value
+
+Field updates in a transaction block are merged for each register and
+committed on exit with a batch of reads for read-modify-write of volatile
+registers, if any, followed by a batch of writes, where contiguous registers
+go together as bursts.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC register map"
+
+#-------------------------------------------------------------------------------
+import os
+import csv
+import json
+import numbers
+import contextlib
+import collections
+import xml.etree.ElementTree as ElementTree
+import numpy
+from confmc import memtest
+
+#===============================================================================
+POLICIES = ('volatile', 'cached', 'write-only')
+
+_ACCESS  = { 'rw': 'rw', 'read-write': 'rw'
+           , 'ro': 'ro', 'read-only' : 'ro'
+           , 'wo': 'wo', 'write-only': 'wo' }
+
+def _int(value):
+    if isinstance(value, numbers.Integral): return int(value)
+    return int(str(value).strip().replace('_', ''), 0)
+
+#-------------------------------------------------------------------------------
+class Field(object):
+    """
+    Bit field of a register.
+    """
+    def __init__(self, name, lsb, width, access='rw', desc=''):
+        if access not in _ACCESS:
+           raise ValueError("unknown access: "+str(access))
+        if (lsb<0) or (width<1) or ((lsb+width)>32):
+           raise ValueError("field "+name+" out of 32-bit register")
+        self.name   = name
+        self.lsb    = lsb
+        self.width  = width
+        self.access = _ACCESS[access]
+        self.desc   = desc
+        self.mask   = ((1<<width)-1)<<lsb
+
+    def __repr__(self):
+        return "Field(%s, %d, %d, %s)" % (self.name, self.lsb, self.width, self.access)
+
+class Register(object):
+    """
+    32-bit register at 'offset' from the base.
+    """
+    def __init__(self, name, offset, fields=(), policy='volatile', reset=0, desc=''):
+        if policy not in POLICIES:
+           raise ValueError("unknown policy: "+str(policy))
+        if offset&0x3:
+           raise ValueError("register "+name+" should be 4-byte aligned")
+        self.name   = name
+        self.offset = offset
+        self.policy = policy
+        self.reset  = reset&0xFFFFFFFF
+        self.desc   = desc
+        self.fields = collections.OrderedDict((f.name, f) for f in fields)
+
+    def __repr__(self):
+        return "Register(%s, 0x%X, %s)" % (self.name, self.offset, self.policy)
+
+class RegisterMap(object):
+    """
+    Registers by name, which are sorted by offset.
+    """
+    def __init__(self, name='', base=0, registers=()):
+        self.name      = name
+        self.base      = base
+        self.registers = collections.OrderedDict()
+        self.offsets   = {} # offset -> Register
+        for reg in sorted(registers, key=lambda r: r.offset):
+            if (reg.name in self.registers) or (reg.offset in self.offsets):
+               raise ValueError("register "+reg.name+" duplicated")
+            self.registers[reg.name] = reg
+            self.offsets[reg.offset] = reg
+
+    def __getitem__(self, name):
+        return self.registers[name]
+
+    def __iter__(self):
+        return iter(self.registers.values())
+
+#===============================================================================
+# Loaders
+#-------------------------------------------------------------------------------
+def load_json(path):
+    """
+    { "name": "dma", "base": "0x40000000",
+      "registers": [ { "name": "CTRL", "offset": "0x0", "policy": "cached", "reset": 0,
+                       "fields": [ { "name": "ENABLE", "lsb": 0, "width": 1, "access": "rw" } ] } ] }
+    """
+    with open(path) as fp:
+        desc = json.load(fp)
+    regs = []
+    for r in desc.get('registers', []):
+        fields = [Field(f['name'], _int(f['lsb']), _int(f.get('width', 1))
+                       ,f.get('access', 'rw'), f.get('desc', ''))
+                  for f in r.get('fields', [])]
+        regs.append(Register(r['name'], _int(r['offset']), fields
+                            ,r.get('policy', 'volatile'), _int(r.get('reset', 0))
+                            ,r.get('desc', '')))
+    return RegisterMap(desc.get('name', ''), _int(desc.get('base', 0)), regs)
+
+def load_csv(path):
+    """
+    One field in each row, with header of
+    'register,offset,policy,reset,field,lsb,width,access,desc',
+    where columns for the register are needed only on its first row.
+    """
+    regs  = collections.OrderedDict()
+    with open(path) as fp:
+        for row in csv.DictReader(fp):
+            row  = dict((k.strip(), (v or '').strip()) for k, v in row.items() if k)
+            name = row['register']
+            if name not in regs:
+               regs[name] = Register(name, _int(row['offset']), ()
+                                    ,row.get('policy') or 'volatile'
+                                    ,reset=_int(row.get('reset') or 0))
+            if row.get('field'):
+               field = Field(row['field'], _int(row['lsb']), _int(row.get('width') or 1)
+                            ,row.get('access') or 'rw', row.get('desc', ''))
+               regs[name].fields[field.name] = field
+    return RegisterMap(os.path.splitext(os.path.basename(path))[0], 0, regs.values())
+
+def load_ipxact(path):
+    """
+    IP-XACT-lite, i.e., 'register' elements with 'name', 'addressOffset',
+    'size' (32 only), 'volatile', 'access', 'reset/value' and 'field' elements
+    with 'name', 'bitOffset', 'bitWidth' and 'access', regardless of namespace.
+    The first 'addressBlock/baseAddress' becomes the base.
+    """
+    def tag(elem):
+        return elem.tag.split('}')[-1]
+    def child(elem, name, default=None):
+        for sub in elem:
+            if tag(sub)==name: return (sub.text or '').strip()
+        return default
+    root = ElementTree.parse(path).getroot()
+    base = 0
+    regs = []
+    for elem in root.iter():
+        if (tag(elem)=='addressBlock') and not base:
+           base = _int(child(elem, 'baseAddress', '0'))
+        if tag(elem)!='register': continue
+        if _int(child(elem, 'size', '32'))!=32:
+           raise ValueError("register "+child(elem, 'name')+" should be 32-bit")
+        reset = 0
+        for sub in elem:
+            if tag(sub)=='reset': reset = _int(child(sub, 'value', '0'))
+        access = _ACCESS.get(child(elem, 'access', 'read-write'), 'rw')
+        fields = [Field(child(f, 'name'), _int(child(f, 'bitOffset'))
+                       ,_int(child(f, 'bitWidth', '1'))
+                       ,child(f, 'access', child(elem, 'access', 'read-write'))
+                       ,child(f, 'description', ''))
+                  for f in elem if tag(f)=='field']
+        if child(elem, 'volatile', 'false').lower()=='true':
+           policy = 'volatile'
+        elif access=='wo':
+           policy = 'write-only'
+        else:
+           policy = 'cached'
+        regs.append(Register(child(elem, 'name'), _int(child(elem, 'addressOffset'))
+                            ,fields, policy, reset, child(elem, 'description', '')))
+    return RegisterMap(child(root, 'name', ''), base, regs)
+
+def load(path):
+    """
+    Load register map by file extension, i.e., '.json', '.csv' or '.xml'.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext=='.json': return load_json(path)
+    if ext=='.csv' : return load_csv(path)
+    if ext in ('.xml', '.ipxact'): return load_ipxact(path)
+    raise ValueError("unknown register map format: "+path)
+
+#===============================================================================
+class RegisterProxy(object):
+    """
+    Register bound to a RegisterBank, whose fields are attributes.
+    """
+    __slots__ = ('_bank', '_reg')
+
+    def __init__(self, bank, reg):
+        object.__setattr__(self, '_bank', bank)
+        object.__setattr__(self, '_reg', reg)
+
+    @property
+    def value(self):
+        return self._bank.read(self._reg.name)
+
+    @value.setter
+    def value(self, value):
+        self._bank.write(self._reg.name, value)
+
+    def __int__(self):
+        return self.value
+
+    def __getattr__(self, name):
+        field = self._reg.fields.get(name)
+        if field is None:
+           raise AttributeError(self._reg.name+" has no field "+name)
+        return (self._bank.read(self._reg.name)&field.mask)>>field.lsb
+
+    def __setattr__(self, name, value):
+        if name=='value': return object.__setattr__(self, name, value)
+        field = self._reg.fields.get(name)
+        if field is None:
+           raise AttributeError(self._reg.name+" has no field "+name)
+        self._bank.update(self._reg.name, **{name: value})
+
+    def __repr__(self):
+        return "<%s 0x%08X>" % (self._reg.name, self.value)
+
+class RegisterBank(object):
+    """
+    Register map bound to a CON-FMC handler with shadow cache.
+    Failed access raises IOError carrying the negative return value.
+    """
+    def __init__(self, bfm, con_handle, regmap, base=None):
+        """
+        :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+        :param con_handle: CON-FMC handler
+        :param regmap: RegisterMap
+        :param base: base address, None for the one of 'regmap'
+        """
+        d = self.__dict__
+        d['bfm']        = bfm
+        d['con_handle'] = con_handle
+        d['regmap']     = regmap
+        d['base']       = regmap.base if base is None else base
+        d['transfers']  = 0  # num of batches pushed
+        d['_shadow']    = dict((r.offset, r.reset) for r in regmap if r.policy=='write-only')
+        d['_pending']   = collections.OrderedDict() # offset -> [value, mask]
+        d['_depth']     = 0  # nesting of transaction()
+
+    #---------------------------------------------------------------------------
+    def __getattr__(self, name):
+        reg = self.regmap.registers.get(name)
+        if reg is None: raise AttributeError("no register "+name)
+        return RegisterProxy(self, reg)
+
+    def __setattr__(self, name, value):
+        if name not in self.regmap.registers:
+           raise AttributeError("no register "+name)
+        self.write(name, value)
+
+    #---------------------------------------------------------------------------
+    def read(self, name):
+        """
+        Value of the register following its policy, where pending updates
+        in a transaction are merged.
+        """
+        reg = self.regmap[name]
+        if (reg.policy=='volatile') or (reg.offset not in self._shadow):
+           data = self._read([reg.offset])
+           value = data[reg.offset]
+           if reg.policy=='cached': self._shadow[reg.offset] = value
+        else:
+           value = self._shadow[reg.offset]
+        pend = self._pending.get(reg.offset)
+        if pend: value = (value&~pend[1])|pend[0]
+        return value
+
+    def write(self, name, value):
+        """
+        Write the whole register.
+        """
+        reg = self.regmap[name]
+        self._pending[reg.offset] = [value&0xFFFFFFFF, 0xFFFFFFFF]
+        if not self._depth: self.commit()
+
+    def update(self, name, **fields):
+        """
+        Update fields of the register, e.g., update('CTRL', ENABLE=1, MODE=2).
+        """
+        reg   = self.regmap[name]
+        value = mask = 0
+        for fname, fvalue in fields.items(): # all checked before any goes pending
+            field = reg.fields.get(fname)
+            if field is None:
+               raise AttributeError(name+" has no field "+fname)
+            if field.access=='ro':
+               raise ValueError(name+"."+fname+" is read-only")
+            if (fvalue<0) or (fvalue>>field.width):
+               raise ValueError(name+"."+fname+" out of range: "+str(fvalue))
+            value = (value&~field.mask)|(fvalue<<field.lsb)
+            mask |= field.mask
+        pend = self._pending.setdefault(reg.offset, [0, 0])
+        pend[0] = (pend[0]&~mask)|value
+        pend[1] |= mask
+        if not self._depth: self.commit()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Defer writes and field updates until the outermost block exits,
+        where pending updates are dropped on exception.
+        """
+        self.__dict__['_depth'] += 1
+        try:
+            yield self
+        except BaseException:
+            self.__dict__['_depth'] -= 1
+            if not self._depth: self._pending.clear()
+            raise
+        self.__dict__['_depth'] -= 1
+        if not self._depth: self.commit()
+
+    def commit(self):
+        """
+        Write pending updates with a batch of reads for read-modify-write of
+        registers whose value is not known, followed by a batch of writes.
+        """
+        pending = self._pending
+        if not pending: return
+        self.__dict__['_pending'] = collections.OrderedDict()
+        unknown = [off for off, (value, mask) in pending.items()
+                   if (mask!=0xFFFFFFFF) and ((self._policy(off)=='volatile')
+                                              or (off not in self._shadow))]
+        current = self._read(unknown) if unknown else {}
+        values  = {}
+        for off, (value, mask) in pending.items():
+            old = current[off] if off in current else self._shadow.get(off, 0)
+            values[off] = (old&~mask)|value
+        self._write(values)
+        for off, value in values.items():
+            if self._policy(off)!='volatile': self._shadow[off] = value
+
+    def invalidate(self):
+        """
+        Drop the shadow of cached registers, which are read again on next access.
+        """
+        for reg in self.regmap:
+            if reg.policy=='cached': self._shadow.pop(reg.offset, None)
+
+    def dump(self):
+        """
+        Read all readable registers in a single batch.
+        :return: OrderedDict of register name and value
+        """
+        regs = [r for r in self.regmap if r.policy!='write-only']
+        data = self._read([r.offset for r in regs])
+        for r in regs:
+            if r.policy=='cached': self._shadow[r.offset] = data[r.offset]
+        return collections.OrderedDict((r.name, data[r.offset]) for r in regs)
+
+    #---------------------------------------------------------------------------
+    def _policy(self, offset):
+        return self.regmap.offsets[offset].policy
+
+    def _runs(self, offsets):
+        """
+        Group offsets into runs of contiguous registers.
+        :return: list of (offset, number of registers)
+        """
+        runs = []
+        for off in sorted(offsets):
+            if runs and (runs[-1][0]+4*runs[-1][1])==off:
+               runs[-1][1] += 1
+            else:
+               runs.append([off, 1])
+        return runs
+
+    def _read(self, offsets):
+        bfm   = self.bfm
+        data  = {}
+        bufs  = []
+        batch = bfm.BfmBatch(self.con_handle)
+        try:
+            for off, num in self._runs(offsets):
+                buf = numpy.empty(num, dtype=numpy.uint32)
+                bufs.append((off, buf))
+                for addr, idx, length in memtest.bursts(bfm, self.con_handle, self.base+off, num, 4):
+                    ret = batch.read(addr, buf[idx:idx+length], 4, length)
+                    if ret: raise IOError(ret, "register read failed")
+            ret = batch.flush()
+            self.__dict__['transfers'] += 1
+            if ret: raise IOError(ret, "register read failed")
+        finally:
+            batch.close()
+        for off, buf in bufs:
+            for idx, value in enumerate(buf):
+                data[off+4*idx] = int(value)
+        return data
+
+    def _write(self, values):
+        bfm   = self.bfm
+        batch = bfm.BfmBatch(self.con_handle)
+        try:
+            for off, num in self._runs(values):
+                buf = numpy.array([values[off+4*idx] for idx in range(num)], dtype=numpy.uint32)
+                for addr, idx, length in memtest.bursts(bfm, self.con_handle, self.base+off, num, 4):
+                    ret = batch.write(addr, buf[idx:idx+length], 4, length)
+                    if ret: raise IOError(ret, "register write failed")
+            ret = batch.flush()
+            self.__dict__['transfers'] += 1
+            if ret: raise IOError(ret, "register write failed")
+        finally:
+            batch.close()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Fields of update() checked before they go pending
+# 2026.10.18: Batch depth follows BfmGetReadDepth(), i.e., F2U fifo of the transactor
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,414 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains streaming interface for CON-FMC.
+
+Stream turns the card into one of stream modes, where USB bulk transfers
+carry raw data of the user design instead of BFM transactions,
+  - CON_MODE_SU2F:  stream-out, i.e., USB-to-FPGA
+  - CON_MODE_SF2U:  stream-in, i.e., FPGA-to-USB, e.g., ADC capture
+  - CON_MODE_SLOOP: both directions
+and a background I/O thread moves data between the card and rings of
+preallocated page-aligned buffers, while the caller produces or consumes
+chunks at its own pace. BFM transactions should not be used on the handler
+until the stream is closed, which puts it back to CON_MODE_CMD.
+
+    with Stream(confmc.pyconbfmaxi, hdl, CON_MODE_SF2U, chunk=1<<20) as stream:
+         for chunk in stream.read_chunks(total=256<<20):
+             process(chunk) # numpy.uint32, valid until the next chunk
+    print(stream.stats)
+
+    with Stream(confmc.pyconbfmaxi, hdl, CON_MODE_SU2F) as stream:
+         stream.write_from('pattern.bin') # file, file object or iterable
+
+An overrun is counted when the I/O thread could not go on reading since all
+stream-in buffers were held by the consumer, which may let the FIFO in the
+FPGA overflow, and an underrun when it had nothing to write while the
+producer was still on.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC streaming interface"
+
+#-------------------------------------------------------------------------------
+import ctypes
+import threading
+import timeit
+import numpy
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+#===============================================================================
+# See 'include/conapi_int.h'.
+CON_MODE_CMD   = 0x0 # command mode
+CON_MODE_SU2F  = 0x1 # stream-out (USB-to-FPGA) mode
+CON_MODE_SF2U  = 0x2 # stream-in (USB-from-FPGA) mode
+CON_MODE_SLOOP = 0x3 # CON_MODE_SU2F|CON_MODE_SF2U
+
+# See 'include/conapi_error.h'.
+CONAPI_ERROR_USB_BULK_IN = 17
+LIBUSB_ERROR_TIMEOUT     = -7
+
+PAGE_SIZE = 4096
+
+#-------------------------------------------------------------------------------
+def aligned(nbytes, align=PAGE_SIZE):
+    """
+    Return numpy.uint32 array of 'nbytes' starting at 'align'-byte boundary.
+    """
+    raw = numpy.empty(nbytes+align, dtype=numpy.uint8)
+    off = (-raw.ctypes.data)%align
+    return raw[off:off+nbytes].view(numpy.uint32)
+
+#-------------------------------------------------------------------------------
+class StreamStats(object):
+    """
+    Statistics of a stream.
+    """
+    def __init__(self):
+        self.bytes_in   = 0
+        self.bytes_out  = 0
+        self.chunks_in  = 0
+        self.chunks_out = 0
+        self.overruns   = 0
+        self.underruns  = 0
+        self.errors     = 0
+        self.start      = timeit.default_timer()
+        self.stop       = None
+
+    @property
+    def seconds(self):
+        stop = timeit.default_timer() if self.stop is None else self.stop
+        return stop-self.start
+
+    @property
+    def mbps_in(self):
+        return self.bytes_in/self.seconds/1.0E6 if self.seconds>0 else 0.0
+
+    @property
+    def mbps_out(self):
+        return self.bytes_out/self.seconds/1.0E6 if self.seconds>0 else 0.0
+
+    def to_dict(self):
+        return { 'bytes_in'  : self.bytes_in
+               , 'bytes_out' : self.bytes_out
+               , 'chunks_in' : self.chunks_in
+               , 'chunks_out': self.chunks_out
+               , 'overruns'  : self.overruns
+               , 'underruns' : self.underruns
+               , 'errors'    : self.errors
+               , 'seconds'   : self.seconds
+               , 'mbps_in'   : self.mbps_in
+               , 'mbps_out'  : self.mbps_out }
+
+    def __str__(self):
+        return ("in %d bytes (%.2f MB/s) out %d bytes (%.2f MB/s) in %.3f sec, %d overruns %d underruns %d errors"
+                % (self.bytes_in, self.mbps_in, self.bytes_out, self.mbps_out
+                  ,self.seconds, self.overruns, self.underruns, self.errors))
+
+#===============================================================================
+class Stream(object):
+    """
+    Stream mode of a CON-FMC handler.
+    A failed transfer stops the stream and raises IOError to the caller.
+    """
+    def __init__(self, bfm, con_handle, mode=CON_MODE_SF2U, chunk=1<<20, depth=4):
+        """
+        :param bfm: BFM module, i.e., confmc.pyconbfmaxi or confmc.pyconbfmahb
+        :param con_handle: CON-FMC handler
+        :param mode: CON_MODE_SU2F, CON_MODE_SF2U or CON_MODE_SLOOP
+        :param chunk: number of bytes of each buffer, i.e., USB transfer,
+                      which should be multiple of 4
+        :param depth: number of buffers of each direction
+        """
+        if mode not in (CON_MODE_SU2F, CON_MODE_SF2U, CON_MODE_SLOOP):
+           raise ValueError("mode should be CON_MODE_SU2F, CON_MODE_SF2U or CON_MODE_SLOOP")
+        if (chunk<=0) or (chunk%4):
+           raise ValueError("chunk should be positive multiple of 4")
+        if depth<1:
+           raise ValueError("depth should be positive")
+        self.bfm        = bfm
+        self.con_handle = con_handle
+        self.mode       = mode
+        self.chunk      = chunk
+        self.depth      = depth
+        self.stats      = StreamStats()
+        self.error      = 0
+        self._words     = chunk//4
+        self._kick      = threading.Event() # wakes up the I/O thread
+        self._cond      = threading.Condition() # for flush()
+        self._stop      = False
+        self._feeding   = False # producer is on
+        self._inflight  = 0 # num of stream-out buffers queued but not written
+        self._in_free = self._in_full = self._out_free = self._out_full = None
+        if mode&CON_MODE_SF2U:
+           self._in_free = queue.Queue()
+           self._in_full = queue.Queue()
+           for idx in range(depth): self._in_free.put(aligned(chunk))
+        if mode&CON_MODE_SU2F:
+           self._out_free = queue.Queue()
+           self._out_full = queue.Queue()
+           for idx in range(depth): self._out_free.put(aligned(chunk))
+        ret = bfm.conSetMode(con_handle, mode)
+        if ret<0: raise IOError(ret, "conSetMode failed")
+        self._thread = threading.Thread(target=self._serve
+                                       ,name='confmc-stream-'+str(id(self)))
+        self._thread.daemon = True
+        self._thread.start()
+
+    #---------------------------------------------------------------------------
+    def close(self):
+        """
+        Write what has been queued, stop the I/O thread and go back to
+        CON_MODE_CMD, where stream-in data not yet consumed are dropped.
+        """
+        if self._thread is None: return
+        try:
+            if self._out_full is not None: self.flush()
+        finally:
+            self._stop = True
+            self._kick.set()
+            self._thread.join()
+            self._thread = None
+            self.stats.stop = timeit.default_timer()
+            self.bfm.conSetMode(self.con_handle, CON_MODE_CMD)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def _check(self):
+        if self.error: raise IOError(self.error, "stream transfer failed")
+
+    #---------------------------------------------------------------------------
+    def _serve(self):
+        bfm       = self.bfm
+        hdl       = self.con_handle
+        stats     = self.stats
+        done      = ctypes.c_uint(0)
+        in_buf    = None
+        in_num    = 0
+        in_stall  = False
+        out_stall = False
+        while not self._stop:
+            busy = False
+            if self._out_full is not None:
+               try:
+                   buf, num, zlp = self._out_full.get_nowait()
+               except queue.Empty:
+                   if self._feeding and not out_stall:
+                      stats.underruns += 1
+                      out_stall = True
+               else:
+                   out_stall = False
+                   busy      = True
+                   addr      = buf.ctypes.data
+                   pos       = 0
+                   while True: # 'num' can be 0 to send ZLP only
+                       ret = bfm._conStreamWrite(hdl, addr+pos*4, num-pos, ctypes.byref(done), zlp)
+                       pos += done.value
+                       if ret or (pos>=num): break
+                       if not done.value:
+                          ret = -1
+                          break
+                   stats.bytes_out  += pos*4
+                   stats.chunks_out += 1
+                   self._out_free.put(buf)
+                   with self._cond:
+                       self._inflight -= 1
+                       self._cond.notify_all()
+                   if ret:
+                      stats.errors += 1
+                      self.error    = ret
+                      break
+            if self._in_full is not None:
+               if in_buf is None:
+                  try:
+                      in_buf = self._in_free.get_nowait()
+                      in_num = 0
+                      in_stall = False
+                  except queue.Empty:
+                      if not in_stall:
+                         stats.overruns += 1
+                         in_stall = True
+               if in_buf is not None:
+                  ret = bfm._conStreamRead(hdl, in_buf.ctypes.data+in_num*4, self._words-in_num
+                                          ,ctypes.byref(done))
+                  in_num += done.value
+                  if done.value: busy = True
+                  if (in_num==self._words) or (in_num and not done.value):
+                     stats.bytes_in  += in_num*4
+                     stats.chunks_in += 1
+                     self._in_full.put((in_buf, in_num))
+                     in_buf = None
+                  if ret and not done.value and not self._timeout():
+                     stats.errors += 1
+                     self.error    = ret
+                     break
+            if not busy:
+               self._kick.wait(0.0005)
+               self._kick.clear()
+        with self._cond:
+            self._cond.notify_all()
+        if self._in_full is not None:
+           self._in_full.put(None) # tells the consumer the end
+
+    def _timeout(self):
+        """
+        Return True when the last stream-in failed by time-out, i.e., nothing to read.
+        """
+        if self.bfm.conGetErrorConapi()!=CONAPI_ERROR_USB_BULK_IN: return False
+        return self.bfm.conGetErrorLibusb() in (0, LIBUSB_ERROR_TIMEOUT)
+
+    #---------------------------------------------------------------------------
+    def read_chunks(self, total=None, copy=False, timeout=None):
+        """
+        Yield stream-in data as they arrive.
+        :param total: number of bytes to read, None for ever
+        :param copy: False to yield a view of the ring buffer, which is
+                     valid until the next chunk is taken; True for a copy
+        :param timeout: seconds to wait for a chunk, None for ever,
+                        which ends iteration when expired
+        :return: iterator of numpy.uint32 arrays of 'chunk' bytes at most
+        """
+        if self._in_full is None:
+           raise ValueError("stream-in is not on, use CON_MODE_SF2U or CON_MODE_SLOOP")
+        if (total is not None) and (total%4):
+           raise ValueError("total should be multiple of 4")
+        left = None if total is None else total//4
+        while (left is None) or (left>0):
+            try:
+                item = self._in_full.get(timeout=timeout)
+            except queue.Empty:
+                return
+            if item is None:
+               self._in_full.put(None)
+               self._check()
+               return
+            buf, num = item
+            if (left is not None) and (num>left): num = left
+            try:
+                yield buf[:num].copy() if copy else buf[:num]
+            finally:
+                self._in_free.put(buf)
+                self._kick.set()
+            if left is not None: left -= num
+
+    #---------------------------------------------------------------------------
+    def write(self, data, zlp=0):
+        """
+        Queue data to stream-out, which blocks while all buffers are queued.
+        Data is split into 'chunk' bytes and the tail is padded with zeros
+        up to multiple of 4 bytes.
+        :param data: buffer-protocol object, e.g., bytes or numpy array
+        :param zlp: 1 to send zero-length packet after the last transfer
+        :return: number of bytes queued
+        """
+        if self._out_full is None:
+           raise ValueError("stream-out is not on, use CON_MODE_SU2F or CON_MODE_SLOOP")
+        if isinstance(data, numpy.ndarray):
+           src = numpy.ascontiguousarray(data).view(numpy.uint8).reshape(-1)
+        else:
+           src = numpy.frombuffer(data, dtype=numpy.uint8)
+        pos = 0
+        while pos<len(src):
+            num = min(self.chunk, len(src)-pos)
+            buf = self._take()
+            dst = buf.view(numpy.uint8)
+            dst[:num] = src[pos:pos+num]
+            pos += num
+            self._queue(buf, num, zlp if pos==len(src) else 0)
+        return pos
+
+    def write_from(self, source, zlp=1):
+        """
+        Stream-out all from 'source' and wait until written.
+        :param source: file name, file object with readinto() or read(),
+                       or iterable of buffer-protocol objects, e.g., generator
+        :param zlp: 1 to send zero-length packet after the last transfer
+        :return: number of bytes written
+        """
+        if self._out_full is None:
+           raise ValueError("stream-out is not on, use CON_MODE_SU2F or CON_MODE_SLOOP")
+        self._feeding = True
+        nbytes = 0
+        try:
+            if isinstance(source, (str, type(u''))):
+               with open(source, 'rb') as fp: nbytes = self._write_file(fp)
+            elif hasattr(source, 'readinto') or hasattr(source, 'read'):
+               nbytes = self._write_file(source)
+            else:
+               for item in source: nbytes += self.write(item)
+        finally:
+            self._feeding = False
+        if zlp: self._queue(self._take(), 0, zlp)
+        self.flush()
+        return nbytes
+
+    def _write_file(self, fp):
+        # reads from the file straight into the ring buffers, where a short
+        # read, e.g., from a pipe, is not the end but a 0-byte read is
+        nbytes = 0
+        while True:
+            buf = self._take()
+            dst = buf.view(numpy.uint8)
+            num = 0
+            while num<self.chunk:
+                if hasattr(fp, 'readinto'):
+                   got = fp.readinto(memoryview(dst[num:])) or 0
+                else:
+                   data = fp.read(self.chunk-num)
+                   got  = len(data)
+                   dst[num:num+got] = numpy.frombuffer(data, dtype=numpy.uint8)
+                if got==0: break
+                num += got
+            if num==0:
+               self._out_free.put(buf)
+               return nbytes
+            nbytes += num
+            self._queue(buf, num, 0)
+            if num<self.chunk: return nbytes
+
+    def _take(self):
+        while True:
+            self._check()
+            try:
+                return self._out_free.get(timeout=0.1)
+            except queue.Empty:
+                if self._thread is None or not self._thread.is_alive():
+                   raise IOError(-1, "stream is closed")
+
+    def _queue(self, buf, nbytes, zlp):
+        if nbytes%4: buf.view(numpy.uint8)[nbytes:nbytes+4-(nbytes%4)] = 0
+        with self._cond:
+            self._inflight += 1
+        self._out_full.put((buf, (nbytes+3)//4, zlp))
+        self._kick.set()
+
+    def flush(self):
+        """
+        Wait until all queued stream-out data are written.
+        """
+        with self._cond:
+            while self._inflight and self._thread is not None and self._thread.is_alive():
+                self._cond.wait(0.1)
+        self._check()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Short reads of file not taken as the end, and stream-in failure other than time-out
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains common part of tests, which run BFM modules against the
+software stand-in of 'libconapi' (see 'emu/c/Makefile'), so that they run
+without CON-FMC card.
+Tests are skipped when the emulator is not built.
+
+    $ make -C emu/c
+    $ cd python/linux_x86_64
+    $ python -m unittest discover -s tests
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC emulator for tests"
+
+#-------------------------------------------------------------------------------
+import os
+import ctypes
+import sys
+import platform
+import importlib
+import unittest
+
+#-------------------------------------------------------------------------------
+# Environment should be ready before the BFM module is loaded.
+TOP = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+os.environ.setdefault('CONFMC_HOME', TOP)
+os.environ.setdefault('CONFMC_EMU', 'none') # no link latency
+try:
+    import confmc
+except ImportError:
+    sys.path.insert(0, os.path.join(TOP, 'python', 'linux_x86_64'))
+
+def load(btype):
+    """
+    Load BFM module of 'btype' bound to the emulator.
+    :param btype: 'axi' or 'ahb'
+    :return: confmc.pyconbfmaxi or confmc.pyconbfmahb
+    :raise: unittest.SkipTest when the emulator or 'libconapi' is not ready
+    """
+    mach = platform.system().lower()+'_'+platform.machine()
+    lib  = os.path.join(os.environ['CONFMC_HOME'], 'hwlib', 'trx_'+btype, 'lib', mach
+                       ,'libbfm'+btype+'_emu.so')
+    if not os.path.isfile(lib):
+       raise unittest.SkipTest(lib+' not found, run "make -C emu/c"')
+    try:
+        return importlib.import_module('confmc.pyconbfm'+btype)
+    except (ImportError, OSError, SystemExit) as error: # e.g., libusb-1.0 missing
+        raise unittest.SkipTest('confmc.pyconbfm'+btype+': '+str(error))
+
+#===============================================================================
+class AxiTestCase(unittest.TestCase):
+    """
+    Test case with card 0 of the emulator for AMBA AXI BFM, where AMBA AHB
+    one is a subclass setting 'btype' to 'ahb'.
+    """
+    btype = 'axi'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.bfm = load(cls.btype)
+
+    def setUp(self):
+        self.hdl = self.bfm.conInit(0)
+        self.assertTrue(self.hdl)
+        if hasattr(self.bfm, 'BfmSetAmbaAxi4'): self.bfm.BfmSetAmbaAxi4(self.hdl)
+
+    def tearDown(self):
+        self.bfm.conEmuSetFault(self.hdl, 0)
+        self.bfm.conRelease(self.hdl)
+
+    def write(self, addr, values, size=4):
+        data = (ctypes.c_uint*len(values))(*values)
+        self.bfm.BfmWrite(self.hdl, addr, data, size, len(values))
+
+    def read(self, addr, length=1, size=4):
+        data = (ctypes.c_uint*length)()
+        self.bfm.BfmRead(self.hdl, addr, data, size, length)
+        return list(data)
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.aio, which is for Python 3.5 or later.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of asyncio interface"
+
+#-------------------------------------------------------------------------------
+import sys
+import ctypes
+import unittest
+import numpy
+import emu
+
+#===============================================================================
+class AioAxiTest(emu.AxiTestCase):
+    @classmethod
+    def setUpClass(cls):
+        if sys.version_info<(3, 5): raise unittest.SkipTest('confmc.aio is for Python 3.5 or later')
+        super(AioAxiTest, cls).setUpClass()
+
+    def setUp(self):
+        super(AioAxiTest, self).setUp()
+        import asyncio
+        from confmc.aio import AioHandle
+        self.asyncio = asyncio
+        self.loop    = asyncio.new_event_loop()
+        self.dev     = AioHandle(self.bfm, self.hdl, loop=self.loop)
+
+    def tearDown(self):
+        self.dev.close()
+        self.loop.close()
+        super(AioAxiTest, self).tearDown()
+
+    def wait(self, *futures):
+        return self.loop.run_until_complete(self.asyncio.gather(*futures, return_exceptions=True))
+
+    def test_merged(self):
+        writes  = [self.dev.write(0x1000+16*idx, [idx, idx+1, idx+2, idx+3]) for idx in range(200)]
+        reads   = [self.dev.read(0x1000+16*idx, length=4) for idx in range(200)]
+        results = self.wait(*(writes+reads))
+        self.assertEqual(results[:200], [None]*200)
+        for idx, data in enumerate(results[200:]):
+            self.assertEqual(list(data), [idx, idx+1, idx+2, idx+3])
+        self.assertTrue(self.dev.merged>0)
+        self.assertTrue(self.dev.transfers<400)
+
+    def test_block_and_gpio(self):
+        results = self.wait(self.dev.write_block(0x10001, b'hello world!')
+                           ,self.dev.read_block(0x10001, 12)
+                           ,self.dev.gpout(0x1234)
+                           ,self.dev.gpin())
+        self.assertEqual(bytes(results[1]), b'hello world!')
+        self.assertEqual(results[3]&0xFFFF, 0x1234)
+
+    def test_failure_of_one(self):
+        # a request raising in the worker does not fail others merged with it
+        results = self.wait(self.dev.write(0x200, [7, 8])
+                           ,self.dev.write(0x300, numpy.arange(8, dtype=numpy.uint32)[::2])
+                           ,self.dev.write(0x3, [1], 4)
+                           ,self.dev.read(0x200, length=2))
+        self.assertEqual(results[0], None)
+        self.assertTrue(isinstance(results[1], ValueError))
+        self.assertTrue(isinstance(results[2], IOError))
+        self.assertEqual(list(results[3]), [7, 8])
+        self.assertEqual(self.read(0x200, 2), [7, 8])
+
+    def test_write_length(self):
+        self.write(0x400, [0]*4)
+        self.wait(self.dev.write(0x400, b'\x01\x00\x00\x00\x02\x00\x00\x00')
+                 ,self.dev.write(0x408, (ctypes.c_uint*1)(3))
+                 ,self.dev.write(0x40C, numpy.array([4], dtype=numpy.uint32)))
+        self.assertEqual(self.read(0x400, 4), [1, 2, 3, 4])
+
+    def test_closed(self):
+        self.dev.close()
+        self.assertRaises(ValueError, self.dev.read, 0x0)
+
+class AioAhbTest(AioAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of BfmBatch, i.e., BFM transactions in a single stream.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of BfmBatch"
+
+#-------------------------------------------------------------------------------
+import ctypes
+import unittest
+import numpy
+import emu
+
+#===============================================================================
+class BatchAxiTest(emu.AxiTestCase):
+    def setUp(self):
+        super(BatchAxiTest, self).setUp()
+        self.read(0x0) # GPIN is read at the first use of AMBA AHB BFM
+        self.stats = self.bfm.BfmStatsEnable(True)
+        self.bfm.BfmStatsClear(self.hdl)
+
+    def tearDown(self):
+        self.bfm.BfmStatsEnable(self.stats)
+        super(BatchAxiTest, self).tearDown()
+
+    def test_single_transfer(self):
+        wdata = [(ctypes.c_uint*4)(*range(idx*4, idx*4+4)) for idx in range(32)]
+        rdata = [(ctypes.c_uint*4)() for idx in range(32)]
+        with self.bfm.BfmBatch(self.hdl) as batch:
+            for idx in range(32):
+                self.assertEqual(batch.write(0x1000+idx*16, wdata[idx], 4, 4), 0)
+            for idx in range(32):
+                self.assertEqual(batch.read(0x1000+idx*16, rdata[idx], 4, 4), 0)
+        self.assertEqual([list(data) for data in rdata], [list(data) for data in wdata])
+        stats = self.bfm.BfmStatsGet(self.hdl)
+        self.assertEqual(stats.writes, 1) # one conStreamWrite() for 64 transactions
+        self.assertEqual(stats.words_in, 32*4)
+
+    def test_in_order(self):
+        old = numpy.zeros(8, dtype=numpy.uint32)
+        new = numpy.zeros(8, dtype=numpy.uint32)
+        batch = self.bfm.BfmBatch(self.hdl)
+        try:
+            self.assertEqual(batch.write(0x100, numpy.arange(8, dtype=numpy.uint32), 4, 8), 0)
+            self.assertEqual(batch.read(0x100, old, 4, 8), 0)
+            self.assertEqual(batch.write(0x100, numpy.arange(8, 16, dtype=numpy.uint32), 4, 8), 0)
+            self.assertEqual(batch.read(0x100, new, 4, 8), 0)
+            self.assertEqual(list(old), [0]*8) # nothing goes before flush()
+            self.assertEqual(batch.flush(), 0)
+        finally:
+            batch.close()
+        self.assertEqual(list(old), list(range(8)))
+        self.assertEqual(list(new), list(range(8, 16)))
+
+    def test_over_read_depth(self):
+        # reads more than F2U fifo holds are split into transfers
+        words = self.bfm.BfmGetReadDepth(self.hdl)*3+5
+        src   = numpy.arange(words, dtype=numpy.uint32)+0x1000
+        dst   = numpy.zeros(words, dtype=numpy.uint32)
+        with self.bfm.BfmBatch(self.hdl) as batch:
+            for idx in range(0, words, 16):
+                num = min(16, words-idx)
+                batch.write(0x10000+idx*4, src[idx:idx+num], 4, num)
+                batch.read(0x10000+idx*4, dst[idx:idx+num], 4, num)
+        self.assertTrue(numpy.array_equal(src, dst))
+        self.assertGreater(self.bfm.BfmStatsGet(self.hdl).reads, 3)
+
+    def test_narrow(self):
+        wdata = (ctypes.c_uint*3)(0x11, 0x22, 0x33)
+        rdata = (ctypes.c_uint*3)()
+        with self.bfm.BfmBatch(self.hdl) as batch:
+            batch.write(0x3, wdata, 1, 3)
+            batch.read(0x3, rdata, 1, 3)
+        self.assertEqual(list(rdata), [0x11, 0x22, 0x33])
+
+    def test_bad_transaction(self):
+        data = (ctypes.c_uint*4)()
+        with self.bfm.BfmBatch(self.hdl) as batch:
+            self.assertLess(batch.write(0x1, data, 4, 1), 0) # unaligned
+            self.assertLess(batch.read(0x0, data, 3, 1), 0)
+
+class BatchAhbTest(BatchAxiTest):
+    btype = 'ahb'
+
+#===============================================================================
+class BatchFixAxiTest(emu.AxiTestCase):
+    def test_fixed(self):
+        wdata = (ctypes.c_uint*3)(0x11, 0x22, 0x33)
+        rdata = (ctypes.c_uint*3)()
+        with self.bfm.BfmBatch(self.hdl) as batch:
+            batch.write_fix(0x100, wdata, 4, 3)
+            batch.read_fix(0x100, rdata, 4, 3)
+        self.assertEqual(list(rdata), [0x33]*3)
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.bench, i.e., benchmarks of BFM and conapi.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of benchmarks"
+
+#-------------------------------------------------------------------------------
+import os
+import sys
+import json
+import ctypes
+import shutil
+import tempfile
+import subprocess
+import unittest
+import emu
+import confmc
+from confmc import bench
+
+#===============================================================================
+class BenchTest(unittest.TestCase):
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        self.assertEqual(bench._percentile(samples, 50), 50)
+        self.assertEqual(bench._percentile(samples, 99), 99)
+        self.assertEqual(bench._percentile([], 50), 0.0)
+
+    def test_lengths(self):
+        self.assertEqual(bench._lengths(256), [1, 2, 4, 8, 16, 32, 64, 128, 256])
+        self.assertEqual(bench._lengths(16), [1, 2, 4, 8, 16])
+        self.assertEqual(bench._lengths(24), [1, 2, 4, 8, 16, 24])
+
+#===============================================================================
+class BenchAxiTest(emu.AxiTestCase):
+    def test_sweep(self):
+        points = bench.bench_bfm(self.bfm, self.hdl, sizes=(1, 4), lengths=[1, 16], count=3)
+        fixed  = 2*2*3 if self.btype=='axi' else 0 # AMBA AXI only
+        self.assertEqual(len(points), 2*2*3+fixed)
+        for point in points:
+            self.assertEqual(point['count'], 3)
+            self.assertTrue(point['p50_us']<=point['p99_us'])
+            self.assertTrue(point['mbps']>0)
+
+    def test_stream_frames(self):
+        points = bench.bench_stream(self.bfm, self.hdl, lengths=[8], frames=4, count=2, addr=0x400)
+        self.assertEqual([point['op'] for point in points], ['write', 'read'])
+        self.assertEqual(self.read(0x400+3*32, 8), list(range(8))) # the last frame written
+        self.assertEqual(self.read(0x0), self.read(0x0)) # still in sync
+
+    def test_usb_info(self):
+        usb = self.bfm._usb() # bound to the emulator
+        self.assertEqual(self.bfm.conGetUsbInfo(self.hdl, ctypes.byref(usb)), 0)
+        self.assertEqual(usb.bulk_max_pkt_size_out, self.hdl.contents.usb.bulk_max_pkt_size_out)
+
+    def test_run(self):
+        report = bench.run(self.bfm, self.hdl, count=2, quick=True)
+        self.assertEqual(report['bfm'], self.btype)
+        self.assertTrue(report['emulated'])
+        for key in ('call_overhead', 'sweep', 'stream', 'gpio', 'emu'):
+            self.assertTrue(report[key])
+        self.assertTrue(report['emu']['stats']['transfers_out']>0)
+        json.dumps(report)
+
+    def test_command_line(self):
+        path = os.path.dirname(os.path.dirname(os.path.abspath(confmc.__file__)))
+        env  = dict(os.environ, PYTHONPATH=os.pathsep.join([path, os.environ.get('PYTHONPATH', '')]))
+        tdir = tempfile.mkdtemp()
+        try:
+            ofile = os.path.join(tdir, 'bench.json')
+            with open(os.devnull, 'w') as null:
+                self.assertEqual(subprocess.call([sys.executable, '-m', 'confmc.bench', '-b', self.btype
+                                                 ,'-e', '-q', '-n', '2', '-o', ofile]
+                                                ,env=env, stdout=null), 0)
+            with open(ofile) as fp: report = json.load(fp)
+            self.assertEqual(report['bfm'], self.btype)
+        finally:
+            shutil.rmtree(tdir)
+
+class BenchAhbTest(BenchAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
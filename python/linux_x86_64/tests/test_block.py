@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of BfmWriteBlock()/BfmReadBlock(), which split a byte
+range into legal bursts, and of burst checks of single transactions.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of block transfers"
+
+#-------------------------------------------------------------------------------
+import os
+import ctypes
+import random
+import unittest
+import emu
+from confmc import errors
+
+#===============================================================================
+class BlockAxiTest(emu.AxiTestCase):
+    def test_split_within_boundary(self):
+        boundary  = self.bfm._burst_boundary
+        burst_max = self.bfm.BfmGetBurstMax(self.hdl)
+        for addr, nbytes in ((0x3, 0x5000), (boundary-5, 2*boundary+7), (0x0, 4), (0x2, 1)):
+            pos = addr
+            for baddr, offset, size, length in self.bfm._block_split(addr, nbytes, burst_max):
+                self.assertEqual(baddr, pos)
+                self.assertEqual(offset, pos-addr)
+                self.assertEqual(baddr%size, 0)
+                self.assertTrue(length<=burst_max)
+                self.assertEqual(baddr//boundary, (baddr+size*length-1)//boundary)
+                pos += size*length
+            self.assertEqual(pos, addr+nbytes)
+
+    def test_across_boundary(self):
+        boundary = self.bfm._burst_boundary
+        rand     = random.Random(1)
+        for addr, nbytes in ((boundary-1, 2), (boundary-3, boundary+6)
+                            ,(3*boundary-6, 4*boundary+9), (0x1, 0x0)):
+            data = bytearray(rand.getrandbits(8) for idx in range(nbytes))
+            self.assertEqual(self.bfm.BfmWriteBlock(self.hdl, addr, data), 0)
+            self.assertEqual(self.bfm.BfmReadBlock(self.hdl, addr, nbytes), data)
+
+    def test_random_ranges(self):
+        rand = random.Random(2)
+        for idx in range(50):
+            addr   = rand.randint(0, 0x10000)
+            nbytes = rand.randint(0, 3000)
+            data   = bytearray(rand.getrandbits(8) for idx in range(nbytes))
+            self.assertEqual(self.bfm.BfmWriteBlock(self.hdl, addr, data), 0)
+            self.assertEqual(self.bfm.BfmReadBlock(self.hdl, addr, nbytes), data)
+
+    def test_large(self):
+        data = bytearray(os.urandom((1<<20)+5))
+        self.assertEqual(self.bfm.BfmWriteBlock(self.hdl, 0x100001, data), 0)
+        self.assertEqual(self.bfm.BfmReadBlock(self.hdl, 0x100001, len(data)), data)
+
+    def test_keeps_neighbours(self):
+        self.write(0x200, [0x11111111, 0x22222222])
+        self.assertEqual(self.bfm.BfmWriteBlock(self.hdl, 0x201, bytearray(b'\xAA\xBB\xCC\xDD\xEE')), 0)
+        self.assertEqual(self.read(0x200, 2), [0xCCBBAA11, 0x2222EEDD])
+
+    def test_burst_checks(self):
+        burst_max = self.bfm.BfmGetBurstMax(self.hdl)
+        boundary  = self.bfm._burst_boundary
+        data      = (ctypes.c_uint*(burst_max+1))()
+        for addr, length, ok in ((0, burst_max, True), (0, burst_max+1, False)
+                                ,(boundary-16, 4, True), (boundary-16, 5, False)):
+            for func in (self.bfm.BfmReadStatus, self.bfm.BfmWriteStatus):
+                ret = func(self.hdl, addr, data, 4, length)
+                self.assertEqual(ret==0, ok, (func.__name__, addr, length, ret))
+                if not ok: self.assertEqual(ret, errors.BFM_ERR_PARAM)
+
+class BlockAhbTest(BlockAxiTest):
+    btype = 'ahb'
+
+#===============================================================================
+class BlockFixAxiTest(emu.AxiTestCase):
+    def test_fixed_burst_limit(self):
+        data = (ctypes.c_uint*17)()
+        self.assertEqual(self.bfm.BfmReadFixStatus(self.hdl, 0, data, 4, 16), 0)
+        self.assertEqual(self.bfm.BfmReadFixStatus(self.hdl, 0, data, 4, 17), errors.BFM_ERR_PARAM)
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
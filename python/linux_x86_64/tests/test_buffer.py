@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of buffer-protocol objects as BFM data, which are
+passed without copying.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of buffer-protocol data"
+
+#-------------------------------------------------------------------------------
+import sys
+import array
+import mmap
+import unittest
+import numpy
+import emu
+
+#===============================================================================
+class BufferAxiTest(emu.AxiTestCase):
+    def setUp(self):
+        super(BufferAxiTest, self).setUp()
+        self.data = numpy.arange(64, dtype=numpy.uint32)*3
+        self.bfm.BfmWrite(self.hdl, 0x100, self.data, 4, 64)
+
+    def test_numpy(self):
+        rdata = numpy.zeros(64, dtype=numpy.uint32)
+        self.bfm.BfmRead(self.hdl, 0x100, rdata, 4, 64)
+        self.assertTrue(numpy.array_equal(rdata, self.data))
+
+    def test_read_into(self):
+        for buf in (array.array('I', [0]*64), bytearray(256), mmap.mmap(-1, 256)):
+            self.bfm.BfmRead(self.hdl, 0x100, buf, 4, 64)
+            self.assertTrue(numpy.array_equal(numpy.frombuffer(buf, dtype=numpy.uint32), self.data))
+
+    def test_write_from(self):
+        self.bfm.BfmWrite(self.hdl, 0x400, self.data.tobytes(), 4, 64)
+        self.bfm.BfmWrite(self.hdl, 0x800, array.array('I', range(64)), 4, 64)
+        readonly = numpy.arange(4, dtype=numpy.uint32)
+        readonly.flags.writeable = False
+        self.bfm.BfmWrite(self.hdl, 0xC00, readonly, 4, 4)
+        self.assertEqual(bytes(self.bfm.BfmReadBlock(self.hdl, 0x400, 256)), self.data.tobytes())
+        self.assertEqual(self.read(0x800, 64), list(range(64)))
+        self.assertEqual(self.read(0xC00, 4), [0, 1, 2, 3])
+
+    def test_memoryview(self):
+        if sys.version_info[0]<3: self.skipTest('memoryview of Python 3')
+        view = memoryview(bytearray(300))[4:260]
+        self.bfm.BfmRead(self.hdl, 0x100, view, 4, 64)
+        self.assertEqual(view.tobytes(), self.data.tobytes())
+
+    def test_too_small(self):
+        self.assertRaises(ValueError, self.bfm.BfmRead, self.hdl, 0, bytearray(8), 4, 4)
+
+    def test_read_only(self):
+        self.assertRaises(TypeError, self.bfm.BfmRead, self.hdl, 0, b'12345678', 4, 2)
+
+    def test_not_contiguous(self):
+        self.assertRaises(ValueError, self.bfm.BfmRead, self.hdl, 0
+                         ,numpy.zeros(8, dtype=numpy.uint32)[::2], 4, 4)
+
+    def test_batch(self):
+        rdata = numpy.zeros(4, dtype=numpy.uint32)
+        with self.bfm.BfmBatch(self.hdl) as batch:
+            batch.read(0x100, rdata, 4, 4)
+        self.assertEqual(list(rdata), [0, 3, 6, 9])
+
+    def test_block_into_mmap(self):
+        data = numpy.random.RandomState(1).randint(0, 256, size=100003).astype(numpy.uint8)
+        self.assertEqual(self.bfm.BfmWriteBlock(self.hdl, 0x20003, data), 0)
+        view = mmap.mmap(-1, 100003)
+        self.bfm.BfmReadBlock(self.hdl, 0x20003, 100003, view)
+        self.assertEqual(view[:], data.tobytes())
+
+class BufferAhbTest(BufferAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of BfmCoalescer, i.e., host-side write coalescer.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of write coalescer"
+
+#-------------------------------------------------------------------------------
+import ctypes
+import random
+import unittest
+import emu
+from confmc.coalesce import BfmCoalescer
+
+#===============================================================================
+class CoalesceAxiTest(emu.AxiTestCase):
+    def setUp(self):
+        super(CoalesceAxiTest, self).setUp()
+        self.assertEqual(self.bfm.BfmWriteBlock(self.hdl, 0, bytearray(4096)), 0)
+
+    def byte(self, co, addr, value):
+        self.assertEqual(co.write(addr, (ctypes.c_uint*1)(value), 1, 1), 0)
+
+    def test_random_against_model(self):
+        for rmw in (False, True):
+            rand = random.Random(5)
+            mem  = bytearray(self.bfm.BfmReadBlock(self.hdl, 0, 4096))
+            co   = BfmCoalescer(self.bfm, self.hdl, limit=50)
+            if rmw: co.mark_rmw_safe(0, 4096)
+            for num in range(1000):
+                size   = rand.choice([1, 2, 4])
+                length = rand.randint(1, 4)
+                addr   = rand.randrange(0, 4000, size)
+                values = [rand.getrandbits(32) for idx in range(length)]
+                self.assertEqual(co.write(addr, (ctypes.c_uint*length)(*values), size, length), 0)
+                for idx, value in enumerate(values):
+                    for lane in range(size): mem[addr+idx*size+lane] = (value>>(8*lane))&0xFF
+                if rand.random()<0.05:
+                   addr, nbytes = rand.randrange(0, 4000), rand.randint(1, 64)
+                   self.assertEqual(co.read_block(addr, nbytes), mem[addr:addr+nbytes])
+            self.assertEqual(co.flush(), 0)
+            self.assertEqual(self.bfm.BfmReadBlock(self.hdl, 0, 4096), mem)
+
+    def test_merged(self):
+        stats = self.bfm.BfmStatsEnable(True)
+        try:
+            with BfmCoalescer(self.bfm, self.hdl) as co:
+                for addr in range(256): self.byte(co, 0x100+addr, addr)
+                self.bfm.BfmStatsClear(self.hdl)
+            self.assertEqual(self.bfm.BfmStatsGet(self.hdl).writes, 1)
+        finally:
+            self.bfm.BfmStatsEnable(stats)
+        self.assertEqual(self.bfm.BfmReadBlock(self.hdl, 0x100, 256), bytearray(range(256)))
+
+    def test_partial_word(self):
+        self.write(0x200, [0x44332211])
+        with BfmCoalescer(self.bfm, self.hdl) as co:
+            self.byte(co, 0x201, 0xAA)
+        with BfmCoalescer(self.bfm, self.hdl, rmw_safe=[(0x200, 4)]) as co:
+            self.byte(co, 0x203, 0xBB)
+        self.assertEqual(self.read(0x200), [0xBB33AA11])
+
+    def test_read_flushes_overlap(self):
+        co = BfmCoalescer(self.bfm, self.hdl)
+        self.byte(co, 0x300, 0x5A)
+        self.assertEqual(self.read(0x300), [0]) # still buffered
+        data = (ctypes.c_uint*1)()
+        co.read(0x400, data, 4, 1)
+        self.assertEqual(self.read(0x300), [0]) # not overlapped
+        co.read(0x300, data, 1, 1)
+        self.assertEqual(data[0], 0x5A)
+
+    def test_limit(self):
+        co = BfmCoalescer(self.bfm, self.hdl, limit=4)
+        for addr in range(0, 16, 4): self.byte(co, 0x500+addr, 0x77)
+        self.assertEqual(self.read(0x500, 4), [0x77]*4)
+
+    def test_kept_on_failure(self):
+        self.bfm.BfmSetRecovery(self.hdl, None)
+        co = BfmCoalescer(self.bfm, self.hdl, rmw_safe=[(0, 256)])
+        for addr in range(0, 64, 3): self.byte(co, addr, addr+1)
+        self.bfm.conEmuSetFault(self.hdl, 1)
+        self.assertNotEqual(co.flush(), 0)
+        self.bfm.conEmuSetFault(self.hdl, 0)
+        self.assertTrue(self.bfm.BfmRecover(self.hdl, self.bfm.BFM_RECOVER_EP)>=0)
+        self.assertEqual(co.flush(), 0)
+        mem = self.bfm.BfmReadBlock(self.hdl, 0, 64)
+        self.assertEqual(list(mem), [(addr+1) if addr%3==0 else 0 for addr in range(64)])
+
+class CoalesceAhbTest(CoalesceAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.confmcd and confmc.client, where the
+server owns card 0 of the emulator and the client goes through a Unix domain
+socket in a temporary directory.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of BFM server"
+
+#-------------------------------------------------------------------------------
+import os
+import ctypes
+import shutil
+import tempfile
+import threading
+import unittest
+import numpy
+import emu
+from confmc import confmcd
+from confmc import client
+
+#===============================================================================
+class ConfmcdAxiTest(emu.AxiTestCase):
+    def setUp(self):
+        super(ConfmcdAxiTest, self).setUp()
+        self.tmp    = tempfile.mkdtemp(prefix='confmcd-')
+        self.server = confmcd.Server(self.bfm, os.path.join(self.tmp, 'sock'), [0]).start()
+        self.client = client.connect(self.server.address)
+        self.chdl   = self.client.conInit(0)
+        self.assertTrue(self.chdl)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+        shutil.rmtree(self.tmp)
+        super(ConfmcdAxiTest, self).tearDown()
+
+    def test_context(self):
+        info = self.bfm.BfmContextGet(self.hdl)
+        self.assertEqual(self.client.conGetCid(self.chdl), 0)
+        self.assertEqual(self.client.BfmContextGet(self.chdl).to_dict()['width'], info.width)
+        self.assertEqual(self.client.BfmGetReadDepth(self.chdl), self.bfm.BfmGetReadDepth(self.hdl))
+        self.assertEqual(self.client.BfmGetBurstMax(self.chdl), self.bfm.BfmGetBurstMax(self.hdl))
+
+    def test_read_write(self):
+        src = numpy.arange(64, dtype=numpy.uint32)+0x100
+        dst = numpy.zeros(64, dtype=numpy.uint32)
+        self.client.BfmWrite(self.chdl, 0x200, src, 4, 64)
+        self.client.BfmRead(self.chdl, 0x200, dst, 4, 64)
+        self.assertTrue(numpy.array_equal(src, dst))
+        value = ctypes.c_uint(0)
+        self.assertEqual(self.client.BfmGpin(self.chdl, ctypes.byref(value)), 0)
+        self.assertEqual(self.client.BfmGpout(self.chdl, 0x12), 0)
+        self.assertEqual(self.client.sync(), 0)
+
+    def test_posted(self):
+        data = numpy.arange(500, dtype=numpy.uint32)
+        for idx in range(500):
+            self.client.BfmWrite(self.chdl, 0x4000+4*idx, data[idx:idx+1], 4, 1)
+        self.assertEqual(self.client.sync(), 0)
+        self.assertEqual(bytes(self.client.BfmReadBlock(self.chdl, 0x4000, data.nbytes)), data.tobytes())
+
+    def test_batch_and_pipe(self):
+        out = numpy.zeros(8, dtype=numpy.uint32)
+        with self.client.BfmBatch(self.chdl) as batch:
+            batch.write(0x300, numpy.arange(8, dtype=numpy.uint32)+5, 4, 8)
+            self.client.BfmWriteBlock(self.chdl, 0x320, b'hello!!', batch)
+            batch.read(0x300, out, 4, 8)
+        self.assertEqual(list(out), list(range(5, 13)))
+        self.assertEqual(bytes(self.client.BfmReadBlock(self.chdl, 0x320, 7)), b'hello!!')
+        pipe    = self.client.BfmPipe(self.chdl)
+        tickets = [pipe.issue_read(0x300+4*idx) for idx in range(8)]
+        data    = pipe.collect()
+        self.assertEqual([int(data[ticket][0]) for ticket in tickets], list(range(5, 13)))
+
+    def test_block_through_shm(self):
+        self.assertEqual(self.client._shm is not None, os.path.isdir(confmcd.SHM_DIR))
+        data = numpy.random.RandomState(1).randint(0, 256, size=300001).astype(numpy.uint8)
+        self.assertEqual(self.client.BfmWriteBlock(self.chdl, 0x1001, data), 0)
+        out = self.client.BfmReadBlock(self.chdl, 0x1001, len(data))
+        self.assertEqual(bytes(out), data.tobytes())
+
+    def test_clients(self):
+        errors = []
+        def worker(idx):
+            try:
+                with client.connect(self.server.address) as conn:
+                    hdl  = conn.conInit(0)
+                    addr = 0x20000+idx*0x1000
+                    out  = numpy.zeros(32, dtype=numpy.uint32)
+                    for loop in range(50):
+                        data = numpy.full(32, idx*1000+loop, dtype=numpy.uint32)
+                        conn.BfmWrite(hdl, addr, data, 4, 32)
+                        conn.BfmRead(hdl, addr, out, 4, 32)
+                        if not numpy.array_equal(out, data): return errors.append((idx, loop))
+            except Exception as error:
+                errors.append(error)
+        threads = [threading.Thread(target=worker, args=(idx,)) for idx in range(4)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        self.assertEqual(errors, [])
+
+    def test_attach_refused(self):
+        path = os.path.join(self.tmp, 'shm')
+        with open(path, 'wb') as fobj: fobj.write(b'\0'*confmcd.SHM_MIN)
+        status, payload = self.client._call(confmcd.OP_ATTACH, 0, (confmcd.SHM_MIN, 0, 0)
+                                           ,path.encode('utf-8'))
+        self.assertEqual(status, -1)
+        status, payload = self.client._call(confmcd.OP_ATTACH, 0, (1<<30, 0, 0)
+                                           ,os.path.join(confmcd.SHM_DIR, 'nothing').encode('utf-8'))
+        self.assertEqual(status, -1)
+
+    def test_bad_request(self):
+        # answered with -1, while the card is still served
+        self.assertEqual(self.client._call(confmcd.OP_READ_BLOCK, 0, (0, 0xFFFFFFF0, 0))[0], -1)
+        self.assertEqual(self.client._call(confmcd.OP_READ, 0, (0, 4, 0x40000000))[0], -1)
+        self.assertEqual(self.client._call(confmcd.OP_BATCH, 0, (3, 0, 0), b'\1\2')[0], -1)
+        self.assertEqual(self.client.BfmWriteBlock(self.chdl, 0x40, b'abcd'), 0)
+        self.assertEqual(bytes(self.client.BfmReadBlock(self.chdl, 0x40, 4)), b'abcd')
+
+class ConfmcdAhbTest(ConfmcdAxiTest):
+    btype = 'ahb'
+
+#===============================================================================
+class TcpAxiTest(emu.AxiTestCase):
+    def test_loopback_only(self):
+        self.assertRaises(ValueError, confmcd.Server, self.bfm, '0.0.0.0:0')
+        for address in ('127.0.0.1:0', 'localhost:0', ':0'):
+            confmcd.Server(self.bfm, address).close()
+        confmcd.Server(self.bfm, '0.0.0.0:0', allow_remote=True).close()
+
+    def test_round_trip(self):
+        with confmcd.Server(self.bfm, '127.0.0.1:0', [0]).start() as server:
+            with client.connect(server.address) as conn:
+                self.assertEqual(conn._shm, None) # no shared memory over TCP
+                hdl  = conn.conInit(0)
+                data = numpy.arange(16, dtype=numpy.uint32)
+                out  = numpy.zeros(16, dtype=numpy.uint32)
+                conn.BfmWrite(hdl, 0x100, data, 4, 16)
+                conn.BfmRead(hdl, 0x100, out, 4, 16)
+                self.assertTrue(numpy.array_equal(out, data))
+                self.assertEqual(bytes(conn.BfmReadBlock(hdl, 0x100, 64)), data.tobytes())
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
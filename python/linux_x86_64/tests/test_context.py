@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of context of each handler kept by the BFM.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of handler context"
+
+#-------------------------------------------------------------------------------
+import os
+import ctypes
+import threading
+import unittest
+import numpy
+import emu
+
+#===============================================================================
+class ContextAxiTest(emu.AxiTestCase):
+    def test_get(self):
+        info = self.bfm.BfmContextGet(self.hdl).to_dict()
+        if self.btype=='axi':
+           self.assertEqual(info['bus'], self.bfm.BFM_BUS_AXI4)
+        else:
+           self.assertEqual(info['bus'], self.bfm.BFM_BUS_AHB)
+        self.assertEqual(info['width'], 4)
+        self.assertEqual(info['burst_max'], 256)
+        self.assertNotEqual(info['gpin'], 0)
+        self.assertEqual(info['depth_f2u'], 1024)
+        self.assertEqual(self.bfm.BfmGetBurstMax(self.hdl), 256)
+
+    def test_set(self):
+        info = self.bfm.BfmContextGet(self.hdl).to_dict()
+        info['burst_max'] = 8
+        self.assertEqual(self.bfm.BfmContextSet(self.hdl, info), 0)
+        self.assertEqual(self.bfm.BfmGetBurstMax(self.hdl), 8)
+        data = (ctypes.c_uint*16)()
+        self.assertTrue(self.bfm.BfmWriteStatus(self.hdl, 0x0, data, 4, 16)<0)
+        self.assertEqual(self.bfm.BfmWriteStatus(self.hdl, 0x0, data, 4, 8), 0)
+        self.assertTrue(self.bfm.BfmContextSet(self.hdl, {'bus': 1})<0)
+        self.assertTrue(self.bfm.BfmContextSet(self.hdl, {'none': 1})<0)
+
+    def test_release(self):
+        # context goes along with the handler, which may be reused
+        hdl  = self.bfm.conInit(1)
+        info = self.bfm.BfmContextGet(hdl)
+        info.burst_max = 8
+        self.assertEqual(self.bfm.BfmContextSet(hdl, info), 0)
+        self.assertEqual(self.bfm.conRelease(hdl), 0)
+        hdl  = self.bfm.conInit(1)
+        try:
+            self.assertEqual(self.bfm.BfmGetBurstMax(hdl), 256)
+        finally:
+            self.bfm.conRelease(hdl)
+
+    def test_threads(self):
+        errors = []
+        def worker(tid):
+            base  = 0x100000*(tid+1)
+            wdata = (ctypes.c_uint*64)(*range(tid*1000, tid*1000+64))
+            rdata = (ctypes.c_uint*64)()
+            value = ctypes.c_uint()
+            for idx in range(100):
+                self.bfm.BfmWrite(self.hdl, base, wdata, 4, 64)
+                self.bfm.BfmRead(self.hdl, base, rdata, 4, 64)
+                if list(rdata)!=list(wdata): return errors.append(('read', tid, idx))
+                if self.bfm.BfmGpin(self.hdl, ctypes.byref(value)): return errors.append(('gpin', tid, idx))
+                block = self.bfm.BfmReadBlock(self.hdl, base, 256)
+                if bytes(block)!=numpy.array(list(wdata), dtype=numpy.uint32).tobytes():
+                   return errors.append(('block', tid, idx))
+        threads = [threading.Thread(target=worker, args=(tid,)) for tid in range(8)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        self.assertEqual(errors, [])
+
+    def test_failed_probe(self):
+        # GPIN failed at the first use is not tried again on every call
+        hdl  = self.bfm.conInit(1)
+        done = ctypes.c_uint()
+        cmds = (ctypes.c_uint*1024)(*([1<<31]*1024)) # read commands filling F2U fifo
+        try:
+            self.assertEqual(self.bfm._conCmdWrite(hdl, cmds, 1024, ctypes.byref(done), 0), 0)
+            stats = self.bfm.con_EmuStats()
+            self.bfm.conEmuGetStats(hdl, ctypes.byref(stats))
+            timeouts = stats.timeouts
+            for idx in range(5): info = self.bfm.BfmContextGet(hdl)
+            self.bfm.conEmuGetStats(hdl, ctypes.byref(stats))
+            self.assertEqual(stats.timeouts, timeouts+1)
+            self.assertEqual(info.gpin, 0)
+            data = (ctypes.c_uint*1024)()
+            self.bfm._conDataRead(hdl, data, 1024, ctypes.byref(done), 0)
+            self.assertTrue(self.bfm.BfmRecover(hdl, 0)>=0)
+            info = self.bfm.BfmContextGet(hdl)
+            self.assertNotEqual(info.gpin, 0)
+            self.assertEqual(info.burst_max, 256)
+        finally:
+            self.bfm.conRelease(hdl)
+
+class ContextAhbTest(ContextAxiTest):
+    btype = 'ahb'
+
+#===============================================================================
+class Axi3Test(emu.AxiTestCase):
+    def setUp(self):
+        super(Axi3Test, self).setUp()
+        self.env = os.environ.get('CONFMC_EMU_AXI3')
+        os.environ['CONFMC_EMU_AXI3'] = '2' # CID 1
+        self.hdl3 = self.bfm.conInit(1)
+
+    def tearDown(self):
+        self.bfm.conRelease(self.hdl3)
+        if self.env is None: del os.environ['CONFMC_EMU_AXI3']
+        else               : os.environ['CONFMC_EMU_AXI3'] = self.env
+        super(Axi3Test, self).tearDown()
+
+    def test_axi3(self):
+        info = self.bfm.BfmContextGet(self.hdl3)
+        self.assertEqual(info.bus, self.bfm.BFM_BUS_AXI3)
+        self.assertEqual(info.burst_max, 16)
+        self.assertEqual(self.bfm.BfmSetAmbaAxi4(self.hdl3), 16)
+        self.assertEqual(self.bfm.BfmGetBurstMax(self.hdl), 256) # other card
+        data = (ctypes.c_uint*32)()
+        with self.bfm.BfmBatch(self.hdl3) as batch:
+            self.assertTrue(batch.write(0x0, data, 4, 32)<0)
+            self.assertEqual(batch.write(0x0, data, 4, 16), 0)
+        src = numpy.arange(1<<14, dtype=numpy.uint32)
+        self.assertEqual(self.bfm.BfmWriteBlock(self.hdl3, 0x1000, src), 0)
+        out = numpy.zeros_like(src)
+        self.assertTrue(self.bfm.BfmReadBlock(self.hdl3, 0x1000, src.nbytes, out) is not None)
+        self.assertTrue(numpy.array_equal(out, src))
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
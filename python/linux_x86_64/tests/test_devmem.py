@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.devmem, where random accesses are checked
+against a host copy for each page size and write policy.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of device memory"
+
+#-------------------------------------------------------------------------------
+import array
+import random
+import struct
+import unittest
+import numpy
+import emu
+from confmc.devmem import DeviceMemory
+
+#===============================================================================
+BASE = 0x40000
+SIZE = 0x8000
+
+class DevMemAxiTest(emu.AxiTestCase):
+    def setUp(self):
+        super(DevMemAxiTest, self).setUp()
+        self.rand = random.Random(1)
+        self.init = self.random_bytes(SIZE)
+        self.assertEqual(self.bfm.BfmWriteBlock(self.hdl, BASE, self.init), 0)
+
+    def random_bytes(self, nbytes):
+        return numpy.frombuffer(bytes(bytearray(self.rand.getrandbits(8) for idx in range(nbytes)))
+                               ,dtype=numpy.uint8).copy()
+
+    def check_random(self, **kwargs):
+        rand   = self.rand
+        shadow = self.init.copy()
+        mem    = DeviceMemory(self.bfm, self.hdl, BASE, SIZE, cache_size=8*1024, **kwargs)
+        mem.uncached(0x4000, 0x40)
+        for idx in range(500):
+            off = rand.randrange(0, SIZE-600)
+            num = rand.randrange(0, 600)
+            op  = rand.random()
+            if op<0.5:
+               self.assertEqual(mem[off:off+num], shadow[off:off+num].tobytes())
+            elif op<0.8:
+               data = self.random_bytes(num)
+               mem.write(off, data)
+               shadow[off:off+num] = data
+            else:
+               off  &= ~3
+               value = rand.getrandbits(32)
+               mem.pack('<I', off, value)
+               shadow[off:off+4] = numpy.frombuffer(struct.pack('<I', value), dtype=numpy.uint8)
+               self.assertEqual(mem.u32(off), value)
+               self.assertEqual(mem[off], value&0xFF)
+               self.assertEqual(mem[off-SIZE], value&0xFF)
+        mem.flush()
+        self.assertEqual(bytes(self.bfm.BfmReadBlock(self.hdl, BASE, SIZE)), shadow.tobytes())
+        self.assertTrue(mem.hits>0)
+        self.assertTrue(mem.direct>0)
+        self.init = shadow # for the next one
+        return mem
+
+    def test_write_through(self):
+        for page_size in (0, 256, 4096):
+            self.check_random(page_size=page_size)
+
+    def test_write_back(self):
+        for page_size in (0, 256, 4096):
+            mem = self.check_random(page_size=page_size, write_back=True)
+            self.assertTrue(mem.writebacks>0)
+
+    def test_write_back_kept(self):
+        mem = DeviceMemory(self.bfm, self.hdl, BASE, SIZE, page_size=256, write_back=True)
+        mem.u32(0x100)
+        mem.pack('<I', 0x100, 0x12345678)
+        self.assertEqual(self.read(BASE+0x100), [int(self.init[0x100:0x104].view(numpy.uint32)[0])])
+        self.assertEqual(mem.stats['dirty'], 1)
+        mem.close()
+        self.assertEqual(self.read(BASE+0x100), [0x12345678])
+
+    def test_buffers(self):
+        mem = DeviceMemory(self.bfm, self.hdl, BASE, SIZE)
+        buf = bytearray(64)
+        mem.readinto(0x100, buf)
+        self.assertEqual(bytes(buf), self.init[0x100:0x140].tobytes())
+        words = array.array('I', [0]*4)
+        mem.readinto(0x200, words)
+        self.assertEqual(words.tolist(), [int(x) for x in self.init[0x200:0x210].view(numpy.uint32)])
+        self.assertTrue(numpy.array_equal(mem.array(0x300, 8), self.init[0x300:0x320].view(numpy.uint32)))
+        self.assertEqual(mem.unpack('<HH', 0x10), struct.unpack('<HH', self.init[0x10:0x14].tobytes()))
+        self.assertEqual(len(mem), SIZE)
+
+    def test_invalidate(self):
+        mem = DeviceMemory(self.bfm, self.hdl, BASE, SIZE)
+        mem.u32(0x0)
+        self.write(BASE, [0xCAFE]) # written by others
+        self.assertNotEqual(mem.u32(0x0), 0xCAFE)
+        mem.invalidate(0x0, 4)
+        self.assertEqual(mem.u32(0x0), 0xCAFE)
+
+    def test_pointer_chase(self):
+        num   = 500
+        nodes = list(range(num))
+        self.rand.shuffle(nodes)
+        image = numpy.zeros(SIZE//4, dtype=numpy.uint32)
+        for idx in range(num-1): image[nodes[idx]*8] = BASE+nodes[idx+1]*32
+        self.assertEqual(self.bfm.BfmWriteBlock(self.hdl, BASE, image), 0)
+        mem   = DeviceMemory(self.bfm, self.hdl, BASE, SIZE)
+        ptr   = BASE+nodes[0]*32
+        count = 0
+        while ptr:
+            ptr    = mem.u32(ptr-BASE)
+            count += 1
+        self.assertEqual(count, num)
+        self.assertTrue(mem.fills<num//4)
+
+    def test_readahead(self):
+        mem = DeviceMemory(self.bfm, self.hdl, BASE, SIZE, page_size=256)
+        for off in range(0, SIZE, 64): mem.u32(off)
+        self.assertTrue(mem.prefetched>0)
+        self.assertTrue(mem.fills<SIZE//256)
+
+    def test_bad_args(self):
+        self.assertRaises(ValueError, DeviceMemory, self.bfm, self.hdl, BASE+2, SIZE)
+        self.assertRaises(ValueError, DeviceMemory, self.bfm, self.hdl, BASE, SIZE, page_size=100)
+        mem = DeviceMemory(self.bfm, self.hdl, BASE, SIZE)
+        self.assertRaises(IndexError, mem.read, SIZE-2, 4)
+        self.assertRaises(ValueError, mem.uncached, 0x2, 4)
+        self.assertRaises(ValueError, mem.__getitem__, slice(0, 8, 2))
+        self.assertRaises(TypeError, mem.__getitem__, 'a')
+
+class DevMemAhbTest(DevMemAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
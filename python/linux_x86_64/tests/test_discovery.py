@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.discovery, where the cache file is
+in a temporary directory.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of discovery cache"
+
+#-------------------------------------------------------------------------------
+import os
+import ctypes
+import json
+import shutil
+import tempfile
+import unittest
+import emu
+
+#===============================================================================
+class DiscoveryAxiTest(emu.AxiTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(DiscoveryAxiTest, cls).setUpClass()
+        from confmc import discovery
+        cls.discovery = discovery
+
+    def setUp(self):
+        self.dir  = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'discovery.json')
+        self.hdls = []
+
+    def tearDown(self):
+        for hdl in self.hdls: self.bfm.conRelease(hdl)
+        shutil.rmtree(self.dir)
+
+    def open_card(self, cid=0, refresh=False):
+        hdl, info = self.discovery.open_card(self.bfm, cid, refresh, self.path)
+        self.assertTrue(hdl)
+        self.hdls.append(hdl)
+        return hdl, info
+
+    def transfers(self, hdl):
+        stats = self.bfm.con_EmuStats()
+        self.bfm.conEmuGetStats(hdl, ctypes.byref(stats))
+        return stats.transfers_out
+
+    def test_miss_and_hit(self):
+        hdl, info = self.open_card()
+        self.assertFalse(info['cached'])
+        self.assertEqual(info['bfm'], self.btype)
+        self.assertEqual(info['topology'], 'emu')
+        self.assertTrue(os.path.isfile(self.path))
+        hdl, info2 = self.open_card()
+        self.assertTrue(info2['cached'])
+        self.assertEqual(info2['context'], info['context'])
+        hdl, info3 = self.open_card(refresh=True)
+        self.assertFalse(info3['cached'])
+
+    def test_context_applied(self):
+        self.open_card()
+        with open(self.path) as fp: entries = json.load(fp)
+        key = list(entries)[0]
+        entries[key]['context']['burst_max'] = 8
+        with open(self.path, 'w') as fp: json.dump(entries, fp)
+        hdl, info = self.open_card()
+        self.assertTrue(info['cached'])
+        self.assertEqual(self.bfm.BfmGetBurstMax(hdl), 8)
+        # no GPIN read at the first use
+        before = self.transfers(hdl)
+        self.assertEqual(self.bfm.BfmContextGet(hdl).burst_max, 8)
+        self.assertEqual(self.transfers(hdl), before)
+
+    def test_older_entry(self):
+        self.open_card()
+        with open(self.path) as fp: entries = json.load(fp)
+        for entry in entries.values(): del entry['context']
+        with open(self.path, 'w') as fp: json.dump(entries, fp)
+        hdl, info = self.open_card()
+        self.assertFalse(info['cached'])
+
+    def test_invalidate(self):
+        self.open_card(0)
+        self.open_card(1)
+        self.assertEqual(sorted(e['cid'] for e in self.discovery.cached(self.path)), [0, 1])
+        self.assertEqual(self.discovery.invalidate(1, self.path), 0)
+        self.assertEqual([e['cid'] for e in self.discovery.cached(self.path)], [0])
+        self.assertEqual(self.discovery.invalidate(None, self.path), 0)
+        self.assertEqual(self.discovery.cached(self.path), [])
+
+    def test_broken_file(self):
+        with open(self.path, 'w') as fp: fp.write('{broken')
+        self.assertEqual(self.discovery.cached(self.path), [])
+        hdl, info = self.open_card()
+        self.assertFalse(info['cached'])
+        self.assertEqual(len(self.discovery.cached(self.path)), 1)
+
+    def test_benchmark(self):
+        result = self.discovery.benchmark(self.bfm, 0, 3, self.path)
+        self.assertTrue(result['full_ms']>0)
+        self.assertTrue(result['cached_ms']>0)
+
+class DiscoveryAhbTest(DiscoveryAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.dump with small windows, so that a few
+windows cover the whole range.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of memory dump"
+
+#-------------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+import emu
+from confmc import dump
+
+#===============================================================================
+class _Stop(Exception):
+    pass
+
+class DumpAxiTest(emu.AxiTestCase):
+    ADDR   = 0x10000003
+    NBYTES = 300*1024+6
+    WINDOW = 64*1024
+
+    def setUp(self):
+        super(DumpAxiTest, self).setUp()
+        self.dir = tempfile.mkdtemp()
+        self.src = os.path.join(self.dir, 'src.bin')
+        self.dst = os.path.join(self.dir, 'dst.bin')
+        self.data = numpy.random.randint(0, 256, self.NBYTES).astype(numpy.uint8)
+        self.data.tofile(self.src)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        super(DumpAxiTest, self).tearDown()
+
+    def test_load_and_dump(self):
+        done = []
+        self.assertEqual(dump.load_from_file(self.bfm, self.hdl, self.ADDR, self.src
+                        ,window=self.WINDOW, progress=lambda d, t: done.append((d, t))), 0)
+        self.assertEqual(done[-1], (self.NBYTES, self.NBYTES))
+        self.assertEqual(bytes(self.bfm.BfmReadBlock(self.hdl, self.ADDR, 16)), self.data[:16].tobytes())
+        self.assertEqual(dump.dump_to_file(self.bfm, self.hdl, self.ADDR, self.NBYTES, self.dst
+                        ,chunk=4096, window=self.WINDOW), 0)
+        self.assertTrue(numpy.array_equal(numpy.fromfile(self.dst, dtype=numpy.uint8), self.data))
+
+    def test_resume(self):
+        self.assertEqual(dump.load_from_file(self.bfm, self.hdl, self.ADDR, self.src, window=self.WINDOW), 0)
+        last = [0]
+        def progress(done, total):
+            last[0] = done
+            if done>100*1024: raise _Stop()
+        self.assertRaises(_Stop, dump.dump_to_file, self.bfm, self.hdl, self.ADDR, self.NBYTES
+                         ,self.dst, window=self.WINDOW, progress=progress)
+        self.assertEqual(os.path.getsize(self.dst), self.NBYTES)
+        self.assertEqual(dump.dump_to_file(self.bfm, self.hdl, self.ADDR, self.NBYTES, self.dst
+                        ,offset=last[0], window=self.WINDOW), 0)
+        self.assertTrue(numpy.array_equal(numpy.fromfile(self.dst, dtype=numpy.uint8), self.data))
+
+    def test_partial_load(self):
+        self.write(0x20000, [0]*4)
+        self.assertEqual(dump.load_from_file(self.bfm, self.hdl, 0x20000, self.src, nbytes=10, offset=4), 0)
+        got = numpy.frombuffer(bytes(self.bfm.BfmReadBlock(self.hdl, 0x20000, 16)), dtype=numpy.uint8)
+        self.assertTrue(numpy.array_equal(got[4:10], self.data[4:10]))
+        self.assertEqual(list(got[:4])+list(got[10:]), [0]*10)
+
+    def test_capture(self):
+        nbytes = 256*1024
+        self.assertEqual(dump.capture_to_file(self.bfm, self.hdl, nbytes, self.dst
+                        ,chunk=16*1024, window=self.WINDOW), 0)
+        got = numpy.fromfile(self.dst, dtype=numpy.uint32)
+        self.assertEqual(len(got), nbytes//4)
+        self.assertTrue(numpy.all(numpy.diff(got.astype(numpy.int64))==1))
+        self.write(0x100, [1, 2]) # back to command mode
+        self.assertEqual(self.read(0x100, 2), [1, 2])
+
+    def test_bad_args(self):
+        self.assertRaises(ValueError, dump.load_from_file, self.bfm, self.hdl, 0, self.src
+                         ,nbytes=self.NBYTES+1)
+        self.assertRaises(ValueError, dump.dump_to_file, self.bfm, self.hdl, 0, 16, self.dst, offset=17)
+        self.assertRaises(ValueError, dump.dump_to_file, self.bfm, self.hdl, 0, 16, self.dst
+                         ,chunk=4096, window=1024)
+        self.assertRaises(ValueError, dump.capture_to_file, self.bfm, self.hdl, 6, self.dst)
+
+class DumpAhbTest(DumpAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of the software stand-in of 'libconapi', i.e.,
+the emulator with link-timing model and finite transactor fifos.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of the emulator"
+
+#-------------------------------------------------------------------------------
+import ctypes
+import timeit
+import threading
+import unittest
+import numpy
+import emu
+
+#===============================================================================
+class EmulatorAxiTest(emu.AxiTestCase):
+    def stats(self):
+        stats = self.bfm.con_EmuStats()
+        self.assertEqual(self.bfm.conEmuGetStats(self.hdl, ctypes.byref(stats)), 0)
+        return stats
+
+    def test_profiles(self):
+        link = self.bfm.con_EmuLink()
+        self.assertEqual(self.bfm.conEmuSetProfile(self.hdl, 'usb2'), 0)
+        self.bfm.conEmuGetLink(self.hdl, ctypes.byref(link))
+        self.assertEqual((link.latency_ns, link.bandwidth, link.realtime), (125000, 40, 1))
+        self.assertEqual(self.hdl.contents.usb.bulk_max_pkt_size_out, 512)
+        self.assertEqual(self.bfm.conEmuSetProfile(self.hdl, 'usb3'), 0)
+        self.assertEqual(self.hdl.contents.usb.bulk_max_pkt_size_out, 1024)
+        self.assertTrue(self.bfm.conEmuSetProfile(self.hdl, 'usb9')<0)
+        self.assertEqual(self.bfm.conEmuSetProfile(self.hdl, 'none'), 0)
+        self.bfm.conEmuGetLink(self.hdl, ctypes.byref(link))
+        self.assertEqual((link.latency_ns, link.bandwidth, link.realtime), (0, 0, 0))
+
+    def test_link_time(self):
+        self.read(0x0) # GPIN is read at the first use of AMBA AHB BFM
+        self.bfm.conEmuSetLink(self.hdl, ctypes.byref(self.bfm.con_EmuLink(1000, 100, 0)))
+        self.bfm.conEmuClearStats(self.hdl)
+        self.read(0x0, 16)
+        stats = self.stats()
+        self.assertEqual((stats.transfers_out, stats.transfers_in), (1, 1))
+        self.assertEqual(stats.bytes_in, 64)
+        # 1us for each transfer and 10ns for each byte at 100MB/s
+        self.assertEqual(stats.link_ns, 2*1000+(stats.bytes_out+stats.bytes_in)*10)
+
+    def test_realtime(self):
+        self.read(0x0)
+        self.bfm.conEmuSetLink(self.hdl, ctypes.byref(self.bfm.con_EmuLink(5000000, 0, 1)))
+        start = timeit.default_timer()
+        self.read(0x0)
+        self.assertTrue(timeit.default_timer()-start>=0.009) # two transfers of 5ms
+        self.bfm.conEmuSetProfile(self.hdl, 'none')
+
+    def test_cards_apart(self):
+        other = self.bfm.conInit(1)
+        self.assertTrue(other)
+        try:
+            self.write(0x100, [0x11111111])
+            data = (ctypes.c_uint*1)(0x22222222)
+            self.bfm.BfmWrite(other, 0x100, data, 4, 1)
+            self.assertEqual(self.read(0x100), [0x11111111])
+            self.assertEqual(self.bfm.conGetCid(other), 1)
+        finally:
+            self.bfm.conRelease(other)
+
+    def test_threads(self):
+        errors = []
+        def worker(base):
+            for idx in range(200):
+                wdata = (ctypes.c_uint*4)(*[base+idx]*4)
+                rdata = (ctypes.c_uint*4)()
+                self.bfm.BfmWrite(self.hdl, base*16+0x10000, wdata, 4, 4)
+                self.bfm.BfmRead(self.hdl, base*16+0x10000, rdata, 4, 4)
+                if list(rdata)!=list(wdata): errors.append((base, idx))
+        threads = [threading.Thread(target=worker, args=(num*1000,)) for num in range(4)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        self.assertEqual(errors, [])
+
+class EmulatorAhbTest(EmulatorAxiTest):
+    btype = 'ahb'
+
+#===============================================================================
+class FifoDepthAxiTest(emu.AxiTestCase):
+    def setUp(self):
+        self.hdl = self.bfm.conInit(0)
+        self.assertEqual(self.bfm.conEmuSetDepth(self.hdl, 64, 32), 0)
+
+    def test_depth(self):
+        # depth is queried at the first use of the context
+        self.assertEqual(self.bfm.BfmGetReadDepth(self.hdl), 32)
+        data = numpy.arange(4096, dtype=numpy.uint32)
+        self.assertEqual(self.bfm.BfmWriteBlock(self.hdl, 0, data), 0)
+        self.assertEqual(bytes(self.bfm.BfmReadBlock(self.hdl, 0, data.nbytes)), data.tobytes())
+        stats = self.bfm.con_EmuStats()
+        self.bfm.conEmuGetStats(self.hdl, ctypes.byref(stats))
+        self.assertEqual(stats.timeouts, 0)
+
+    def test_full_fifo(self):
+        # raw stream beyond F2U and U2F fifos times out, and then goes on as F2U is popped
+        self.assertEqual(self.bfm.BfmGetReadDepth(self.hdl), 32)
+        if self.btype=='axi': cmd = (2<<25)|(1<<23)|15
+        else:                 cmd = (2<<26)|15
+        flits = []
+        for idx in range(40): flits += [(2<<16)|(0x2<<12), cmd, 64*idx, (16<<16)|(0x5<<12)]
+        wbuf = (ctypes.c_uint*len(flits))(*flits)
+        done = ctypes.c_uint(0)
+        self.assertTrue(self.bfm._conStreamWrite(self.hdl, wbuf, len(flits), ctypes.byref(done), 0)<0)
+        self.assertTrue(0<done.value<len(flits))
+        stats = self.bfm.con_EmuStats()
+        self.bfm.conEmuGetStats(self.hdl, ctypes.byref(stats))
+        self.assertEqual(stats.timeouts, 1)
+        rest = (ctypes.c_uint*(len(flits)-done.value)).from_buffer(wbuf, done.value*4)
+        got  = []
+        while len(got)<640:
+            rbuf = (ctypes.c_uint*640)()
+            self.bfm._conStreamRead(self.hdl, rbuf, 640-len(got), ctypes.byref(done))
+            got += list(rbuf[:done.value])
+            if len(rest):
+               self.bfm._conStreamWrite(self.hdl, rest, len(rest), ctypes.byref(done), 0)
+               rest = (ctypes.c_uint*(len(rest)-done.value)).from_buffer(rest, done.value*4)
+        self.assertEqual(got, [0]*640) # nothing written yet
+
+class FifoDepthAhbTest(FifoDepthAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
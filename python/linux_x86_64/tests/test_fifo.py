@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.fifo, where the emulator memory acts as
+a FIFO register keeping the last item written, and a plain word acts as the
+level or space register.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of FIFO port"
+
+#-------------------------------------------------------------------------------
+import unittest
+import numpy
+import emu
+from confmc import fifo
+
+#===============================================================================
+FIFO  = 0x40000
+LEVEL = 0x50000
+
+class FifoAxiTest(emu.AxiTestCase):
+    def test_write_read(self):
+        port = fifo.FifoPort(self.bfm, self.hdl, FIFO)
+        data = numpy.arange(1, 1001, dtype=numpy.uint32)
+        self.assertEqual(port.write(data), 0)
+        self.assertEqual(self.read(FIFO, 2), [1000, 0]) # nothing past the FIFO
+        self.assertTrue(port.batches>1)
+        items = port.read(333)
+        self.assertEqual(len(items), 333)
+        self.assertTrue(numpy.all(items==1000))
+        out = bytearray(8)
+        self.assertEqual(list(port.read(2, out)), [1000, 1000])
+        self.assertEqual(bytes(out), numpy.array([1000, 1000], dtype=numpy.uint32).tobytes())
+
+    def test_narrow(self):
+        port = fifo.FifoPort(self.bfm, self.hdl, FIFO+0x11, size=1)
+        self.assertEqual(port.write(b'\x01\x02\x03'), 0)
+        self.assertEqual(list(port.read(2)), [3, 3])
+        port = fifo.FifoPort(self.bfm, self.hdl, FIFO+0x22, size=2)
+        self.assertEqual(port.write(bytearray(b'\x34\x12\x78\x56')), 0)
+        items = port.read(3)
+        self.assertEqual(list(items), [0x5678]*3)
+        self.assertEqual(items.dtype, numpy.uint16)
+
+    def test_level(self):
+        self.write(LEVEL, [5<<8])
+        port = fifo.FifoPort(self.bfm, self.hdl, FIFO, level=(LEVEL, 0xFF00, 8)
+                            ,space=(LEVEL, 0xFF00, 8))
+        self.assertEqual(len(port.read(23)), 23)
+        self.assertEqual(port.batches, 5) # 5 items each
+        self.assertEqual(port.polls, 1)   # level read in the same batch after that
+        self.assertEqual(port.write(numpy.arange(12, dtype=numpy.uint32)), 0)
+        self.assertEqual(port.batches, 8)
+
+    def test_timeout(self):
+        self.write(LEVEL, [0])
+        port = fifo.FifoPort(self.bfm, self.hdl, FIFO, space=LEVEL, timeout=0.01)
+        self.assertEqual(port.write(numpy.arange(4, dtype=numpy.uint32)), -2)
+        self.assertTrue(port.polls>1)
+        port = fifo.FifoPort(self.bfm, self.hdl, FIFO, level=LEVEL, timeout=0.01)
+        self.assertEqual(port.read(4), None)
+
+    def test_bad_args(self):
+        self.assertRaises(ValueError, fifo.FifoPort, self.bfm, self.hdl, FIFO, size=3)
+        self.assertRaises(ValueError, fifo.FifoPort, self.bfm, self.hdl, FIFO, level=(1, 2, 3, 4))
+        port = fifo.FifoPort(self.bfm, self.hdl, FIFO, size=2)
+        self.assertRaises(ValueError, port.write, b'\x01\x02\x03')
+        self.assertRaises(ValueError, port.read, 4, bytearray(6))
+
+class FifoAhbTest(FifoAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.image, where ELF, Intel HEX, S-record and
+raw binary of the same segments are written to a temporary directory.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of image loader"
+
+#-------------------------------------------------------------------------------
+import os
+import shutil
+import struct
+import tempfile
+import types
+import unittest
+import numpy
+import emu
+from confmc import image
+
+#===============================================================================
+ENTRY    = 0x10000000
+SEGMENTS = [ (0x10000000, bytearray(range(256))*3)
+           , (0x10000400, bytearray(b'CON-FMC firmware image\0'))
+           , (0x10010000, bytearray(range(255, -1, -1))) ]
+
+def _checksum(rec):
+    return (-sum(rec))&0xFF
+
+def write_ihex(path):
+    lines = []
+    upper = None
+    for addr, data in SEGMENTS:
+        for pos in range(0, len(data), 16):
+            at = addr+pos
+            if (at>>16)!=upper:
+               upper = at>>16
+               rec = bytearray([2, 0, 0, 4, upper>>8, upper&0xFF])
+               lines.append(rec)
+            chunk = data[pos:pos+16]
+            lines.append(bytearray([len(chunk), (at>>8)&0xFF, at&0xFF, 0])+chunk)
+    lines.append(bytearray([4, 0, 0, 5])+bytearray(struct.pack('>I', ENTRY)))
+    lines.append(bytearray([0, 0, 0, 1]))
+    with open(path, 'w') as fp:
+        for rec in lines:
+            fp.write(':'+''.join('%02X' % b for b in rec+bytearray([_checksum(rec)]))+'\n')
+
+def write_srec(path):
+    lines = [('0', bytearray([0, 0])+bytearray(b'fw'))]
+    for addr, data in SEGMENTS:
+        for pos in range(0, len(data), 16):
+            lines.append(('3', bytearray(struct.pack('>I', addr+pos))+data[pos:pos+16]))
+    lines.append(('7', bytearray(struct.pack('>I', ENTRY))))
+    with open(path, 'w') as fp:
+        for stype, body in lines:
+            rec = bytearray([len(body)+1])+body
+            fp.write('S'+stype+''.join('%02X' % b for b in rec+bytearray([0xFF-(sum(rec)&0xFF)]))+'\n')
+
+def write_elf(path, bss=0):
+    phoff  = 52
+    offset = phoff+32*len(SEGMENTS)
+    header = b'\x7fELF'+bytes(bytearray([1, 1, 1]))+b'\0'*9
+    header+= struct.pack('<HHIIIIIHHHHHH', 2, 0x28, 1, ENTRY, phoff, 0, 0, 52, 32
+                        ,len(SEGMENTS), 0, 0, 0)
+    phdrs  = b''
+    blob   = b''
+    for idx, (addr, data) in enumerate(SEGMENTS):
+        memsz  = len(data)+(bss if idx==len(SEGMENTS)-1 else 0)
+        phdrs += struct.pack('<IIIIIIII', 1, offset+len(blob), addr, addr, len(data), memsz, 5, 4)
+        blob  += bytes(data)
+    with open(path, 'wb') as fp: fp.write(header+phdrs+blob)
+
+#===============================================================================
+class ImageTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+    def expect(self, img):
+        self.assertEqual([(a, d.tobytes()) for a, d in img.regions()]
+                        ,[(a, bytes(d)) for a, d in SEGMENTS])
+
+    def test_formats(self):
+        write_ihex(self.path('fw.hex'))
+        write_srec(self.path('fw.srec'))
+        write_elf(self.path('fw.elf'))
+        for name in ('fw.hex', 'fw.srec', 'fw.elf'):
+            img = image.load(self.path(name))
+            self.assertEqual(img.entry, ENTRY)
+            self.expect(img)
+
+    def test_elf_bss(self):
+        write_elf(self.path('fw.elf'), bss=16)
+        img = image.load_elf(self.path('fw.elf'), bss=True)
+        addr, data = img.regions()[-1]
+        self.assertEqual(len(data), 256+16)
+        self.assertEqual(list(data[-16:]), [0]*16)
+
+    def test_raw(self):
+        with open(self.path('fw.bin'), 'wb') as fp: fp.write(bytes(SEGMENTS[0][1]))
+        img = image.load(self.path('fw.bin'), 0x2000)
+        self.assertEqual(img.entry, None)
+        self.assertEqual(img.regions()[0][0], 0x2000)
+        self.assertEqual(img.nbytes, len(SEGMENTS[0][1]))
+
+    def test_regions(self):
+        img = image.Image('t')
+        img.add(0x100, b'\x01'*8)
+        img.add(0x104, b'\x02'*8) # later one overrides
+        img.add(0x10C, b'\x03')   # adjacent
+        img.add(0x200, b'\x04')
+        self.assertEqual([(a, d.tobytes()) for a, d in img.regions()]
+                        ,[(0x100, b'\x01'*4+b'\x02'*8+b'\x03'), (0x200, b'\x04')])
+        regions = img.regions(fill=0xAA)
+        self.assertEqual(len(regions), 1)
+        self.assertEqual(regions[0][1][0x10D-0x100], 0xAA)
+        self.assertEqual(len(img.regions(fill=0xAA, max_gap=16)), 2)
+
+    def test_bad_files(self):
+        with open(self.path('bad.hex'), 'w') as fp: fp.write(':0100000001FF\n')
+        self.assertRaises(ValueError, image.load, self.path('bad.hex'))
+        with open(self.path('bad.srec'), 'w') as fp: fp.write('S1050000010200\n')
+        self.assertRaises(ValueError, image.load, self.path('bad.srec'))
+        with open(self.path('bad.elf'), 'wb') as fp: fp.write(b'\x7fELF\x03\x01'+b'\0'*64)
+        self.assertRaises(ValueError, image.load, self.path('bad.elf'))
+
+#-------------------------------------------------------------------------------
+class WriteAxiTest(emu.AxiTestCase):
+    def test_write(self):
+        img = image.Image('fw')
+        for addr, data in SEGMENTS: img.add(addr, data)
+        result = image.write(self.bfm, self.hdl, img, verify=True, chunk=256)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.nbytes, sum(len(d) for a, d in SEGMENTS))
+        self.assertEqual(result.verify.errors, 0)
+        self.assertEqual(bytes(self.bfm.BfmReadBlock(self.hdl, 0x10000400, 23)), bytes(SEGMENTS[1][1]))
+
+    def test_mismatch(self):
+        # BFM module flipping bits of written data
+        bfm = types.ModuleType('flip')
+        bfm.__dict__.update(self.bfm.__dict__)
+        def write_block(hdl, addr, buf):
+            data = numpy.array(buf)
+            data[3] ^= 0x10
+            data[9] ^= 0xFF
+            return self.bfm.BfmWriteBlock(hdl, addr, data)
+        bfm.BfmWriteBlock = write_block
+        img = image.Image('t')
+        img.add(0x1001, numpy.arange(64, dtype=numpy.uint8))
+        result = image.write(bfm, self.hdl, img, verify=True)
+        self.assertFalse(result.ok)
+        self.assertEqual(result.verify.errors, 2)
+        self.assertEqual(result.verify.addresses, [0x1004, 0x100A])
+        self.assertTrue('2 mis-match' in str(result))
+
+class WriteAhbTest(WriteAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.irq, where the emulator drives IRQ and FIQ
+by conEmuSetIrq().
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of interrupt wait"
+
+#-------------------------------------------------------------------------------
+import threading
+import unittest
+import emu
+from confmc import irq
+
+#===============================================================================
+class IrqAxiTest(emu.AxiTestCase):
+    def tearDown(self):
+        self.bfm.conEmuSetIrq(self.hdl, 0, 0)
+        super(IrqAxiTest, self).tearDown()
+
+    def test_timeout(self):
+        stats = irq.WaitStats()
+        self.assertEqual(irq.wait_irq(self.bfm, self.hdl, timeout=0.02, stats=stats), 0)
+        self.assertEqual(stats.waits, 1)
+        self.assertEqual(stats.timeouts, 1)
+        self.assertTrue(stats.polls>1)
+        self.assertEqual(stats.latency, [])
+
+    def test_irq(self):
+        stats = irq.WaitStats()
+        for idx in range(5):
+            timer = threading.Timer(0.005, self.bfm.conEmuSetIrq, (self.hdl, 1, 0))
+            timer.start()
+            value = irq.wait_irq(self.bfm, self.hdl, timeout=2.0, stats=stats)
+            timer.join()
+            self.assertTrue(value&irq.GPIN_IRQ)
+            self.assertFalse(value&irq.GPIN_FIQ)
+            self.bfm.conEmuSetIrq(self.hdl, 0, 0)
+        self.assertEqual(stats.waits, 5)
+        self.assertEqual(stats.timeouts, 0)
+        self.assertEqual(len(stats.latency), 5)
+
+    def test_mask(self):
+        self.bfm.conEmuSetIrq(self.hdl, 1, 0)
+        self.assertEqual(irq.wait_irq(self.bfm, self.hdl, timeout=0.01, mask=irq.GPIN_FIQ), 0)
+        self.bfm.conEmuSetIrq(self.hdl, 0, 1)
+        self.assertTrue(irq.wait_irq(self.bfm, self.hdl, mask=irq.GPIN_FIQ)&irq.GPIN_FIQ)
+
+    def test_condition(self):
+        self.write(0x40, [0x0, 0x1234])
+        def later():
+            with lock: self.write(0x40, [0x35])
+        lock  = threading.Lock()
+        timer = threading.Timer(0.01, later)
+        timer.start()
+        value = irq.wait_condition(self.bfm, self.hdl, [(0x40, 0xF0, 0x30), (0x44, 0, 0)]
+                                  ,timeout=2.0, lock=lock)
+        timer.join()
+        self.assertEqual(value, [0x35, 0x1234])
+        self.assertEqual(irq.wait_condition(self.bfm, self.hdl, [(0x40, 0xFF, 0x99)], timeout=0.01), None)
+        self.assertEqual(irq.wait_condition(self.bfm, self.hdl, [(0x40, 0xFF, 0x99), (0x44, 0xFF, 0x34)]
+                                           ,match='any'), [0x35, 0x1234])
+
+    def test_condition_irq(self):
+        self.write(0x40, [0x35])
+        self.assertEqual(irq.wait_condition(self.bfm, self.hdl, [(0x40, 0xFF, 0x35)]
+                                           ,timeout=0.01, irq=irq.GPIN_IRQ), None)
+        self.bfm.conEmuSetIrq(self.hdl, 1, 0)
+        self.assertEqual(irq.wait_condition(self.bfm, self.hdl, [(0x40, 0xFF, 0x35)]
+                                           ,irq=irq.GPIN_IRQ), [0x35])
+
+    def test_bad_condition(self):
+        self.assertRaises(ValueError, irq.wait_condition, self.bfm, self.hdl, [])
+        self.assertRaises(ValueError, irq.wait_condition, self.bfm, self.hdl
+                         ,[(0x40, 0xFF, 0)], match='some')
+
+class IrqAhbTest(IrqAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.march, i.e., March and pattern memory tests.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of March tests"
+
+#-------------------------------------------------------------------------------
+import os
+import sys
+import types
+import subprocess
+import unittest
+import emu
+import confmc
+from confmc import march
+
+#===============================================================================
+class MarchAxiTest(emu.AxiTestCase):
+    def test_all_pass(self):
+        results = march.run(self.bfm, self.hdl, 0x1000, 0x23000, verbose=False)
+        self.assertEqual(len(results), len(march.TESTS))
+        for result in results: self.assertTrue(result.ok, result.to_dict())
+
+    def test_stuck_at(self):
+        # bit 5 stuck at 1 in read data
+        bfm = self.bfm
+        class StuckBatch(bfm.BfmBatch):
+            def read(self, addr, pdata, size, length):
+                self.stuck = getattr(self, 'stuck', [])
+                self.stuck.append(pdata)
+                return bfm.BfmBatch.read(self, addr, pdata, size, length)
+            def flush(self):
+                ret = bfm.BfmBatch.flush(self)
+                for pdata in getattr(self, 'stuck', []): pdata |= 0x20
+                self.stuck = []
+                return ret
+        stuck = types.ModuleType('stuck')
+        stuck.__dict__.update(bfm.__dict__)
+        stuck.BfmBatch = StuckBatch
+        for result in march.run(stuck, self.hdl, 0, 0x1000
+                               ,['march-c-', 'march-b', 'checkerboard', 'walking0'], verbose=False):
+            self.assertTrue(result.errors>0)
+            self.assertEqual(result.bit_errors[5], result.errors)
+
+    def test_failed_transfer(self):
+        self.bfm.BfmSetRecovery(self.hdl, None)
+        self.bfm.conEmuSetFault(self.hdl, 3)
+        result = march.march(self.bfm, self.hdl, 0, 0x10000, march.MARCH_C_MINUS)
+        self.assertFalse(result.ok)
+        self.assertTrue(result.status<0)
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, march.run, self.bfm, self.hdl, 0, 0x100, ['no-such'])
+
+    def test_command_line(self):
+        path = os.path.dirname(os.path.dirname(os.path.abspath(confmc.__file__)))
+        env  = dict(os.environ, PYTHONPATH=os.pathsep.join([path, os.environ.get('PYTHONPATH', '')]))
+        argv = [sys.executable, '-m', 'confmc.march', '-b', self.btype, '-d', '0x10000', '-j', '-t']
+        with open(os.devnull, 'w') as null:
+            self.assertEqual(subprocess.call(argv+['march-c-,march-b'], env=env, stdout=null), 0)
+            env['CONFMC_EMU_FAULT'] = '3'
+            self.assertEqual(subprocess.call(argv+['march-c-'], env=env, stdout=null), 1)
+
+class MarchAhbTest(MarchAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.memtest and MemTest* of BFM modules.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of memory tests"
+
+#-------------------------------------------------------------------------------
+import unittest
+import numpy
+import emu
+from confmc import memtest
+
+#===============================================================================
+class MemTestAxiTest(emu.AxiTestCase):
+    def test_bfm_suite(self):
+        bfm, hdl = self.bfm, self.hdl
+        for result in (bfm.MemTestAddRAW(hdl, 0, 0x100), bfm.MemTestAdd(hdl, 0x10, 0x100)
+                      ,bfm.MemTestRAW(hdl, 1, 0x101, 1), bfm.MemTestRAW(hdl, 2, 0x100, 2)
+                      ,bfm.MemTest(hdl, 0, 0x100, 2), bfm.MemTest(hdl, 0, 0x100, 1)
+                      ,bfm.MemTestBurstRAW(hdl, 0, 4*8*2, 8), bfm.MemTestBurst(hdl, 0, 4*8*2, 16)):
+            self.assertTrue(result.ok, result.to_dict())
+
+    def test_pass(self):
+        result = memtest.memtest(self.bfm, self.hdl, 0xF00, 0x10000, chunk=0x4000)
+        self.assertTrue(result.ok, result.to_dict())
+        self.assertEqual(result.items, 0x10000//4)
+        self.assertEqual(result.errors, 0)
+
+    def test_items(self):
+        data = numpy.array([0x12345678, 0x9ABCDEF0, 0x0F0F0F0F], dtype=numpy.uint32)
+        for size in (1, 2, 4):
+            mask = (1<<(size*8))-1
+            self.assertEqual(memtest.write_items(self.bfm, self.hdl, 0x800, data, size), 0)
+            self.assertEqual(list(memtest.read_items(self.bfm, self.hdl, 0x800, 3, size))
+                            ,[int(value)&mask for value in data])
+
+    def test_corrupted_read(self):
+        # bits 0 and 7 of the 4th and bit 0 of the 8th word of each chunk flip
+        read_items = memtest._read_items
+        def corrupt(bfm, con_handle, addr, out, *args):
+            ret = read_items(bfm, con_handle, addr, out, *args)
+            out[3] ^= 0x81
+            out[7] ^= 0x01
+            return ret
+        memtest._read_items = corrupt
+        try:
+            result = memtest.memtest(self.bfm, self.hdl, 0x100, 0x1000, order='raw', chunk=0x400)
+        finally:
+            memtest._read_items = read_items
+        info = result.to_dict()
+        self.assertFalse(result.ok)
+        self.assertEqual(result.errors, 8)
+        self.assertEqual(info['bit_errors'][0], 8)
+        self.assertEqual(info['bit_errors'][7], 4)
+        self.assertEqual(info['addresses'][:2], [0x100+12, 0x100+28])
+
+    def test_failed_transfer(self):
+        self.bfm.BfmSetRecovery(self.hdl, None)
+        self.bfm.conEmuSetFault(self.hdl, 3)
+        result = memtest.memtest(self.bfm, self.hdl, 0, 0x10000)
+        self.assertFalse(result.ok)
+        self.assertTrue(result.status<0)
+        self.assertTrue(result.items<0x10000//4)
+        self.bfm.conEmuSetFault(self.hdl, 0)
+        self.bfm.BfmRecover(self.hdl, self.bfm.BFM_RECOVER_TRX)
+        result = memtest.memtest(self.bfm, self.hdl, 0, 0x10000)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.items, 0x10000//4)
+
+class MemTestAhbTest(MemTestAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.metrics and USB counters of the BFM.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of metrics"
+
+#-------------------------------------------------------------------------------
+import os
+import ctypes
+import json
+import shutil
+import tempfile
+import unittest
+import numpy
+import emu
+from confmc import metrics
+
+#===============================================================================
+class MetricsAxiTest(emu.AxiTestCase):
+    def setUp(self):
+        self.orig    = self.bfm.BfmWrite
+        self.metrics = metrics.Metrics(self.bfm, trace=True)
+        self.metrics.enable()
+        super(MetricsAxiTest, self).setUp() # conInit() seen by metrics
+
+    def tearDown(self):
+        super(MetricsAxiTest, self).tearDown()
+        self.metrics.disable()
+
+    def test_calls(self):
+        for idx in range(10):
+            self.write(0x100, list(range(16)))
+            self.read(0x100, 16)
+        buf = numpy.arange(40000, dtype=numpy.uint8)
+        self.assertEqual(self.bfm.BfmWriteBlock(self.hdl, 0x10000, buf), 0)
+        self.assertTrue(self.bfm.BfmReadBlock(self.hdl, 0x10000, 40000) is not None)
+        calls = self.metrics.to_dict()['calls']['0']
+        self.assertEqual(calls['BfmWrite']['calls'], 10)
+        self.assertEqual(calls['BfmWrite']['bytes'], 640)
+        self.assertEqual(calls['BfmWrite']['burst_buckets']['16'], 10)
+        self.assertEqual(calls['BfmRead']['errors'], 0)
+        self.assertEqual(calls['BfmWriteBlock']['bytes'], 40000)
+        self.assertEqual(calls['BfmReadBlock']['bytes'], 40000)
+        self.assertEqual(sum(calls['BfmRead']['latency_us_buckets'].values()), 10)
+
+    def test_errors(self):
+        data = (ctypes.c_uint*1)()
+        self.assertRaises(IOError, self.bfm.BfmWrite, self.hdl, 0x100, data, 3, 1)
+        self.assertTrue(self.bfm.BfmWriteStatus(self.hdl, 0x100, data, 4, 1000)<0)
+        calls = self.metrics.to_dict()['calls']['0']
+        self.assertEqual(calls['BfmWrite']['errors'], 1)
+        self.assertEqual(calls['BfmWriteStatus']['errors'], 1)
+
+    def test_usb(self):
+        self.read(0x0)
+        self.metrics.clear()
+        self.write(0x100, list(range(16)))
+        usb = self.metrics.usb()[0]
+        self.assertTrue(usb['writes']>=1)
+        self.assertEqual(usb['reads'], 0)
+        self.assertEqual(usb['words_out'], 4+16)
+        self.assertEqual(usb['errors'], 0)
+        self.assertEqual(self.metrics.to_dict()['usb']['0'], usb)
+
+    def test_prometheus(self):
+        for idx in range(10): self.read(0x100, 4)
+        text = self.metrics.to_prometheus()
+        self.assertTrue('confmc_calls_total{cid="0",call="BfmRead"} 10' in text)
+        self.assertTrue('confmc_latency_seconds_bucket{cid="0",call="BfmRead",le="+Inf"} 10' in text)
+        self.assertTrue('confmc_burst_length_bucket{cid="0",call="BfmRead",le="4"} 10' in text)
+        self.assertTrue('# TYPE confmc_usb_writes_total counter' in text)
+
+    def test_trace(self):
+        for idx in range(5): self.read(0x100)
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'trace.json')
+            self.metrics.dump_trace(path)
+            with open(path) as fp: events = json.load(fp)['traceEvents']
+        finally:
+            shutil.rmtree(tmpdir)
+        reads = [e for e in events if e['name']=='BfmRead']
+        self.assertEqual(len(reads), 5)
+        self.assertEqual(reads[0]['pid'], 0)
+
+    def test_disabled(self):
+        self.write(0x100, [0])
+        self.metrics.disable()
+        self.assertTrue(self.bfm.BfmWrite is self.orig)
+        writes = self.bfm.BfmStatsGet(self.hdl).writes
+        self.write(0x100, [1])
+        self.assertEqual(self.bfm.BfmStatsGet(self.hdl).writes, writes)
+        self.assertEqual(self.metrics.to_dict()['calls']['0']['BfmWrite']['calls'], 1)
+
+    def test_released(self):
+        hdl = self.bfm.conInit(1)
+        self.assertTrue(1 in self.metrics.handles)
+        self.bfm.conRelease(hdl)
+        self.assertFalse(1 in self.metrics.handles)
+        self.assertFalse(1 in self.metrics.usb())
+        self.assertEqual(self.bfm.BfmStatsGet(hdl), None)
+
+class MetricsAhbTest(MetricsAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
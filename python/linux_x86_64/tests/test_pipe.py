@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of BfmPipe.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of split-phase reads"
+
+#-------------------------------------------------------------------------------
+import threading
+import unittest
+import numpy
+import emu
+
+#===============================================================================
+class PipeAxiTest(emu.AxiTestCase):
+    def test_tickets(self):
+        words = numpy.arange(4*300, dtype=numpy.uint32)*3+7
+        self.assertEqual(self.bfm.BfmWriteBlock(self.hdl, 0x0, words), 0)
+        with self.bfm.BfmPipe(self.hdl, depth=256) as pipe:
+            tickets = [pipe.issue_read(16*idx, 4, (idx%4)+1) for idx in range(300)]
+            self.assertTrue(min(tickets)>=0)
+            self.assertEqual(len(set(tickets)), 300)
+            data = pipe.collect()
+            for idx, ticket in enumerate(tickets):
+                self.assertEqual(list(data[ticket]), [int(w) for w in words[4*idx:4*idx+(idx%4)+1]])
+            self.assertEqual(pipe.outstanding, 0)
+            self.assertEqual(pipe.collect(), {})
+
+    def test_depth(self):
+        with self.bfm.BfmPipe(self.hdl, depth=1<<30) as pipe:
+            self.assertEqual(pipe.depth, self.bfm.BfmGetReadDepth(self.hdl))
+        self.write(0x0, [0x11111111])
+        with self.bfm.BfmPipe(self.hdl, depth=10) as pipe:
+            tickets = [pipe.issue_read(0x0) for idx in range(10)] # over the depth
+            self.assertTrue(pipe._words<=10)
+            self.assertEqual(pipe.outstanding, 10)
+            data = pipe.collect()
+            self.assertEqual([data[ticket][0] for ticket in tickets], [0x11111111]*10)
+
+    def test_other_call_first(self):
+        # reads pushed come back before a later call of others
+        self.write(0x0, [0x11111111])
+        self.write(0x100, [0x22222222])
+        with self.bfm.BfmPipe(self.hdl, post=1) as pipe:
+            ticket = pipe.issue_read(0x0)
+            self.assertEqual(self.read(0x100), [0x22222222])
+            self.assertEqual(pipe.collect()[ticket][0], 0x11111111)
+            ticket = pipe.issue_read(0x0)
+            self.write(0x0, [0x33333333])
+            self.assertEqual(self.read(0x0), [0x33333333])
+            self.assertEqual(pipe.collect()[ticket][0], 0x11111111)
+
+    def test_interleaved(self):
+        self.write(0x0, [0x11111111])
+        self.write(0x100, [0x22222222])
+        pipe0 = self.bfm.BfmPipe(self.hdl, post=1)
+        pipe1 = self.bfm.BfmPipe(self.hdl, post=1)
+        try:
+            ticket0 = pipe0.issue_read(0x100)
+            ticket1 = pipe1.issue_read(0x0)
+            ticket2 = pipe0.issue_read(0x0)
+            data1   = pipe1.collect()
+            data0   = pipe0.collect()
+            self.assertEqual(data0[ticket0][0], 0x22222222)
+            self.assertEqual(data1[ticket1][0], 0x11111111)
+            self.assertEqual(data0[ticket2][0], 0x11111111)
+            pipe0.issue_read(0x0)
+            thread = threading.Thread(target=pipe0.close) # closed with issued reads
+            thread.start()
+            thread.join()
+            self.assertEqual(self.read(0x100), [0x22222222])
+        finally:
+            pipe1.close()
+
+    def test_dropped(self):
+        # reads dropped by a failed collection inside issue_read()
+        self.bfm.BfmSetRecovery(self.hdl, None)
+        with self.bfm.BfmPipe(self.hdl, depth=40) as pipe:
+            tickets = [pipe.issue_read(4*idx) for idx in range(5)]
+            self.assertTrue(min(tickets)>=0)
+            self.bfm.conEmuSetFault(self.hdl, 1)
+            rets = [pipe.issue_read(0x100+4*idx) for idx in range(10)]
+            self.assertTrue(min(rets)<0)
+            self.bfm.conEmuSetFault(self.hdl, 0)
+            self.assertTrue(self.bfm.BfmRecover(self.hdl)>=0)
+            self.assertEqual(pipe.collect(), None)
+            self.assertEqual(pipe.collect(), {})
+            ticket = pipe.issue_read(0x0)
+            self.assertTrue(ticket in pipe.collect())
+
+class PipeAhbTest(PipeAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
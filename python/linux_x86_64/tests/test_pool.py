@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.pool, which runs jobs on all cards at once.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of card pool"
+
+#-------------------------------------------------------------------------------
+import unittest
+import numpy
+import emu
+from confmc.pool import CardPool, CardResult, PoolResult, cid_max
+
+#===============================================================================
+class _Failed(object):
+    ok     = False
+    nbytes = 0
+
+def read_word(bfm, hdl, addr):
+    return bfm.BfmReadBlock(hdl, addr, 4)
+
+class PoolAxiTest(emu.AxiTestCase):
+    def setUp(self):
+        self.pool = CardPool(self.bfm, cids=[0, 1, 2])
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_cid_max(self):
+        self.assertTrue(cid_max(self.bfm)>=len(self.pool))
+
+    def test_cards(self):
+        self.assertEqual(self.pool.cids, [0, 1, 2])
+        result = self.pool.map(lambda bfm, hdl, value: bfm.BfmWriteBlock(hdl, 0x10, bytearray([value]*4)), 7)
+        self.assertTrue(result.ok)
+        self.assertEqual(sorted(result.cards), [0, 1, 2])
+
+    def test_broadcast_write(self):
+        buf    = numpy.arange(1024, dtype=numpy.uint32)
+        result = self.pool.broadcast_write(0x1000, buf)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.nbytes, 3*buf.nbytes)
+        result = self.pool.broadcast_write(0x2003, bytearray(b'abcdefg'))
+        self.assertTrue(result.ok)
+        result = self.pool.map(lambda bfm, hdl: bytes(bfm.BfmReadBlock(hdl, 0x2003, 7)))
+        for card in result.cards.values():
+            self.assertEqual(card.value, b'abcdefg')
+        result = self.pool.map(read_word, 0x1000+4*1023)
+        for card in result.cards.values():
+            self.assertEqual(numpy.frombuffer(bytes(card.value), dtype=numpy.uint32)[0], 1023)
+
+    def test_errors(self):
+        result = self.pool.map(lambda bfm, hdl: 1//0)
+        self.assertEqual(result.errors, 3)
+        self.assertFalse(result.ok)
+        self.assertTrue(isinstance(result[0].error, ZeroDivisionError))
+        self.assertEqual(result.to_dict()['cards'][1]['errors'], 1)
+        self.assertTrue('NG' in str(result))
+
+    def test_closed(self):
+        self.pool.close()
+        self.assertEqual(len(self.pool), 0)
+        self.pool.close()
+
+class PoolAhbTest(PoolAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+class CardResultTest(unittest.TestCase):
+    def test_errors(self):
+        self.assertEqual(CardResult(0, 0).errors, 0)
+        self.assertEqual(CardResult(0, -1).errors, 1)
+        self.assertEqual(CardResult(0, None, ValueError()).errors, 1)
+        self.assertEqual(CardResult(0, _Failed()).errors, 1)
+
+    def test_mbps(self):
+        result = CardResult(0, None, seconds=2.0)
+        result.nbytes = 4.0E6
+        self.assertEqual(result.mbps, 2.0)
+        self.assertEqual(CardResult(0).mbps, 0.0)
+        pool = PoolResult({0: result, 1: CardResult(1)}, 1.0)
+        self.assertEqual(pool.nbytes, 4.0E6)
+        self.assertEqual(pool.mbps, 4.0)
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
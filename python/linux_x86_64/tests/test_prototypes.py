@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of BFM and conapi prototypes bound at load.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of BFM prototypes"
+
+#-------------------------------------------------------------------------------
+import ctypes
+import unittest
+import emu
+from confmc import bench
+
+#===============================================================================
+class PrototypeAxiTest(emu.AxiTestCase):
+    def test_bound_at_load(self):
+        for func in (self.bfm._BfmWriteStatus, self.bfm._BfmReadStatus
+                    ,self.bfm._BfmGpout, self.bfm._BfmGpin
+                    ,self.bfm._conStreamWrite, self.bfm._conStreamRead):
+            self.assertTrue(func.argtypes)
+            self.assertEqual(func.restype, ctypes.c_int)
+
+    def test_calls_do_not_wrap(self):
+        wrap = self.bfm.wrap_function
+        def fail(*args):
+            raise AssertionError('wrap_function() called for '+str(args[1]))
+        self.bfm.wrap_function = fail
+        try:
+            value = ctypes.c_uint(0)
+            self.write(0x100, [0x12345678])
+            self.assertEqual(self.read(0x100), [0x12345678])
+            self.assertEqual(self.bfm.BfmGpout(self.hdl, 0x5A5A), 0)
+            self.assertEqual(self.bfm.BfmGpin(self.hdl, ctypes.byref(value)), 0)
+            self.assertEqual(value.value&0xFFFF, 0x5A5A) # GPOUT loops back to GPIN
+        finally:
+            self.bfm.wrap_function = wrap
+
+    def test_sizes(self):
+        self.write(0x200, [0x11223344, 0x55667788], 4)
+        self.write(0x202, [0xAABB], 2)
+        self.write(0x205, [0xCC], 1)
+        self.assertEqual(self.read(0x200, 2), [0xAABB3344, 0x5566CC88])
+        self.assertEqual(self.read(0x202, 1, 2), [0xAABB])
+        self.assertEqual(self.read(0x205, 1, 1), [0xCC])
+
+    def test_bench_call_overhead(self):
+        result = bench.bench_call_overhead(self.bfm, self.hdl, count=200)
+        for key in ('gpin_rewrap_ns', 'gpin_prebound_ns', 'read_rewrap_ns', 'read_prebound_ns'):
+            self.assertGreater(result[key], 0)
+
+class PrototypeAhbTest(PrototypeAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of recovery from failed stream transfers, which are
+made by the fault injection of the emulator, i.e., conEmuSetFault().
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of recovery"
+
+#-------------------------------------------------------------------------------
+import unittest
+import numpy
+import emu
+from confmc import errors
+
+#===============================================================================
+class RecoverAxiTest(emu.AxiTestCase):
+    def setUp(self):
+        super(RecoverAxiTest, self).setUp()
+        self.src = numpy.arange(256, dtype=numpy.uint32)
+        for idx in range(0, 256, 16):
+            self.bfm.BfmWrite(self.hdl, idx*4, self.src[idx:], 4, 16)
+
+    def read_all(self):
+        out = numpy.zeros(256, dtype=numpy.uint32)
+        for idx in range(0, 256, 16):
+            self.bfm.BfmRead(self.hdl, idx*4, out[idx:], 4, 16)
+        return out
+
+    def test_read_retried(self):
+        # every 3rd stream transfer fails, where reads come back by retry
+        self.bfm.BfmStatsClear(self.hdl)
+        self.bfm.conEmuSetFault(self.hdl, 3)
+        for rep in range(4):
+            self.assertTrue(numpy.array_equal(self.read_all(), self.src))
+        stats = self.bfm.BfmStatsGet(self.hdl)
+        self.assertGreater(stats.recoveries, 0)
+        self.assertGreater(stats.retries, 0)
+
+    def test_write_error_in_frame(self):
+        # writes are not retried, while the stream stays in frame
+        dst    = self.src+1000
+        failed = 0
+        self.bfm.conEmuSetFault(self.hdl, 2)
+        for idx in range(0, 256, 16):
+            try:
+                self.bfm.BfmWrite(self.hdl, idx*4, dst[idx:], 4, 16)
+            except errors.BfmWriteError as error:
+                self.assertEqual(error.status, self.bfm.BFM_ERR_WRITE)
+                failed += 1
+            self.assertIn(self.bfm.BfmWriteStatus(self.hdl, idx*4, dst[idx:], 4, 16)
+                         ,(0, self.bfm.BFM_ERR_WRITE))
+        self.bfm.conEmuSetFault(self.hdl, 0)
+        self.assertGreater(failed, 0)
+        self.assertTrue(numpy.array_equal(self.read_all(), dst))
+
+    def test_batch_flush_failed(self):
+        out   = numpy.zeros(64, dtype=numpy.uint32)
+        batch = self.bfm.BfmBatch(self.hdl)
+        try:
+            self.bfm.conEmuSetFault(self.hdl, 1)
+            for idx in range(4): batch.read(idx*64, out[idx*16:], 4, 16)
+            self.assertEqual(batch.flush(), self.bfm.BFM_ERR_RECOVER)
+            self.bfm.conEmuSetFault(self.hdl, 0)
+            for idx in range(4): batch.read(idx*64, out[idx*16:], 4, 16)
+            self.assertEqual(batch.flush(), self.bfm.BFM_ERR_DESYNC)
+            self.assertEqual(self.bfm.BfmRecover(self.hdl), 0)
+            for idx in range(4): batch.read(idx*64, out[idx*16:], 4, 16)
+            self.assertEqual(batch.flush(), 0)
+        finally:
+            batch.close()
+        self.assertTrue(numpy.array_equal(out, numpy.concatenate(
+                        [self.src[idx*16:idx*16+16] for idx in range(4)])))
+
+    def test_desync_until_recover(self):
+        # without automatic recovery, the handler stays out of frame until BfmRecover()
+        out = numpy.zeros(16, dtype=numpy.uint32)
+        self.bfm.BfmSetRecovery(self.hdl, None)
+        self.bfm.conEmuSetFault(self.hdl, 1)
+        self.assertLess(self.bfm.BfmReadStatus(self.hdl, 0, out, 4, 16), 0)
+        self.bfm.conEmuSetFault(self.hdl, 0)
+        self.assertEqual(self.bfm.BfmReadStatus(self.hdl, 0, out, 4, 16), self.bfm.BFM_ERR_DESYNC)
+        self.assertRaises(errors.BfmDesyncError, self.bfm.BfmRead, self.hdl, 0, out, 4, 16)
+        self.assertEqual(self.bfm.BfmRecover(self.hdl, self.bfm.BFM_RECOVER_FX3)
+                        ,self.bfm.BFM_RECOVER_EP)
+        self.assertEqual(self.bfm.BfmReadStatus(self.hdl, 0, out, 4, 16), 0)
+        self.assertTrue(numpy.array_equal(out, self.src[:16]))
+
+class RecoverAhbTest(RecoverAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.regmap, where register maps are written
+to a temporary directory.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of register map"
+
+#-------------------------------------------------------------------------------
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import emu
+from confmc import regmap
+
+#===============================================================================
+DMA_JSON = {
+    'name': 'dma', 'base': '0x10000',
+    'registers': [
+        { 'name': 'CTRL', 'offset': '0x0', 'policy': 'cached', 'reset': 0,
+          'fields': [ { 'name': 'ENABLE', 'lsb': 0, 'width': 1 },
+                      { 'name': 'MODE'  , 'lsb': 1, 'width': 2 },
+                      { 'name': 'START' , 'lsb': 8, 'width': 1 } ] },
+        { 'name': 'SRC', 'offset': '0x4', 'policy': 'cached' },
+        { 'name': 'DST', 'offset': '0x8', 'policy': 'cached' },
+        { 'name': 'LEN', 'offset': '0xC', 'policy': 'write-only', 'reset': '0x100',
+          'fields': [ { 'name': 'LO', 'lsb': 0 , 'width': 16 },
+                      { 'name': 'HI', 'lsb': 16, 'width': 16 } ] },
+        { 'name': 'STATUS', 'offset': '0x20',
+          'fields': [ { 'name': 'BUSY', 'lsb': 0, 'width': 1, 'access': 'ro' },
+                      { 'name': 'CNT' , 'lsb': 4, 'width': 8 } ] } ] }
+
+DMA_CSV = """register,offset,policy,reset,field,lsb,width,access,desc
+CTRL,0x0,cached,0,ENABLE,0,1,rw,enable
+CTRL,,,,MODE,1,2,rw,
+STATUS,0x20,volatile,,BUSY,0,1,ro,
+"""
+
+DMA_XML = """<?xml version="1.0"?>
+<ipxact:component xmlns:ipxact="http://www.accellera.org/XMLSchema/IPXACT/1685-2014">
+ <ipxact:name>dma</ipxact:name>
+ <ipxact:memoryMaps><ipxact:memoryMap><ipxact:addressBlock>
+  <ipxact:baseAddress>0x10000</ipxact:baseAddress>
+  <ipxact:register><ipxact:name>CTRL</ipxact:name><ipxact:addressOffset>0x0</ipxact:addressOffset><ipxact:size>32</ipxact:size>
+   <ipxact:field><ipxact:name>ENABLE</ipxact:name><ipxact:bitOffset>0</ipxact:bitOffset><ipxact:bitWidth>1</ipxact:bitWidth></ipxact:field></ipxact:register>
+  <ipxact:register><ipxact:name>KICK</ipxact:name><ipxact:addressOffset>0x4</ipxact:addressOffset><ipxact:size>32</ipxact:size><ipxact:access>write-only</ipxact:access>
+   <ipxact:reset><ipxact:value>0x5</ipxact:value></ipxact:reset></ipxact:register>
+  <ipxact:register><ipxact:name>STATUS</ipxact:name><ipxact:addressOffset>0x8</ipxact:addressOffset><ipxact:size>32</ipxact:size><ipxact:volatile>true</ipxact:volatile><ipxact:access>read-only</ipxact:access></ipxact:register>
+ </ipxact:addressBlock></ipxact:memoryMap></ipxact:memoryMaps>
+</ipxact:component>
+"""
+
+class _MapFiles(object):
+    def make_maps(self):
+        self.dir = tempfile.mkdtemp()
+        for name, text in (('dma.json', json.dumps(DMA_JSON)), ('dma.csv', DMA_CSV)
+                          ,('dma.xml', DMA_XML)):
+            with open(os.path.join(self.dir, name), 'w') as fp: fp.write(text)
+
+    def load(self, name):
+        return regmap.load(os.path.join(self.dir, name))
+
+#===============================================================================
+class LoadTest(unittest.TestCase, _MapFiles):
+    def setUp(self):
+        self.make_maps()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_json(self):
+        rmap = self.load('dma.json')
+        self.assertEqual(rmap.base, 0x10000)
+        self.assertEqual([r.name for r in rmap], ['CTRL', 'SRC', 'DST', 'LEN', 'STATUS'])
+        self.assertEqual(rmap['LEN'].policy, 'write-only')
+        self.assertEqual(rmap['LEN'].reset, 0x100)
+        self.assertEqual(rmap['CTRL'].fields['MODE'].mask, 0x6)
+        self.assertEqual(rmap['STATUS'].fields['BUSY'].access, 'ro')
+
+    def test_csv(self):
+        rmap = self.load('dma.csv')
+        self.assertEqual(rmap.name, 'dma')
+        self.assertEqual(list(rmap['CTRL'].fields), ['ENABLE', 'MODE'])
+        self.assertEqual(rmap['STATUS'].offset, 0x20)
+
+    def test_ipxact(self):
+        rmap = self.load('dma.xml')
+        self.assertEqual(rmap.base, 0x10000)
+        self.assertEqual(rmap['CTRL'].policy, 'cached')
+        self.assertEqual(rmap['KICK'].policy, 'write-only')
+        self.assertEqual(rmap['KICK'].reset, 5)
+        self.assertEqual(rmap['STATUS'].policy, 'volatile')
+
+    def test_bad(self):
+        self.assertRaises(ValueError, regmap.load, os.path.join(self.dir, 'dma.txt'))
+        self.assertRaises(ValueError, regmap.Register, 'X', 0x2)
+        self.assertRaises(ValueError, regmap.Register, 'X', 0x0, (), 'sometimes')
+        self.assertRaises(ValueError, regmap.Field, 'F', 30, 4)
+        self.assertRaises(ValueError, regmap.RegisterMap, 'm', 0
+                         ,[regmap.Register('X', 0x0), regmap.Register('Y', 0x0)])
+
+#===============================================================================
+class BankAxiTest(emu.AxiTestCase, _MapFiles):
+    def setUp(self):
+        super(BankAxiTest, self).setUp()
+        self.make_maps()
+        self.regs = regmap.RegisterBank(self.bfm, self.hdl, self.load('dma.json'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        super(BankAxiTest, self).tearDown()
+
+    def test_shadow(self):
+        regs = self.regs
+        regs.CTRL.ENABLE = 1
+        transfers = regs.transfers
+        self.assertEqual(regs.CTRL.ENABLE, 1) # cached
+        self.assertEqual(regs.transfers, transfers)
+        regs.CTRL.MODE = 2
+        self.assertEqual(regs.transfers, transfers+1)
+        self.assertEqual(regs.CTRL.value, 5)
+        self.assertEqual(self.read(0x10000), [5])
+        self.write(0x10000, [0])
+        self.assertEqual(regs.CTRL.value, 5)
+        regs.invalidate()
+        self.assertEqual(regs.CTRL.value, 0)
+        self.write(0x10020, [0x31])
+        self.assertEqual(regs.STATUS.CNT, 3) # volatile
+        self.assertEqual(regs.STATUS.BUSY, 1)
+
+    def test_write_only(self):
+        regs = self.regs
+        self.write(0x1000C, [0xFFFFFFFF])
+        regs.LEN.HI = 7 # over the reset value, not read
+        self.assertEqual(self.read(0x1000C), [(7<<16)|0x100])
+        self.assertEqual(regs.LEN.LO, 0x100)
+
+    def test_transaction(self):
+        regs = self.regs
+        regs.CTRL.value = 0
+        transfers = regs.transfers
+        with regs.transaction():
+            for idx in range(100):
+                regs.SRC = 0x1000+idx
+                regs.DST = 0x2000+idx
+                regs.CTRL.START = idx&1
+                regs.LEN.HI = 7
+                regs.STATUS.CNT = idx
+            self.assertEqual(regs.transfers, transfers)
+        self.assertEqual(regs.transfers, transfers+2) # read STATUS and write all
+        self.assertEqual(self.read(0x10000, 4), [0x100, 0x1000+99, 0x2000+99, (7<<16)|0x100])
+        self.assertEqual(regs.STATUS.CNT, 99)
+        self.assertEqual(list(regs.dump()), ['CTRL', 'SRC', 'DST', 'STATUS'])
+
+    def test_transaction_dropped(self):
+        regs = self.regs
+        regs.SRC = 1
+        try:
+            with regs.transaction():
+                regs.SRC = 5
+                raise KeyError('SRC')
+        except KeyError:
+            pass
+        self.assertEqual(regs.SRC.value, 1)
+        self.assertEqual(self.read(0x10004), [1])
+
+    def test_errors(self):
+        regs = self.regs
+        self.assertRaises(ValueError, setattr, regs.STATUS, 'BUSY', 1)
+        self.assertRaises(ValueError, setattr, regs.CTRL, 'MODE', 4)
+        self.assertRaises(AttributeError, setattr, regs.CTRL, 'NONE', 1)
+        self.assertRaises(AttributeError, getattr, regs, 'NONE')
+        self.assertRaises(AttributeError, setattr, regs, 'NONE', 1)
+
+    def test_update_checked_first(self):
+        regs = self.regs
+        regs.CTRL.value = 0
+        with regs.transaction():
+            self.assertRaises(ValueError, regs.update, 'CTRL', ENABLE=1, MODE=9)
+            self.assertEqual(len(regs._pending), 0)
+            regs.update('CTRL', MODE=2)
+        self.assertEqual(regs.CTRL.value, 4)
+
+    def test_ipxact_bank(self):
+        regs = regmap.RegisterBank(self.bfm, self.hdl, self.load('dma.xml'), base=0x20000)
+        regs.KICK = 9
+        self.assertEqual(regs.KICK.value, 9)
+        self.assertEqual(self.read(0x20004), [9])
+
+class BankAhbTest(BankAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
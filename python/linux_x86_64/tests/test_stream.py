@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of confmc.stream, where the emulator has a counter
+as stream-in source and a FIFO between stream-out and stream-in for
+CON_MODE_SLOOP.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of streaming interface"
+
+#-------------------------------------------------------------------------------
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import numpy
+import emu
+from confmc import stream
+
+#===============================================================================
+class ShortReader(io.RawIOBase):
+    """
+    File-like source returning 3 bytes at most for each read.
+    """
+    def __init__(self, data):
+        self.data = data
+        self.pos  = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        num = min(3, len(buf), len(self.data)-self.pos)
+        buf[:num] = self.data[self.pos:self.pos+num]
+        self.pos += num
+        return num
+
+class StreamAxiTest(emu.AxiTestCase):
+    def test_counter(self):
+        with stream.Stream(self.bfm, self.hdl, stream.CON_MODE_SF2U, chunk=64*1024, depth=4) as strm:
+            expect = None
+            nbytes = 0
+            for chunk in strm.read_chunks(total=1<<20):
+                self.assertEqual(chunk.ctypes.data%stream.PAGE_SIZE, 0)
+                if expect is not None: self.assertEqual(chunk[0], expect)
+                self.assertTrue(numpy.all(numpy.diff(chunk.astype(numpy.int64))==1))
+                expect  = (int(chunk[-1])+1)&0xFFFFFFFF
+                nbytes += chunk.nbytes
+            self.assertEqual(nbytes, 1<<20)
+        self.assertTrue(strm.stats.bytes_in>=1<<20)
+        self.assertEqual(strm.stats.errors, 0)
+
+    def test_overrun(self):
+        with stream.Stream(self.bfm, self.hdl, stream.CON_MODE_SF2U, chunk=4096, depth=2) as strm:
+            for chunk in strm.read_chunks(total=16*4096):
+                time.sleep(0.005)
+        self.assertTrue(strm.stats.overruns>=1)
+
+    def test_loop(self):
+        data = numpy.arange(100000, dtype=numpy.uint32)
+        def produce():
+            for idx in range(0, len(data), 7777): yield data[idx:idx+7777]
+        with stream.Stream(self.bfm, self.hdl, stream.CON_MODE_SLOOP, chunk=32*1024) as strm:
+            thread = threading.Thread(target=strm.write_from, args=(produce(),))
+            thread.start()
+            got = numpy.concatenate(list(strm.read_chunks(total=data.nbytes, copy=True, timeout=5)))
+            thread.join()
+        self.assertTrue(numpy.array_equal(got, data))
+        self.assertEqual(strm.stats.bytes_out, data.nbytes)
+
+    def test_file(self):
+        data   = numpy.arange(1001, dtype=numpy.uint32)
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'stream.bin')
+            with open(path, 'wb') as fp: fp.write(data.tobytes()+b'\x01\x02')
+            with stream.Stream(self.bfm, self.hdl, stream.CON_MODE_SLOOP, chunk=1024) as strm:
+                self.assertEqual(strm.write_from(path), 4006)
+                got = numpy.concatenate(list(strm.read_chunks(total=4008, copy=True, timeout=5)))
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertTrue(numpy.array_equal(got[:1001], data))
+        self.assertEqual(got[1001], 0x0201) # padded with zeros
+
+    def test_short_reads(self):
+        data = bytes(bytearray(range(256)))*64
+        with stream.Stream(self.bfm, self.hdl, stream.CON_MODE_SLOOP, chunk=4096) as strm:
+            self.assertEqual(strm.write_from(ShortReader(data)), len(data))
+            got = b''.join(c.tobytes() for c in strm.read_chunks(total=len(data), timeout=5))
+        self.assertEqual(got, data)
+
+    def test_back_to_command(self):
+        with stream.Stream(self.bfm, self.hdl, stream.CON_MODE_SU2F) as strm:
+            strm.write(bytearray(3<<20))
+            strm.flush()
+        self.assertEqual(strm.stats.bytes_out, 3<<20)
+        self.write(0x100, [1, 2, 3, 4])
+        self.assertEqual(self.read(0x100, 4), [1, 2, 3, 4])
+
+    def test_bad_args(self):
+        self.assertRaises(ValueError, stream.Stream, self.bfm, self.hdl, 7)
+        self.assertRaises(ValueError, stream.Stream, self.bfm, self.hdl, stream.CON_MODE_SF2U, 1022)
+        self.assertRaises(ValueError, stream.Stream, self.bfm, self.hdl, stream.CON_MODE_SF2U, 4096, 0)
+        with stream.Stream(self.bfm, self.hdl, stream.CON_MODE_SU2F) as strm:
+            self.assertRaises(ValueError, next, strm.read_chunks())
+        with stream.Stream(self.bfm, self.hdl, stream.CON_MODE_SF2U) as strm:
+            self.assertRaises(ValueError, strm.write, b'1234')
+
+    def test_failure(self):
+        # stream-in failed other than time-out stops the stream
+        orig = self.bfm._conStreamRead
+        def failed(hdl, addr, num, done):
+            return orig(hdl, None, num, done) # invalid parameter
+        self.bfm._conStreamRead = failed
+        try:
+            strm = stream.Stream(self.bfm, self.hdl, stream.CON_MODE_SF2U, chunk=4096)
+            try:
+                self.assertRaises(IOError, list, strm.read_chunks(timeout=5))
+                self.assertTrue(strm.error<0)
+                self.assertEqual(strm.stats.errors, 1)
+            finally:
+                strm.close()
+        finally:
+            self.bfm._conStreamRead = orig
+
+class StreamAhbTest(StreamAxiTest):
+    btype = 'ahb'
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+This file contains tests of BfmTransactV.
+"""
+__author__     = "agent"
+__copyright__  = "Copyright 2026, Future Design Systems"
+__credits__    = ["none", "some"]
+__license__    = "FUTURE DESIGN SYSTEMS SOFTWARE END-USER LICENSE AGREEMENT FOR CON-FMC."
+__version__    = "1"
+__revision__   = "0"
+__maintainer__ = "Ando Ki"
+__email__      = "contact@future-ds.com"
+__status__     = "Development"
+__date__       = "2026.10.18"
+__description__= "CON-FMC tests of vectored transactions"
+
+#-------------------------------------------------------------------------------
+import ctypes
+import unittest
+import numpy
+import emu
+
+#===============================================================================
+def make_descs(bfm, *items):
+    """
+    Return descriptors of (addr, offset, length, size, write, burst),
+    whose status is not 0 before the call.
+    """
+    descs = numpy.zeros(len(items), dtype=bfm.BfmDesc)
+    for idx, (addr, offset, length, size, write, burst) in enumerate(items):
+        descs[idx] = (addr, offset, length, size, write, burst, (0, 0, 0), 9)
+    return descs
+
+class TransactVAxiTest(emu.AxiTestCase):
+    def test_dtype(self):
+        self.assertEqual(numpy.dtype(self.bfm.BfmDesc).itemsize, ctypes.sizeof(self.bfm.BfmDesc))
+        self.assertEqual(ctypes.sizeof(self.bfm.BfmDesc), 20)
+
+    def test_singles(self):
+        num   = 2000
+        descs = numpy.zeros(2*num, dtype=self.bfm.BfmDesc)
+        data  = numpy.zeros(2*num, dtype=numpy.uint32)
+        data[:num] = numpy.arange(num)*7+3
+        descs['addr'][:num]   = 0x100000+numpy.arange(num)*4
+        descs['offset'][:num] = numpy.arange(num)
+        descs['write'][:num]  = 1
+        descs['addr'][num:]   = descs['addr'][:num][::-1]
+        descs['offset'][num:] = num+numpy.arange(num)
+        descs['length'] = 1
+        descs['size']   = 4
+        descs['burst']  = 1
+        self.assertEqual(self.bfm.BfmTransactV(self.hdl, descs, data), 0)
+        self.assertTrue(numpy.all(descs['status']==0))
+        self.assertTrue(numpy.array_equal(data[num:], data[:num][::-1]))
+
+    def test_mixed(self):
+        data = numpy.zeros(100, dtype=numpy.uint32)
+        data[:40] = numpy.arange(40)+1
+        descs = make_descs(self.bfm, (0x2000, 0 , 40, 4, 1, 1)  # incremental write
+                          ,(0x2000, 40, 40, 4, 0, 1)  # read back
+                          ,(0x3000, 0 , 20, 4, 1, 0)  # fixed, the last one stays
+                          ,(0x3000, 99, 5 , 4, 0, 1)  # beyond data
+                          ,(0x3001, 80, 1 , 1, 0, 1)) # byte 1 of 20
+        self.assertEqual(self.bfm.BfmTransactV(self.hdl, descs, data), 1)
+        self.assertEqual(list(descs['status']), [0, 0, 0, -1, 0])
+        self.assertTrue(numpy.array_equal(data[40:80], data[:40]))
+        self.assertEqual(self.read(0x3000), [20])
+        self.assertEqual(data[80], 0)
+
+    def test_ctypes_descs(self):
+        self.write(0x3000, [20])
+        descs = (self.bfm.BfmDesc*1)()
+        descs[0].addr   = 0x3000
+        descs[0].length = 1
+        descs[0].size   = 4
+        descs[0].burst  = 1
+        data = numpy.zeros(1, dtype=numpy.uint32)
+        self.assertEqual(self.bfm.BfmTransactV(self.hdl, descs, data), 0)
+        self.assertEqual(data[0], 20)
+        self.assertRaises(ValueError, self.bfm.BfmTransactV, self.hdl, bytearray(7), data)
+
+    def test_across_boundary(self):
+        # incremental longer than burst limit across the boundary
+        boundary = self.bfm._burst_boundary
+        num   = 600
+        start = 2*boundary-40
+        data  = numpy.zeros(2*num, dtype=numpy.uint32)
+        data[:num] = numpy.arange(num)+0x100
+        descs = make_descs(self.bfm, (start, 0, num, 4, 1, 1), (start, num, num, 4, 0, 1))
+        self.assertEqual(self.bfm.BfmTransactV(self.hdl, descs, data), 0)
+        self.assertEqual(list(descs['status']), [0, 0])
+        self.assertTrue(numpy.array_equal(data[num:], data[:num]))
+        self.assertEqual(self.read(2*boundary), [0x100+10])
+
+    def test_bad_burst(self):
+        data  = numpy.zeros(16, dtype=numpy.uint32)
+        descs = make_descs(self.bfm, (0x0, 0, 4, 4, 0, 3), (0x0, 0, 4, 3, 0, 1))
+        self.assertEqual(self.bfm.BfmTransactV(self.hdl, descs, data), 2)
+        self.assertEqual(list(descs['status']), [-1, -1])
+
+class TransactVAhbTest(TransactVAxiTest):
+    btype = 'ahb'
+
+#===============================================================================
+class WrapAxiTest(emu.AxiTestCase):
+    def test_wrap(self):
+        # 4 beats from 0x5008 go 0x5008, 0x500C, 0x5000, 0x5004
+        data  = numpy.array([1, 2, 3, 4]+[0]*4, dtype=numpy.uint32)
+        descs = make_descs(self.bfm, (0x5008, 0, 4, 4, 1, 2)
+                                    ,(0x5000, 4, 4, 4, 0, 1)
+                                    ,(0x5008, 0, 3, 4, 1, 2)  # illegal length
+                                    ,(0x5002, 0, 4, 4, 1, 2)) # not aligned
+        self.assertEqual(self.bfm.BfmTransactV(self.hdl, descs, data), 2)
+        self.assertEqual(list(descs['status']), [0, 0, -1, -1])
+        self.assertEqual(list(data[4:]), [3, 4, 1, 2])
+
+    def test_wrap_not_split(self):
+        data  = numpy.zeros(32, dtype=numpy.uint32)
+        descs = make_descs(self.bfm, (0x6000, 0, 32, 4, 1, 2))
+        self.assertEqual(self.bfm.BfmTransactV(self.hdl, descs, data), 1)
+
+#-------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+
+#===============================================================================
+# Revision history:
+#
+# 2026.10.18: Started
+#===============================================================================